@@ -0,0 +1,66 @@
+"""
+Huey periodic tasks for the user activity feed.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from huey import crontab
+from huey.contrib.djhuey import lock_task, periodic_task
+
+logger = logging.getLogger(__name__)
+
+
+def prune_activity_feed_window(max_per_user=None, retention_days=None):
+    """Delete activities outside each user's rolling window.
+
+    Removes entries older than ``retention_days`` and, for users above
+    ``max_per_user`` entries, everything older than their newest
+    ``max_per_user``. Returns the number of deleted rows.
+    """
+    from gym_app.models import ActivityFeed
+
+    if max_per_user is None:
+        max_per_user = getattr(settings, 'ACTIVITY_FEED_MAX_PER_USER', 200)
+    if retention_days is None:
+        retention_days = getattr(settings, 'ACTIVITY_FEED_RETENTION_DAYS', 365)
+
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = ActivityFeed.objects.filter(created_at__lt=cutoff).delete()
+
+    over_limit = (
+        ActivityFeed.objects.order_by()
+        .values('user_id')
+        .annotate(total=Count('id'))
+        .filter(total__gt=max_per_user)
+        .values_list('user_id', flat=True)
+    )
+    for user_id in list(over_limit):
+        user_activities = ActivityFeed.objects.filter(user_id=user_id)
+        # Oldest entry that is still inside the window; (created_at, id)
+        # matches the feed's cursor ordering so ties are resolved the same way.
+        boundary_created, boundary_id = user_activities.order_by(
+            '-created_at', '-id',
+        ).values_list('created_at', 'id')[max_per_user - 1]
+        count, _ = user_activities.filter(
+            Q(created_at__lt=boundary_created)
+            | Q(created_at=boundary_created, id__lt=boundary_id)
+        ).delete()
+        deleted += count
+    return deleted
+
+
+@periodic_task(crontab(minute='45'))
+@lock_task('activity-feed-prune-lock')
+def prune_activity_feed():
+    """Enforce the per-user activity window.
+
+    Runs hourly so inserts (single or batched) never pay for trimming.
+    """
+    deleted = prune_activity_feed_window()
+    if deleted:
+        logger.info("Pruned %d activity feed entries", deleted)
+    return deleted
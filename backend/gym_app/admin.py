@@ -9,7 +9,7 @@ from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
 from gym_app.utils.auth_utils import generate_auth_tokens
-from gym_app.models import User, Process, Stage, CaseFile, Case, StageAlert, LegalRequest, LegalRequestType, LegalDiscipline, LegalRequestFiles, LegalRequestResponse, CorporateRequest, CorporateRequestType, CorporateRequestFiles, CorporateRequestResponse, Organization, OrganizationInvitation, OrganizationMembership, OrganizationPost, LegalDocument, IntranetProfile, DynamicDocument, DocumentVariable, LegalUpdate, RecentDocument, RecentProcess, DocumentSignature, Tag, DocumentVisibilityPermission, DocumentUsabilityPermission, DocumentFolder, DocumentRelationship, Subscription, PaymentHistory, Service, ServiceStage, ServiceField, ServiceRequest, ServiceRequestAnswer, ServiceRequestFieldFile, ServiceRequestLawyerResponse, ServiceRequestLawyerResponseFile, ServiceRequestSequence, Notification
+from gym_app.models import User, Process, Stage, CaseFile, Case, StageAlert, LegalRequest, LegalRequestType, LegalDiscipline, LegalRequestFiles, LegalRequestResponse, CorporateRequest, CorporateRequestType, CorporateRequestFiles, CorporateRequestResponse, Organization, OrganizationInvitation, OrganizationMembership, OrganizationPost, LegalDocument, IntranetProfile, DynamicDocument, DocumentVariable, LegalUpdate, RecentDocument, RecentProcess, DocumentSignature, Tag, DocumentVisibilityPermission, DocumentUsabilityPermission, DocumentFolder, DocumentRelationship, Subscription, PaymentHistory, WompiWebhookEvent, Service, ServiceStage, ServiceField, ServiceRequest, ServiceRequestAnswer, ServiceRequestFieldFile, ServiceRequestLawyerResponse, ServiceRequestLawyerResponseFile, ServiceRequestSequence, Notification
 from gym_app.models.user import UserSignature, ActivityFeed
 from gym_app.models.password_code import PasswordCode
 from gym_app.models.email_verification_code import EmailVerificationCode
@@ -846,9 +846,9 @@ class NotificationAdmin(admin.ModelAdmin):
 
 
 class StageAlertAdmin(admin.ModelAdmin):
-    list_display = ('stage', 'is_active', 'notify_clients', 'notified_3_days', 'notified_1_day', 'created_at')
+    list_display = ('stage', 'is_active', 'notify_clients', 'notified_3_days', 'notified_1_day', 'next_fire_at', 'created_at')
     list_filter = ('is_active', 'notify_clients', 'notified_3_days', 'notified_1_day')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('next_fire_at', 'created_at', 'updated_at')
     raw_id_fields = ('stage',)
 
 
@@ -1033,6 +1033,7 @@ admin_site.register(RecentDocument, RecentDocumentAdmin)
 admin_site.register(RecentProcess, RecentProcessAdmin)
 admin_site.register(Subscription)
 admin_site.register(PaymentHistory)
+admin_site.register(WompiWebhookEvent)
 admin_site.register(ActivityFeed, ActivityFeedAdmin)
 admin_site.register(PasswordCode, PasswordCodeAdmin)
 admin_site.register(EmailVerificationCode, EmailVerificationCodeAdmin)
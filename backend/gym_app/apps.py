@@ -9,3 +9,4 @@ class LogInAppConfig(AppConfig):
         import gym_app.secop_tasks  # noqa: F401
         import gym_app.notification_tasks  # noqa: F401
         import gym_app.process_alert_tasks  # noqa: F401
+        import gym_app.activity_feed_tasks  # noqa: F401
@@ -0,0 +1,43 @@
+"""DRF authentication classes."""
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from gym_app.utils import auth_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that resolves the token's user through ``auth_cache``.
+
+    Misses load the user exactly like simplejwt does (existence, active and
+    revocation checks). Hits repeat the active and revocation checks on the
+    cached user, which costs no query.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification') from None
+
+        loaded = []
+
+        def load():
+            loaded.append(True)
+            return super(CachedJWTAuthentication, self).get_user(validated_token)
+
+        user = auth_cache.get_or_load(user_id, load)
+        if not loaded:
+            self._check_cached_user(user, validated_token)
+        return user
+
+    @staticmethod
+    def _check_cached_user(user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
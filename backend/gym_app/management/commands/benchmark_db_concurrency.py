@@ -0,0 +1,159 @@
+"""
+Management command to benchmark SQLite tuning profiles under concurrency.
+
+For each profile in ``gym_project.database.SQLITE_PROFILES`` it creates a
+scratch database, then runs ``--readers`` threads issuing indexed lookups
+and range counts while one writer thread inserts and updates rows in short
+transactions — the access pattern of the web workers plus the Huey
+consumer. Each thread uses its own ``sqlite3`` connection configured with
+the profile's PRAGMAs, exactly like Django's ``init_command`` does.
+
+The project database is never touched.
+
+Usage::
+
+    python manage.py benchmark_db_concurrency                      # all profiles, 4 readers, 5 s
+    python manage.py benchmark_db_concurrency --readers 8 --seconds 10
+    python manage.py benchmark_db_concurrency --profiles wal
+"""
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from gym_project.database import SQLITE_PROFILES, sqlite_pragmas
+
+SEED_ROWS = 20000
+
+
+def _connect(path, profile):
+    # timeout=0: lock waits come only from the profile's busy_timeout
+    connection = sqlite3.connect(path, timeout=0, isolation_level=None, check_same_thread=False)
+    for pragma in sqlite_pragmas(profile):
+        connection.execute(pragma)
+    return connection
+
+
+def _seed(path, profile):
+    connection = _connect(path, profile)
+    connection.execute(
+        'CREATE TABLE item (id INTEGER PRIMARY KEY, owner INTEGER, state TEXT, payload TEXT)'
+    )
+    connection.execute('CREATE INDEX item_owner ON item (owner)')
+    connection.execute('BEGIN')
+    connection.executemany(
+        'INSERT INTO item (owner, state, payload) VALUES (?, ?, ?)',
+        ((i % 500, 'Draft', 'x' * 200) for i in range(SEED_ROWS)),
+    )
+    connection.execute('COMMIT')
+    connection.close()
+
+
+def run_profile(path, profile, readers, seconds):
+    """Run the workload against ``path`` and return the per-profile counters."""
+    _seed(path, profile)
+    stop = threading.Event()
+    lock = threading.Lock()
+    totals = {'reads': 0, 'writes': 0, 'lock_errors': 0}
+
+    def record(key):
+        with lock:
+            totals[key] += 1
+
+    def reader():
+        connection = _connect(path, profile)
+        rng = random.Random()
+        while not stop.is_set():
+            try:
+                owner = rng.randrange(500)
+                connection.execute('SELECT id, state FROM item WHERE owner = ?', (owner,)).fetchall()
+                connection.execute(
+                    "SELECT COUNT(*) FROM item WHERE state = 'Completed' AND owner < ?", (owner,)
+                ).fetchone()
+                record('reads')
+            except sqlite3.OperationalError:
+                record('lock_errors')
+        connection.close()
+
+    def writer():
+        connection = _connect(path, profile)
+        rng = random.Random()
+        while not stop.is_set():
+            try:
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute(
+                    'INSERT INTO item (owner, state, payload) VALUES (?, ?, ?)',
+                    (rng.randrange(500), 'Draft', 'y' * 200),
+                )
+                connection.execute(
+                    "UPDATE item SET state = 'Completed' WHERE id = ?", (rng.randrange(1, SEED_ROWS),)
+                )
+                connection.execute('COMMIT')
+                record('writes')
+            except sqlite3.OperationalError:
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+                record('lock_errors')
+        connection.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'profile': profile,
+        'reads_per_second': totals['reads'] / elapsed,
+        'writes_per_second': totals['writes'] / elapsed,
+        'lock_errors': totals['lock_errors'],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare SQLite tuning profiles with parallel readers and a concurrent writer'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles',
+            nargs='+',
+            default=list(SQLITE_PROFILES),
+            help=f"Profiles to compare (default: {' '.join(SQLITE_PROFILES)})",
+        )
+        parser.add_argument('--readers', type=int, default=4, help='Reader threads (default: 4)')
+        parser.add_argument(
+            '--seconds', type=float, default=5.0, help='Duration per profile in seconds (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['profiles']) - set(SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+        if options['readers'] < 1 or options['seconds'] <= 0:
+            raise CommandError('--readers must be >= 1 and --seconds > 0')
+
+        self.stdout.write(
+            f"{options['readers']} readers + 1 writer, {options['seconds']:g}s per profile"
+        )
+        self.stdout.write(f"{'profile':<10} {'reads/s':>10} {'writes/s':>10} {'lock errors':>12}")
+        for profile in options['profiles']:
+            with tempfile.TemporaryDirectory() as directory:
+                result = run_profile(
+                    os.path.join(directory, 'bench.sqlite3'),
+                    profile,
+                    options['readers'],
+                    options['seconds'],
+                )
+            self.stdout.write(
+                f"{profile:<10} {result['reads_per_second']:>10.0f} "
+                f"{result['writes_per_second']:>10.0f} {result['lock_errors']:>12}"
+            )
@@ -0,0 +1,56 @@
+"""
+Management command to garbage-collect the deduplicated media blob store.
+
+Removes blobs under ``MEDIA_ROOT/.blobs`` that no stored file links to
+anymore (see ``gym_app.storage``). With ``--backfill`` it first folds media
+written before deduplication was enabled into the blob store, so identical
+legacy files end up sharing one copy.
+
+Usage::
+
+    python manage.py gc_media_blobs                 # collect unreferenced blobs
+    python manage.py gc_media_blobs --dry-run       # only report
+    python manage.py gc_media_blobs --backfill      # dedupe legacy files, then collect
+"""
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from gym_app.storage import ContentAddressedStorage, collect_garbage, deduplicate_existing
+
+
+class Command(BaseCommand):
+    help = 'Delete unreferenced media blobs (and optionally deduplicate legacy media files)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Deduplicate media files written before content-addressed storage was enabled',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be done without changing anything',
+        )
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        if not isinstance(storage, ContentAddressedStorage):
+            self.stdout.write(
+                self.style.WARNING("Content-addressed media storage is not enabled. Nothing to do.")
+            )
+            return
+
+        dry_run = options['dry_run']
+        prefix = '[dry-run] ' if dry_run else ''
+
+        if options['backfill']:
+            processed, reclaimed = deduplicate_existing(storage, dry_run=dry_run)
+            self.stdout.write(
+                f"{prefix}Backfill: {processed} files hashed, {reclaimed / 1024 / 1024:.1f} MB reclaimable"
+            )
+
+        removed, reclaimed = collect_garbage(storage, dry_run=dry_run)
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Removed {removed} unreferenced blobs ({reclaimed / 1024 / 1024:.1f} MB)"
+        ))
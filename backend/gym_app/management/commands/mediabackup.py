@@ -0,0 +1,52 @@
+"""
+Hard-link-aware media backup.
+
+Overrides django-dbbackup's ``mediabackup`` (``gym_app`` is listed before
+``dbbackup`` in ``INSTALLED_APPS``), so ``scheduled_backup`` and any timer
+running ``manage.py mediabackup`` get it. With content-addressed media
+storage (``gym_app.storage``) identical files are hard links to one blob,
+and the stock command archived every name in full. Here the first name of
+each shared inode is archived with its content and the other names as tar
+hard-link entries: each distinct content is stored once, and extracting the
+archive recreates the links.
+
+Options are the ones of django-dbbackup's command.
+"""
+import os
+import tarfile
+
+from dbbackup import utils
+from dbbackup.management.commands.mediabackup import Command as MediaBackupCommand
+
+
+class Command(MediaBackupCommand):
+    def _shared_inode(self, name):
+        """Return ``(st_dev, st_ino)`` when ``name`` has other hard links, else ``None``."""
+        try:
+            stat_result = os.stat(self.media_storage.path(name))
+        except (NotImplementedError, OSError):
+            return None
+        if stat_result.st_nlink < 2:
+            return None
+        return stat_result.st_dev, stat_result.st_ino
+
+    def _create_tar(self, name):
+        """Create the TAR file, archiving each shared inode once."""
+        fileobj = utils.create_spooled_temporary_file()
+        mode = "w:gz" if self.compress else "w"
+        archived = {}  # shared inode -> name it was archived under
+        with tarfile.open(name=name, fileobj=fileobj, mode=mode) as tar_file:
+            for media_filename in self._explore_storage():
+                tarinfo = tarfile.TarInfo(media_filename)
+                inode = self._shared_inode(media_filename)
+                if inode in archived:
+                    tarinfo.type = tarfile.LNKTYPE
+                    tarinfo.linkname = archived[inode]
+                    tar_file.addfile(tarinfo)
+                    continue
+                with self.media_storage.open(media_filename) as media_file:
+                    tarinfo.size = len(media_file)
+                    tar_file.addfile(tarinfo, media_file)
+                if inode is not None:
+                    archived[inode] = media_filename
+        return fileobj
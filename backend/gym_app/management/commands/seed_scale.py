@@ -0,0 +1,447 @@
+"""Generate a large, deterministic synthetic dataset for load and benchmark runs.
+
+Unlike the ``create_*`` seeders chained by ``create_fake_data`` (Faker +
+``.save()`` per row, meant for ~50 coherent demo records), this command
+writes rows with ``bulk_create`` in batches inside a single transaction and
+draws every value from a ``random.Random(seed)`` — the same ``--seed`` and
+``--scale`` always yield the same dataset.
+
+Approximate volumes at ``--scale 1`` (~1M rows):
+
+=====================  =========================================================
+Users                  200 lawyers, 1,800 clients
+Dynamic documents      80,000 — documents per lawyer follow a Pareto
+                       distribution (a few lawyers own most templates)
+Document variables     2–15 per document (mode 6) → ~600,000
+Signatures             35% of documents require 1–4 signers → ~55,000
+Processes              8,000 with 1–8 stages (+ M2M rows and last-stage alert)
+SECOP processes        60,000 (status/department/method skewed like production)
+Notifications          20 per user
+Activity feed          20 per user, dated now (inside the
+                       ``ACTIVITY_FEED_MAX_PER_USER`` /
+                       ``ACTIVITY_FEED_RETENTION_DAYS`` window, so
+                       ``prune_activity_feed`` keeps them all)
+=====================  =========================================================
+
+Seeded rows are tagged so they can be removed without touching real or demo
+data: users use the ``@seed-scale.test`` domain and SECOP processes the
+``SEED.`` id prefix.
+
+Usage::
+
+    python manage.py seed_scale                       # scale 1, seed 42
+    python manage.py seed_scale --scale 0.01          # ~10k rows (CI / benchmarks)
+    python manage.py seed_scale --scale 5 --seed 7
+    python manage.py seed_scale --purge               # delete a previous seed
+"""
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from gym_app.models import (
+    ActivityFeed,
+    Case,
+    DocumentSignature,
+    DocumentVariable,
+    DynamicDocument,
+    Notification,
+    Process,
+    SECOPProcess,
+    Stage,
+    StageAlert,
+    User,
+)
+from gym_app.models.process import alert_fire_at
+
+from .create_secop_data import (
+    CITIES,
+    CONTRACT_TYPES,
+    DEPARTMENTS,
+    ENTITIES,
+    PROCUREMENT_METHODS,
+    UNSPSC_CODES,
+)
+
+SEED_EMAIL_DOMAIN = 'seed-scale.test'
+SEED_SECOP_PREFIX = 'SEED.'
+
+# Base volumes at --scale 1.
+BASE_VOLUMES = {
+    'lawyers': 200,
+    'clients': 1800,
+    'documents': 80_000,
+    'processes': 8_000,
+    'secop': 60_000,
+    'notifications_per_user': 20,
+    'activities_per_user': 20,
+}
+
+DOCUMENT_STATES = [
+    ('Published', 18), ('Draft', 12), ('Progress', 20), ('Completed', 30),
+    ('PendingSignatures', 8), ('FullySigned', 9), ('Rejected', 2), ('Expired', 1),
+]
+SECOP_STATUSES = [('Abierto', 25), ('Publicado', 15), ('Adjudicado', 35), ('Cerrado', 25)]
+PROCESS_STAGES = [
+    'Radicación', 'Admisión', 'Notificación', 'Contestación', 'Pruebas',
+    'Alegatos', 'Fallo', 'Recurso', 'Archivo',
+]
+SELECT_OPTIONS = ['A', 'B', 'C']
+VARIABLE_TYPES = [('input', 50), ('text_area', 10), ('number', 15), ('date', 15), ('email', 5), ('select', 5)]
+NOTIFICATION_CATEGORIES = [
+    ('signature_request', 30), ('signature_completed', 15), ('signature_rejected', 3),
+    ('signature_reminder', 12), ('process_alert', 20), ('general', 20),
+]
+ACTIVITY_TYPES = [('create', 25), ('edit', 30), ('finish', 10), ('update', 15), ('download', 15), ('delete', 5)]
+TITLE_WORDS = [
+    'Contrato', 'Poder', 'Acta', 'Otrosí', 'Demanda', 'Derecho de petición',
+    'Acuerdo', 'Memorial', 'Tutela', 'Certificación', 'Promesa de compraventa',
+]
+SUBJECT_WORDS = [
+    'arrendamiento', 'prestación de servicios', 'confidencialidad', 'compraventa',
+    'laboral', 'sociedad', 'transacción', 'cesión', 'mandato', 'obra',
+]
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def _variable_value(rng, field_type, position):
+    """A value ``DocumentVariable.clean()`` accepts for ``field_type``."""
+    if field_type == 'number':
+        return str(rng.randint(1, 5000) * 10_000)
+    if field_type == 'date':
+        return (date(2024, 1, 1) + timedelta(days=rng.randint(0, 1095))).isoformat()
+    if field_type == 'email':
+        return f'contacto{rng.randint(1, 99_999)}@ejemplo.test'
+    if field_type == 'select':
+        return rng.choice(SELECT_OPTIONS)
+    return f'valor {position}'
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate a deterministic synthetic dataset (~1M rows at --scale 1)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Scale factor applied to the base volumes (default: 1.0 ≈ 1M rows)')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Random seed; the same seed and scale produce the same dataset')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows per bulk_create batch (default: 5000)')
+        parser.add_argument('--purge', action='store_true',
+                            help='Delete previously seeded rows instead of creating new ones')
+
+    def handle(self, *args, **options):
+        if options['purge']:
+            self._purge()
+            return
+
+        scale = options['scale']
+        if scale <= 0:
+            raise CommandError('--scale must be positive.')
+        if User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').exists():
+            raise CommandError('A scale seed already exists. Run with --purge first.')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.counts = {}
+        volumes = {key: max(1, int(round(value * scale))) for key, value in BASE_VOLUMES.items()}
+        volumes['notifications_per_user'] = BASE_VOLUMES['notifications_per_user']
+        volumes['activities_per_user'] = BASE_VOLUMES['activities_per_user']
+
+        started = time.monotonic()
+        with transaction.atomic():
+            if connection.vendor == 'sqlite':
+                # Safe inside the single seeding transaction; speeds up SQLite a lot.
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA defer_foreign_keys = ON')
+            lawyers, clients = self._seed_users(volumes['lawyers'], volumes['clients'])
+            self._seed_documents(volumes['documents'], lawyers, clients)
+            self._seed_processes(volumes['processes'], lawyers, clients)
+            self._seed_secop(volumes['secop'])
+            self._seed_notifications(lawyers + clients, volumes['notifications_per_user'])
+            self._seed_activities(lawyers + clients, volumes['activities_per_user'])
+
+        elapsed = time.monotonic() - started
+        total = sum(self.counts.values())
+        for label, count in self.counts.items():
+            self.stdout.write(f'  {label:<22} {count:>10,}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {total:,} rows (scale={scale}, seed={options["seed"]}) in {elapsed:.1f}s'
+        ))
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _bulk(self, model, objects, label=None):
+        """``bulk_create`` in batches and record the row count."""
+        for start in range(0, len(objects), self.batch_size):
+            model.objects.bulk_create(objects[start:start + self.batch_size], batch_size=self.batch_size)
+        label = label or model._meta.verbose_name_plural
+        self.counts[label] = self.counts.get(label, 0) + len(objects)
+        return objects
+
+    def _resolve_pks(self, model, objects, key):
+        """Fill in primary keys for backends that don't return them from bulk inserts."""
+        missing = [obj for obj in objects if obj.pk is None]
+        if not missing:
+            return
+        for start in range(0, len(missing), self.batch_size):
+            chunk = missing[start:start + self.batch_size]
+            lookup = dict(
+                model.objects.filter(**{f'{key}__in': [getattr(obj, key) for obj in chunk]})
+                .values_list(key, 'pk')
+            )
+            for obj in chunk:
+                obj.pk = lookup[getattr(obj, key)]
+
+    def _past(self, max_days):
+        return self.now - timedelta(days=self.rng.randint(0, max_days), minutes=self.rng.randint(0, 1439))
+
+    # ------------------------------------------------------------------
+    # Domains
+    # ------------------------------------------------------------------
+    def _seed_users(self, num_lawyers, num_clients):
+        password = make_password('password')  # hash once; PBKDF2 per row would dominate
+        users = []
+        for index in range(num_lawyers):
+            users.append(User(
+                email=f'lawyer{index:05d}@{SEED_EMAIL_DOMAIN}', password=password,
+                first_name='Abogado', last_name=f'Escala {index}', role='lawyer',
+                is_gym_lawyer=True, is_profile_completed=True,
+            ))
+        for index in range(num_clients):
+            users.append(User(
+                email=f'client{index:05d}@{SEED_EMAIL_DOMAIN}', password=password,
+                first_name='Cliente', last_name=f'Escala {index}',
+                role=_weighted(self.rng, [('client', 60), ('basic', 25), ('corporate_client', 15)]),
+                is_profile_completed=True,
+            ))
+        self._bulk(User, users, 'users')
+        self._resolve_pks(User, users, 'email')
+        return users[:num_lawyers], users[num_lawyers:]
+
+    def _seed_documents(self, num_documents, lawyers, clients):
+        rng = self.rng
+        # Pareto weights: a handful of lawyers author most documents.
+        lawyer_weights = [rng.paretovariate(1.2) for _ in lawyers]
+        authors = rng.choices(lawyers, weights=lawyer_weights, k=num_documents)
+
+        documents = []
+        variable_counts = []
+        for index, author in enumerate(authors):
+            state = _weighted(rng, DOCUMENT_STATES)
+            is_template = state in ('Published', 'Draft')
+            requires_signature = not is_template and rng.random() < 0.35
+            if requires_signature and state not in ('PendingSignatures', 'FullySigned', 'Rejected', 'Expired'):
+                state = rng.choice(['PendingSignatures', 'FullySigned'])
+            title = f'{rng.choice(TITLE_WORDS)} de {rng.choice(SUBJECT_WORDS)} #{index:07d}'
+            num_variables = int(rng.triangular(2, 15, 6))
+            variable_counts.append(num_variables)
+            tokens = ' '.join(f'{{{{var_{position}}}}}' for position in range(num_variables))
+            documents.append(DynamicDocument(
+                title=title,
+                content=f'<p>{title}</p><p>Cláusula {index}: {tokens}</p>',
+                state=state,
+                created_by=author,
+                assigned_to=None if is_template else rng.choice(clients),
+                requires_signature=requires_signature,
+                fully_signed=state == 'FullySigned',
+                is_public=is_template and rng.random() < 0.1,
+            ))
+        self._bulk(DynamicDocument, documents, 'dynamic documents')
+        self._resolve_pks(DynamicDocument, documents, 'title')
+
+        variables = []
+        signatures = []
+        for document, num_variables in zip(documents, variable_counts):
+            for position in range(num_variables):
+                field_type = _weighted(rng, VARIABLE_TYPES)
+                variables.append(DocumentVariable(
+                    document_id=document.pk,
+                    name_en=f'var_{position}',
+                    name_es=f'Variable {position}',
+                    field_type=field_type,
+                    select_options=SELECT_OPTIONS if field_type == 'select' else None,
+                    value=(
+                        None if document.state in ('Published', 'Draft')
+                        else _variable_value(rng, field_type, position)
+                    ),
+                ))
+            if document.requires_signature:
+                signers = rng.sample(clients, k=min(len(clients), rng.randint(1, 4)))
+                for signer in signers:
+                    signed = document.state == 'FullySigned' or rng.random() < 0.4
+                    signatures.append(DocumentSignature(
+                        document_id=document.pk,
+                        signer_id=signer.pk,
+                        signed=signed,
+                        signed_at=self._past(365) if signed else None,
+                        rejected=document.state == 'Rejected' and not signed,
+                    ))
+            if len(variables) >= self.batch_size * 4:
+                self._bulk(DocumentVariable, variables, 'document variables')
+                variables = []
+        self._bulk(DocumentVariable, variables, 'document variables')
+        self._bulk(DocumentSignature, signatures, 'document signatures')
+
+    def _seed_processes(self, num_processes, lawyers, clients):
+        rng = self.rng
+        cases = list(Case.objects.all()[:20])
+        if not cases:
+            cases = self._bulk(Case, [Case(type=name) for name in ('Civil', 'Laboral', 'Penal', 'Familia', 'Administrativo')], 'cases')
+            cases = list(Case.objects.all()[:20])
+
+        processes = [
+            Process(
+                authority=f'Juzgado {rng.randint(1, 40)} {rng.choice(["Civil", "Laboral", "Administrativo"])}',
+                plaintiff=f'Demandante {index}',
+                defendant=f'Demandado {index}',
+                ref=f'SEED-{index:07d}',
+                case=rng.choice(cases),
+                subcase=rng.choice(SUBJECT_WORDS),
+                lawyer=rng.choice(lawyers),
+                progress=rng.randint(0, 100),
+            )
+            for index in range(num_processes)
+        ]
+        self._bulk(Process, processes, 'processes')
+        self._resolve_pks(Process, processes, 'ref')
+
+        stages = []
+        stage_owner = []
+        for process in processes:
+            count = max(1, min(8, int(rng.gauss(4, 2))))
+            start = self._past(900).date()
+            for position in range(count):
+                stages.append(Stage(
+                    status=PROCESS_STAGES[position % len(PROCESS_STAGES)],
+                    date=start + timedelta(days=position * rng.randint(10, 60)),
+                ))
+                stage_owner.append(process.pk)
+        self._bulk(Stage, stages, 'stages')
+        if stages and stages[0].pk is None:
+            # No RETURNING support: stages were inserted in order after this id.
+            first_pk = Stage.objects.order_by('-pk').values_list('pk', flat=True)[len(stages) - 1]
+            for offset, stage in enumerate(stages):
+                stage.pk = first_pk + offset
+
+        stage_links = [
+            Process.stages.through(process_id=process_pk, stage_id=stage.pk)
+            for stage, process_pk in zip(stages, stage_owner)
+        ]
+        self._bulk(Process.stages.through, stage_links, 'process-stage links')
+
+        last_stage_by_process = {}
+        for stage, process_pk in zip(stages, stage_owner):
+            last_stage_by_process[process_pk] = stage
+        alerts = []
+        for stage in last_stage_by_process.values():
+            is_active = rng.random() < 0.3
+            # bulk_create skips StageAlert.save(), so plan the due time here.
+            alerts.append(StageAlert(
+                stage_id=stage.pk,
+                description=f'Vencimiento etapa {stage.status}',
+                is_active=is_active,
+                next_fire_at=alert_fire_at(stage.date, stage.status, is_active, False, False),
+            ))
+        self._bulk(StageAlert, alerts, 'stage alerts')
+
+        client_links = []
+        for process in processes:
+            for client in rng.sample(clients, k=min(len(clients), rng.choice([1, 1, 1, 2, 3]))):
+                client_links.append(Process.clients.through(process_id=process.pk, user_id=client.pk))
+        self._bulk(Process.clients.through, client_links, 'process-client links')
+
+    def _seed_secop(self, num_processes):
+        rng = self.rng
+        rows = []
+        for index in range(num_processes):
+            department = rng.choice(DEPARTMENTS)
+            status = _weighted(rng, SECOP_STATUSES)
+            published = self._past(540)
+            rows.append(SECOPProcess(
+                process_id=f'{SEED_SECOP_PREFIX}{index:08d}',
+                reference=f'REF-{index:08d}',
+                entity_name=rng.choice(ENTITIES),
+                entity_nit=str(800000000 + rng.randint(0, 99999999)),
+                department=department,
+                city=rng.choice(CITIES[department]),
+                entity_level=rng.choice(['Nacional', 'Territorial']),
+                procedure_name=f'{rng.choice(CONTRACT_TYPES)} {rng.choice(SUBJECT_WORDS)} {index}',
+                description=f'Objeto contractual sintético {index}',
+                status=status,
+                procurement_method=rng.choice(PROCUREMENT_METHODS),
+                contract_type=rng.choice(CONTRACT_TYPES),
+                # Log-normal prices: many small contracts, a long tail of large ones.
+                base_price=Decimal(int(rng.lognormvariate(18, 1.5))),
+                duration_value=rng.randint(1, 36),
+                duration_unit='Meses',
+                publication_date=published.date(),
+                last_update_date=published.date(),
+                closing_date=(
+                    self.now + timedelta(days=rng.randint(1, 60))
+                    if status in SECOPProcess.APIStatus.ACTIVE_STATUSES
+                    else published + timedelta(days=rng.randint(5, 45))
+                ),
+                unspsc_code=rng.choice(UNSPSC_CODES),
+            ))
+        self._bulk(SECOPProcess, rows, 'SECOP processes')
+
+    def _seed_notifications(self, users, per_user):
+        rng = self.rng
+        rows = []
+        for user in users:
+            for _ in range(rng.randint(per_user // 2, per_user)):
+                category = _weighted(rng, NOTIFICATION_CATEGORIES)
+                rows.append(Notification(
+                    user_id=user.pk,
+                    title=f'Notificación {category}',
+                    message='Mensaje sintético de carga.',
+                    category=category,
+                    priority=rng.choice(['low', 'medium', 'medium', 'high']),
+                    is_read=rng.random() < 0.6,
+                    is_archived=rng.random() < 0.1,
+                ))
+        self._bulk(Notification, rows, 'notifications')
+
+    def _seed_activities(self, users, per_user):
+        rng = self.rng
+        rows = []
+        for user in users:
+            for _ in range(per_user):
+                rows.append(ActivityFeed(
+                    user_id=user.pk,
+                    action_type=_weighted(rng, ACTIVITY_TYPES),
+                    description='Actividad sintética de carga.',
+                ))
+        self._bulk(ActivityFeed, rows, 'activity feed')
+
+    # ------------------------------------------------------------------
+    # Purge
+    # ------------------------------------------------------------------
+    def _purge(self):
+        seed_users = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}')
+        with transaction.atomic():
+            # Documents use SET_NULL on created_by and stages are only linked
+            # through the M2M table, so both are removed explicitly.
+            deleted_documents = DynamicDocument.objects.filter(created_by__in=seed_users).delete()[0]
+            stage_ids = list(Stage.objects.filter(process__ref__startswith='SEED-').values_list('pk', flat=True))
+            Process.objects.filter(ref__startswith='SEED-', lawyer__in=seed_users).delete()
+            for start in range(0, len(stage_ids), 5000):
+                Stage.objects.filter(pk__in=stage_ids[start:start + 5000]).delete()
+            deleted_secop = SECOPProcess.objects.filter(process_id__startswith=SEED_SECOP_PREFIX).delete()[0]
+            deleted_users = seed_users.delete()[0]
+        self.stdout.write(self.style.SUCCESS(
+            f'Purged scale seed: {deleted_documents:,} document rows, {deleted_secop:,} SECOP rows, '
+            f'{deleted_users:,} user-related rows'
+        ))
@@ -0,0 +1,296 @@
+"""Project middleware."""
+
+import json
+import logging
+import random
+import time
+
+import brotli
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+from gym_app.utils import metrics
+from gym_app.utils.query_inspector import QueryInspector
+
+slow_request_logger = logging.getLogger('gym_app.slow_requests')
+
+
+class _QueryRecorder:
+    """``connection.execute_wrapper`` that counts and times every SQL statement.
+
+    SQL text is kept (without parameters) up to ``max_statements`` so a slow
+    request can be logged with its full query list; only the reference to the
+    string is stored, so the cost for fast requests stays negligible.
+    """
+
+    def __init__(self, max_statements):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+        self.max_statements = max_statements
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if len(self.statements) < self.max_statements:
+                self.statements.append((sql, elapsed))
+
+
+class RequestMetricsMiddleware:
+    """Record per-view latency, SQL count/time and response size.
+
+    Aggregates go to :mod:`gym_app.utils.metrics` (exposed at
+    ``/api/metrics/``). Requests slower than ``METRICS_SLOW_REQUEST_MS`` are
+    counted and, for a ``METRICS_SLOW_REQUEST_SAMPLE_RATE`` fraction of them,
+    logged to ``gym_app.slow_requests`` with their SQL statements — a sampled
+    stand-in for Silk's full recording.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True) or request.path in self._excluded_paths():
+            return self.get_response(request)
+
+        recorder = _QueryRecorder(getattr(settings, 'METRICS_SLOW_REQUEST_MAX_QUERIES', 500))
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        try:
+            self._record(request, response, duration, recorder)
+        except Exception:  # pragma: no cover – metrics must never break a response
+            slow_request_logger.exception("Failed to record request metrics")
+        return response
+
+    @staticmethod
+    def _excluded_paths():
+        return getattr(settings, 'METRICS_EXCLUDED_PATHS', ('/api/metrics/', '/api/health/'))
+
+    @staticmethod
+    def _view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unmatched'
+        return match.view_name or match.route or 'unmatched'
+
+    def _record(self, request, response, duration, recorder):
+        labels = {
+            'view': self._view_name(request),
+            'method': request.method,
+            'status': response.status_code,
+        }
+        view_labels = {'view': labels['view']}
+        increments = (
+            metrics.histogram_increments('http_request_duration_seconds', duration, labels)
+            + metrics.histogram_increments('http_request_db_queries', recorder.count, view_labels)
+            + metrics.histogram_increments('http_request_db_duration_seconds', recorder.duration, view_labels)
+        )
+        size = self._response_size(response)
+        if size is not None:
+            increments += metrics.histogram_increments('http_response_size_bytes', size, view_labels)
+
+        threshold_ms = getattr(settings, 'METRICS_SLOW_REQUEST_MS', 1000)
+        if duration * 1000 >= threshold_ms:
+            increments += metrics.counter_increments('http_slow_requests_total', view_labels)
+            if random.random() < getattr(settings, 'METRICS_SLOW_REQUEST_SAMPLE_RATE', 0.1):
+                self._log_slow_request(request, response, duration, recorder, labels['view'])
+
+        metrics.record(increments)
+
+    @staticmethod
+    def _response_size(response):
+        if getattr(response, 'streaming', False):
+            length = response.get('Content-Length')
+            return int(length) if length and length.isdigit() else None
+        return len(response.content)
+
+    @staticmethod
+    def _log_slow_request(request, response, duration, recorder, view):
+        slow_request_logger.warning(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 1),
+            'query_count': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 1),
+            'queries': [
+                {'sql': sql, 'ms': round(elapsed * 1000, 2)}
+                for sql, elapsed in recorder.statements
+            ],
+            'queries_truncated': recorder.count > len(recorder.statements),
+        }))
+
+
+class QueryInspectorMiddleware:
+    """Development/test-time N+1 detection and per-view query budgets.
+
+    When ``QUERY_INSPECTOR_ENABLED`` is set, every request's SQL is grouped
+    by normalized template (see :mod:`gym_app.utils.query_inspector`);
+    repeated templates and views exceeding their ``@query_budget`` are
+    logged, or raised with ``QUERY_INSPECTOR_RAISE``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', False):
+            return self.get_response(request)
+
+        inspector = QueryInspector()
+        with connection.execute_wrapper(inspector):
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        budget = getattr(match.func, 'query_budget', None) if match else None
+        label = match.view_name if match and match.view_name else request.path
+        inspector.report(f"{request.method} {label}", budget)
+        return response
+
+
+# Types worth compressing; images, PDFs, Office files and archives already are.
+COMPRESSIBLE_CONTENT_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick ``'br'``, ``'gzip'`` or ``None`` from an ``Accept-Encoding`` header.
+
+    Honours q-values (``q=0`` refuses a coding) and ``*``; on equal weight
+    Brotli wins since it compresses JSON noticeably better.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding.strip()] = quality
+    wildcard = weights.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for coding in ('br', 'gzip'):
+        quality = weights.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _brotli_stream(chunks, quality):
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _brotli_stream_async(chunks, quality):
+    compressor = brotli.Compressor(quality=quality)
+    async for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """Brotli/gzip response compression negotiated from ``Accept-Encoding``.
+
+    A superset of Django's ``GZipMiddleware``: Brotli is preferred when the
+    client accepts it, only textual content types are compressed, bodies
+    under ``RESPONSE_COMPRESSION_MIN_SIZE`` bytes are left alone and
+    streaming responses are compressed chunk by chunk (sync and async).
+    Gzip keeps Django's random filename padding against BREACH-style
+    length probing; API secrets travel in headers, not bodies.
+    """
+
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not getattr(settings, 'RESPONSE_COMPRESSION_ENABLED', True) or not self._compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self._compress_stream(response, encoding)
+            del response.headers['Content-Length']
+        else:
+            compressed = self._compress(response.content, encoding)
+            # Only worth it when it actually shrinks the body
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def _compressible(response):
+        if response.has_header('Content-Encoding') or response.status_code == 206:
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return False
+        min_size = getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+        if response.streaming:
+            length = response.get('Content-Length')
+            return not (length and length.isdigit() and int(length) < min_size)
+        return len(response.content) >= min_size
+
+    def _compress(self, content, encoding):
+        if encoding == 'br':
+            return brotli.compress(content, quality=self._brotli_quality())
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
+
+    def _compress_stream(self, response, encoding):
+        chunks = response.streaming_content
+        if encoding == 'br':
+            if response.is_async:
+                return _brotli_stream_async(chunks, self._brotli_quality())
+            return _brotli_stream(chunks, self._brotli_quality())
+        if response.is_async:
+            async def gzip_chunks():
+                async for chunk in chunks:
+                    yield compress_string(chunk, max_random_bytes=self.max_random_bytes)
+            return gzip_chunks()
+        return compress_sequence(chunks, max_random_bytes=self.max_random_bytes)
+
+    @staticmethod
+    def _brotli_quality():
+        # 11 is for static assets; 4-5 is the usual sweet spot for dynamic bodies
+        return getattr(settings, 'RESPONSE_COMPRESSION_BROTLI_QUALITY', 4)
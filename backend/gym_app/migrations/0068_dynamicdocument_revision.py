@@ -0,0 +1,18 @@
+# Generated by Django 5.2.14 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gym_app', '0067_servicerequest_year_sequence_unconditional_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dynamicdocument',
+            name='revision',
+            field=models.PositiveIntegerField(default=0, help_text='Monotonic content revision. Incremented on every content save so the autosave endpoint can reject patches computed against a stale copy.'),
+        ),
+    ]
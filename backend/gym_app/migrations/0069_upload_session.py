@@ -0,0 +1,37 @@
+# Generated by Django 5.2.14 on 2026-10-19 02:45
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gym_app', '0068_dynamicdocument_revision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('legal_request', 'Legal request'), ('process', 'Process'), ('service_request', 'Service request')], help_text='Kind of object the file is attached to.', max_length=30)),
+                ('target_id', models.PositiveIntegerField(blank=True, help_text='Primary key of the target object.', null=True)),
+                ('filename', models.CharField(help_text='Original filename declared by the client.', max_length=255)),
+                ('total_size', models.BigIntegerField(help_text='Declared final size of the file in bytes.')),
+                ('received_bytes', models.BigIntegerField(default=0, help_text='Bytes persisted so far.')),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('completed', 'Completed')], default='uploading', max_length=20)),
+                ('part_name', models.CharField(blank=True, help_text='Storage name of the partial file.', max_length=255)),
+                ('attached_object_id', models.PositiveIntegerField(blank=True, help_text='ID of the file record created on finalize.', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(help_text='The user that owns the upload session.', on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='uploadsession_status_upd_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.14 on 2026-10-19 03:34
+
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Frozen copy of gym_app.models.process.alert_fire_at as of this migration, so
+# later changes to the live scheduling rules do not alter this backfill.
+ALERT_REMINDER_DAYS = (3, 1)
+
+
+def _alert_fire_time(day):
+    hour = getattr(settings, 'PROCESS_ALERT_SEND_HOUR_UTC', 14)
+    return datetime.combine(day, time(hour=hour), tzinfo=dt_timezone.utc)
+
+
+def alert_fire_at(stage_date, stage_status, is_active, notified_3_days, notified_1_day):
+    if not is_active or stage_date is None:
+        return None
+    today = timezone.now().date()
+    if stage_status != 'Fallo':
+        notified = {3: notified_3_days, 1: notified_1_day}
+        for days in ALERT_REMINDER_DAYS:
+            fire_date = stage_date - timedelta(days=days)
+            if not notified[days] and fire_date >= today:
+                return _alert_fire_time(fire_date)
+    return _alert_fire_time(max(stage_date + timedelta(days=1), today))
+
+
+def schedule_existing_alerts(apps, schema_editor):
+    """Backfill: give active alerts their due time so the indexed reminder
+    task picks them up (alerts without a date never fire)."""
+    StageAlert = apps.get_model('gym_app', 'StageAlert')
+    pending = []
+    alerts = StageAlert.objects.filter(is_active=True, stage__date__isnull=False).select_related('stage')
+    for alert in alerts.iterator(chunk_size=2000):
+        alert.next_fire_at = alert_fire_at(
+            alert.stage.date, alert.stage.status, alert.is_active,
+            alert.notified_3_days, alert.notified_1_day,
+        )
+        pending.append(alert)
+        if len(pending) >= 2000:
+            StageAlert.objects.bulk_update(pending, ['next_fire_at'])
+            pending = []
+    if pending:
+        StageAlert.objects.bulk_update(pending, ['next_fire_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gym_app', '0069_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stagealert',
+            name='next_fire_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the reminder task next has to look at this alert (reminder or expiry).', null=True),
+        ),
+        migrations.RunPython(schedule_existing_alerts, migrations.RunPython.noop),
+    ]
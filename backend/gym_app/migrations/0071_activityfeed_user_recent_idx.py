@@ -0,0 +1,17 @@
+# Generated by Django 5.2.14 on 2026-10-19 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gym_app', '0070_stagealert_next_fire_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activityfeed',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='activity_user_recent_idx'),
+        ),
+    ]
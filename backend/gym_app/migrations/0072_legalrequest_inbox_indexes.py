@@ -0,0 +1,25 @@
+# Generated by Django 5.2.14 on 2026-10-19 04:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gym_app', '0071_activityfeed_user_recent_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='legalrequest',
+            index=models.Index(fields=['-created_at', '-id'], name='legalreq_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='legalrequest',
+            index=models.Index(fields=['user', '-created_at'], name='legalreq_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='legalrequest',
+            index=models.Index(fields=['status', '-created_at'], name='legalreq_status_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.14 on 2026-10-19 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gym_app', '0072_legalrequest_inbox_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WompiWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_id', models.CharField(help_text='Wompi transaction ID.', max_length=255)),
+                ('transaction_status', models.CharField(help_text='Transaction status reported by the event.', max_length=20)),
+                ('event_type', models.CharField(blank=True, default='', help_text='Wompi event name (e.g. transaction.updated).', max_length=100)),
+                ('reference', models.CharField(blank=True, default='', help_text='Payment reference of the transaction.', max_length=255)),
+                ('payload', models.JSONField(default=dict, help_text='Full event body as received.')),
+                ('status', models.CharField(choices=[('received', 'Received'), ('processed', 'Processed'), ('ignored', 'Ignored'), ('failed', 'Failed')], default='received', help_text='Processing status of the event.', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Number of processing attempts.')),
+                ('error_message', models.TextField(blank=True, help_text='Last processing error, if any.', null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True, help_text='When the event was received.')),
+                ('processed_at', models.DateTimeField(blank=True, help_text='When the event was processed.', null=True)),
+            ],
+            options={
+                'verbose_name': 'Wompi Webhook Event',
+                'verbose_name_plural': 'Wompi Webhook Events',
+                'ordering': ['-received_at'],
+                'constraints': [models.UniqueConstraint(fields=('transaction_id', 'transaction_status'), name='wompi_event_transaction_status_uniq')],
+            },
+        ),
+    ]
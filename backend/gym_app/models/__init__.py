@@ -9,8 +9,9 @@ from .organization import Organization, OrganizationInvitation, OrganizationMemb
 from .intranet_gym import LegalDocument, IntranetProfile
 from .dynamic_document import DynamicDocument, DocumentVariable, DocumentSignature, RecentDocument, Tag, DocumentVisibilityPermission, DocumentUsabilityPermission, DocumentFolder, DocumentRelationship
 from .legal_update import LegalUpdate
-from .subscription import Subscription, PaymentHistory
+from .subscription import Subscription, PaymentHistory, WompiWebhookEvent
 from .secop import SECOPProcess, ProcessClassification, SECOPAlert, AlertNotification, SyncLog, SavedView
+from .upload_session import UploadSession
 from .service_tramite import (
     Service,
     ServiceStage,
@@ -31,10 +32,11 @@ __all__ = [
     'Organization', 'OrganizationInvitation', 'OrganizationMembership', 'OrganizationPost',
     'LegalDocument', 'IntranetProfile', 'DynamicDocument', 'DocumentVariable', 'DocumentSignature', 'LegalUpdate', 'RecentDocument', 'RecentProcess',
     'Tag', 'DocumentVisibilityPermission', 'DocumentUsabilityPermission', 'DocumentFolder', 'DocumentRelationship',
-    'Subscription', 'PaymentHistory',
+    'Subscription', 'PaymentHistory', 'WompiWebhookEvent',
     'EmailVerificationCode',
     'SECOPProcess', 'ProcessClassification', 'SECOPAlert', 'AlertNotification', 'SyncLog', 'SavedView',
     'Service', 'ServiceStage', 'ServiceField', 'ServiceRequest', 'ServiceRequestSequence',
     'ServiceRequestAnswer', 'ServiceRequestFieldFile', 'ServiceRequestLawyerResponse',
     'ServiceRequestLawyerResponseFile',
+    'UploadSession',
 ]
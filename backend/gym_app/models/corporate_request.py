@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 import os
@@ -288,3 +288,14 @@ class CorporateRequestResponse(models.Model):
         
     def __str__(self):
         return f"{self.corporate_request.request_number} - {self.user_type} response"
+
+
+@receiver(post_save, sender=CorporateRequest)
+@receiver(post_delete, sender=CorporateRequest)
+def corporate_request_changed(sender, instance, **kwargs):
+    """Request counts changed for the receiving corporate client and the organization leader."""
+    from gym_app.models.organization import invalidate_organization_stats
+    from gym_app.utils import dashboard_cache
+
+    dashboard_cache.invalidate(dashboard_cache.CORPORATE_REQUEST_STATS, instance.corporate_client_id)
+    invalidate_organization_stats(instance.organization_id)
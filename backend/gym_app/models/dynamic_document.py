@@ -173,6 +173,13 @@ class DynamicDocument(models.Model):
         default='normal',
         help_text="Type of signature workflow: 'normal' (all parties sign), 'issuer_only' (only creator signs), 'informative' (no signatures needed)."
     )
+    revision = models.PositiveIntegerField(
+        default=0,
+        help_text=(
+            "Monotonic content revision. Incremented on every content save so the "
+            "autosave endpoint can reject patches computed against a stale copy."
+        ),
+    )
     formalized_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="formalized_documents",
@@ -383,20 +390,18 @@ class DynamicDocument(models.Model):
             all_related = document.get_related_documents()
         """
         from django.db.models import Q
-        
-        # Get documents where this document is the source or target
-        related_relationships = DocumentRelationship.objects.filter(
-            Q(source_document=self) | Q(target_document=self)
-        ).select_related('source_document', 'target_document')
-        related_document_ids = set()
-        for relationship in related_relationships:
-            if relationship.source_document.id != self.id:
-                related_document_ids.add(relationship.source_document.id)
-            if relationship.target_document.id != self.id:
-                related_document_ids.add(relationship.target_document.id)
 
-        related_documents = DynamicDocument.objects.filter(id__in=related_document_ids)
-        
+        # Both directions are resolved in SQL as id subqueries, so the result
+        # stays a lazy queryset that callers can prefetch/paginate.
+        related_documents = DynamicDocument.objects.filter(
+            Q(pk__in=DocumentRelationship.objects.filter(
+                source_document=self
+            ).values('target_document'))
+            | Q(pk__in=DocumentRelationship.objects.filter(
+                target_document=self
+            ).values('source_document'))
+        ).exclude(pk=self.pk)
+
         # Filter by user permissions and ownership if provided
         if user:
             # For related documents, we use a permissive approach:
@@ -404,26 +409,19 @@ class DynamicDocument(models.Model):
             # they should be able to see ALL related documents in final states,
             # even if they don't have direct access to those documents.
             # This is because relationships are explicitly created and provide context.
-            
-            # Check if user has access to the source document
             user_has_source_access = (
-                self.created_by == user or 
-                self.assigned_to == user or 
-                self.signatures.filter(signer=user).exists() or
-                self.is_lawyer(user)
+                self.created_by_id == user.pk or
+                self.assigned_to_id == user.pk or
+                self.is_lawyer(user) or
+                self.signatures.filter(signer=user).exists()
             )
+            if not user_has_source_access:
+                return related_documents.none()
 
-            accessible_docs = []
-            for doc in related_documents:
-                # Check if document is in a "final" state (Completed or FullySigned)
-                is_final_state = doc.state in ['Completed', 'FullySigned']
-
-                # If user has access to source document, show all related docs in final states
-                if user_has_source_access and is_final_state:
-                    accessible_docs.append(doc.id)
+            related_documents = related_documents.filter(
+                state__in=['Completed', 'FullySigned']
+            )
 
-            related_documents = related_documents.filter(id__in=accessible_docs)
-        
         return related_documents
     
     def add_relationship(self, target_document, created_by=None):
@@ -85,6 +85,14 @@ class LegalRequest(models.Model):
         help_text="Timestamp when the status was last updated"
     )
 
+    class Meta:
+        indexes = [
+            # Lawyer inbox (newest first), client inbox and status filter.
+            models.Index(fields=['-created_at', '-id'], name='legalreq_recent_idx'),
+            models.Index(fields=['user', '-created_at'], name='legalreq_user_recent_idx'),
+            models.Index(fields=['status', '-created_at'], name='legalreq_status_recent_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Override save method to auto-generate request_number if not provided.
@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.core.exceptions import ValidationError
@@ -444,3 +444,31 @@ class OrganizationPost(models.Model):
         verbose_name = "Post de Organización"
         verbose_name_plural = "Posts de Organización"
         ordering = ['-is_pinned', '-created_at']  # Pinned posts first, then by creation date
+
+
+def invalidate_organization_stats(organization_id):
+    """Drop the cached dashboard stats of the organization's corporate client."""
+    from gym_app.utils import dashboard_cache
+
+    leader_id = Organization.objects.filter(pk=organization_id).values_list(
+        'corporate_client_id', flat=True,
+    ).first()
+    dashboard_cache.invalidate(dashboard_cache.ORGANIZATION_STATS, leader_id)
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def organization_changed(sender, instance, **kwargs):
+    """Organization counts (total / active) changed for its leader."""
+    from gym_app.utils import dashboard_cache
+
+    dashboard_cache.invalidate(dashboard_cache.ORGANIZATION_STATS, instance.corporate_client_id)
+
+
+@receiver(post_save, sender=OrganizationMembership)
+@receiver(post_delete, sender=OrganizationMembership)
+@receiver(post_save, sender=OrganizationInvitation)
+@receiver(post_delete, sender=OrganizationInvitation)
+def organization_member_or_invitation_changed(sender, instance, **kwargs):
+    """Member and invitation counts changed for the organization's leader."""
+    invalidate_organization_stats(instance.organization_id)
@@ -1,9 +1,12 @@
 import os
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
 from django.db import models
 from django.conf import settings
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 
 class Case(models.Model):
     """
@@ -117,12 +120,43 @@ class Process(models.Model):
     def __str__(self):
         return self.ref
 
+# Days before the stage date on which reminders are sent, in firing order.
+ALERT_REMINDER_DAYS = (3, 1)
+
+
+def _alert_fire_time(day):
+    hour = getattr(settings, 'PROCESS_ALERT_SEND_HOUR_UTC', 14)
+    return datetime.combine(day, time(hour=hour), tzinfo=dt_timezone.utc)
+
+
+def alert_fire_at(stage_date, stage_status, is_active, notified_3_days, notified_1_day, not_before=None):
+    """Return when the alert scheduler next has work for an alert, or ``None``.
+
+    That is the first pending reminder (3 days / 1 day before ``stage_date``)
+    falling on or after ``not_before`` (default: today), otherwise the day
+    after ``stage_date``, when the lapsed alert is deactivated.
+    """
+    if not is_active or stage_date is None:
+        return None
+    not_before = not_before or timezone.now().date()
+    if stage_status != 'Fallo':
+        notified = {3: notified_3_days, 1: notified_1_day}
+        for days in ALERT_REMINDER_DAYS:
+            fire_date = stage_date - timedelta(days=days)
+            if not notified[days] and fire_date >= not_before:
+                return _alert_fire_time(fire_date)
+    return _alert_fire_time(max(stage_date + timedelta(days=1), not_before))
+
+
 class StageAlert(models.Model):
     """Alert configuration for a legal process stage.
 
     Created automatically when a Stage is added to a Process.
-    Only the alert of the *last* stage of each process is evaluated
-    by the daily reminder task.
+    Only the alert of the *last* stage of each process sends reminders.
+
+    ``next_fire_at`` is the alert's due time in the scheduler index: it is
+    recomputed on every save (and when the stage is edited) so the reminder
+    task only loads the alerts that are actually due.
     """
 
     stage = models.OneToOneField(
@@ -142,12 +176,48 @@ class StageAlert(models.Model):
     )
     notified_3_days = models.BooleanField(default=False)
     notified_1_day = models.BooleanField(default=False)
+    next_fire_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="When the reminder task next has to look at this alert (reminder or expiry).",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Alert for Stage {self.stage_id} (active={self.is_active})"
 
+    def compute_next_fire_at(self, not_before=None):
+        # Stages created with an ISO string keep it until reloaded.
+        stage_date = Stage._meta.get_field('date').to_python(self.stage.date)
+        return alert_fire_at(
+            stage_date,
+            self.stage.status,
+            self.is_active,
+            self.notified_3_days,
+            self.notified_1_day,
+            not_before=not_before,
+        )
+
+    def save(self, *args, **kwargs):
+        self.next_fire_at = self.compute_next_fire_at()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'next_fire_at'}
+        super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=Stage)
+def reschedule_stage_alert(sender, instance, created, **kwargs):
+    """Re-plan the stage's alert when its date or status is edited."""
+    if created:
+        return
+    alert = StageAlert.objects.filter(stage=instance).first()
+    if alert is not None:
+        alert.stage = instance
+        alert.save(update_fields=['next_fire_at'])
+
 
 class RecentProcess(models.Model):
     """
@@ -157,3 +157,107 @@ class Subscription(models.Model):
     def __str__(self):
         """String representation of the subscription."""
         return f"{self.user.email} - {self.get_plan_type_display()} ({self.status})"
+
+
+class WompiWebhookEvent(models.Model):
+    """
+    Inbound Wompi webhook event log.
+
+    Wompi delivers events at least once, so every verified notification is
+    stored here before being processed on the Huey queue. The unique
+    (transaction_id, transaction_status) pair turns retries of the same
+    transition into no-ops while still accepting later transitions of the
+    same transaction (e.g. PENDING -> APPROVED).
+
+    Attributes:
+        transaction_id (CharField): Wompi transaction ID.
+        transaction_status (CharField): Transaction status reported by the event.
+        event_type (CharField): Wompi event name (e.g. transaction.updated).
+        reference (CharField): Payment reference of the transaction.
+        payload (JSONField): Full event body as received.
+        status (CharField): Processing status of the event.
+        attempts (PositiveIntegerField): Number of processing attempts.
+        error_message (TextField): Last processing error, if any.
+        received_at (DateTimeField): When the event was received.
+        processed_at (DateTimeField): When the event was processed.
+    """
+
+    STATUS_CHOICES = [
+        ('received', 'Received'),
+        ('processed', 'Processed'),
+        ('ignored', 'Ignored'),
+        ('failed', 'Failed'),
+    ]
+
+    transaction_id = models.CharField(
+        max_length=255,
+        help_text="Wompi transaction ID."
+    )
+
+    transaction_status = models.CharField(
+        max_length=20,
+        help_text="Transaction status reported by the event."
+    )
+
+    event_type = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        help_text="Wompi event name (e.g. transaction.updated)."
+    )
+
+    reference = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        help_text="Payment reference of the transaction."
+    )
+
+    payload = models.JSONField(
+        default=dict,
+        help_text="Full event body as received."
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='received',
+        help_text="Processing status of the event."
+    )
+
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of processing attempts."
+    )
+
+    error_message = models.TextField(
+        blank=True,
+        null=True,
+        help_text="Last processing error, if any."
+    )
+
+    received_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the event was received."
+    )
+
+    processed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When the event was processed."
+    )
+
+    class Meta:
+        ordering = ['-received_at']
+        verbose_name = 'Wompi Webhook Event'
+        verbose_name_plural = 'Wompi Webhook Events'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['transaction_id', 'transaction_status'],
+                name='wompi_event_transaction_status_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        """String representation of the event."""
+        return f"{self.transaction_id} - {self.transaction_status} ({self.status})"
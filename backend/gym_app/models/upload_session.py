@@ -0,0 +1,107 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+
+def upload_session_part_name(session_id):
+    """Storage name of the partial file that accumulates a session's chunks."""
+    return os.path.join('upload_sessions', f'{session_id}.part')
+
+
+class UploadSession(models.Model):
+    """
+    Model representing a resumable, chunked upload.
+
+    Clients create a session declaring the final size and target, then send
+    the bytes in sequential chunks (each one tagged with its offset) that are
+    appended straight to ``part_name`` in media storage. Finalizing validates
+    the assembled file once and attaches it to the target model.
+
+    Attributes:
+        id (UUIDField): Public identifier used in the upload URLs.
+        user (ForeignKey): The user that owns the session.
+        target (CharField): Kind of object the file will be attached to.
+        target_id (PositiveIntegerField): Primary key of the target object
+            (not used for service requests, which consume sessions on save).
+        filename (CharField): Original filename declared by the client.
+        total_size (BigIntegerField): Declared final size in bytes.
+        received_bytes (BigIntegerField): Bytes persisted so far; the offset
+            the next chunk must start at.
+        status (CharField): Lifecycle state of the session.
+        part_name (CharField): Storage name of the partial file.
+        attached_object_id (PositiveIntegerField): ID of the created file
+            record once the session has been attached.
+    """
+    TARGET_LEGAL_REQUEST = 'legal_request'
+    TARGET_PROCESS = 'process'
+    TARGET_SERVICE_REQUEST = 'service_request'
+    TARGET_CHOICES = [
+        (TARGET_LEGAL_REQUEST, 'Legal request'),
+        (TARGET_PROCESS, 'Process'),
+        (TARGET_SERVICE_REQUEST, 'Service request'),
+    ]
+
+    STATUS_UPLOADING = 'uploading'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_UPLOADING, 'Uploading'),
+        (STATUS_COMPLETED, 'Completed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        help_text="The user that owns the upload session."
+    )
+    target = models.CharField(max_length=30, choices=TARGET_CHOICES, help_text="Kind of object the file is attached to.")
+    target_id = models.PositiveIntegerField(null=True, blank=True, help_text="Primary key of the target object.")
+    filename = models.CharField(max_length=255, help_text="Original filename declared by the client.")
+    total_size = models.BigIntegerField(help_text="Declared final size of the file in bytes.")
+    received_bytes = models.BigIntegerField(default=0, help_text="Bytes persisted so far.")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING)
+    part_name = models.CharField(max_length=255, blank=True, help_text="Storage name of the partial file.")
+    attached_object_id = models.PositiveIntegerField(null=True, blank=True, help_text="ID of the file record created on finalize.")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='uploadsession_status_upd_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_bytes}/{self.total_size})"
+
+    def save(self, *args, **kwargs):
+        if not self.part_name:
+            self.part_name = upload_session_part_name(self.id)
+        super().save(*args, **kwargs)
+
+    @property
+    def part_path(self):
+        """Absolute filesystem path of the partial file."""
+        return default_storage.path(self.part_name)
+
+    @property
+    def is_complete(self):
+        return self.received_bytes >= self.total_size
+
+
+# Signal to delete the partial file when the UploadSession object is deleted
+@receiver(post_delete, sender=UploadSession)
+def delete_upload_session_part(sender, instance, **kwargs):
+    """
+    Deletes the partial file (if it was not moved into place) when the session is deleted.
+    """
+    if instance.part_name:
+        path = default_storage.path(instance.part_name)
+        if os.path.isfile(path):
+            os.remove(path)
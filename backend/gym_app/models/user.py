@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 import uuid
 import os
 
@@ -188,8 +190,10 @@ class ActivityFeed(models.Model):
     """
     Activity Feed model to track user actions.
     
-    Maintains a maximum of 20 entries per user, with the oldest entry being deleted
-    when a new one is added beyond the limit.
+    Each user keeps a rolling window of their most recent entries
+    (``ACTIVITY_FEED_MAX_PER_USER``, no older than
+    ``ACTIVITY_FEED_RETENTION_DAYS``). Inserts do no trimming of their own;
+    the ``prune_activity_feed`` Huey task enforces the window periodically.
     
     Attributes:
         user (ForeignKey): The user who performed the action.
@@ -216,22 +220,28 @@ class ActivityFeed(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Activity'
         verbose_name_plural = 'Activities'
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='activity_user_recent_idx'),
+        ]
     
     def __str__(self):
         """String representation of an activity."""
         return f"{self.user.email} - {self.action_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
-    
-    def save(self, *args, **kwargs):
-        """
-        Override save method to maintain a maximum of 20 activity entries per user.
-        When a new entry is added beyond the limit, the oldest one is deleted.
-        """
-        super().save(*args, **kwargs)
-        
-        # Check if this user has more than 20 activities
-        activities_count = ActivityFeed.objects.filter(user=self.user).count()
-        if activities_count > 20:
-            # Get the oldest activity and delete it
-            oldest_activity = ActivityFeed.objects.filter(user=self.user).order_by('created_at').first()
-            if oldest_activity:
-                oldest_activity.delete()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Role, activation or profile changed: drop the cached JWT user."""
+    from gym_app.utils import auth_cache
+
+    auth_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender='token_blacklist.BlacklistedToken')
+def refresh_token_blacklisted(sender, instance, created, **kwargs):
+    """Logout / rotation blacklisted a refresh token: drop the cached JWT user."""
+    from gym_app.utils import auth_cache
+
+    if created:
+        auth_cache.invalidate(instance.token.user_id)
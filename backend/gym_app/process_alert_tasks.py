@@ -1,33 +1,42 @@
 """
-Huey periodic task for sending legal-process stage alerts.
-
-Runs daily at 14:00 UTC (9:00 AM Colombia, UTC-5).
-For each active process whose last stage has an active StageAlert,
-sends reminders 3 days and 1 day before the stage date via email
-and in-app notification.
+Huey tasks for sending legal-process stage alerts.
+
+Every ``StageAlert`` carries its own due time (``next_fire_at``: the next
+3-day / 1-day reminder at ``PROCESS_ALERT_SEND_HOUR_UTC``, or the day after
+the stage date for expiry), recomputed whenever the alert or its stage is
+saved. ``send_process_alerts`` runs hourly and only loads alerts whose due
+time has passed, so its cost follows the number of due alerts rather than the
+size of the process table. A due time that lapsed while the consumer was
+down is still ``<= now`` on the next run, and the task is also enqueued when
+the consumer starts; reminder flags are updated under a row lock so replays
+never send twice. Emails are sent once those flags are committed, so SMTP
+latency never holds the lock and a rolled-back run sends nothing.
 """
 
 import logging
 from datetime import timedelta
+from functools import partial
 
 from huey import crontab
-from huey.contrib.djhuey import periodic_task, lock_task
-from django.db.models import Prefetch
+from huey.contrib.djhuey import lock_task, on_startup, periodic_task, task
+from django.db import transaction
 from django.utils import timezone
 
 from gym_app.views.layouts.sendEmail import send_template_email
 
 logger = logging.getLogger(__name__)
 
+DUE_ALERT_BATCH_SIZE = 500
+
 
-@periodic_task(crontab(hour='14', minute='5'))
+@task()
 @lock_task('process-alert-deactivate-past-lock')
 def deactivate_past_alerts():
     """Auto-deactivate StageAlerts whose target stage date is already in the past.
 
-    Runs once a day shortly after the reminder task. Keeps the database in a
-    consistent state so the UI tag "Alerta activa" never lingers on a stage
-    whose date has lapsed.
+    Lapsed alerts are deactivated by ``send_process_alerts`` when their
+    expiry comes due; this one-shot sweep remains for manual clean-ups (e.g.
+    alerts imported without a due time).
     """
     from gym_app.models import StageAlert
 
@@ -36,113 +45,163 @@ def deactivate_past_alerts():
         is_active=True,
         stage__date__isnull=False,
         stage__date__lt=today,
-    ).update(is_active=False)
+    ).update(is_active=False, next_fire_at=None)
 
     logger.info("Past-date alert deactivation: updated=%d", updated)
     return f"deactivated={updated}"
 
 
-@periodic_task(crontab(hour='14', minute='0'))
+@periodic_task(crontab(minute='0'))
 @lock_task('process-alert-daily-lock')
 def send_process_alerts():
-    """Check every active process and send 3-day / 1-day reminders."""
-    from gym_app.models import Process, Stage, StageAlert
-    from gym_app.services.notification_service import create_notification
+    """Send the 3-day / 1-day reminders (and expire lapsed alerts) that are due."""
+    from gym_app.models import StageAlert
 
-    today = timezone.now().date()
+    now = timezone.now()
     processed = 0
     sent = 0
-
-    # Prefetch stages with explicit ordering so the per-process loop reuses
-    # the cache instead of issuing a fresh query per process.
-    processes = (
-        Process.objects
-        .prefetch_related(
-            Prefetch('stages', queryset=Stage.objects.order_by('id').select_related('alert')),
-            'clients',
-        )
-        .select_related('lawyer')
-        .all()
+    deactivated = 0
+    handled = set()
+
+    while True:
+        due_ids = [
+            pk for pk in StageAlert.objects
+            .filter(next_fire_at__lte=now)
+            .order_by('next_fire_at', 'pk')
+            .values_list('pk', flat=True)[:DUE_ALERT_BATCH_SIZE]
+            if pk not in handled
+        ]
+        if not due_ids:
+            break
+        handled.update(due_ids)
+        for alert_id in due_ids:
+            outcome = _fire_alert(alert_id, now)
+            if outcome == 'sent':
+                processed += 1
+                sent += 1
+            elif outcome == 'evaluated':
+                processed += 1
+            elif outcome == 'deactivated':
+                deactivated += 1
+
+    logger.info(
+        "Process alert task: processed=%d, sent=%d, deactivated=%d",
+        processed, sent, deactivated,
     )
+    return f"processed={processed}, sent={sent}"
 
-    for process in processes:
-        stages = list(process.stages.all())
-        if not stages:
-            continue
-
-        last_stage = stages[-1]
-
-        # Skip finished processes
-        if last_stage.status == 'Fallo':
-            continue
 
-        # Must have a date
-        if not last_stage.date:
-            continue
+@on_startup()
+def catch_up_process_alerts():
+    """Enqueue a run when the consumer starts so alerts missed while it was down go out."""
+    send_process_alerts()
 
-        # Must have an active alert
-        try:
-            alert = last_stage.alert
-        except StageAlert.DoesNotExist:
-            continue
 
-        if not alert.is_active:
-            continue
+def _fire_alert(alert_id, now):
+    """Handle one due alert. Returns ``'sent'``, ``'evaluated'``, ``'deactivated'`` or ``'skipped'``."""
+    from gym_app.models import Process, StageAlert
 
-        days_until = (last_stage.date - today).days
-        processed += 1
+    today = now.date()
+    with transaction.atomic():
+        alert = (
+            StageAlert.objects
+            .select_for_update()
+            .select_related('stage')
+            .filter(pk=alert_id, next_fire_at__lte=now)
+            .first()
+        )
+        if alert is None:
+            # Re-planned or handled by a concurrent run.
+            return 'skipped'
+
+        stage = alert.stage
+        if not alert.is_active or stage.date is None:
+            StageAlert.objects.filter(pk=alert.pk).update(next_fire_at=None)
+            return 'skipped'
+
+        if stage.date < today:
+            StageAlert.objects.filter(pk=alert.pk).update(
+                is_active=False, next_fire_at=None, updated_at=now,
+            )
+            return 'deactivated'
+
+        # Everything below consumes today's slot: the next due time is the
+        # first reminder from tomorrow on, or the expiry.
+        next_fire_at = alert.compute_next_fire_at(not_before=today + timedelta(days=1))
+
+        process = (
+            Process.objects
+            .filter(stages=stage)
+            .select_related('lawyer')
+            .prefetch_related('clients')
+            .first()
+        )
+        last_stage_id = (
+            process.stages.order_by('-id').values_list('id', flat=True).first()
+            if process else None
+        )
+        # Only the last stage of a non-finished process sends reminders.
+        if last_stage_id != stage.pk or stage.status == 'Fallo':
+            StageAlert.objects.filter(pk=alert.pk).update(next_fire_at=next_fire_at)
+            return 'skipped'
 
-        # Determine which reminder to send
-        should_send_3 = (days_until == 3 and not alert.notified_3_days)
-        should_send_1 = (days_until == 1 and not alert.notified_1_day)
+        days_until = (stage.date - today).days
+        should_send_1 = days_until == 1 and not alert.notified_1_day
+        # A 3-day reminder missed while the worker was down still goes out
+        # the day after; once only one day is left the 1-day reminder wins.
+        should_send_3 = 2 <= days_until <= 3 and not alert.notified_3_days
 
         if not should_send_3 and not should_send_1:
-            continue
+            StageAlert.objects.filter(pk=alert.pk).update(next_fire_at=next_fire_at)
+            return 'evaluated'
 
-        # Build recipients
         recipients = _build_recipients(process, alert)
         if not recipients:
-            continue
-
-        reminder_label = '3 días' if should_send_3 else '1 día'
-        description = alert.description or f'Recordatorio de etapa procesal: {last_stage.status}'
-
-        # Send email to all recipients
-        _send_alert_email(
-            process=process,
-            stage=last_stage,
-            description=description,
-            reminder_label=reminder_label,
-            recipient_emails=[r['email'] for r in recipients],
-        )
+            StageAlert.objects.filter(pk=alert.pk).update(next_fire_at=next_fire_at)
+            return 'evaluated'
 
-        # Create in-app notifications
-        for r in recipients:
-            create_notification(
-                user=r['user'],
-                title=f'Alerta de Proceso — {reminder_label} restante',
-                message=(
-                    f'El proceso {process.ref} ({process.subcase}) tiene '
-                    f'la etapa "{last_stage.status}" programada para '
-                    f'{last_stage.date.strftime("%d/%m/%Y")}. {description}'
-                ),
-                category='process_alert',
-                priority='high',
-                link_type='process',
-                link_id=process.id,
-            )
+        reminder_label = '1 día' if days_until == 1 else f'{days_until} días'
+        _send_alert(process, stage, alert, recipients, reminder_label)
 
         # Update alert flags
-        if should_send_3:
-            alert.notified_3_days = True
-        if should_send_1:
-            alert.notified_1_day = True
-        alert.save(update_fields=['notified_3_days', 'notified_1_day', 'updated_at'])
+        flags = {'notified_1_day': True} if should_send_1 else {'notified_3_days': True}
+        StageAlert.objects.filter(pk=alert.pk).update(
+            next_fire_at=next_fire_at, updated_at=now, **flags,
+        )
+    return 'sent'
 
-        sent += 1
 
-    logger.info("Process alert task: processed=%d, sent=%d", processed, sent)
-    return f"processed={processed}, sent={sent}"
+def _send_alert(process, stage, alert, recipients, reminder_label):
+    """Notify ``recipients`` about ``stage``; the email goes out on commit."""
+    from gym_app.services.notification_service import create_notification
+
+    description = alert.description or f'Recordatorio de etapa procesal: {stage.status}'
+
+    # Email all recipients once the alert flags are committed
+    transaction.on_commit(partial(
+        _send_alert_email,
+        process=process,
+        stage=stage,
+        description=description,
+        reminder_label=reminder_label,
+        recipient_emails=[r['email'] for r in recipients],
+    ))
+
+    # Create in-app notifications
+    for r in recipients:
+        create_notification(
+            user=r['user'],
+            title=f'Alerta de Proceso — {reminder_label} restante',
+            message=(
+                f'El proceso {process.ref} ({process.subcase}) tiene '
+                f'la etapa "{stage.status}" programada para '
+                f'{stage.date.strftime("%d/%m/%Y")}. {description}'
+            ),
+            category='process_alert',
+            priority='high',
+            link_type='process',
+            link_id=process.id,
+        )
 
 
 def _build_recipients(process, alert):
@@ -0,0 +1,39 @@
+"""orjson-backed JSON renderer for the DRF API.
+
+Output matches DRF's ``JSONRenderer`` with the default settings (compact,
+UTF-8, ``\\u2028``/``\\u2029`` escaped): datetimes, Decimals, lazy strings,
+querysets, etc. go through DRF's own ``JSONEncoder.default``, so their
+representation is unchanged. Serializers already turn most of these into
+strings; the hook covers values views put in ``Response`` dicts directly.
+
+Differences: NaN/Infinity render as ``null`` instead of raising, and
+integers beyond 64 bits raise. Pretty-printed output (``indent`` from the
+Accept header or the browsable API) falls back to the stdlib renderer.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes with orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.ensure_ascii or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+        # Same escaping as DRF: keep the output a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
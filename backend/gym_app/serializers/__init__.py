@@ -24,6 +24,7 @@ from .service_tramite import (
     ServiceRequestLawyerResponseSerializer,
     ServiceRequestLawyerResponseFileSerializer,
 )
+from .upload_session import UploadSessionSerializer
 
 __all__ = [
     'UserSerializer', 'ProcessSerializer', 'StageSerializer', 'CaseFileSerializer', 'CaseSerializer',
@@ -38,4 +39,5 @@ __all__ = [
     'ServiceRequestListSerializer', 'ServiceRequestDetailSerializer', 'ServiceRequestAnswerSerializer',
     'ServiceRequestFieldFileSerializer', 'ServiceRequestLawyerResponseSerializer',
     'ServiceRequestLawyerResponseFileSerializer',
+    'UploadSessionSerializer',
 ]
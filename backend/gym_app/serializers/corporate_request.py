@@ -257,7 +257,9 @@ class CorporateRequestListSerializer(serializers.ModelSerializer):
         return delta.days
 
     def get_response_count(self, obj):
-        return obj.responses.count()
+        # Annotated by the list views; falls back to a COUNT query
+        count = getattr(obj, 'response_count', None)
+        return obj.responses.count() if count is None else count
 
 class CorporateRequestCreateSerializer(serializers.ModelSerializer):
     """
@@ -208,8 +208,10 @@ class DynamicDocumentSerializer(serializers.ModelSerializer):
             'summary_counterparty', 'summary_object', 'summary_value',
             'summary_value_currency', 'summary_term',
             'summary_subscription_date', 'summary_start_date',
-            'summary_end_date', 'relationships_count', 'created_by_name'
+            'summary_end_date', 'relationships_count', 'created_by_name',
+            'revision'
         ]
+        read_only_fields = ['revision']
 
     def get_signer_ids(self, obj):
         """
@@ -729,6 +731,9 @@ class DynamicDocumentSerializer(serializers.ModelSerializer):
         # Set requires_signature and signature_type explicitly
         instance.requires_signature = requires_signature
         instance.signature_type = signature_type
+        # Any full save supersedes in-flight autosave patches computed against
+        # the previous revision (see autosave_dynamic_document).
+        instance.revision = (instance.revision or 0) + 1
         instance.save()
         # Invalidate stale prefetched relations (variables/tags were replaced
         # above); otherwise re-serializing this instance returns the old rows.
@@ -748,6 +753,22 @@ class DynamicDocumentListSerializer(DynamicDocumentSerializer):
         fields = [f for f in DynamicDocumentSerializer.Meta.fields if f != 'content']
 
 
+class RelationshipCandidateSerializer(serializers.ModelSerializer):
+    """Compact representation used by the related-document picker.
+
+    Only carries what the picker list renders; the full document (content,
+    variables, signatures) is fetched on demand when the user opens a preview.
+    """
+    tags = TagSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = DynamicDocument
+        fields = [
+            'id', 'title', 'state', 'created_by', 'assigned_to',
+            'created_at', 'updated_at', 'tags'
+        ]
+
+
 class RecentDocumentSerializer(serializers.ModelSerializer):
     document = DynamicDocumentListSerializer(read_only=True)
     
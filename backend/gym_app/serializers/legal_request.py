@@ -75,6 +75,7 @@ class LegalRequestListSerializer(serializers.ModelSerializer):
     discipline_name = serializers.CharField(source='discipline.name', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     response_count = serializers.SerializerMethodField()
+    file_count = serializers.SerializerMethodField()
     
     # User fields from related user
     first_name = serializers.CharField(source='user.first_name', read_only=True)
@@ -86,9 +87,17 @@ class LegalRequestListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'request_number', 'user', 'first_name', 'last_name', 'email',
             'request_type_name', 'discipline_name', 'description',
-            'status', 'status_display', 'response_count', 'created_at'
+            'status', 'status_display', 'response_count', 'file_count', 'created_at'
         ]
     
     def get_response_count(self, obj):
-        """Get the number of responses for this request."""
-        return obj.responses.count()
\ No newline at end of file
+        """Get the number of responses for this request (annotated by the list view)."""
+        if hasattr(obj, 'response_count'):
+            return obj.response_count
+        return obj.responses.count()
+
+    def get_file_count(self, obj):
+        """Get the number of files attached to this request (annotated by the list view)."""
+        if hasattr(obj, 'file_count'):
+            return obj.file_count
+        return obj.files.count()
\ No newline at end of file
@@ -50,10 +50,13 @@ class OrganizationListSerializer(serializers.ModelSerializer):
         ]
 
     def get_member_count(self, obj):
-        return obj.get_member_count()
+        # Annotated by the list/detail views; falls back to a COUNT query
+        count = getattr(obj, 'active_member_count', None)
+        return obj.get_member_count() if count is None else count
 
     def get_pending_invitations_count(self, obj):
-        return obj.get_pending_invitations_count()
+        count = getattr(obj, 'pending_invitation_count', None)
+        return obj.get_pending_invitations_count() if count is None else count
 
     def get_profile_image_url(self, obj):
         """Get the full URL for the profile image"""
@@ -96,10 +99,13 @@ class OrganizationSerializer(serializers.ModelSerializer):
         ]
 
     def get_member_count(self, obj):
-        return obj.get_member_count()
+        # Annotated by the list/detail views; falls back to a COUNT query
+        count = getattr(obj, 'active_member_count', None)
+        return obj.get_member_count() if count is None else count
 
     def get_pending_invitations_count(self, obj):
-        return obj.get_pending_invitations_count()
+        count = getattr(obj, 'pending_invitation_count', None)
+        return obj.get_pending_invitations_count() if count is None else count
 
     def get_profile_image_url(self, obj):
         if obj.profile_image:
@@ -119,7 +125,9 @@ class OrganizationSerializer(serializers.ModelSerializer):
 
     def get_members(self, obj):
         """Get active members of the organization"""
-        memberships = obj.memberships.filter(is_active=True).select_related('user')
+        memberships = getattr(obj, 'active_memberships', None)
+        if memberships is None:
+            memberships = obj.memberships.filter(is_active=True).select_related('user')
         return [{
             'id': membership.user.id,
             'email': membership.user.email,
@@ -130,6 +138,9 @@ class OrganizationSerializer(serializers.ModelSerializer):
 
     def get_recent_requests_count(self, obj):
         """Get count of recent requests (last 30 days)"""
+        count = getattr(obj, 'recent_request_count', None)
+        if count is not None:
+            return count
         thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
         return obj.corporate_requests.filter(created_at__gte=thirty_days_ago).count()
 
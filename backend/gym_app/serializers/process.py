@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from gym_app.models import Case, CaseFile, Stage, StageAlert, Process, RecentProcess
+from gym_app.models import Case, CaseFile, Stage, StageAlert, Process, RecentProcess, User
 from gym_app.serializers import UserSerializer
 
 class CaseSerializer(serializers.ModelSerializer):
@@ -128,3 +128,34 @@ class RecentProcessSerializer(serializers.ModelSerializer):
     class Meta:
         model = RecentProcess
         fields = ['id', 'process', 'last_viewed']
+
+
+class ProcessPartySerializer(serializers.ModelSerializer):
+    """Minimal user representation (lawyer / clients) for process listings."""
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'first_name', 'last_name']
+
+
+class ProcessListSerializer(serializers.ModelSerializer):
+    """
+    Compact serializer for paginated process listings.
+
+    Only the current (last) stage is included instead of the full stage
+    history, and case files are omitted; the detail endpoint keeps using
+    ``ProcessSerializer``. The view attaches ``current_stage`` to each
+    instance so the whole page is resolved with a fixed number of queries.
+    """
+    case = CaseSerializer(read_only=True)
+    lawyer = ProcessPartySerializer(read_only=True)
+    clients = ProcessPartySerializer(many=True, read_only=True)
+    current_stage = StageSerializer(read_only=True, allow_null=True)
+    stage_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Process
+        fields = [
+            'id', 'authority', 'plaintiff', 'defendant', 'ref',
+            'case', 'subcase', 'lawyer', 'progress', 'created_at',
+            'clients', 'current_stage', 'stage_count',
+        ]
@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from gym_app.models import UploadSession
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Serializer for the UploadSession model (resume/progress information)."""
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'target', 'target_id', 'filename', 'total_size',
+            'received_bytes', 'status', 'attached_object_id',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
@@ -92,4 +92,16 @@ class ActivityFeedSerializer(serializers.ModelSerializer):
         """
         Returns the display value for the action_type field.
         """
-        return dict(ActivityFeed.ACTION_TYPE_CHOICES).get(obj.action_type, obj.action_type)
\ No newline at end of file
+        return dict(ActivityFeed.ACTION_TYPE_CHOICES).get(obj.action_type, obj.action_type)
+
+
+class ActivityFeedEntrySerializer(serializers.ModelSerializer):
+    """
+    Validates one entry of a batch activity submission.
+
+    The user is always the authenticated requester, so it is not accepted
+    from the payload.
+    """
+    class Meta:
+        model = ActivityFeed
+        fields = ['action_type', 'description']
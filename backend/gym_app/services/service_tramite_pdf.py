@@ -4,6 +4,8 @@ from django.core.files.base import ContentFile
 from django.template.loader import render_to_string
 from xhtml2pdf import pisa
 
+from gym_app.utils import render_pool
+
 
 class ServiceRequestPDFError(Exception):
     """Raised when PDF generation fails for service requests."""
@@ -25,6 +27,21 @@ def _normalize_answer_value(answer):
 
 
 
+def render_service_request_pdf(html):
+    """Render the service request summary HTML to PDF bytes with xhtml2pdf.
+
+    Runs on the render pool, so it only works with its argument.
+    """
+    buffer = io.BytesIO()
+    pisa_status = pisa.CreatePDF(html.encode("utf-8"), dest=buffer)
+
+    if pisa_status.err:
+        raise ServiceRequestPDFError("No se pudo generar el PDF del tramite")
+
+    return buffer.getvalue()
+
+
+
 def generate_service_request_pdf(service_request):
     """Render and persist PDF summary for a submitted service request."""
     answers = service_request.answers.all().order_by("stage_order", "id")
@@ -68,17 +85,12 @@ def generate_service_request_pdf(service_request):
     }
 
     html = render_to_string("service_request_pdf.html", context)
-    buffer = io.BytesIO()
-    pisa_status = pisa.CreatePDF(html.encode("utf-8"), dest=buffer)
-
-    if pisa_status.err:
-        raise ServiceRequestPDFError("No se pudo generar el PDF del tramite")
+    pdf_bytes = render_pool.run("service_request_pdf", render_service_request_pdf, html)
 
-    buffer.seek(0)
     filename = f"solicitud_{service_request.tracking_number or service_request.id}.pdf"
     service_request.generated_document.save(
         filename,
-        ContentFile(buffer.getvalue()),
+        ContentFile(pdf_bytes),
         save=False,
     )
 
@@ -0,0 +1,260 @@
+"""Content-addressed, deduplicating media storage.
+
+Uploaded attachments and letterhead snapshots are frequently byte-identical
+(the same letterhead is frozen onto every formalized document, clients upload
+the same scan to several requests). :class:`ContentAddressedStorage` keeps a
+single copy of each distinct content:
+
+- Every saved file is hashed (SHA-256) while it is streamed to a temporary
+  file under ``MEDIA_ROOT/.blobs/``. The content is then stored once as
+  ``.blobs/<aa>/<bb>/<sha256>``.
+- The name Django hands back (``legal_request_files/acta.pdf``, ...) is a
+  *hard link* to that blob. Code that works with ``FieldFile.path`` (the
+  ``post_delete`` receivers, ``serve_file``, nginx ``X-Accel-Redirect``)
+  keeps working unchanged, and deleting a name — from our receivers or from
+  ``django-cleanup``, which calls :meth:`Storage.delete` — only drops one
+  reference.
+- The filesystem link count is the reference count: a blob whose
+  ``st_nlink`` is 1 is referenced by nothing but the blob store and is
+  removed by :func:`collect_garbage` (``gc_media_blobs`` command and a daily
+  Huey task).
+
+Because identical files share an inode, the project's ``mediabackup``
+command (``gym_app/management/commands/mediabackup.py``) archives each
+distinct content once and the other names as tar hard links. ``listdir``
+hides ``.blobs`` so the backup, which walks the storage API, does not archive
+the blob store a second time.
+
+A save holds a shared ``flock`` on the ``.blobs`` directory from promoting its blob until
+its name is linked, and :func:`collect_garbage` re-checks an orphan under the
+exclusive lock before removing it, so a blob cannot be collected between
+those two steps.
+
+When hard links are not available (e.g. ``MEDIA_ROOT`` spans filesystems)
+the storage silently falls back to plain copies.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines: no concurrent GC there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = '.blobs'
+TEMP_PREFIX = 'incoming-'
+# Temp files younger than this may belong to a save still in progress.
+TEMP_GRACE_SECONDS = 6 * 60 * 60
+
+
+def _discard_temp(path):
+    """Best-effort removal of a temp file; leftovers are swept by the periodic clean-ups."""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except OSError as exc:
+        logger.warning("Could not remove temporary file %s (%s)", path, exc)
+
+
+@contextmanager
+def _blob_lock(storage, exclusive=False):
+    """Hold the blob store lock: shared while saving, exclusive while collecting."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(storage.blob_root, exist_ok=True)
+    fd = os.open(storage.blob_root, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def _hash_file(path, block_size=64 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """``FileSystemStorage`` that stores each distinct content once (see module docs)."""
+
+    @property
+    def blob_root(self):
+        return os.path.join(self.location, BLOB_DIR)
+
+    def blob_path(self, digest):
+        """Absolute path of the blob holding content ``digest``."""
+        return os.path.join(self.blob_root, digest[:2], digest[2:4], digest)
+
+    def _save(self, name, content):
+        os.makedirs(self.blob_root, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.blob_root, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    handle.write(chunk)
+            return self._link_blob(temp_path, digest.hexdigest(), name)
+        finally:
+            _discard_temp(temp_path)
+
+    def adopt_file(self, source_path, name):
+        """Move an already-written file (e.g. an assembled chunked upload) into storage.
+
+        Returns the final storage name, which may differ from ``name`` if it
+        was taken.
+        """
+        validate_file_name(name, allow_relative_path=True)
+        os.makedirs(self.blob_root, exist_ok=True)
+        digest = _hash_file(source_path)
+        try:
+            return self._link_blob(source_path, digest, name)
+        finally:
+            _discard_temp(source_path)
+
+    def _link_blob(self, temp_path, digest, name):
+        """Promote ``temp_path`` to the blob for ``digest`` and hard-link ``name`` to it."""
+        with _blob_lock(self):
+            return self._link_blob_locked(temp_path, digest, name)
+
+    def _link_blob_locked(self, temp_path, digest, name):
+        blob_path = self.blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(temp_path, blob_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(blob_path, self.file_permissions_mode)
+
+        while True:
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                os.link(blob_path, full_path)
+            except FileExistsError:
+                # A file appeared under this name since get_available_name().
+                name = self.get_available_name(name)
+                continue
+            except OSError as exc:
+                logger.warning("Hard links unavailable for %s (%s); storing a copy.", name, exc)
+                shutil.copyfile(blob_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+            break
+
+        return os.path.relpath(full_path, self.location).replace(os.sep, '/')
+
+    def listdir(self, path):
+        directories, files = super().listdir(path)
+        if os.path.normpath(path) in ('', '.'):
+            directories = [d for d in directories if d != BLOB_DIR]
+        return directories, files
+
+
+def collect_garbage(storage, dry_run=False):
+    """Remove blobs no stored name links to anymore.
+
+    Args:
+        storage: A :class:`ContentAddressedStorage` instance.
+        dry_run: Only count what would be removed.
+
+    Returns:
+        tuple: ``(removed_blobs, reclaimed_bytes)``.
+    """
+    removed = 0
+    reclaimed = 0
+    if not os.path.isdir(storage.blob_root):
+        return removed, reclaimed
+
+    now = time.time()
+    for dirpath, _dirnames, filenames in os.walk(storage.blob_root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                stat_result = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if filename.startswith(TEMP_PREFIX):
+                # Leftover from an interrupted save, once it is old enough.
+                if now - stat_result.st_mtime < TEMP_GRACE_SECONDS:
+                    continue
+            elif stat_result.st_nlink > 1:
+                continue
+            if not dry_run and not _remove_orphan(storage, path, filename):
+                continue
+            removed += 1
+            reclaimed += stat_result.st_size
+    return removed, reclaimed
+
+
+def _remove_orphan(storage, path, filename):
+    """Remove ``path`` unless a save linked a name to it since it was inspected."""
+    if filename.startswith(TEMP_PREFIX):
+        os.remove(path)
+        return True
+    with _blob_lock(storage, exclusive=True):
+        try:
+            if os.stat(path).st_nlink > 1:
+                return False
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def deduplicate_existing(storage, exclude=('upload_sessions',), dry_run=False):
+    """Fold files written before deduplication was enabled into the blob store.
+
+    Every regular file under ``storage.location`` that is not yet linked to a
+    blob is hashed; if an identical blob exists the file is atomically
+    replaced by a link to it, otherwise the file itself becomes the blob.
+
+    Returns:
+        tuple: ``(processed_files, reclaimed_bytes)``.
+    """
+    processed = 0
+    reclaimed = 0
+    skip_dirs = {BLOB_DIR, *exclude}
+    for dirpath, dirnames, filenames in os.walk(storage.location):
+        if os.path.normpath(dirpath) == os.path.normpath(storage.location):
+            dirnames[:] = [d for d in dirnames if d not in skip_dirs]
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if os.path.islink(path):
+                continue
+            stat_result = os.stat(path)
+            if stat_result.st_nlink > 1:
+                continue
+            blob_path = storage.blob_path(_hash_file(path))
+            processed += 1
+            if dry_run:
+                if os.path.exists(blob_path):
+                    reclaimed += stat_result.st_size
+                continue
+            with _blob_lock(storage):
+                if os.path.exists(blob_path):
+                    temp_link = f"{path}.{TEMP_PREFIX}link"
+                    os.link(blob_path, temp_link)
+                    os.replace(temp_link, path)
+                    reclaimed += stat_result.st_size
+                else:
+                    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                    os.link(path, blob_path)
+    return processed, reclaimed
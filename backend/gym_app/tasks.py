@@ -1,42 +1,103 @@
 import hashlib
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
-from huey.contrib.djhuey import task
+from huey.contrib.djhuey import lock_task, task
 from django.conf import settings
-from gym_app.models import Subscription
+from django.db import transaction
+from django.utils import timezone
+from gym_app.models import Subscription, User, WompiWebhookEvent
+from gym_app.utils import auth_cache
 
 logger = logging.getLogger(__name__)
 
 
 @task()
+@lock_task('subscription-billing-lock')
 def process_monthly_subscriptions():
     """
     Huey task to process monthly subscription payments.
     
     This task runs daily and processes all active subscriptions that are due for billing.
-    It charges the payment source saved in the subscription and updates the subscription status.
+    Due subscriptions are handled in batches of ``SUBSCRIPTION_BILLING_BATCH_SIZE``:
+    each batch is locked with ``SELECT ... FOR UPDATE SKIP LOCKED`` so a concurrent
+    run (or a webhook being applied) never charges the same subscription twice,
+    the Wompi charges of the batch run on up to ``SUBSCRIPTION_BILLING_CONCURRENCY``
+    threads, and the resulting status changes are written with bulk updates before
+    the lock is released.
     """
     today = datetime.now().date()
     
     # Get all active subscriptions that are due for billing
-    due_subscriptions = Subscription.objects.filter(
-        status='active',
-        next_billing_date__lte=today
+    due_ids = list(
+        Subscription.objects.filter(status='active', next_billing_date__lte=today)
+        .order_by('id')
+        .values_list('id', flat=True)
     )
     
-    logger.info(f"Processing {due_subscriptions.count()} subscriptions due for billing")
+    logger.info(f"Processing {len(due_ids)} subscriptions due for billing")
     
-    for subscription in due_subscriptions:
-        try:
-            process_subscription_payment(subscription)
-        except Exception as e:
-            logger.error(f"Error processing subscription {subscription.id}: {str(e)}")
-            continue
+    batch_size = max(1, getattr(settings, 'SUBSCRIPTION_BILLING_BATCH_SIZE', 50))
+    processed = 0
+    for start in range(0, len(due_ids), batch_size):
+        processed += _process_billing_batch(due_ids[start:start + batch_size], today)
     
     logger.info("Monthly subscription processing completed")
-    return f"Processed {due_subscriptions.count()} subscriptions"
+    return f"Processed {processed} subscriptions"
+
+
+def _process_billing_batch(subscription_ids, today):
+    """
+    Charge one batch of due subscriptions while holding their row locks.
+
+    Subscriptions locked by another transaction, or no longer due once the
+    lock is taken, are skipped. Returns the number of subscriptions charged.
+    """
+    with transaction.atomic():
+        subscriptions = list(
+            Subscription.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('user')
+            .filter(id__in=subscription_ids, status='active', next_billing_date__lte=today)
+            .order_by('id')
+        )
+        if not subscriptions:
+            return 0
+
+        workers = max(1, min(getattr(settings, 'SUBSCRIPTION_BILLING_CONCURRENCY', 4), len(subscriptions)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(charge_subscription, subscription): subscription
+                for subscription in subscriptions
+            }
+            payment_statuses = {}
+            for future, subscription in futures.items():
+                try:
+                    payment_statuses[subscription.id] = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing subscription {subscription.id}: {str(e)}")
+
+        changed = []
+        downgraded_user_ids = set()
+        for subscription in subscriptions:
+            if subscription.id not in payment_statuses:
+                continue
+            if apply_payment_status(subscription, payment_statuses[subscription.id]):
+                changed.append(subscription)
+                if subscription.status == 'expired':
+                    downgraded_user_ids.add(subscription.user_id)
+
+        if changed:
+            now = timezone.now()
+            for subscription in changed:
+                subscription.updated_at = now
+            Subscription.objects.bulk_update(changed, ['status', 'next_billing_date', 'updated_at'])
+        if downgraded_user_ids:
+            User.objects.filter(id__in=downgraded_user_ids).update(role='basic')
+            auth_cache.invalidate(*downgraded_user_ids)
+
+    return len(subscriptions)
 
 
 def process_subscription_payment(subscription):
@@ -46,12 +107,31 @@ def process_subscription_payment(subscription):
     Args:
         subscription (Subscription): The subscription to process
     """
+    payment_status = charge_subscription(subscription)
+    if apply_payment_status(subscription, payment_status):
+        subscription.save()
+        if subscription.status == 'expired':
+            # Update user role to basic
+            subscription.user.role = 'basic'
+            subscription.user.save()
+
+
+def charge_subscription(subscription):
+    """
+    Charge the saved payment source of a subscription through Wompi.
+
+    Performs no database writes, so it can run on a worker thread.
+
+    Args:
+        subscription (Subscription): The subscription to charge (with ``user`` loaded)
+
+    Returns:
+        str | None: Wompi transaction status, or None for free plans.
+    """
     # Skip if amount is 0 (free plan)
     if subscription.amount <= 0:
-        subscription.next_billing_date = datetime.now().date() + timedelta(days=30)
-        subscription.save()
         logger.info(f"Subscription {subscription.id} is free plan, skipping payment")
-        return
+        return None
     
     # Convert amount to cents for Wompi
     amount_in_cents = int(subscription.amount * 100)
@@ -93,34 +173,41 @@ def process_subscription_payment(subscription):
         response.raise_for_status()
         payment_response = response.json()
         
-        payment_status = payment_response.get('data', {}).get('status')
-        
-        if payment_status == 'APPROVED':
-            # Payment successful, update next billing date
-            subscription.next_billing_date = datetime.now().date() + timedelta(days=30)
-            subscription.save()
-            logger.info(f"Subscription {subscription.id} payment successful")
-            
-        elif payment_status == 'DECLINED':
-            # Payment failed, mark subscription as expired
-            subscription.status = 'expired'
-            subscription.save()
-            
-            # Update user role to basic
-            subscription.user.role = 'basic'
-            subscription.user.save()
-            
-            logger.warning(f"Subscription {subscription.id} payment declined, subscription expired")
-            
-        else:
-            # Payment pending or other status
-            logger.info(f"Subscription {subscription.id} payment status: {payment_status}")
-            
+        return payment_response.get('data', {}).get('status')
     except requests.RequestException as e:
         logger.error(f"Error processing payment for subscription {subscription.id}: {str(e)}")
         raise
 
 
+def apply_payment_status(subscription, payment_status):
+    """
+    Apply the outcome of a billing charge to a subscription in memory.
+
+    Args:
+        subscription (Subscription): The charged subscription
+        payment_status (str | None): Status returned by :func:`charge_subscription`
+
+    Returns:
+        bool: True when the subscription changed and must be saved.
+    """
+    if payment_status is None or payment_status == 'APPROVED':
+        # Payment successful (or free plan), update next billing date
+        subscription.next_billing_date = datetime.now().date() + timedelta(days=30)
+        if payment_status:
+            logger.info(f"Subscription {subscription.id} payment successful")
+        return True
+
+    if payment_status == 'DECLINED':
+        # Payment failed, mark subscription as expired
+        subscription.status = 'expired'
+        logger.warning(f"Subscription {subscription.id} payment declined, subscription expired")
+        return True
+
+    # Payment pending or other status
+    logger.info(f"Subscription {subscription.id} payment status: {payment_status}")
+    return False
+
+
 @task()
 def cancel_subscription(subscription_id):
     """
@@ -144,3 +231,118 @@ def cancel_subscription(subscription_id):
     except Subscription.DoesNotExist:
         logger.error(f"Subscription {subscription_id} not found")
         raise
+
+
+# Subscription plan -> user role granted while the subscription is active
+PLAN_ROLE_MAPPING = {
+    'basico': 'basic',
+    'cliente': 'client',
+    'corporativo': 'corporate_client',
+}
+
+
+@task(retries=3, retry_delay=60)
+def process_wompi_webhook_event(event_id):
+    """
+    Apply a logged Wompi webhook event to its subscription.
+
+    The event row is locked while it is processed, and events already marked
+    as processed or ignored are skipped, so duplicate deliveries and
+    re-enqueued tasks are no-ops. Failures are recorded on the event and
+    re-raised so Huey retries the task.
+
+    Args:
+        event_id (int): ID of the WompiWebhookEvent to process
+    """
+    error = None
+    with transaction.atomic():
+        event = WompiWebhookEvent.objects.select_for_update().filter(id=event_id).first()
+        if event is None:
+            logger.error(f"Wompi webhook event {event_id} not found")
+            return f"Event {event_id} not found"
+        if event.status in ('processed', 'ignored'):
+            return f"Event {event_id} already {event.status}"
+
+        event.attempts += 1
+        try:
+            with transaction.atomic():
+                event.status = apply_wompi_transaction(event.reference, event.transaction_status)
+            event.error_message = None
+            event.processed_at = timezone.now()
+        except Exception as e:
+            error = e
+            event.status = 'failed'
+            event.error_message = str(e)
+            logger.error(f"Error processing Wompi webhook event {event_id}: {str(e)}")
+        event.save(update_fields=['status', 'attempts', 'error_message', 'processed_at'])
+
+    if error is not None:
+        raise error
+    return f"Event {event_id} {event.status}"
+
+
+def apply_wompi_transaction(reference, transaction_status):
+    """
+    Update the subscription referenced by a Wompi transaction.
+
+    Args:
+        reference (str): Transaction reference (format: SUB-{subscription_id}-{timestamp})
+        transaction_status (str): Wompi transaction status
+
+    Returns:
+        str: 'processed' when the transaction belongs to a subscription,
+        'ignored' otherwise.
+    """
+    # Process only subscription-related transactions
+    if not reference.startswith('SUB-'):
+        return 'ignored'
+
+    try:
+        subscription_id = int(reference.split('-')[1])
+        subscription = (
+            Subscription.objects.select_for_update(of=('self',))
+            .select_related('user')
+            .get(id=subscription_id)
+        )
+    except (IndexError, ValueError):
+        logger.error(f"Invalid subscription reference format: {reference}")
+        return 'ignored'
+    except Subscription.DoesNotExist:
+        logger.error(f"Subscription not found for reference: {reference}")
+        return 'ignored'
+
+    # Update subscription based on transaction status
+    if transaction_status == 'APPROVED':
+        # Payment successful
+        if subscription.status != 'active':
+            subscription.status = 'active'
+            subscription.save()
+
+            # Update user role if needed
+            expected_role = PLAN_ROLE_MAPPING.get(subscription.plan_type)
+            if subscription.user.role != expected_role:
+                subscription.user.role = expected_role
+                subscription.user.save()
+
+        logger.info(f"Subscription {subscription_id} payment approved")
+
+    elif transaction_status == 'DECLINED':
+        # Payment failed
+        subscription.status = 'expired'
+        subscription.save()
+
+        # Downgrade user to basic
+        subscription.user.role = 'basic'
+        subscription.user.save()
+
+        logger.warning(f"Subscription {subscription_id} payment declined")
+
+    elif transaction_status == 'VOIDED':
+        # Payment voided/cancelled
+        logger.info(f"Subscription {subscription_id} payment voided")
+
+    elif transaction_status == 'ERROR':
+        # Payment error
+        logger.error(f"Subscription {subscription_id} payment error")
+
+    return 'processed'
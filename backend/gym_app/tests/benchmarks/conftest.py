@@ -0,0 +1,154 @@
+"""Fixtures for the endpoint benchmark suite.
+
+Benchmarks are excluded from the default run (``addopts`` in ``pytest.ini``)
+and selected explicitly::
+
+    pytest -m benchmark gym_app/tests/benchmarks
+
+Environment knobs:
+
+- ``BENCHMARK_SCALE`` / ``BENCHMARK_SEED``: dataset passed to ``seed_scale``
+  (default ``0.01`` / ``42``, ~10k rows).
+- ``BENCHMARK_ROUNDS``: timed rounds per endpoint; the median is reported
+  (default ``5``).
+- ``BENCHMARK_BUDGET_FILE``: JSON budgets to enforce (default
+  ``budgets.json`` next to this file).
+- ``BENCHMARK_RESULTS_FILE``: where the measured results are written
+  (default ``benchmarks/latest.json`` in pytest's temporary directory, so
+  runs never write into the source tree; the path is printed at the end).
+"""
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BUDGET_FILE = BENCHMARK_DIR / 'budgets.json'
+
+BENCHMARK_LAWYER_EMAIL = 'lawyer00000@seed-scale.test'
+
+
+def _consume(response):
+    """Drain streaming responses so rendering cost is part of the measurement."""
+    if getattr(response, 'streaming', False):
+        for _chunk in response.streaming_content:
+            pass
+    return response
+
+
+@pytest.fixture(scope='session')
+def benchmark_budgets():
+    """Per-endpoint budgets: ``max_queries``, ``max_seconds``, ``max_peak_kb``."""
+    path = Path(os.environ.get('BENCHMARK_BUDGET_FILE', DEFAULT_BUDGET_FILE))
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+@pytest.fixture(scope='session')
+def benchmark_results(request, tmp_path_factory):
+    """Collect measurements and write them as JSON once the session ends."""
+    results = {}
+    yield results
+    if not results:
+        return
+    path = os.environ.get('BENCHMARK_RESULTS_FILE')
+    path = Path(path) if path else tmp_path_factory.getbasetemp() / 'benchmarks' / 'latest.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'generated_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'database': connection.vendor,
+        'scale': float(os.environ.get('BENCHMARK_SCALE', '0.01')),
+        'seed': int(os.environ.get('BENCHMARK_SEED', '42')),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+    reporter = request.config.pluginmanager.get_plugin('terminalreporter')
+    if reporter is not None:
+        reporter.write_line(f'Benchmark results written to {path}')
+
+
+@pytest.fixture(scope='module')
+def seeded_dataset(django_db_setup, django_db_blocker):
+    """Seed the scale dataset once per module and purge it afterwards."""
+    scale = os.environ.get('BENCHMARK_SCALE', '0.01')
+    seed = os.environ.get('BENCHMARK_SEED', '42')
+    with django_db_blocker.unblock():
+        call_command('seed_scale', '--scale', scale, '--seed', seed, stdout=StringIO())
+    yield
+    with django_db_blocker.unblock():
+        call_command('seed_scale', '--purge', stdout=StringIO())
+
+
+@pytest.fixture
+def benchmark_lawyer(seeded_dataset):
+    from gym_app.models import User
+
+    return User.objects.get(email=BENCHMARK_LAWYER_EMAIL)
+
+
+@pytest.fixture
+def measure(benchmark_budgets, benchmark_results):
+    """Measure a request and check it against its budget.
+
+    ``measure(name, call)`` runs ``call`` once to warm caches, then
+    ``BENCHMARK_ROUNDS`` timed rounds (median wall time), then one round
+    under ``CaptureQueriesContext`` and ``tracemalloc`` for the query count
+    and peak Python memory. Timing rounds run without tracing so the
+    allocator hooks do not inflate latency. The result lists every budget
+    the endpoint ``exceeded``; tests assert that list is empty.
+    """
+    rounds = int(os.environ.get('BENCHMARK_ROUNDS', '5'))
+
+    def _measure(name, call, expected_status=200):
+        response = _consume(call())
+        assert response.status_code == expected_status, getattr(response, 'data', response)
+
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            _consume(call())
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                _consume(call())
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {
+            'queries': len(queries),
+            'median_seconds': round(statistics.median(timings), 4),
+            'max_seconds': round(max(timings), 4),
+            'peak_kb': round(peak / 1024, 1),
+            'rounds': rounds,
+        }
+
+        budget = benchmark_budgets.get(name)
+        if budget is None:
+            pytest.fail(f"No budget defined for '{name}' in the benchmark budget file")
+        exceeded = []
+        if 'max_queries' in budget and result['queries'] > budget['max_queries']:
+            exceeded.append(f"queries {result['queries']} > {budget['max_queries']}")
+        if 'max_seconds' in budget and result['median_seconds'] > budget['max_seconds']:
+            exceeded.append(f"median {result['median_seconds']}s > {budget['max_seconds']}s")
+        if 'max_peak_kb' in budget and result['peak_kb'] > budget['max_peak_kb']:
+            exceeded.append(f"peak {result['peak_kb']}KB > {budget['max_peak_kb']}KB")
+        result['exceeded'] = exceeded
+        benchmark_results[name] = result
+        return result
+
+    return _measure
@@ -0,0 +1,66 @@
+"""JS AST bridge throughput over the frontend test tree.
+
+Parses every spec under ``frontend/test`` and ``frontend/e2e`` once with one
+Node process per file and once through persistent ``--serve`` workers (one
+worker, then a pool), and checks the payloads are identical. Needs Node.js and
+``frontend/node_modules``; run with ``pytest -m benchmark gym_app/tests/benchmarks``.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SCRIPTS_DIR = REPO_ROOT / 'scripts'
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from quality.js_ast_bridge import JSASTBridge  # noqa: E402
+
+pytestmark = pytest.mark.benchmark
+
+SPEC_SUFFIXES = ('.js', '.jsx', '.ts', '.tsx')
+
+
+def _frontend_specs():
+    specs = {}
+    for area, is_e2e in (('test', False), ('e2e', True)):
+        root = REPO_ROOT / 'frontend' / area
+        specs[is_e2e] = sorted(
+            path for path in root.rglob('*')
+            if path.suffix in SPEC_SUFFIXES and ('.test.' in path.name or '.spec.' in path.name)
+        )
+    return specs
+
+
+def _parse_tree(bridge, specs):
+    started = time.perf_counter()
+    with bridge:
+        results = [bridge.parse_files(paths, is_e2e=is_e2e) for is_e2e, paths in specs.items()]
+    return results, round(time.perf_counter() - started, 3)
+
+
+def test_persistent_bridge_over_frontend_tree(benchmark_results):
+    """Persistent workers return the per-file payloads, faster."""
+    if not JSASTBridge(REPO_ROOT).is_available():
+        pytest.skip(JSASTBridge(REPO_ROOT).unavailable_reason())
+    specs = _frontend_specs()
+    workers = int(os.environ.get('BENCHMARK_BRIDGE_WORKERS', os.cpu_count() or 1))
+
+    per_file, per_file_seconds = _parse_tree(JSASTBridge(REPO_ROOT, persistent=False), specs)
+    served, served_seconds = _parse_tree(JSASTBridge(REPO_ROOT), specs)
+    pooled, pooled_seconds = _parse_tree(JSASTBridge(REPO_ROOT, workers=workers), specs)
+    assert served == per_file
+    assert pooled == per_file
+
+    benchmark_results['js_ast_bridge[frontend_tree]'] = {
+        'files': sum(len(paths) for paths in specs.values()),
+        'per_file_seconds': per_file_seconds,
+        'persistent_seconds': served_seconds,
+        'pool_seconds': pooled_seconds,
+        'pool_workers': workers,
+        'speedup': round(per_file_seconds / served_seconds, 1) if served_seconds else None,
+    }
+    assert served_seconds < per_file_seconds
@@ -0,0 +1,79 @@
+"""Word export throughput on letterhead documents.
+
+Renders a generated short letter (3 sections) and a long contract
+(``BENCHMARK_DOCX_SECTIONS`` sections, default 60), each section a heading, a
+formatted paragraph and a 10-row table, on a letterhead template
+``BENCHMARK_ROUNDS`` times (default 5):
+
+- reparse: template cache disabled, so every export parses and configures the
+  template again, as the Word download used to;
+- cached: the template is parsed once and each export clones its body.
+
+Both runs must produce the same ``word/document.xml``. Run with
+``pytest -m benchmark gym_app/tests/benchmarks``.
+"""
+import os
+import statistics
+import time
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from bs4 import BeautifulSoup
+from docx import Document
+
+from gym_app.utils.docx_export import clear_template_cache, render_document_docx
+
+pytestmark = pytest.mark.benchmark
+
+
+def _contract_html(sections):
+    rows = ''.join(
+        f'<tr><td>Cláusula {row}</td><td><em>Valor {row}</em></td><td>{row * 1000}</td></tr>'
+        for row in range(10)
+    )
+    return ''.join(
+        f'<h2>Sección {index}</h2>'
+        f'<p style="text-align: justify">Las partes acuerdan la <strong>sección {index}</strong> '
+        f'según lo <span style="color: navy; font-size: 11pt">estipulado</span> en el anexo.</p>'
+        f'<table><tr><th>Concepto</th><th>Detalle</th><th>Monto</th></tr>{rows}</table>'
+        for index in range(sections)
+    )
+
+
+def _export(html, template, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        output = render_document_docx(BeautifulSoup(html, 'html.parser'), word_template=template)
+        timings.append(time.perf_counter() - started)
+    with zipfile.ZipFile(output) as package:
+        return package.read('word/document.xml'), round(statistics.median(timings), 4)
+
+
+@pytest.mark.parametrize('name', ['letter', 'contract'])
+def test_cached_template_export(benchmark_results, settings, tmp_path, name):
+    """Cached-template exports are faster and produce the same document body."""
+    letterhead = Document()
+    letterhead.sections[0].header.paragraphs[0].text = 'MEMBRETE'
+    letterhead.save(tmp_path / 'letterhead.docx')
+    template = SimpleNamespace(path=str(tmp_path / 'letterhead.docx'))
+    sections = 3 if name == 'letter' else int(os.environ.get('BENCHMARK_DOCX_SECTIONS', '60'))
+    rounds = int(os.environ.get('BENCHMARK_ROUNDS', '5'))
+    html = _contract_html(sections)
+
+    clear_template_cache()
+    settings.DOCX_TEMPLATE_CACHE_SIZE = 0
+    reparsed, reparse_seconds = _export(html, template, rounds)
+    settings.DOCX_TEMPLATE_CACHE_SIZE = 16
+    cached, cached_seconds = _export(html, template, rounds)
+    clear_template_cache()
+    assert cached == reparsed
+
+    benchmark_results[f'docx_export[{name}]'] = {
+        'sections': sections,
+        'reparse_seconds': reparse_seconds,
+        'cached_seconds': cached_seconds,
+        'speedup': round(reparse_seconds / cached_seconds, 1) if cached_seconds else None,
+    }
+    assert cached_seconds < reparse_seconds
@@ -0,0 +1,124 @@
+"""Latency, query-count and memory budgets for the hot API endpoints.
+
+Run with ``pytest -m benchmark gym_app/tests/benchmarks``; see ``conftest.py``
+for the dataset and budget knobs. Budgets live in ``budgets.json``.
+"""
+import pytest
+from django.urls import reverse
+
+from gym_app.models import DynamicDocument
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+
+def _weasyprint_available():
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+requires_weasyprint = pytest.mark.skipif(
+    not _weasyprint_available(),
+    reason="WeasyPrint system libraries (pango) are not installed",
+)
+
+
+@pytest.fixture
+def client(api_client, benchmark_lawyer):
+    api_client.force_authenticate(user=benchmark_lawyer)
+    return api_client
+
+
+@pytest.fixture
+def signed_document(seeded_dataset):
+    """The richest fully-signed document of the seed (most variables)."""
+    from django.db.models import Count
+
+    document = (
+        DynamicDocument.objects.filter(state='FullySigned', signatures__isnull=False)
+        .annotate(variable_count=Count('variables', distinct=True))
+        .order_by('-variable_count', 'pk')
+        .first()
+    )
+    assert document is not None, "seed_scale produced no fully-signed documents"
+    return document
+
+
+@pytest.fixture
+def signed_documents(seeded_dataset):
+    """Comma-separated ids of 20 fully-signed documents of the seed."""
+    ids = list(
+        DynamicDocument.objects.filter(state='FullySigned', signatures__isnull=False)
+        .distinct().order_by('pk').values_list('pk', flat=True)[:20]
+    )
+    assert len(ids) == 20, "seed_scale produced fewer than 20 fully-signed documents"
+    return ','.join(str(pk) for pk in ids)
+
+
+class TestDocumentEndpoints:
+    def test_list_dynamic_documents(self, client, measure):
+        url = reverse('list_dynamic_documents')
+        result = measure('list_dynamic_documents', lambda: client.get(url))
+        assert result['exceeded'] == []
+
+    @requires_weasyprint
+    def test_download_dynamic_document_pdf(self, client, measure, signed_document):
+        url = reverse('download_dynamic_document_pdf', kwargs={'pk': signed_document.pk})
+        result = measure('download_dynamic_document_pdf', lambda: client.get(url))
+        assert result['exceeded'] == []
+
+    def test_download_dynamic_document_word(self, client, measure, signed_document):
+        url = reverse('download_dynamic_document_word', kwargs={'pk': signed_document.pk})
+        result = measure('download_dynamic_document_word', lambda: client.get(url))
+        assert result['exceeded'] == []
+
+    @requires_weasyprint
+    def test_generate_signatures_pdf(self, client, measure, signed_document):
+        url = reverse('generate-signatures-pdf', kwargs={'pk': signed_document.pk})
+        result = measure('generate_signatures_pdf', lambda: client.get(url))
+        assert result['exceeded'] == []
+
+    def test_bulk_export_word(self, client, measure, signed_documents):
+        url = reverse('bulk-export-dynamic-documents')
+        params = {'file_type': 'word', 'ids': signed_documents}
+        result = measure('bulk_export_dynamic_documents[word]', lambda: client.get(url, params))
+        assert result['exceeded'] == []
+
+    @requires_weasyprint
+    def test_bulk_export_signed(self, client, measure, signed_documents):
+        url = reverse('bulk-export-dynamic-documents')
+        params = {'file_type': 'signed', 'ids': signed_documents}
+        result = measure('bulk_export_dynamic_documents[signed]', lambda: client.get(url, params))
+        assert result['exceeded'] == []
+
+
+class TestSecopEndpoints:
+    def test_secop_process_list(self, client, measure):
+        url = reverse('secop-process-list')
+        result = measure('secop_process_list', lambda: client.get(url, {'page_size': 50}))
+        assert result['exceeded'] == []
+
+    def test_secop_export_excel(self, client, measure):
+        url = reverse('secop-export-excel')
+        result = measure('secop_export_excel', lambda: client.get(url))
+        assert result['exceeded'] == []
+
+
+class TestNotificationEndpoints:
+    def test_notification_list(self, client, measure):
+        url = reverse('notification-list')
+        result = measure('notification_list', lambda: client.get(url))
+        assert result['exceeded'] == []
+
+
+class TestReportEndpoints:
+    @pytest.mark.parametrize('report_type', ['active_processes', 'documents_by_state'])
+    def test_generate_excel_report(self, client, measure, report_type):
+        url = reverse('generate-excel-report')
+        result = measure(
+            f'generate_excel_report[{report_type}]',
+            lambda: client.post(url, {'reportType': report_type}, format='json'),
+        )
+        assert result['exceeded'] == []
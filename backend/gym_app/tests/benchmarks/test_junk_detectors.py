@@ -0,0 +1,69 @@
+"""Junk-detector throughput over the frontend E2E tree.
+
+Runs ``analyze_e2e_source`` over every spec under ``frontend/e2e`` (repeated
+``BENCHMARK_JUNK_COPIES`` times, default 3, to emulate a larger tree) twice:
+
+- isolated: scan caches cleared before each spec, so every spec re-reads and
+  re-masks the helper modules it imports;
+- shared: one run-wide pass, as the quality gate does.
+
+The findings of both runs must be identical. Run with
+``pytest -m benchmark gym_app/tests/benchmarks``.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SCRIPTS_DIR = REPO_ROOT / 'scripts'
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from quality.junk_detectors import analyze_e2e_source, clear_scan_caches  # noqa: E402
+
+pytestmark = pytest.mark.benchmark
+
+
+def _specs():
+    root = REPO_ROOT / 'frontend' / 'e2e'
+    paths = sorted(path for path in root.rglob('*.spec.*') if path.suffix in ('.js', '.ts'))
+    return [(path, path.read_text(encoding='utf-8', errors='replace')) for path in paths]
+
+
+def _analyze(specs, copies, isolated):
+    findings = []
+    clear_scan_caches()
+    started = time.perf_counter()
+    for copy in range(copies):
+        for path, source in specs:
+            if isolated:
+                clear_scan_caches()
+            rel = path.relative_to(REPO_ROOT).as_posix()
+            # A trailing comment makes each copy a distinct text to scan
+            copy_source = f'{source}\n// copy {copy}\n'
+            findings.append([vars(finding) for finding in analyze_e2e_source(copy_source, rel, path)])
+    return findings, round(time.perf_counter() - started, 3)
+
+
+def test_shared_scanning_pass_over_e2e_tree(benchmark_results):
+    """The run-wide scanning pass is faster and reports exactly the same findings."""
+    specs = _specs()
+    if not specs:
+        pytest.skip('No E2E specs under frontend/e2e')
+    copies = int(os.environ.get('BENCHMARK_JUNK_COPIES', '3'))
+
+    isolated, isolated_seconds = _analyze(specs, copies, isolated=True)
+    shared, shared_seconds = _analyze(specs, copies, isolated=False)
+    assert shared == isolated
+
+    benchmark_results['junk_detectors[e2e_tree]'] = {
+        'specs': len(specs) * copies,
+        'findings': sum(len(found) for found in shared),
+        'isolated_seconds': isolated_seconds,
+        'shared_seconds': shared_seconds,
+        'speedup': round(isolated_seconds / shared_seconds, 1) if shared_seconds else None,
+    }
+    assert shared_seconds < isolated_seconds
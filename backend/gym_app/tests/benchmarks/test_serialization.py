@@ -0,0 +1,86 @@
+"""JSON encoding and response compression on representative API payloads.
+
+Compares DRF's stdlib ``JSONRenderer`` with ``ORJSONRenderer`` and gzip with
+Brotli on the bodies of the largest list endpoints (documents with embedded
+HTML, SECOP listings with long descriptions). Results are written with the
+endpoint measurements; run with ``pytest -m benchmark gym_app/tests/benchmarks``.
+"""
+import gzip
+import os
+import statistics
+import time
+
+import brotli
+import pytest
+from django.conf import settings
+from django.urls import reverse
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from gym_app.renderers import ORJSONRenderer
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+PAYLOADS = {
+    'list_dynamic_documents': ('list_dynamic_documents', {}),
+    'secop_process_list': ('secop-process-list', {'page_size': 100}),
+}
+
+
+def _median_seconds(call):
+    rounds = int(os.environ.get('BENCHMARK_ROUNDS', '5'))
+    call()
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings), 5)
+
+
+@pytest.fixture
+def payload(request, api_client, benchmark_lawyer):
+    url_name, params = PAYLOADS[request.param]
+    api_client.force_authenticate(user=benchmark_lawyer)
+    response = api_client.get(reverse(url_name), params)
+    assert response.status_code == 200
+    return request.param, response.data
+
+
+@pytest.mark.parametrize('payload', list(PAYLOADS), indirect=True)
+def test_json_rendering(payload, benchmark_results):
+    name, data = payload
+    stdlib_body = JSONRenderer().render(data)
+    orjson_body = ORJSONRenderer().render(data)
+    assert orjson_body == stdlib_body
+
+    stdlib = _median_seconds(lambda: JSONRenderer().render(data))
+    fast = _median_seconds(lambda: ORJSONRenderer().render(data))
+    benchmark_results[f'render_json[{name}]'] = {
+        'bytes': len(stdlib_body),
+        'stdlib_seconds': stdlib,
+        'orjson_seconds': fast,
+        'speedup': round(stdlib / fast, 1) if fast else None,
+    }
+    assert fast < stdlib
+
+
+@pytest.mark.parametrize('payload', list(PAYLOADS), indirect=True)
+def test_response_compression(payload, benchmark_results):
+    name, data = payload
+    body = ORJSONRenderer().render(data)
+    quality = settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+
+    gzipped = compress_string(body, max_random_bytes=100)
+    brotlied = brotli.compress(body, quality=quality)
+    assert gzip.decompress(gzipped) == brotli.decompress(brotlied) == body
+
+    benchmark_results[f'compress[{name}]'] = {
+        'bytes': len(body),
+        'gzip_bytes': len(gzipped),
+        'gzip_seconds': _median_seconds(lambda: compress_string(body, max_random_bytes=100)),
+        'brotli_bytes': len(brotlied),
+        'brotli_seconds': _median_seconds(lambda: brotli.compress(body, quality=quality)),
+        'brotli_quality': quality,
+    }
+    assert len(brotlied) < len(gzipped) < len(body)
@@ -0,0 +1,31 @@
+"""Tests for the benchmark_db_concurrency SQLite profile comparison."""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from gym_app.management.commands.benchmark_db_concurrency import run_profile
+
+
+class TestBenchmarkDbConcurrency:
+    def test_reports_every_profile(self):
+        out = StringIO()
+        call_command(
+            "benchmark_db_concurrency", "--readers", "2", "--seconds", "0.3", stdout=out,
+        )
+
+        lines = out.getvalue().splitlines()
+        assert lines[0] == "2 readers + 1 writer, 0.3s per profile"
+        assert [line.split()[0] for line in lines[2:]] == ["default", "wal"]
+
+    def test_wal_readers_and_writer_make_progress_without_lock_errors(self, tmp_path):
+        result = run_profile(str(tmp_path / "bench.sqlite3"), "wal", readers=2, seconds=0.3)
+
+        assert result["reads_per_second"] > 0
+        assert result["writes_per_second"] > 0
+        assert result["lock_errors"] == 0
+
+    def test_unknown_profile_is_rejected(self):
+        with pytest.raises(CommandError, match="Unknown profile"):
+            call_command("benchmark_db_concurrency", "--profiles", "turbo", stdout=StringIO())
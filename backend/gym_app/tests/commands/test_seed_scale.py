@@ -0,0 +1,84 @@
+"""Tests for the seed_scale bulk synthetic-data generator."""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from gym_app.models import (
+    DocumentVariable,
+    DynamicDocument,
+    Process,
+    SECOPProcess,
+    Stage,
+    User,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+SCALE = "0.002"
+
+
+def _snapshot():
+    return (
+        list(DynamicDocument.objects.order_by("title").values_list("title", "state", "created_by__email")),
+        DocumentVariable.objects.count(),
+        list(SECOPProcess.objects.order_by("process_id").values_list("process_id", "base_price")),
+    )
+
+
+class TestSeedScale:
+    """Volumes, determinism and purge."""
+
+    def test_scaled_volumes_are_created(self):
+        """Row counts follow the scale factor and documents carry their variables."""
+        out = StringIO()
+        call_command("seed_scale", "--scale", SCALE, stdout=out)
+
+        assert DynamicDocument.objects.count() == 160
+        assert Process.objects.filter(ref__startswith="SEED-").count() == 16
+        assert SECOPProcess.objects.filter(process_id__startswith="SEED.").count() == 120
+        assert Stage.objects.filter(process__ref__startswith="SEED-").exists()
+        assert not DocumentVariable.objects.filter(document__isnull=True).exists()
+        document = DynamicDocument.objects.prefetch_related("variables").first()
+        for variable in document.variables.all():
+            assert "{{%s}}" % variable.name_en in document.content
+        assert "Seeded" in out.getvalue()
+
+    def test_variable_values_fit_their_field_type(self):
+        """Filled values pass the model's own validation (numbers, dates, emails, options)."""
+        call_command("seed_scale", "--scale", SCALE, stdout=StringIO())
+        filled = DocumentVariable.objects.exclude(value=None)
+
+        for variable in filled:
+            variable.clean()
+        selects = filled.filter(field_type="select")
+        assert {variable.value for variable in selects} <= {"A", "B", "C"}
+        assert set(filled.values_list("field_type", flat=True)) >= {"number", "date", "email"}
+
+    def test_same_seed_produces_same_dataset(self):
+        """Purging and re-seeding with the same seed reproduces the data."""
+        call_command("seed_scale", "--scale", SCALE, "--seed", "7", stdout=StringIO())
+        first = _snapshot()
+        call_command("seed_scale", "--purge", stdout=StringIO())
+        call_command("seed_scale", "--scale", SCALE, "--seed", "7", stdout=StringIO())
+
+        assert _snapshot() == first
+
+    def test_purge_only_removes_seeded_rows(self):
+        """Non-seed users survive a purge."""
+        keeper = User.objects.create_user(email="real@example.com", password="x")
+        call_command("seed_scale", "--scale", SCALE, stdout=StringIO())
+
+        call_command("seed_scale", "--purge", stdout=StringIO())
+
+        assert list(User.objects.values_list("pk", flat=True)) == [keeper.pk]
+        assert DynamicDocument.objects.count() == 0
+        assert Stage.objects.count() == 0
+        assert SECOPProcess.objects.count() == 0
+
+    def test_refuses_to_seed_twice(self):
+        call_command("seed_scale", "--scale", SCALE, stdout=StringIO())
+
+        with pytest.raises(CommandError):
+            call_command("seed_scale", "--scale", SCALE, stdout=StringIO())
@@ -31,10 +31,12 @@ def reset_throttle_cache():
     independent. Specific tests that need to verify throttling can re-enable it
     locally and call this fixture to reset.
     """
-    from django.core.cache import cache
-    cache.clear()
+    from django.core.cache import caches
+    for backend in caches.all():
+        backend.clear()
     yield
-    cache.clear()
+    for backend in caches.all():
+        backend.clear()
 
 
 @pytest.fixture
@@ -8,53 +8,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from django.core.exceptions import ValidationError
-from freezegun import freeze_time
 
-from gym_app.models.user import ActivityFeed, User
-
-
-# ---------------------------------------------------------------------------
-# user.py — ActivityFeed.save: oldest_activity is None after filter (line 235)
-# ---------------------------------------------------------------------------
-@pytest.mark.django_db
-class TestActivityFeedSaveBranch:
-    """Test ActivityFeed.save branch when activity count is at or over limit."""
-
-    def test_save_does_not_fail_when_under_limit(self):
-        """No deletion when user has fewer than 20 activity entries."""
-        user = User.objects.create_user(
-            email="feed_under@example.com", password="pw", role="client"
-        )
-        ActivityFeed.objects.create(
-            user=user,
-            action_type="create",
-            description="Test",
-        )
-
-        assert ActivityFeed.objects.filter(user=user).count() == 1
-
-    @freeze_time("2026-01-15 12:00:00")
-    def test_save_deletes_oldest_when_over_limit(self):
-        """Delete oldest entry when count exceeds 20."""
-        user = User.objects.create_user(
-            email="feed_over@example.com", password="pw", role="client"
-        )
-        for i in range(20):
-            ActivityFeed.objects.create(
-                user=user,
-                action_type="create",
-                description=f"Entry {i}",
-            )
-
-        assert ActivityFeed.objects.filter(user=user).count() == 20
-
-        ActivityFeed.objects.create(
-            user=user,
-            action_type="create",
-            description="Entry 21 triggers trim",
-        )
-
-        assert ActivityFeed.objects.filter(user=user).count() == 20
+from gym_app.models.user import User
 
 
 # ---------------------------------------------------------------------------
@@ -4,7 +4,8 @@ from datetime import date
 import pytest
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 
 from gym_app.models.user import ActivityFeed, User, UserSignature
 
@@ -383,29 +384,15 @@ class TestActivityFeed:
         assert user.email in result
         assert 'create' in result
 
-    def test_activity_feed_keeps_maximum_20_entries_per_user(self):
-        """Test that only the 20 most recent activities per user are kept."""
+    def test_activity_feed_insert_does_not_trim(self):
+        """Inserts never delete; the rolling window is enforced by prune_activity_feed."""
         user = User.objects.create_user(
             email='activity-limit@example.com',
             password='testpassword'
         )
 
-        # Create 21 activities to trigger the pruning logic
-        for i in range(21):
-            ActivityFeed.objects.create(
-                user=user,
-                action_type='create',
-                description=f'Action {i}'
-            )
-
-        activities = ActivityFeed.objects.filter(user=user).order_by('-created_at')
-
-        # Only 20 activities should remain for this user
-        assert activities.count() == 20
-
-        descriptions = list(activities.values_list('description', flat=True))
+        with CaptureQueriesContext(connection) as queries:
+            ActivityFeed.objects.create(user=user, action_type='create', description='Action')
 
-        # Oldest activity (Action 0) should have been deleted
-        assert 'Action 0' not in descriptions
-        # Newest activity should be present
-        assert 'Action 20' in descriptions
+        assert len(queries) == 1
+        assert ActivityFeed.objects.filter(user=user).count() == 1
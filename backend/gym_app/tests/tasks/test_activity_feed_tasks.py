@@ -0,0 +1,55 @@
+"""Tests for the activity feed pruning Huey task."""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from freezegun import freeze_time
+
+from gym_app.activity_feed_tasks import prune_activity_feed, prune_activity_feed_window
+from gym_app.models import ActivityFeed
+
+
+def _add(user, count, prefix='Entry'):
+    for i in range(count):
+        ActivityFeed.objects.create(user=user, action_type='create', description=f'{prefix} {i}')
+
+
+@pytest.mark.django_db
+def test_keeps_only_newest_entries_per_user(client_user, lawyer_user, settings):
+    """Users over the cap keep their newest entries; others are untouched."""
+    settings.ACTIVITY_FEED_MAX_PER_USER = 5
+    _add(client_user, 8)
+    _add(lawyer_user, 3)
+
+    deleted = prune_activity_feed.call_local()
+
+    assert deleted == 3
+    kept = list(ActivityFeed.objects.filter(user=client_user).values_list('description', flat=True))
+    assert sorted(kept) == [f'Entry {i}' for i in range(3, 8)]
+    assert ActivityFeed.objects.filter(user=lawyer_user).count() == 3
+
+
+@freeze_time('2026-01-15 12:00:00')
+@pytest.mark.django_db
+def test_identical_timestamps_are_resolved_by_id(client_user):
+    """Entries created in the same instant are trimmed oldest-id first."""
+    _add(client_user, 6)
+
+    prune_activity_feed_window(max_per_user=4, retention_days=365)
+
+    kept = sorted(ActivityFeed.objects.filter(user=client_user).values_list('description', flat=True))
+    assert kept == ['Entry 2', 'Entry 3', 'Entry 4', 'Entry 5']
+
+
+@pytest.mark.django_db
+def test_entries_past_retention_are_deleted(client_user):
+    """Entries older than the retention window are removed regardless of the cap."""
+    _add(client_user, 2)
+    old = ActivityFeed.objects.create(user=client_user, action_type='edit', description='Old')
+    ActivityFeed.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=40))
+
+    deleted = prune_activity_feed_window(max_per_user=100, retention_days=30)
+
+    assert deleted == 1
+    assert not ActivityFeed.objects.filter(pk=old.pk).exists()
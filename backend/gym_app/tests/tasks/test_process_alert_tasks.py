@@ -1,13 +1,20 @@
-"""Tests for the daily process-alert reminder task."""
+"""Tests for the process-alert reminder task."""
 from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
 from django.utils import timezone
 from gym_app.models import Case, Notification, Process, Stage, StageAlert, User
 from gym_app.process_alert_tasks import send_process_alerts
 
 
+@pytest.fixture(autouse=True)
+def send_hour_midnight(settings):
+    """Make reminders due from 00:00 UTC so results do not depend on the time of day."""
+    settings.PROCESS_ALERT_SEND_HOUR_UTC = 0
+
+
 @pytest.fixture
 def case_type():
     """Case type."""
@@ -74,7 +81,7 @@ def _add_stage(process, status_label='Audiencia', days_from_today=3):
     return stage
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 class TestProcessAlertTaskReminders:
     """Triggering of 3-day and 1-day reminders."""
 
@@ -145,7 +152,7 @@ class TestProcessAlertTaskReminders:
         assert mock_email.called is False
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 class TestProcessAlertTaskSkips:
     """Cases where the task must NOT send a reminder."""
 
@@ -221,7 +228,7 @@ class TestProcessAlertTaskSkips:
         assert mock_email.called is False
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 class TestProcessAlertRecipients:
     """Recipient configuration via notify_clients."""
 
@@ -283,7 +290,7 @@ class TestProcessAlertRecipients:
 from gym_app.process_alert_tasks import deactivate_past_alerts
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 class TestDeactivatePastAlerts:
     """Daily cleanup of alerts whose stage date already lapsed."""
 
@@ -316,7 +323,7 @@ class TestDeactivatePastAlerts:
         assert result == "deactivated=0"
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 class TestSendProcessAlertsGuards:
     """Early-continue guards and email failure logging."""
 
@@ -368,3 +375,125 @@ class TestSendProcessAlertsGuards:
             send_process_alerts.call_local()
 
         assert mock_logger.error.call_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestProcessAlertScheduling:
+    """Due-time index, catch-up and expiry."""
+
+    def test_alert_is_planned_for_first_pending_reminder(
+        self, lawyer, process_client, case_type
+    ):
+        """The due time is the 3-day reminder, then the 1-day one, then expiry."""
+        process = _make_process(lawyer, [process_client], case_type)
+        stage = _add_stage(process, days_from_today=10)
+        alert = StageAlert.objects.create(stage=stage)
+
+        assert alert.next_fire_at.date() == stage.date - timedelta(days=3)
+
+        alert.notified_3_days = True
+        alert.save()
+        assert alert.next_fire_at.date() == stage.date - timedelta(days=1)
+
+        alert.notified_1_day = True
+        alert.save()
+        assert alert.next_fire_at.date() == stage.date + timedelta(days=1)
+
+    def test_editing_stage_date_replans_alert(
+        self, lawyer, process_client, case_type
+    ):
+        """Changing the stage date moves the alert's due time."""
+        process = _make_process(lawyer, [process_client], case_type)
+        stage = _add_stage(process, days_from_today=10)
+        alert = StageAlert.objects.create(stage=stage)
+
+        stage.date = stage.date + timedelta(days=5)
+        stage.save()
+
+        alert.refresh_from_db()
+        assert alert.next_fire_at.date() == stage.date - timedelta(days=3)
+
+    def test_alerts_not_yet_due_are_not_loaded(
+        self, lawyer, process_client, case_type, django_assert_max_num_queries
+    ):
+        """Only due alerts are touched, regardless of how many processes exist."""
+        for index in range(5):
+            process = _make_process(lawyer, [process_client], case_type, ref=f'FUT-{index}')
+            StageAlert.objects.create(stage=_add_stage(process, days_from_today=20))
+
+        with patch('gym_app.process_alert_tasks.send_template_email') as mock_email, \
+                django_assert_max_num_queries(1):
+            send_process_alerts.call_local()
+
+        assert mock_email.called is False
+
+    def test_missed_3_day_reminder_is_caught_up(
+        self, lawyer, process_client, case_type
+    ):
+        """A reminder whose due time lapsed while the worker was down still goes out."""
+        process = _make_process(lawyer, [process_client], case_type)
+        stage = _add_stage(process, days_from_today=2)
+        alert = StageAlert.objects.create(stage=stage)
+        # Planned yesterday for the 3-day reminder; the worker never ran it.
+        StageAlert.objects.filter(pk=alert.pk).update(
+            next_fire_at=timezone.now() - timedelta(days=1),
+        )
+
+        with patch(
+            'gym_app.process_alert_tasks.send_template_email'
+        ) as mock_email:
+            send_process_alerts.call_local()
+
+        alert.refresh_from_db()
+        assert alert.notified_3_days is True
+        assert mock_email.call_args.kwargs['subject'].startswith('Alerta de Proceso — 2 días')
+        assert alert.next_fire_at.date() == stage.date - timedelta(days=1)
+
+    def test_email_is_sent_after_the_alert_commits(
+        self, lawyer, process_client, case_type
+    ):
+        """SMTP runs outside the transaction holding the alert's row lock."""
+        process = _make_process(lawyer, [process_client], case_type)
+        StageAlert.objects.create(stage=_add_stage(process, days_from_today=3))
+        in_transaction = []
+
+        with patch(
+            'gym_app.process_alert_tasks.send_template_email',
+            side_effect=lambda **kwargs: in_transaction.append(connection.in_atomic_block),
+        ):
+            send_process_alerts.call_local()
+
+        assert in_transaction == [False]
+
+    def test_replaying_the_task_does_not_resend(
+        self, lawyer, process_client, case_type
+    ):
+        """Catch-up runs are idempotent."""
+        process = _make_process(lawyer, [process_client], case_type)
+        StageAlert.objects.create(stage=_add_stage(process, days_from_today=3))
+
+        with patch(
+            'gym_app.process_alert_tasks.send_template_email'
+        ) as mock_email:
+            send_process_alerts.call_local()
+            send_process_alerts.call_local()
+
+        assert mock_email.call_count == 1
+
+    def test_lapsed_alert_is_deactivated_when_due(
+        self, lawyer, process_client, case_type
+    ):
+        """Expiry is part of the schedule, no separate sweep needed."""
+        process = _make_process(lawyer, [process_client], case_type)
+        stage = _add_stage(process, days_from_today=-1)
+        alert = StageAlert.objects.create(stage=stage)
+
+        with patch(
+            'gym_app.process_alert_tasks.send_template_email'
+        ) as mock_email:
+            send_process_alerts.call_local()
+
+        alert.refresh_from_db()
+        assert alert.is_active is False
+        assert alert.next_fire_at is None
+        assert mock_email.called is False
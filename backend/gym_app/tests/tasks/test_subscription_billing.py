@@ -0,0 +1,240 @@
+"""Tests for the batched, concurrent billing run and Wompi webhook event processing.
+
+Billing is exercised end-to-end against a local Wompi stub: a threaded HTTP
+server that answers ``POST /transactions`` with a status chosen per payment
+source and records how many charges were in flight at once.
+"""
+import json
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from freezegun import freeze_time
+
+from gym_app.models import Subscription, WompiWebhookEvent
+from gym_app.tasks import (
+    apply_payment_status,
+    process_monthly_subscriptions,
+    process_wompi_webhook_event,
+)
+
+User = get_user_model()
+FIXED_TODAY = date(2026, 1, 15)
+
+
+class WompiStub:
+    """Threaded local stand-in for the Wompi transactions API."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.statuses = {}
+        self.charges = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.charges.append(body)
+                time.sleep(stub.delay)
+                with stub._lock:
+                    stub.in_flight -= 1
+                status = stub.statuses.get(body["payment_source_id"], "APPROVED")
+                payload = json.dumps({"data": {"id": f"trx-{body['reference']}", "status": status}})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(payload.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def wompi_stub(settings):
+    """Local Wompi stub wired into the Wompi settings."""
+    with WompiStub() as stub:
+        settings.WOMPI_API_URL = stub.url
+        settings.WOMPI_PRIVATE_KEY = "priv_test"
+        settings.WOMPI_INTEGRITY_KEY = "integrity_test"
+        yield stub
+
+
+def _subscriber(index):
+    return User.objects.create_user(
+        email=f"billing{index}@example.com",
+        password="testpassword",
+        role="client",
+    )
+
+
+def _due_subscription(index, amount="50000.00", **fields):
+    return Subscription.objects.create(
+        user=_subscriber(index),
+        plan_type="cliente",
+        status=fields.pop("status", "active"),
+        next_billing_date=fields.pop("next_billing_date", FIXED_TODAY),
+        amount=Decimal(amount),
+        payment_source_id=f"src-{index}",
+        **fields,
+    )
+
+
+@pytest.mark.django_db
+class TestBillingRunAgainstWompiStub:
+    """process_monthly_subscriptions charges due subscriptions in locked, concurrent batches."""
+
+    @freeze_time("2026-01-15", tick=True)
+    def test_charges_run_concurrently_up_to_the_limit(self, wompi_stub, settings):
+        settings.SUBSCRIPTION_BILLING_CONCURRENCY = 3
+        for index in range(6):
+            _due_subscription(index)
+
+        result = process_monthly_subscriptions.call_local()
+
+        assert "Processed 6 subscriptions" in result
+        assert len(wompi_stub.charges) == 6
+        assert 1 < wompi_stub.max_in_flight <= 3
+
+    @freeze_time("2026-01-15", tick=True)
+    def test_outcomes_are_applied_in_bulk(self, wompi_stub):
+        approved = _due_subscription(1)
+        declined = _due_subscription(2)
+        pending = _due_subscription(3)
+        free = _due_subscription(4, amount="0.00")
+        wompi_stub.statuses.update({"src-2": "DECLINED", "src-3": "PENDING"})
+
+        process_monthly_subscriptions.call_local()
+
+        for subscription in (approved, declined, pending, free):
+            subscription.refresh_from_db()
+        assert approved.next_billing_date == FIXED_TODAY + timedelta(days=30)
+        assert free.next_billing_date == FIXED_TODAY + timedelta(days=30)
+        assert declined.status == "expired"
+        assert declined.next_billing_date == FIXED_TODAY
+        assert User.objects.get(id=declined.user_id).role == "basic"
+        assert pending.status == "active"
+        assert pending.next_billing_date == FIXED_TODAY
+        assert User.objects.get(id=approved.user_id).role == "client"
+        # Free plans never reach Wompi
+        assert {c["payment_source_id"] for c in wompi_stub.charges} == {"src-1", "src-2", "src-3"}
+
+    @freeze_time("2026-01-15", tick=True)
+    def test_batches_cover_every_due_subscription(self, wompi_stub, settings):
+        settings.SUBSCRIPTION_BILLING_BATCH_SIZE = 2
+        subscriptions = [_due_subscription(index) for index in range(5)]
+        _due_subscription(9, next_billing_date=FIXED_TODAY + timedelta(days=1))
+
+        result = process_monthly_subscriptions.call_local()
+
+        assert "Processed 5 subscriptions" in result
+        charged = sorted(c["payment_source_id"] for c in wompi_stub.charges)
+        assert charged == sorted(s.payment_source_id for s in subscriptions)
+
+    @freeze_time("2026-01-15", tick=True)
+    def test_second_run_does_not_charge_again(self, wompi_stub):
+        _due_subscription(1)
+        _due_subscription(2)
+
+        process_monthly_subscriptions.call_local()
+        result = process_monthly_subscriptions.call_local()
+
+        assert "Processed 0 subscriptions" in result
+        assert len(wompi_stub.charges) == 2
+
+    @freeze_time("2026-01-15", tick=True)
+    def test_subscription_cancelled_before_its_batch_is_skipped(self, wompi_stub, settings):
+        settings.SUBSCRIPTION_BILLING_BATCH_SIZE = 1
+        first = _due_subscription(1)
+        second = _due_subscription(2)
+
+        def cancel_second(subscription, payment_status):
+            # Runs after the first batch was charged, before the second is locked
+            Subscription.objects.filter(id=second.id).update(status="cancelled")
+            return apply_payment_status(subscription, payment_status)
+
+        with mock.patch("gym_app.tasks.apply_payment_status", side_effect=cancel_second):
+            result = process_monthly_subscriptions.call_local()
+
+        assert [c["payment_source_id"] for c in wompi_stub.charges] == [first.payment_source_id]
+        assert "Processed 1 subscriptions" in result
+
+
+@pytest.mark.django_db
+class TestProcessWompiWebhookEvent:
+    """process_wompi_webhook_event applies each logged event at most once."""
+
+    @pytest.fixture
+    def subscription(self):
+        return _due_subscription(1, status="expired", next_billing_date=date(2099, 1, 1))
+
+    def _event(self, subscription, transaction_status="APPROVED", **fields):
+        return WompiWebhookEvent.objects.create(
+            transaction_id=fields.pop("transaction_id", "trx_1"),
+            transaction_status=transaction_status,
+            reference=fields.pop("reference", f"SUB-{subscription.id}-20260115000000"),
+            **fields,
+        )
+
+    def test_approved_event_activates_subscription(self, subscription):
+        event = self._event(subscription)
+
+        process_wompi_webhook_event.call_local(event.id)
+
+        event.refresh_from_db()
+        subscription.refresh_from_db()
+        assert event.status == "processed"
+        assert event.attempts == 1
+        assert event.processed_at is not None
+        assert subscription.status == "active"
+
+    def test_processed_event_is_not_applied_again(self, subscription):
+        event = self._event(subscription, status="processed")
+
+        result = process_wompi_webhook_event.call_local(event.id)
+
+        subscription.refresh_from_db()
+        assert "already processed" in result
+        assert subscription.status == "expired"
+
+    def test_non_subscription_reference_is_ignored(self, subscription):
+        event = self._event(subscription, reference="ORDER-1")
+
+        process_wompi_webhook_event.call_local(event.id)
+
+        event.refresh_from_db()
+        assert event.status == "ignored"
+
+    def test_failure_is_recorded_and_reraised(self, subscription):
+        event = self._event(subscription)
+
+        with mock.patch("gym_app.tasks.apply_wompi_transaction", side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError):
+                process_wompi_webhook_event.call_local(event.id)
+
+        event.refresh_from_db()
+        assert event.status == "failed"
+        assert event.error_message == "db down"
+        assert event.attempts == 1
@@ -331,7 +331,7 @@ class TestProcessMonthlySubscriptions:
     """Tests for Process Monthly Subscriptions."""
 
     @freeze_time("2026-01-15")
-    @mock.patch("gym_app.tasks.process_subscription_payment")
+    @mock.patch("gym_app.tasks.charge_subscription", return_value="APPROVED")
     def test_process_monthly_subscriptions_filters_due_and_calls_processor(
         self, mock_processor, subscription_user
     ):
@@ -371,7 +371,7 @@ class TestProcessMonthlySubscriptions:
         assert "Processed 2 subscriptions" in result
 
     @freeze_time("2026-01-15")
-    @mock.patch("gym_app.tasks.process_subscription_payment")
+    @mock.patch("gym_app.tasks.charge_subscription")
     def test_process_monthly_subscriptions_continues_on_exception(
         self, mock_processor, subscription_user
     ):
@@ -394,7 +394,12 @@ class TestProcessMonthlySubscriptions:
             amount=Decimal("50000.00"),
         )
 
-        mock_processor.side_effect = [Exception("boom"), None]
+        def charge(subscription):
+            if subscription.id == due1.id:
+                raise Exception("boom")
+            return "APPROVED"
+
+        mock_processor.side_effect = charge
 
         result = process_monthly_subscriptions.call_local()
 
@@ -402,9 +407,13 @@ class TestProcessMonthlySubscriptions:
         processed_ids = {call.args[0].id for call in mock_processor.call_args_list}
         assert processed_ids == {due1.id, due2.id}
         assert "Processed 2 subscriptions" in result
+        due1.refresh_from_db()
+        due2.refresh_from_db()
+        assert due1.next_billing_date == today - timedelta(days=1)
+        assert due2.next_billing_date == today + timedelta(days=30)
 
     @freeze_time("2026-01-15")
-    @mock.patch("gym_app.tasks.process_subscription_payment")
+    @mock.patch("gym_app.tasks.charge_subscription")
     def test_ignores_cancelled_subscriptions(
         self, mock_processor, subscription_user
     ):
@@ -423,7 +432,7 @@ class TestProcessMonthlySubscriptions:
         assert "Processed 0 subscriptions" in result
 
     @freeze_time("2026-01-15")
-    @mock.patch("gym_app.tasks.process_subscription_payment")
+    @mock.patch("gym_app.tasks.charge_subscription")
     def test_ignores_expired_subscriptions(
         self, mock_processor, subscription_user
     ):
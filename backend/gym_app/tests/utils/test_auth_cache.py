@@ -0,0 +1,98 @@
+"""Tests for cached JWT user resolution (gym_app.utils.auth_cache, gym_app.authentication)."""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from gym_app.authentication import CachedJWTAuthentication
+from gym_app.models import User
+from gym_app.utils import auth_cache
+
+pytestmark = pytest.mark.django_db
+
+
+def _user_queries(queries):
+    return [q for q in queries if 'FROM "gym_app_user"' in q["sql"]]
+
+
+@pytest.fixture
+def access_token(client_user):
+    return str(RefreshToken.for_user(client_user).access_token)
+
+
+def _authenticate(token):
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    user, _token = CachedJWTAuthentication().authenticate(request)
+    return user
+
+
+class TestCachedJWTAuthentication:
+    def test_repeated_requests_load_the_user_once(self, api_client, access_token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+        with CaptureQueriesContext(connection) as first:
+            assert api_client.get(reverse("validate_token")).status_code == 200
+        with CaptureQueriesContext(connection) as second:
+            assert api_client.get(reverse("validate_token")).status_code == 200
+
+        assert len(_user_queries(first.captured_queries)) == 1
+        assert _user_queries(second.captured_queries) == []
+
+    def test_role_change_is_seen_on_next_request(self, client_user, access_token):
+        assert _authenticate(access_token).role == "client"
+
+        client_user.role = "lawyer"
+        client_user.save()
+
+        assert _authenticate(access_token).role == "lawyer"
+
+    def test_deactivated_user_is_rejected(self, client_user, access_token):
+        _authenticate(access_token)
+
+        client_user.is_active = False
+        client_user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            _authenticate(access_token)
+
+    def test_blacklisting_a_refresh_token_invalidates(self, client_user, access_token):
+        _authenticate(access_token)
+        User.objects.filter(pk=client_user.pk).update(first_name="Renamed")
+        refresh = RefreshToken.for_user(client_user)
+
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=refresh["jti"]))
+
+        assert _authenticate(access_token).first_name == "Renamed"
+
+    def test_queryset_update_needs_explicit_invalidation(self, client_user, access_token):
+        _authenticate(access_token)
+        User.objects.filter(pk=client_user.pk).update(role="basic")
+
+        assert _authenticate(access_token).role == "client"
+        auth_cache.invalidate(client_user.pk)
+        assert _authenticate(access_token).role == "basic"
+
+    def test_zero_ttl_disables_the_cache(self, api_client, access_token, settings):
+        settings.USER_AUTH_CACHE_TTL = 0
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        api_client.get(reverse("validate_token"))
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(reverse("validate_token"))
+
+        assert len(_user_queries(queries.captured_queries)) == 1
+
+
+class TestInvalidateRace:
+    def test_load_racing_an_invalidation_does_not_cache_stale_data(self, client_user):
+        def stale_load():
+            # The row changes (and is invalidated) while this load is in flight
+            auth_cache.invalidate(client_user.pk)
+            return "stale"
+
+        assert auth_cache.get_or_load(client_user.pk, stale_load) == "stale"
+        assert auth_cache.get_or_load(client_user.pk, lambda: "fresh") == "fresh"
@@ -0,0 +1,177 @@
+"""Tests for gym_app.storage (content-addressed, deduplicating media storage)."""
+import os
+import tarfile
+import threading
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from gym_app import storage as storage_module
+from gym_app.storage import ContentAddressedStorage, collect_garbage, deduplicate_existing
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return ContentAddressedStorage(location=str(tmp_path), base_url="/media/")
+
+
+class TestContentAddressedStorage:
+    """Saving, sharing and releasing blobs."""
+
+    def test_identical_contents_share_one_blob(self, storage):
+        """Two names with the same bytes point to the same inode."""
+        first = storage.save("letterheads/a.png", ContentFile(b"same-bytes"))
+        second = storage.save("snapshots/b.png", ContentFile(b"same-bytes"))
+
+        first_stat = os.stat(storage.path(first))
+        second_stat = os.stat(storage.path(second))
+        assert first_stat.st_ino == second_stat.st_ino
+        # Two names + the blob itself.
+        assert first_stat.st_nlink == 3
+        with storage.open(second) as handle:
+            assert handle.read() == b"same-bytes"
+
+    def test_distinct_contents_get_distinct_blobs(self, storage):
+        """Different bytes are stored separately."""
+        first = storage.save("a.pdf", ContentFile(b"one"))
+        second = storage.save("b.pdf", ContentFile(b"two"))
+
+        assert os.stat(storage.path(first)).st_ino != os.stat(storage.path(second)).st_ino
+
+    def test_name_collisions_still_get_unique_names(self, storage):
+        """Saving the same name twice keeps both files."""
+        first = storage.save("case_files/acta.pdf", ContentFile(b"x"))
+        second = storage.save("case_files/acta.pdf", ContentFile(b"x"))
+
+        assert first != second
+        assert storage.exists(first) and storage.exists(second)
+
+    def test_blob_dir_is_hidden_from_listdir(self, storage):
+        """Backups that walk the storage API don't archive the blob store."""
+        storage.save("docs/a.pdf", ContentFile(b"x"))
+
+        directories, _files = storage.listdir("")
+
+        assert directories == ["docs"]
+
+    def test_adopt_file_moves_existing_file_into_storage(self, storage, tmp_path):
+        """Assembled uploads are linked without being copied again."""
+        source = tmp_path / "upload.part"
+        source.write_bytes(b"scan")
+        existing = storage.save("legal_request_files/old.pdf", ContentFile(b"scan"))
+
+        name = storage.adopt_file(str(source), "legal_request_files/new.pdf")
+
+        assert not source.exists()
+        assert os.stat(storage.path(name)).st_ino == os.stat(storage.path(existing)).st_ino
+
+
+class TestGarbageCollection:
+    """Reference counting via link counts."""
+
+    def test_blob_survives_until_last_reference_is_deleted(self, storage):
+        """Deleting one name keeps the shared blob alive."""
+        first = storage.save("a.png", ContentFile(b"logo"))
+        second = storage.save("b.png", ContentFile(b"logo"))
+
+        storage.delete(first)
+        assert collect_garbage(storage) == (0, 0)
+        assert storage.exists(second)
+
+        storage.delete(second)
+        assert collect_garbage(storage) == (1, len(b"logo"))
+        assert not any(files for _root, _dirs, files in os.walk(storage.blob_root))
+
+    def test_dry_run_keeps_blobs(self, storage):
+        """Dry-run only reports."""
+        storage.delete(storage.save("a.png", ContentFile(b"logo")))
+
+        assert collect_garbage(storage, dry_run=True) == (1, len(b"logo"))
+        assert collect_garbage(storage) == (1, len(b"logo"))
+
+
+    def test_collection_waits_for_a_save_to_link_its_fresh_blob(self, storage, monkeypatch):
+        """A blob promoted but not linked yet is not collected under the saving request."""
+        collections = []
+        real_link = os.link
+
+        def link_after_concurrent_gc(source, target):
+            # The blob exists with st_nlink == 1 here; run GC concurrently.
+            worker = threading.Thread(target=lambda: collections.append(collect_garbage(storage)))
+            worker.start()
+            worker.join(timeout=0.5)
+            collections.append(worker)
+            return real_link(source, target)
+
+        monkeypatch.setattr(storage_module.os, 'link', link_after_concurrent_gc)
+        name = storage.save("a.png", ContentFile(b"logo"))
+        monkeypatch.setattr(storage_module.os, 'link', real_link)
+        worker = collections.pop(0)
+        worker.join(timeout=5)
+
+        assert worker.is_alive() is False
+        assert collections == [(0, 0)]
+        assert storage.open(name).read() == b"logo"
+
+
+class TestDeduplicateExisting:
+    """Backfill of media written before deduplication was enabled."""
+
+    def test_legacy_duplicates_are_folded(self, storage, tmp_path):
+        """Plain copies become links to a single blob."""
+        (tmp_path / "legacy").mkdir()
+        (tmp_path / "legacy" / "a.pdf").write_bytes(b"dup")
+        (tmp_path / "legacy" / "b.pdf").write_bytes(b"dup")
+        (tmp_path / "upload_sessions").mkdir()
+        (tmp_path / "upload_sessions" / "x.part").write_bytes(b"dup")
+
+        processed, reclaimed = deduplicate_existing(storage)
+
+        assert processed == 2
+        assert reclaimed == len(b"dup")
+        a_stat = os.stat(tmp_path / "legacy" / "a.pdf")
+        assert a_stat.st_ino == os.stat(tmp_path / "legacy" / "b.pdf").st_ino
+        assert os.stat(tmp_path / "upload_sessions" / "x.part").st_nlink == 1
+
+
+@pytest.mark.django_db
+class TestGcMediaBlobsCommand:
+    """The gc_media_blobs management command."""
+
+    def test_command_collects_unreferenced_blobs(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        from django.core.files.storage import default_storage
+
+        default_storage.delete(default_storage.save("a.pdf", ContentFile(b"bye")))
+        out = StringIO()
+
+        call_command("gc_media_blobs", stdout=out)
+
+        assert "Removed 1 unreferenced blobs" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestMediaBackupCommand:
+    """The hard-link-aware mediabackup override."""
+
+    def test_shared_contents_are_archived_once(self, settings, tmp_path):
+        """Names sharing a blob become tar hard links to the first archived name."""
+        settings.MEDIA_ROOT = str(tmp_path / "media")
+        from django.core.files.storage import default_storage
+
+        first = default_storage.save("a/scan.pdf", ContentFile(b"same scan"))
+        second = default_storage.save("b/scan.pdf", ContentFile(b"same scan"))
+        default_storage.save("c/other.pdf", ContentFile(b"other"))
+        backup = tmp_path / "media.tar"
+
+        call_command("mediabackup", output_path=str(backup), verbosity=0)
+
+        with tarfile.open(backup) as archive:
+            members = {member.name: member for member in archive.getmembers()}
+            archive.extractall(tmp_path / "restore", filter="tar")
+        assert sorted(members) == sorted([first, second, "c/other.pdf"])
+        linked = [member for member in members.values() if member.islnk()]
+        assert [(m.linkname, m.name) for m in linked] in ([(first, second)], [(second, first)])
+        assert (tmp_path / "restore" / second).read_bytes() == b"same scan"
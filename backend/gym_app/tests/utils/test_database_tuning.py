@@ -0,0 +1,54 @@
+"""Tests for the database connection tuning (gym_project.database)."""
+import sqlite3
+
+import pytest
+
+from gym_project.database import (
+    SQLITE_ENGINE,
+    database_settings,
+    sqlite_init_command,
+    sqlite_pragmas,
+)
+
+
+class TestDatabaseSettings:
+    def test_server_engine_gets_persistent_connections_only(self):
+        database = database_settings(
+            'django.db.backends.mysql', 'gym', 'user', 'secret', 'db', '3306',
+            conn_max_age=120, health_checks=True,
+        )
+
+        assert database['CONN_MAX_AGE'] == 120
+        assert database['CONN_HEALTH_CHECKS'] is True
+        assert 'OPTIONS' not in database
+
+    def test_sqlite_wal_profile_sets_init_command(self):
+        database = database_settings(SQLITE_ENGINE, 'db.sqlite3', sqlite_profile='wal')
+
+        assert database['OPTIONS']['init_command'] == sqlite_init_command('wal')
+        assert database['OPTIONS']['transaction_mode'] == 'IMMEDIATE'
+
+    def test_sqlite_default_profile_keeps_stock_options(self):
+        database = database_settings(SQLITE_ENGINE, 'db.sqlite3', sqlite_profile='default')
+
+        assert 'OPTIONS' not in database
+        assert database['CONN_MAX_AGE'] == 60
+
+    def test_unknown_profile_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown SQLite profile 'turbo'"):
+            database_settings(SQLITE_ENGINE, 'db.sqlite3', sqlite_profile='turbo')
+
+
+class TestSqlitePragmas:
+    def test_wal_profile_applies_to_a_file_database(self, tmp_path):
+        connection = sqlite3.connect(tmp_path / 'tuned.sqlite3')
+        try:
+            for pragma in sqlite_pragmas('wal'):
+                connection.execute(pragma)
+
+            assert connection.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            assert connection.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+            assert connection.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+            assert connection.execute('PRAGMA cache_size').fetchone()[0] == -65536
+        finally:
+            connection.close()
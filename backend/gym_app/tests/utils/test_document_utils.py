@@ -2,17 +2,57 @@
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from gym_app.utils.documents import (
     _copy_field_to_snapshot,
+    apply_content_patch,
     build_letterhead_layer_html,
     ensure_letterhead_snapshot,
     get_letterhead_for_document,
     get_letterhead_word_template,
     normalize_fragmented_variables,
+    prepare_export_soup,
     sanitize_html_for_pdf,
     sanitize_soup_for_pdf,
 )
 
+# ── apply_content_patch ───────────────────────────────────────────────────────
+
+
+class TestApplyContentPatch:
+    """Tests for server-side application of autosave content deltas."""
+
+    def test_offsets_refer_to_base_content(self):
+        """Multiple operations use offsets from the unpatched content."""
+        result = apply_content_patch("abcdef", [
+            {"start": 0, "end": 1, "text": "XY"},
+            {"start": 4, "end": 6, "text": ""},
+        ])
+        assert result == "XYbcd"
+
+    def test_insertions_at_same_offset_keep_order(self):
+        """Pure insertions at the same offset are applied in submitted order."""
+        result = apply_content_patch("ab", [
+            {"start": 1, "end": 1, "text": "1"},
+            {"start": 1, "end": 1, "text": "2"},
+        ])
+        assert result == "a12b"
+
+    def test_rejects_overlapping_operations(self):
+        """Overlapping ranges are ambiguous and rejected."""
+        with pytest.raises(ValueError):
+            apply_content_patch("abcdef", [
+                {"start": 0, "end": 3, "text": ""},
+                {"start": 2, "end": 4, "text": ""},
+            ])
+
+    def test_rejects_out_of_range_operation(self):
+        """Offsets past the end of the base content are rejected."""
+        with pytest.raises(ValueError):
+            apply_content_patch("abc", [{"start": 2, "end": 9, "text": ""}])
+
+
 # ── normalize_fragmented_variables ────────────────────────────────────────────
 
 
@@ -432,6 +472,39 @@ class TestSanitizeHtmlForPdf:
         assert 'color:blue' in result
 
 
+# ── prepare_export_soup ───────────────────────────────────────────────────────
+
+
+def _export_document(content, **values):
+    variables = [
+        SimpleNamespace(name_en=name, value=value, get_formatted_value=lambda value=value: value)
+        for name, value in values.items()
+    ]
+    return SimpleNamespace(content=content, variables=SimpleNamespace(all=lambda: variables))
+
+
+class TestPrepareExportSoup:
+    """Tests for the content-preparation stage shared by the PDF and Word exports."""
+
+    def test_substitutes_fragmented_and_spaced_markers(self):
+        """Fragmented and whitespace-padded markers are both replaced."""
+        document = _export_document(
+            "<p><span>{{</span>nombre<span>}}</span> - {{ fecha }}</p>",
+            nombre="Ana", fecha="2026-01-01",
+        )
+        assert prepare_export_soup(document).get_text() == "Ana - 2026-01-01"
+
+    def test_values_are_inserted_literally(self):
+        """Backslashes in a value are not read as regex group references."""
+        document = _export_document("<p>{{ruta}}</p>", ruta=r"C:\docs\1")
+        assert prepare_export_soup(document).get_text() == r"C:\docs\1"
+
+    def test_sanitizes_word_markup(self):
+        """The soup comes back sanitized for export."""
+        document = _export_document('<p style="mso-bidi-font-size:12.0pt;color:blue;">x</p>')
+        assert "mso-" not in str(prepare_export_soup(document))
+
+
 # ── get_letterhead_for_document ───────────────────────────────────────────────
 
 
@@ -0,0 +1,146 @@
+"""Tests for the Word export engine (gym_app.utils.docx_export)."""
+import io
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+from bs4 import BeautifulSoup
+from docx import Document
+from docx.shared import Inches, Pt, RGBColor
+
+from gym_app.utils import docx_export
+from gym_app.utils.docx_export import clear_template_cache, render_document_docx
+
+
+@pytest.fixture(autouse=True)
+def fresh_template_cache():
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+@pytest.fixture
+def letterhead(tmp_path):
+    """A letterhead template with a header and the single empty body paragraph."""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "MEMBRETE"
+    path = tmp_path / "letterhead.docx"
+    doc.save(path)
+    return SimpleNamespace(path=str(path))
+
+
+@pytest.fixture
+def count_loads(monkeypatch):
+    loads = []
+    original = docx_export._Template.load.__func__
+
+    def counting_load(cls, path=None):
+        loads.append(path)
+        return original(cls, path)
+
+    monkeypatch.setattr(docx_export._Template, "load", classmethod(counting_load))
+    return loads
+
+
+def _render(html, word_template=None):
+    output = render_document_docx(BeautifulSoup(html, "html.parser"), word_template=word_template)
+    return Document(io.BytesIO(output.read()))
+
+
+class TestTemplateCache:
+    def test_template_is_parsed_once_per_file_identity(self, letterhead, count_loads):
+        _render("<p>Uno</p>", letterhead)
+        _render("<p>Dos</p>", letterhead)
+
+        assert count_loads == [letterhead.path]
+
+    def test_replaced_template_file_is_parsed_again(self, letterhead, count_loads):
+        _render("<p>Uno</p>", letterhead)
+        replacement = Document()
+        replacement.sections[0].header.paragraphs[0].text = "MEMBRETE NUEVO"
+        replacement.save(letterhead.path)
+        stat = os.stat(letterhead.path)
+        os.utime(letterhead.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        docx_doc = _render("<p>Dos</p>", letterhead)
+
+        assert count_loads == [letterhead.path, letterhead.path]
+        assert docx_doc.sections[0].header.paragraphs[0].text == "MEMBRETE NUEVO"
+
+    def test_zero_cache_size_disables_the_cache(self, letterhead, count_loads, settings):
+        settings.DOCX_TEMPLATE_CACHE_SIZE = 0
+        _render("<p>Uno</p>", letterhead)
+        _render("<p>Dos</p>", letterhead)
+
+        assert count_loads == [letterhead.path, letterhead.path]
+
+    def test_exports_do_not_leak_into_the_cached_template(self, letterhead):
+        _render("<p>Uno</p><table><tr><td>A</td></tr></table>", letterhead)
+        docx_doc = _render("<p>Dos</p>", letterhead)
+
+        assert [p.text for p in docx_doc.paragraphs] == ["Dos"]
+        assert docx_doc.tables == []
+        assert docx_doc.sections[0].header.paragraphs[0].text == "MEMBRETE"
+
+    def test_unreadable_template_falls_back_to_blank_and_is_not_cached(self, tmp_path, count_loads):
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a docx")
+        template = SimpleNamespace(path=str(path))
+
+        docx_doc = _render("<p>Uno</p>", template)
+        _render("<p>Dos</p>", template)
+
+        assert docx_doc.sections[0].page_width == Inches(8.5)
+        assert count_loads.count(str(path)) == 2
+
+
+class TestConversion:
+    def test_first_paragraph_reuses_the_template_blank_line(self, letterhead):
+        docx_doc = _render("<p>Uno</p><p>Dos</p>", letterhead)
+        assert [p.text for p in docx_doc.paragraphs] == ["Uno", "Dos"]
+
+    # quality: disable too_many_assertions (one run checked for every inherited format)
+    def test_inline_formatting_is_inherited_by_nested_runs(self):
+        docx_doc = _render(
+            '<p><strong>a <span style="color: red; font-size: 14pt">b <em>c</em></span></strong></p>'
+        )
+        runs = docx_doc.paragraphs[0].runs
+
+        assert [run.text for run in runs] == ["a ", "b ", "c"]
+        assert [run.bold for run in runs] == [True, True, True]
+        assert [run.italic for run in runs] == [None, None, True]
+        assert runs[2].font.color.rgb == RGBColor(255, 0, 0)
+        assert runs[2].font.size == Pt(14)
+        assert all(run.font.name == "Calibri" for run in runs)
+
+    def test_top_level_inline_content_becomes_a_paragraph(self):
+        docx_doc = _render('Hello <strong>world</strong>')
+
+        assert [p.text for p in docx_doc.paragraphs] == ["Hello world"]
+        assert docx_doc.paragraphs[0].runs[1].bold is True
+
+    def test_top_level_text_between_blocks_keeps_its_place(self):
+        docx_doc = _render('Intro <em>uno</em><p>Dos</p>  \n<ul><li>Tres</li></ul>')
+
+        assert [p.text for p in docx_doc.paragraphs] == ["Intro uno", "Dos", "Tres"]
+
+    def test_table_rows_keep_their_cells_and_header_weight(self):
+        docx_doc = _render("<table><tr><th>H</th><th>I</th></tr><tr><td>a\tb</td></tr></table>")
+        table = docx_doc.tables[0]
+
+        assert [[cell.text for cell in row.cells] for row in table.rows] == [["H", "I"], ["a\tb", ""]]
+        assert table.rows[0].cells[0].paragraphs[0].runs[0].bold is True
+        assert table.style.name == "Table Grid"
+
+    def test_headings_use_the_heading_styles(self):
+        docx_doc = _render("<h1>Uno</h1><h3>Tres</h3>")
+        assert [p.style.name for p in docx_doc.paragraphs] == ["Heading 1", "Heading 3"]
+
+    def test_output_is_a_rewound_spooled_file(self, settings):
+        settings.DOCX_EXPORT_SPOOL_MAX_SIZE = 1024
+        output = render_document_docx(BeautifulSoup("<p>Uno</p>", "html.parser"))
+
+        assert isinstance(output, tempfile.SpooledTemporaryFile)
+        assert output.tell() == 0
+        assert output.read(2) == b"PK"
@@ -115,7 +115,9 @@ class TestActivityFeedActionTypes:
             activity.delete()
 
     def test_activity_feed_max_20_per_user(self, setup_base_users):
-        """Verify ActivityFeed enforces max 20 entries per user."""
+        """Verify the activity window prune keeps max 20 entries per user."""
+        from gym_app.activity_feed_tasks import prune_activity_feed_window
+
         user = setup_base_users['client']
         
         # Create 25 activities
@@ -126,7 +128,8 @@ class TestActivityFeedActionTypes:
                 description=f'Activity {i}',
             )
         
-        # Should only have 20 activities due to model limit
+        # Should only have 20 activities once the window is enforced
+        prune_activity_feed_window(max_per_user=20)
         assert ActivityFeed.objects.filter(user=user).count() == 20
 
 
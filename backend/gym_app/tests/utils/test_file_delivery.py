@@ -0,0 +1,113 @@
+"""Tests for gym_app.utils.file_delivery (streaming, ranges, conditionals)."""
+import pytest
+from django.test import RequestFactory
+
+from gym_app.utils.file_delivery import parse_range_header, serve_file
+
+PAYLOAD = b"0123456789abcdefghij"
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """A 20-byte file on disk."""
+    path = tmp_path / "contrato.pdf"
+    path.write_bytes(PAYLOAD)
+    return str(path)
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+class TestParseRangeHeader:
+    """Tests for single-range header parsing."""
+
+    def test_absent_header_serves_full_body(self):
+        """No header → full body."""
+        assert parse_range_header(None, 20) is None
+
+    def test_explicit_range(self):
+        """``bytes=2-5`` → inclusive offsets."""
+        assert parse_range_header("bytes=2-5", 20) == (2, 5)
+
+    def test_open_ended_range_is_clamped(self):
+        """``bytes=15-`` and over-long ends stop at the last byte."""
+        assert parse_range_header("bytes=15-", 20) == (15, 19)
+        assert parse_range_header("bytes=15-99", 20) == (15, 19)
+
+    def test_suffix_range(self):
+        """``bytes=-4`` → the final four bytes."""
+        assert parse_range_header("bytes=-4", 20) == (16, 19)
+
+    def test_unsatisfiable_range(self):
+        """Start past EOF cannot be satisfied."""
+        assert parse_range_header("bytes=30-40", 20) is False
+
+    def test_multi_range_falls_back_to_full_body(self):
+        """Multi-range requests are not supported and get the full body."""
+        assert parse_range_header("bytes=0-1,4-5", 20) is None
+
+
+class TestServeFile:
+    """Tests for serve_file response building."""
+
+    def test_full_response_streams_with_validators(self, sample_file):
+        """A plain GET streams the whole file and advertises validators."""
+        response = serve_file(RequestFactory().get("/"), sample_file)
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert _body(response) == PAYLOAD
+        assert response["Accept-Ranges"] == "bytes"
+        assert response["ETag"]
+        assert response["Last-Modified"]
+        assert response["Content-Type"] == "application/pdf"
+        assert response["Content-Disposition"].startswith("attachment;")
+
+    def test_range_request_returns_partial_content(self, sample_file):
+        """A satisfiable Range yields 206 with the requested slice only."""
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=10-13")
+        response = serve_file(request, sample_file)
+
+        assert response.status_code == 206
+        assert response["Content-Range"] == "bytes 10-13/20"
+        assert response["Content-Length"] == "4"
+        assert _body(response) == b"abcd"
+
+    def test_unsatisfiable_range_returns_416(self, sample_file):
+        """Ranges beyond EOF are rejected with the full size advertised."""
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=50-60")
+        response = serve_file(request, sample_file)
+
+        assert response.status_code == 416
+        assert response["Content-Range"] == "bytes */20"
+
+    def test_if_none_match_returns_not_modified(self, sample_file):
+        """A matching ETag short-circuits to 304."""
+        etag = serve_file(RequestFactory().get("/"), sample_file)["ETag"]
+        request = RequestFactory().get("/", HTTP_IF_NONE_MATCH=etag)
+        response = serve_file(request, sample_file)
+
+        assert response.status_code == 304
+
+    def test_stale_if_range_serves_full_body(self, sample_file):
+        """A Range with a non-matching If-Range validator gets the full file."""
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE='"stale"')
+        response = serve_file(request, sample_file)
+
+        assert response.status_code == 200
+        assert _body(response) == PAYLOAD
+
+    def test_x_accel_redirect_for_media_files(self, settings, tmp_path):
+        """With a prefix configured, files under MEDIA_ROOT are offloaded to nginx."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.FILE_DELIVERY_X_ACCEL_PREFIX = "/protected-media/"
+        (tmp_path / "legal_requests").mkdir()
+        path = tmp_path / "legal_requests" / "acta.pdf"
+        path.write_bytes(PAYLOAD)
+
+        response = serve_file(RequestFactory().get("/"), str(path))
+
+        assert response.status_code == 200
+        assert response["X-Accel-Redirect"] == "/protected-media/legal_requests/acta.pdf"
+        assert response.content == b""
@@ -0,0 +1,214 @@
+"""Tests for request/task metrics (gym_app.utils.metrics, RequestMetricsMiddleware, /api/metrics/)."""
+import fnmatch
+import json
+import logging
+
+import pytest
+from django.urls import reverse
+
+from gym_app.models import User
+from gym_app.utils import metrics
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(settings):
+    settings.METRICS_BACKEND = 'memory'
+    settings.METRICS_ENABLED = True
+    metrics.reset_backend()
+    yield
+    metrics.reset_backend()
+
+
+def _series(name, **labels):
+    """Return {suffix_or_le: value} for one label set from the rendered output."""
+    values = {}
+    for line in metrics.render_prometheus().splitlines():
+        if not line.startswith(name) or line.startswith('#'):
+            continue
+        metric, value = line.rsplit(' ', 1)
+        if not all(f'{k}="{v}"' in metric for k, v in labels.items()):
+            continue
+        if '_bucket' in metric:
+            values[metric.split('le="')[1].rstrip('"}')] = float(value)
+        else:
+            values[metric.split('{')[0].rsplit('_', 1)[1]] = float(value)
+    return values
+
+
+class TestRenderPrometheus:
+    def test_histogram_buckets_are_cumulative(self):
+        metrics.observe('http_request_db_queries', 3, view='a')
+        metrics.observe('http_request_db_queries', 40, view='a')
+        metrics.observe('http_request_db_queries', 9999, view='a')
+
+        series = _series('http_request_db_queries', view='a')
+
+        assert series['2.0'] == 0
+        assert series['5.0'] == 1
+        assert series['50.0'] == 2
+        assert series['500.0'] == 2
+        assert series['+Inf'] == 3
+        assert series['count'] == 3
+        assert series['sum'] == 3 + 40 + 9999
+
+    def test_label_values_are_escaped(self):
+        metrics.observe('http_request_db_queries', 1, view='a"b')
+
+        assert 'view="a\\"b"' in metrics.render_prometheus()
+
+    def test_gauges_report_the_latest_value(self):
+        metrics.set_gauge('document_render_queue_depth', 2, kind='pdf')
+        metrics.set_gauge('document_render_queue_depth', 1, kind='pdf')
+
+        output = metrics.render_prometheus()
+
+        assert '# TYPE document_render_queue_depth gauge' in output
+        assert 'document_render_queue_depth{kind="pdf"} 1' in output.splitlines()
+
+    def test_disabled_metrics_record_nothing(self, settings):
+        settings.METRICS_ENABLED = False
+        metrics.observe('http_request_db_queries', 1, view='a')
+
+        assert metrics.render_prometheus().strip() == ''
+
+
+class _FakeRedis:
+    """The string commands RedisBackend uses for gauges; deleting a key stands in for its TTL."""
+
+    def __init__(self):
+        self.strings = {}
+        self.ttls = {}
+
+    def set(self, key, value, ex=None):
+        self.strings[key] = str(value).encode()
+        self.ttls[key] = ex
+
+    def scan_iter(self, match, count=None):
+        return [key.encode() for key in self.strings if fnmatch.fnmatchcase(key, match)]
+
+    def mget(self, keys):
+        return [self.strings.get(key.decode()) for key in keys]
+
+    def hgetall(self, key):
+        return {}
+
+
+class TestRedisGauges:
+    @pytest.fixture
+    def backend(self):
+        backend = metrics.RedisBackend('redis://localhost:6379/1', 'gym:metrics')
+        backend._redis = _FakeRedis()
+        return backend
+
+    def test_gauges_sum_the_value_of_every_process(self, backend, settings):
+        settings.METRICS_GAUGE_TTL = 60
+        key = ('document_render_queue_depth', (('kind', 'pdf'),), 'value')
+        backend.set_gauge(key, 2, settings.METRICS_GAUGE_TTL)
+        other_process = f'gym:metrics:gauge:web-2-4242:{backend._field(key)}'
+        backend._redis.set(other_process, 3, ex=60)
+
+        assert backend.snapshot() == {key: 5.0}
+        assert set(backend._redis.ttls.values()) == {60}
+
+    def test_a_dead_process_stops_counting_when_its_key_expires(self, backend):
+        key = ('document_render_queue_depth', (('kind', 'pdf'),), 'value')
+        backend.set_gauge(key, 1, 60)
+        crashed = f'gym:metrics:gauge:web-2-4242:{backend._field(key)}'
+        backend._redis.set(crashed, 4, ex=60)
+
+        del backend._redis.strings[crashed]
+
+        assert backend.snapshot() == {key: 1.0}
+
+
+class TestRequestMetricsMiddleware:
+    def test_records_latency_queries_and_size_per_view(self, api_client):
+        api_client.get(reverse('secop-process-list'))
+
+        latency = _series('http_request_duration_seconds', view='secop-process-list', method='GET')
+        queries = _series('http_request_db_queries', view='secop-process-list')
+        size = _series('http_response_size_bytes', view='secop-process-list')
+        assert latency['count'] == 1
+        assert queries['count'] == 1
+        assert size['sum'] > 0
+
+    def test_slow_requests_are_counted_and_sampled(self, api_client, lawyer_user, settings, caplog):
+        api_client.force_authenticate(user=lawyer_user)
+        settings.METRICS_SLOW_REQUEST_MS = 0
+        settings.METRICS_SLOW_REQUEST_SAMPLE_RATE = 1.0
+        logger = logging.getLogger('gym_app.slow_requests')
+        logger.addHandler(caplog.handler)
+        try:
+            api_client.get(reverse('secop-process-list'))
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert _series('http_slow_requests', view='secop-process-list')['total'] == 1
+        record = next(r for r in caplog.records if r.name == 'gym_app.slow_requests')
+        entry = json.loads(record.getMessage())
+        assert entry['view'] == 'secop-process-list'
+        assert entry['status'] == 200
+        assert entry['query_count'] == len(entry['queries'])
+        assert entry['queries'][0]['sql']
+
+    def test_metrics_endpoint_is_not_recorded(self, client):
+        client.get(reverse('metrics'))
+
+        assert metrics.render_prometheus().strip() == ''
+
+
+class TestMetricsEndpoint:
+    def test_exposes_prometheus_text(self, client, api_client, settings):
+        settings.METRICS_AUTH_TOKEN = 's3cret'
+        api_client.get(reverse('secop-process-list'))
+
+        response = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        assert b'# TYPE http_request_duration_seconds histogram' in response.content
+
+    def test_token_is_enforced_when_configured(self, client, settings):
+        settings.METRICS_AUTH_TOKEN = 's3cret'
+
+        assert client.get(reverse('metrics')).status_code == 401
+        assert client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret').status_code == 200
+
+    def test_denied_by_default_without_a_token(self, client, settings):
+        settings.METRICS_AUTH_TOKEN = ''
+
+        assert client.get(reverse('metrics')).status_code == 401
+        assert client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ').status_code == 401
+
+    def test_staff_sessions_can_read_metrics(self, client, settings):
+        settings.METRICS_AUTH_TOKEN = ''
+        client.force_login(User.objects.create_user(email='ops@example.com', password='x', is_staff=True))
+
+        assert client.get(reverse('metrics')).status_code == 200
+
+    def test_non_staff_sessions_are_denied(self, client, settings):
+        client.force_login(User.objects.create_user(email='client@example.com', password='x'))
+
+        assert client.get(reverse('metrics')).status_code == 401
+
+    def test_public_access_is_opt_in(self, client, settings):
+        settings.METRICS_PUBLIC = True
+
+        assert client.get(reverse('metrics')).status_code == 200
+
+
+class TestHueyTaskMetrics:
+    def test_task_duration_is_recorded(self):
+        from gym_project.tasks import _task_executing, _task_finished
+
+        class FakeTask:
+            id = 'abc'
+            name = 'purge_stale_upload_sessions'
+
+        _task_executing('executing', FakeTask())
+        _task_finished('complete', FakeTask())
+
+        series = _series('huey_task_duration_seconds', task='purge_stale_upload_sessions', outcome='complete')
+        assert series['count'] == 1
@@ -0,0 +1,70 @@
+"""ORJSONRenderer / ORJSONParser output parity with DRF's stdlib JSON classes."""
+import datetime
+import decimal
+import io
+import uuid
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from gym_app.models import User
+from gym_app.parsers import ORJSONParser
+from gym_app.renderers import ORJSONRenderer
+
+PAYLOAD = {
+    "naive": datetime.datetime(2026, 1, 15, 10, 30, 5, 123456),
+    "utc": datetime.datetime(2026, 1, 15, 10, 30, tzinfo=datetime.timezone.utc),
+    "bogota": datetime.datetime(2026, 1, 15, 10, 30, tzinfo=ZoneInfo("America/Bogota")),
+    "date": datetime.date(2026, 1, 15),
+    "time": datetime.time(8, 15, 30, 500),
+    "duration": datetime.timedelta(hours=1, seconds=3),
+    "amount": decimal.Decimal("50000.10"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": gettext_lazy("Draft"),
+    "unicode": "Contratación — señor ñandú",
+    "separators": "line paragraph end",
+    "int_keys": {1: "one", 2: "two"},
+    "nested": [{"a": None, "b": True, "c": 1.5}],
+    "bytes": b"raw",
+}
+
+
+class TestORJSONRenderer:
+    def test_output_matches_drf_json_renderer(self):
+        assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+    @pytest.mark.django_db
+    def test_queryset_values_match(self, client_user):
+        data = {"emails": User.objects.values_list("email", flat=True)}
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_falls_back_to_stdlib(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+
+        assert rendered == b'{\n    "a": 1\n}'
+
+    def test_none_renders_empty_body(self):
+        assert ORJSONRenderer().render(None) == b""
+
+
+class TestORJSONParser:
+    def _parse(self, body, encoding="utf-8"):
+        return ORJSONParser().parse(io.BytesIO(body), parser_context={"encoding": encoding})
+
+    def test_parses_like_drf(self):
+        body = '{"title": "Contratación", "items": [1, 2.5, null, true]}'.encode()
+
+        assert self._parse(body) == JSONParser().parse(io.BytesIO(body))
+
+    def test_non_utf8_charset_is_transcoded(self):
+        assert self._parse('{"name": "señor"}'.encode("latin-1"), encoding="latin-1") == {"name": "señor"}
+
+    @pytest.mark.parametrize("body", [b"{not json", b'{"value": NaN}', b""])
+    def test_invalid_json_raises_parse_error(self, body):
+        with pytest.raises(ParseError, match="JSON parse error"):
+            self._parse(body)
@@ -18,6 +18,7 @@ import json
 import shutil
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
 import pytest
@@ -2008,3 +2009,291 @@ def test_external_lint_runner_fingerprint_normalizes_whitespace(tmp_path: Path)
     second = runner_two._build_fingerprint(rel_path, 2, "ruff:pt001")
 
     assert first == second
+
+
+def _write_mixed_suite(repo_root: Path) -> None:
+    """Synthetic repo with findings in all three suites and a shared e2e helper."""
+    _write_backend_test(
+        repo_root,
+        "backend/gym_app/tests/models/test_parallel_a.py",
+        "import time\n\ndef test_sleeps():\n    time.sleep(1)\n    assert True\n",
+    )
+    _write_backend_test(
+        repo_root,
+        "backend/gym_app/tests/views/test_parallel_b.py",
+        "def test_without_assertions():\n    value = 1\n",
+    )
+    _write_backend_test(
+        repo_root,
+        "frontend/test/stores/parallel.test.js",
+        "test('renders', () => { console.log('x'); expect(1).toBe(1); });\n",
+    )
+    _write_backend_test(
+        repo_root,
+        "frontend/e2e/helpers.js",
+        "export async function openHome(page) { await page.goto('/'); }\n",
+    )
+    _write_backend_test(
+        repo_root,
+        "frontend/e2e/parallel.spec.js",
+        "import { openHome } from './helpers';\n"
+        "test('home', async ({ page }) => { await openHome(page); await page.waitForTimeout(500); });\n",
+    )
+
+
+def _report_without_timings(report: dict[str, object]) -> str:
+    report["summary"].pop("timings")
+    return json.dumps(report, indent=2)
+
+
+def test_parallel_and_cached_runs_match_serial_report(tmp_path: Path) -> None:
+    """Process-pool and warm-cache runs produce the serial cold-run report."""
+    _write_mixed_suite(tmp_path)
+    cache_dir = tmp_path / ".cache" / "test-quality"
+
+    def build(**kwargs: object) -> str:
+        return _report_without_timings(QualityReport(repo_root=tmp_path, config=_gate_config(), **kwargs).build())
+
+    serial = build()
+    assert json.loads(serial)["summary"]["warnings"] > 0
+
+    assert build(jobs=2) == serial
+    assert build(jobs=2, cache_dir=cache_dir) == serial
+    assert (cache_dir / "results.pickle").is_file()
+    assert build(cache_dir=cache_dir) == serial
+
+
+def test_result_cache_reanalyzes_only_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A warm cache only re-runs the analyzer for files whose content changed."""
+    from quality.backend_analyzer import PythonAnalyzer
+    from quality.file_runner import FileRunner, ResultCache
+
+    _write_mixed_suite(tmp_path)
+    analyzed: list[str] = []
+    original = PythonAnalyzer._analyze_file
+
+    def spy(self, path, tests_root):  # type: ignore[no-untyped-def]
+        analyzed.append(path.name)
+        return original(self, path, tests_root)
+
+    monkeypatch.setattr(PythonAnalyzer, "_analyze_file", spy)
+    config = _gate_config()
+    tests_root = tmp_path / "backend" / "gym_app" / "tests"
+    cache_path = tmp_path / "cache" / "results.pickle"
+
+    def run() -> list[FileResult]:
+        cache = ResultCache(cache_path)
+        runner = FileRunner(cache=cache, context="ctx")
+        files = PythonAnalyzer(tmp_path, config, Patterns(config), file_runner=runner).analyze_suite(tests_root).files
+        cache.save()
+        return files
+
+    cold = run()
+    _write_backend_test(
+        tmp_path,
+        "backend/gym_app/tests/views/test_parallel_b.py",
+        "def test_without_assertions():\n    assert 1 == 1\n",
+    )
+    warm = run()
+
+    assert analyzed == ["test_parallel_a.py", "test_parallel_b.py", "test_parallel_b.py"]
+    assert [f.file for f in warm] == [f.file for f in cold]
+    assert warm[0].issues == cold[0].issues
+
+
+def test_result_cache_key_tracks_imported_helpers(tmp_path: Path) -> None:
+    """Editing a helper a spec imports invalidates the spec's cached result."""
+    from quality.file_runner import FileRunner
+
+    _write_mixed_suite(tmp_path)
+    _unit, e2e = _build_analyzers(tmp_path)
+    spec = tmp_path / "frontend" / "e2e" / "parallel.spec.js"
+    runner = FileRunner(context="ctx")
+
+    before = runner._key(e2e, "analyze_file", spec)
+    (tmp_path / "frontend" / "e2e" / "helpers.js").write_text(
+        "export async function openHome(page) { await page.goto('/home'); }\n", encoding="utf-8",
+    )
+
+    assert runner._key(e2e, "analyze_file", spec) != before
+    assert runner._key(e2e, "_analyze_file_source_only", spec) != runner._key(e2e, "analyze_file", spec)
+
+
+# Serve-mode stand-in for ast-parser.cjs: answers every request with an empty
+# payload for that file and never answers files whose name contains "hang".
+_FAKE_SERVE_PARSER = """
+const readline = require('readline');
+if (!process.argv.includes('--serve')) {
+  process.stdout.write(JSON.stringify({ file: process.argv[2], tests: [], issues: [], error: null,
+    summary: { testCount: 0, issueCount: 0, hasParseError: false } }) + '\\n');
+  process.exit(0);
+}
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  const request = JSON.parse(line);
+  if (request.file.includes('hang')) return;
+  process.stdout.write(JSON.stringify({ id: request.id, result: { file: request.file, tests: [],
+    issues: [], error: null, summary: { testCount: process.pid, issueCount: 0, hasParseError: false } } }) + '\\n');
+});
+"""
+
+
+def _bridge_repo(tmp_path: Path, parser_source: str | None = None) -> Path:
+    """Synthetic frontend with a parser script and a (stub) @babel/parser dir."""
+    if shutil.which("node") is None:
+        pytest.skip("Node.js is not available in this environment")
+    scripts_dir = tmp_path / "frontend" / "scripts"
+    scripts_dir.mkdir(parents=True)
+    (tmp_path / "frontend" / "node_modules" / "@babel" / "parser").mkdir(parents=True)
+    parser_script = scripts_dir / "ast-parser.cjs"
+    if parser_source is None:
+        shutil.copy(REPO_ROOT / "frontend" / "scripts" / "ast-parser.cjs", parser_script)
+    else:
+        parser_script.write_text(parser_source, encoding="utf-8")
+    return tmp_path
+
+
+def test_js_ast_bridge_serve_mode_matches_per_file_payloads(tmp_path: Path) -> None:
+    """The persistent worker returns exactly what one process per file returns."""
+    from quality.js_ast_bridge import JSASTBridge
+
+    repo_root = _bridge_repo(tmp_path)
+    specs = [
+        _write_backend_test(repo_root, f"frontend/e2e/spec_{index}.spec.js", "test('x', () => {});\n")
+        for index in range(3)
+    ]
+
+    with JSASTBridge(repo_root) as persistent:
+        served = persistent.parse_files(specs, is_e2e=True)
+    per_file = JSASTBridge(repo_root, persistent=False).parse_files(specs, is_e2e=True)
+
+    assert served == per_file
+    assert [result.file_path for result in served] == [str(spec) for spec in specs]
+    assert all(result.has_parse_error for result in served)
+
+
+def test_js_ast_bridge_reuses_one_worker_per_slot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Files share worker processes; a pool of two spreads them in input order."""
+    from quality import js_ast_bridge
+
+    repo_root = _bridge_repo(tmp_path, _FAKE_SERVE_PARSER)
+    specs = [tmp_path / f"spec_{index}.spec.js" for index in range(6)]
+
+    # Each new worker's first parse waits for the other pool slot, so both
+    # slots hold a worker at once and exactly two processes are started.
+    both_slots_busy = threading.Barrier(2, timeout=30)
+    started = []
+    original_parse = js_ast_bridge._NodeWorker.parse
+
+    def parse(worker, file_path, is_e2e, timeout):
+        if worker not in started:
+            started.append(worker)
+            both_slots_busy.wait()
+        return original_parse(worker, file_path, is_e2e, timeout)
+
+    with js_ast_bridge.JSASTBridge(repo_root) as bridge:
+        first_run = [result.test_count for result in bridge.parse_files(specs)]
+        second_run = [result.test_count for result in bridge.parse_files(specs)]
+    monkeypatch.setattr(js_ast_bridge._NodeWorker, "parse", parse)
+    with js_ast_bridge.JSASTBridge(repo_root, workers=2) as bridge:
+        pooled = bridge.parse_files(specs)
+
+    assert len(set(first_run)) == 1
+    assert second_run == first_run  # the same process across calls
+    assert [result.file_path for result in pooled] == [str(spec) for spec in specs]
+    assert {result.test_count for result in pooled} == {worker.process.pid for worker in started}
+    assert len(started) == 2
+
+
+def test_js_ast_bridge_restarts_worker_after_timeout(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A file that exceeds the budget gets a timeout error; the next file gets a fresh worker."""
+    from quality import js_ast_bridge
+
+    repo_root = _bridge_repo(tmp_path, _FAKE_SERVE_PARSER)
+    normal_budget = js_ast_bridge.PARSE_TIMEOUT_SECONDS
+
+    with js_ast_bridge.JSASTBridge(repo_root) as bridge:
+        before = bridge.parse_file(tmp_path / "ok.spec.js")
+        # Only the hanging request gets the short budget; starting the fresh
+        # worker for the next file can take longer on a loaded machine.
+        monkeypatch.setattr(js_ast_bridge, "PARSE_TIMEOUT_SECONDS", 0.5)
+        hung = bridge.parse_file(tmp_path / "hang.spec.js")
+        monkeypatch.setattr(js_ast_bridge, "PARSE_TIMEOUT_SECONDS", normal_budget)
+        after = bridge.parse_file(tmp_path / "ok.spec.js")
+
+    assert hung.error == "Parser timeout (0.5s)"
+    assert after.error is None
+    assert after.test_count != before.test_count  # new worker process
+
+
+def test_js_ast_bridge_falls_back_when_parser_lacks_serve_mode(tmp_path: Path) -> None:
+    """An older single-file parser script keeps working through per-file processes."""
+    from quality.js_ast_bridge import JSASTBridge
+
+    legacy_parser = _FAKE_SERVE_PARSER.replace("process.argv.includes('--serve')", "false")
+    repo_root = _bridge_repo(tmp_path, legacy_parser)
+    spec = tmp_path / "legacy.spec.js"
+
+    with JSASTBridge(repo_root) as bridge:
+        result = bridge.parse_file(spec)
+        assert bridge.persistent is False
+
+    assert result.error is None
+    assert result.file_path == str(spec)
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("a = 'x}y' + \"q\\\"(\" ;", "a = '   ' + \"    \" ;"),
+        ("f(/[/'(]+/g, b) / 2", "f(         , b) / 2"),
+        ("x = `a\nb` // it's\ny", "x = ` \n `        \ny"),
+        ("go() /* (c) */ z", "go()           z"),
+        ("s = 'unterminated\n(", "s = '            \n "),
+    ],
+)
+def test_strip_for_scanning_masks_literals_and_comments(source: str, expected: str) -> None:
+    """Masking blanks string, comment and regex content but keeps delimiters and newlines."""
+    from quality.junk_detectors import _strip_for_scanning
+
+    assert _strip_for_scanning(source) == expected
+
+
+def test_source_scan_bracket_tables_match_the_forward_walk() -> None:
+    """Table lookups agree with walking the masked text, unmatched openers included."""
+    from quality.junk_detectors import SourceScan, _match_paren, _matched_brace_end
+
+    scan = SourceScan("test('a)', () => { if (x) { y('}') } }); fn({ a: (1 }\nbroken(")
+
+    for index, ch in enumerate(scan.masked):
+        if ch == "(":
+            assert scan.paren_end(index) == _match_paren(scan.masked, index)
+        elif ch == "{":
+            assert scan.brace_end(index) == _matched_brace_end(scan.masked, index)
+    assert scan.paren_end(scan.masked.rindex("(")) == -1
+    assert scan.line_of(scan.masked.rindex("(")) == 2
+
+
+def test_junk_detectors_reread_a_helper_module_after_it_changes(tmp_path: Path) -> None:
+    """Memoized helper modules are revalidated, so an edited helper is picked up."""
+    from quality.junk_detectors import analyze_e2e_source
+
+    helper = tmp_path / "helpers.js"
+    helper.write_text("export async function openPanel(page) { await page.goto('/'); }\n", encoding="utf-8")
+    spec = tmp_path / "panel.spec.js"
+    source = (
+        "import { openPanel } from './helpers';\n"
+        "test('opens the panel', async ({ page }) => {\n"
+        "  await openPanel(page);\n"
+        "  await expect(page.getByText('Panel')).toBeVisible();\n"
+        "});\n"
+    )
+
+    before = {finding.rule_id for finding in analyze_e2e_source(source, "panel.spec.js", spec)}
+    helper.write_text(
+        "export async function openPanel(page) {\n  await page.goto('/');\n  await page.click('#panel');\n}\n",
+        encoding="utf-8",
+    )
+    after = {finding.rule_id for finding in analyze_e2e_source(source, "panel.spec.js", spec)}
+
+    assert "no_user_interaction" in before
+    assert "no_user_interaction" not in after
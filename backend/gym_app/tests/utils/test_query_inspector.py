@@ -0,0 +1,108 @@
+"""Tests for the N+1 detector and per-view query budgets (gym_app.utils.query_inspector)."""
+import logging
+
+import pytest
+from django.urls import reverse
+
+from gym_app.models import Organization, OrganizationMembership
+from gym_app.serializers.organization import OrganizationListSerializer
+from gym_app.utils.query_inspector import (
+    NPlusOneDetected,
+    QueryBudgetExceeded,
+    QueryInspector,
+    inspect_queries,
+    normalize_sql,
+)
+from gym_app.views import organization as organization_views
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def raising_inspector(settings):
+    settings.QUERY_INSPECTOR_ENABLED = True
+    settings.QUERY_INSPECTOR_RAISE = True
+    settings.QUERY_INSPECTOR_NPLUSONE_THRESHOLD = 3
+    return settings
+
+
+@pytest.fixture
+def organizations(corporate_user, client_user):
+    orgs = []
+    for index in range(4):
+        org = Organization.objects.create(
+            title=f"Org {index}", description="Desc", corporate_client=corporate_user,
+        )
+        OrganizationMembership.objects.create(organization=org, user=client_user, role="MEMBER")
+        orgs.append(org)
+    return orgs
+
+
+class TestNormalizeSql:
+    def test_literals_and_in_lists_collapse_to_one_template(self):
+        first = normalize_sql("SELECT * FROM t WHERE id = 1 AND name = 'a' AND x IN (%s, %s)")
+        second = normalize_sql("SELECT *  FROM t WHERE id = 22 AND name = 'it''s' AND x IN (%s)")
+
+        assert first == second == "SELECT * FROM t WHERE id = ? AND name = ? AND x IN (...)"
+
+
+class TestQueryInspector:
+    def test_repeated_template_reports_serializer_method(self, organizations, settings):
+        settings.QUERY_INSPECTOR_RAISE = True
+
+        with pytest.raises(NPlusOneDetected) as exc_info:
+            with inspect_queries("organization list", threshold=3):
+                OrganizationListSerializer(
+                    Organization.objects.select_related("corporate_client"), many=True,
+                ).data
+
+        message = str(exc_info.value)
+        assert "4 x SELECT" in message
+        assert "gym_app/serializers/organization.py" in message
+        assert "in get_member_count" in message
+
+    def test_reports_are_logged_when_not_raising(self, organizations, settings, caplog):
+        settings.QUERY_INSPECTOR_RAISE = False
+        logger = logging.getLogger("gym_app.query_inspector")
+        logger.addHandler(caplog.handler)
+        try:
+            with inspect_queries("organization list", threshold=3) as inspector:
+                OrganizationListSerializer(Organization.objects.all(), many=True).data
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert inspector.repeated()
+        assert any("Possible N+1 in organization list" in r.getMessage() for r in caplog.records)
+
+    def test_budget_is_checked_against_total_queries(self, settings):
+        settings.QUERY_INSPECTOR_RAISE = True
+        inspector = QueryInspector(threshold=10)
+        inspector.count = 4
+
+        assert inspector.report("view", budget=4) == []
+        with pytest.raises(QueryBudgetExceeded):
+            inspector.report("view", budget=3)
+
+
+class TestQueryInspectorMiddleware:
+    def test_list_endpoint_stays_within_budget(self, api_client, corporate_user, organizations, raising_inspector):
+        api_client.force_authenticate(user=corporate_user)
+
+        response = api_client.get(reverse("get-my-organizations"))
+
+        assert response.status_code == 200
+        assert [o["member_count"] for o in response.data["results"]] == [1, 1, 1, 1]
+
+    def test_budget_overrun_raises(self, api_client, corporate_user, organizations, raising_inspector, monkeypatch):
+        monkeypatch.setattr(organization_views.get_my_organizations, "query_budget", 1)
+        api_client.force_authenticate(user=corporate_user)
+
+        with pytest.raises(QueryBudgetExceeded, match="get-my-organizations ran"):
+            api_client.get(reverse("get-my-organizations"))
+
+    def test_disabled_inspector_does_not_check(self, api_client, corporate_user, organizations, raising_inspector, monkeypatch):
+        raising_inspector.QUERY_INSPECTOR_ENABLED = False
+        monkeypatch.setattr(organization_views.get_my_organizations, "query_budget", 1)
+        api_client.force_authenticate(user=corporate_user)
+
+        assert api_client.get(reverse("get-my-organizations")).status_code == 200
@@ -0,0 +1,82 @@
+"""Tests for the shared document render cache (gym_app.utils.render_cache)."""
+import pytest
+from django.core.cache import cache
+
+from gym_app.utils import documents, render_cache
+from gym_app.utils.documents import render_document_pdf
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Fake WeasyPrint pass; returns the list of rendered HTML documents."""
+    rendered = []
+
+    def fake_render(html_content, *, base_url):
+        rendered.append(html_content)
+        return f'%PDF-{len(rendered)}'.encode()
+
+    monkeypatch.setattr(documents, 'render_html_to_pdf', fake_render)
+    return rendered
+
+
+class TestRenderDocumentPdfCache:
+    def test_identical_inputs_are_rendered_once(self, renders):
+        first = render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+        second = render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+
+        assert (first, second) == (b'%PDF-1', b'%PDF-1')
+        assert len(renders) == 1
+
+    def test_any_input_change_renders_again(self, renders):
+        render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+        render_document_pdf(title='Contrato', body_html='<p>Dos</p>')
+        render_document_pdf(title='Otro', body_html='<p>Dos</p>')
+
+        assert len(renders) == 3
+
+    def test_zero_ttl_disables_the_cache(self, renders, settings):
+        settings.DOCUMENT_RENDER_CACHE_TTL = 0
+        render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+        render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+
+        assert len(renders) == 2
+
+    def test_renders_above_the_size_limit_are_not_cached(self, renders, settings):
+        settings.DOCUMENT_RENDER_CACHE_MAX_BYTES = 4
+        render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+        render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+
+        assert len(renders) == 2
+
+    def test_unavailable_cache_falls_back_to_rendering(self, renders, monkeypatch):
+        def broken(*args, **kwargs):
+            raise ConnectionError('redis down')
+
+        monkeypatch.setattr(render_cache._backend(), 'get', broken)
+        monkeypatch.setattr(render_cache._backend(), 'set', broken)
+
+        assert render_document_pdf(title='Contrato', body_html='<p>Uno</p>') == b'%PDF-1'
+
+    def test_renders_stay_out_of_the_default_cache(self, renders):
+        """Large PDFs must not evict sessions or throttle counters."""
+        render_document_pdf(title='Contrato', body_html='<p>Uno</p>')
+        key = render_cache.render_key(render_cache.PDF, documents.build_document_html(
+            title='Contrato', body_html='<p>Uno</p>',
+        ))
+
+        assert cache.get(key) is None
+        assert render_cache.lookup(key) == b'%PDF-1'
+
+
+class TestStoreBudget:
+    def test_renders_beyond_the_budget_are_not_cached(self):
+        budget = render_cache.StoreBudget(10)
+
+        render_cache.store('first', b'x' * 6, budget)
+        render_cache.store('second', b'y' * 6, budget)
+        render_cache.store('third', b'z' * 4, budget)
+
+        assert [render_cache.lookup(key) for key in ('first', 'second', 'third')] == [
+            b'x' * 6, None, b'z' * 4,
+        ]
+        assert budget.remaining == 0
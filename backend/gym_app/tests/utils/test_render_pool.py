@@ -0,0 +1,108 @@
+"""Tests for the document render pool (gym_app.utils.render_pool)."""
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from gym_app.utils import documents, metrics, render_pool
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(settings):
+    settings.METRICS_BACKEND = 'memory'
+    settings.METRICS_ENABLED = True
+    metrics.reset_backend()
+    yield
+    metrics.reset_backend()
+
+
+@pytest.fixture
+def process_pool(settings):
+    """A real one-worker pool, stopped after the test."""
+    settings.RENDER_POOL_WORKERS = 1
+    yield
+    render_pool.shutdown()
+
+
+def _value(name, suffix, **labels):
+    """Return the stored value of one series (0 when it was never recorded)."""
+    label_key = tuple(sorted(labels.items()))
+    return metrics.get_backend().snapshot().get((name, label_key, suffix), 0)
+
+
+def _queue_depth(kind):
+    return _value('document_render_queue_depth', 'value', kind=kind)
+
+
+class TestInlineRenders:
+    def test_renders_in_the_calling_process_when_disabled(self, settings):
+        settings.RENDER_POOL_WORKERS = 0
+
+        assert render_pool.run('document_pdf', os.getpid) == os.getpid()
+        assert _value('document_render_duration_seconds', 'count', kind='document_pdf', outcome='ok') == 1
+        assert _value('document_render_queue_wait_seconds', 'count', kind='document_pdf') == 1
+
+    def test_queue_depth_counts_jobs_in_flight(self, settings):
+        settings.RENDER_POOL_WORKERS = 0
+
+        depth_during_render = render_pool.run('document_pdf', lambda: _queue_depth('document_pdf'))
+
+        assert (depth_during_render, _queue_depth('document_pdf')) == (1, 0)
+
+    def test_render_errors_propagate_and_are_recorded(self, settings):
+        settings.RENDER_POOL_WORKERS = 0
+
+        with pytest.raises(ValueError, match='invalid literal'):
+            render_pool.run('document_pdf', int, 'not a number')
+
+        assert _value('document_render_duration_seconds', 'count', kind='document_pdf', outcome='error') == 1
+        assert _queue_depth('document_pdf') == 0
+
+    def test_document_downloads_render_through_the_pool(self, monkeypatch):
+        kinds = []
+        original_submit = render_pool.submit
+
+        def spy(kind, fn, *args, **kwargs):
+            kinds.append(kind)
+            return original_submit(kind, fn, *args, **kwargs)
+
+        monkeypatch.setattr(render_pool, 'submit', spy)
+        monkeypatch.setattr(documents, 'render_html_to_pdf', lambda html_content, *, base_url: b'%PDF-pool')
+
+        assert documents.render_document_pdf(title='Contrato', body_html='<p>Uno</p>') == b'%PDF-pool'
+        assert kinds == ['document_pdf']
+
+
+class TestProcessPool:
+    def test_renders_in_a_worker_process(self, process_pool):
+        assert render_pool.run('document_pdf', os.getpid) != os.getpid()
+        assert _value('document_render_duration_seconds', 'count', kind='document_pdf', outcome='ok') == 1
+        assert _queue_depth('document_pdf') == 0
+
+    def test_worker_errors_reach_the_caller(self, process_pool):
+        with pytest.raises(ValueError, match='invalid literal'):
+            render_pool.run('service_request_pdf', int, 'not a number')
+
+        assert _value(
+            'document_render_duration_seconds', 'count', kind='service_request_pdf', outcome='error'
+        ) == 1
+
+    def test_a_crashed_worker_is_replaced(self, process_pool):
+        """A worker dying mid-job fails that job only; the next job gets a new pool."""
+        with pytest.raises(BrokenProcessPool):
+            render_pool.run('document_pdf', os._exit, 1)
+
+        assert render_pool.run('document_pdf', os.getpid) != os.getpid()
+        assert _queue_depth('document_pdf') == 0
+
+    def test_warm_up_starts_every_worker(self, process_pool):
+        futures = render_pool.warm_up()
+
+        assert [future.result(timeout=120) != os.getpid() for future in futures] == [True]
+
+    def test_a_forked_process_starts_its_own_pool(self, process_pool, monkeypatch):
+        """A pool created before a fork (gunicorn --preload) is not reused by the child."""
+        parent_pool = render_pool._get_executor()
+        monkeypatch.setattr(render_pool.os, 'getpid', lambda: -1)
+
+        assert render_pool._get_executor() is not parent_pool
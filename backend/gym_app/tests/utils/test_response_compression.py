@@ -0,0 +1,106 @@
+"""Tests for the Brotli/gzip CompressionMiddleware."""
+import gzip
+import json
+
+import brotli
+import pytest
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from gym_app.middleware import CompressionMiddleware, negotiate_encoding
+
+BODY = {"items": [{"title": f"Documento {i}", "content": "<p>Cláusula</p>" * 20} for i in range(50)]}
+
+
+def _run(response, accept_encoding="gzip, deflate, br"):
+    request = RequestFactory().get("/api/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda _request: response)(request)
+
+
+def _streamed(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip;q=0.9", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("*;q=0.1", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+class TestCompressionMiddleware:
+    def test_brotli_preferred_for_json(self):
+        response = _run(JsonResponse(BODY))
+
+        assert response["Content-Encoding"] == "br"
+        assert "Accept-Encoding" in response["Vary"]
+        assert int(response["Content-Length"]) == len(response.content)
+        assert json.loads(brotli.decompress(response.content)) == BODY
+
+    def test_gzip_when_brotli_not_accepted(self):
+        response = _run(JsonResponse(BODY), "gzip")
+
+        assert response["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(response.content)) == BODY
+
+    def test_small_bodies_are_left_alone(self, settings):
+        settings.RESPONSE_COMPRESSION_MIN_SIZE = 1024
+        response = _run(JsonResponse({"ok": True}))
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == b'{"ok": true}'
+
+    def test_binary_content_types_are_skipped(self):
+        response = _run(HttpResponse(b"%PDF" * 1000, content_type="application/pdf"))
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_already_encoded_and_no_transform_are_skipped(self):
+        encoded = JsonResponse(BODY)
+        encoded["Content-Encoding"] = "gzip"
+        no_transform = JsonResponse(BODY)
+        no_transform["Cache-Control"] = "no-transform"
+
+        assert _run(encoded)["Content-Encoding"] == "gzip"
+        assert not _run(no_transform).has_header("Content-Encoding")
+
+    def test_strong_etag_is_weakened(self):
+        response = JsonResponse(BODY)
+        response["ETag"] = '"abc"'
+
+        assert _run(response)["ETag"] == 'W/"abc"'
+
+    @pytest.mark.parametrize(
+        ("accept_encoding", "decompress"),
+        [("br", brotli.decompress), ("gzip", gzip.decompress)],
+    )
+    def test_streaming_responses_are_compressed_chunk_by_chunk(self, accept_encoding, decompress):
+        chunks = [f"row {i},{'x' * 100}\n".encode() for i in range(200)]
+        response = _run(StreamingHttpResponse(iter(chunks), content_type="text/csv"), accept_encoding)
+
+        assert response["Content-Encoding"] == accept_encoding
+        assert not response.has_header("Content-Length")
+        assert decompress(_streamed(response)) == b"".join(chunks)
+
+    def test_file_downloads_are_not_recompressed(self, tmp_path):
+        path = tmp_path / "contract.pdf"
+        path.write_bytes(b"%PDF-1.7" + b"0" * 4096)
+
+        with open(path, "rb") as handle:
+            response = _run(FileResponse(handle, content_type="application/pdf"))
+
+            assert not response.has_header("Content-Encoding")
+
+    def test_disabled_by_setting(self, settings):
+        settings.RESPONSE_COMPRESSION_ENABLED = False
+
+        assert not _run(JsonResponse(BODY)).has_header("Content-Encoding")
@@ -0,0 +1,31 @@
+"""Tests for the incremental ZIP writer (gym_app.utils.zip_stream)."""
+import io
+import zipfile
+
+from gym_app.utils.zip_stream import ZipStream
+
+
+def test_chunks_form_a_valid_archive():
+    stream = ZipStream()
+    chunks = [
+        stream.add('contrato.pdf', b'%PDF-' + b'x' * 5000),
+        stream.add('manifest.json', b'{"documents": []}' * 100, compress=True),
+        stream.finish(),
+    ]
+
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    assert archive.testzip() is None
+    assert archive.read('contrato.pdf') == b'%PDF-' + b'x' * 5000
+    assert [info.compress_type for info in archive.infolist()] == [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED]
+
+
+def test_each_entry_is_handed_out_as_soon_as_it_is_written():
+    stream = ZipStream()
+
+    first = stream.add('a.pdf', b'a' * 1000)
+    second = stream.add('b.pdf', b'b' * 1000)
+
+    assert b'a' * 1000 in first
+    assert b'a' * 1000 not in second
+    assert b'b' * 1000 in second
@@ -0,0 +1,201 @@
+"""Tests for the aggregated, per-user cached dashboard statistics.
+
+Covers:
+- corporate_get_dashboard_stats and get_organization_stats compute their
+  counts in a single query and keep the response shape.
+- Repeated visits are served from the cache.
+- Writes to corporate requests, organizations, memberships and invitations
+  invalidate the affected user's cached stats.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from gym_app.models import (
+    CorporateRequest,
+    CorporateRequestType,
+    OrganizationInvitation,
+    OrganizationMembership,
+)
+
+
+@pytest.fixture
+def request_type(db):
+    """Corporate request type."""
+    return CorporateRequestType.objects.create(name="Dashboard Stats Type")
+
+
+@pytest.fixture
+def member(client_user, organization):
+    """Active member of the conftest organization."""
+    OrganizationMembership.objects.create(
+        organization=organization, user=client_user, role="MEMBER", is_active=True,
+    )
+    return client_user
+
+
+def _create_request(member, organization, request_type, **fields):
+    return CorporateRequest.objects.create(
+        client=member,
+        organization=organization,
+        corporate_client=organization.corporate_client,
+        request_type=request_type,
+        title=fields.pop("title", "Req"),
+        description="Desc",
+        **fields,
+    )
+
+
+def _stats_queries(api_client, url_name):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse(url_name))
+    assert response.status_code == status.HTTP_200_OK
+    return response, [q["sql"] for q in queries.captured_queries]
+
+
+def _queries_on(sql_list, table):
+    return [sql for sql in sql_list if table in sql]
+
+
+@pytest.mark.django_db
+class TestCorporateDashboardStats:
+    """Corporate request counters come from one conditional aggregate."""
+
+    def test_counts_match_per_status_and_priority(
+        self, api_client, corporate_user, organization, member, request_type
+    ):
+        _create_request(member, organization, request_type, priority="URGENT", status="PENDING")
+        _create_request(
+            member, organization, request_type, priority="LOW", status="IN_REVIEW",
+            estimated_completion_date=timezone.now() - timezone.timedelta(days=1),
+        )
+        _create_request(
+            member, organization, request_type, priority="LOW", status="RESOLVED",
+            assigned_to=corporate_user,
+        )
+        api_client.force_authenticate(user=corporate_user)
+
+        response = api_client.get(reverse("corporate-get-dashboard-stats"))
+
+        data = response.data
+        assert data["total_requests"] == 3
+        assert data["status_counts"]["PENDING"] == 1
+        assert data["status_counts"]["IN_REVIEW"] == 1
+        assert data["status_counts"]["RESOLVED"] == 1
+        assert data["status_counts"]["CLOSED"] == 0
+        assert data["priority_counts"] == {"LOW": 2, "MEDIUM": 0, "HIGH": 0, "URGENT": 1}
+        assert data["recent_requests_count"] == 3
+        assert data["assigned_to_me_count"] == 1
+        assert data["overdue_count"] == 1
+
+    def test_stats_use_a_single_query(
+        self, api_client, corporate_user, organization, member, request_type, settings
+    ):
+        settings.DASHBOARD_STATS_CACHE_TTL = 0
+        for _ in range(3):
+            _create_request(member, organization, request_type)
+        api_client.force_authenticate(user=corporate_user)
+
+        _response, sql = _stats_queries(api_client, "corporate-get-dashboard-stats")
+
+        assert len(_queries_on(sql, "gym_app_corporaterequest")) == 1
+
+    def test_second_visit_is_served_from_cache(
+        self, api_client, corporate_user, organization, member, request_type
+    ):
+        _create_request(member, organization, request_type)
+        api_client.force_authenticate(user=corporate_user)
+        api_client.get(reverse("corporate-get-dashboard-stats"))
+
+        response, sql = _stats_queries(api_client, "corporate-get-dashboard-stats")
+
+        assert response.data["total_requests"] == 1
+        assert _queries_on(sql, "gym_app_corporaterequest") == []
+
+    def test_new_request_invalidates_cached_stats(
+        self, api_client, corporate_user, organization, member, request_type
+    ):
+        api_client.force_authenticate(user=corporate_user)
+        assert api_client.get(reverse("corporate-get-dashboard-stats")).data["total_requests"] == 0
+
+        _create_request(member, organization, request_type)
+
+        assert api_client.get(reverse("corporate-get-dashboard-stats")).data["total_requests"] == 1
+
+    def test_status_change_invalidates_cached_stats(
+        self, api_client, corporate_user, organization, member, request_type
+    ):
+        corporate_request = _create_request(member, organization, request_type, status="PENDING")
+        api_client.force_authenticate(user=corporate_user)
+        api_client.get(reverse("corporate-get-dashboard-stats"))
+
+        corporate_request.status = "RESOLVED"
+        corporate_request.save()
+
+        data = api_client.get(reverse("corporate-get-dashboard-stats")).data
+        assert data["status_counts"]["PENDING"] == 0
+        assert data["status_counts"]["RESOLVED"] == 1
+
+
+@pytest.mark.django_db
+class TestOrganizationDashboardStats:
+    """Organization counters come from one annotated aggregate."""
+
+    def test_counts_cover_members_invitations_and_requests(
+        self, api_client, corporate_user, organization, member, request_type
+    ):
+        OrganizationInvitation.objects.create(
+            organization=organization,
+            invited_user=member,
+            invited_by=corporate_user,
+            status="PENDING",
+            expires_at=timezone.now() + timezone.timedelta(days=10),
+        )
+        _create_request(member, organization, request_type)
+        api_client.force_authenticate(user=corporate_user)
+
+        data = api_client.get(reverse("get-organization-stats")).data
+
+        assert data["total_organizations"] == 1
+        assert data["active_organizations_count"] == 1
+        assert data["total_members"] == 1
+        assert data["total_pending_invitations"] == 1
+        assert data["recent_invitations_count"] == 1
+        assert data["recent_requests_count"] == 1
+
+    def test_stats_use_a_single_query(
+        self, api_client, corporate_user, organization, member, request_type, settings
+    ):
+        settings.DASHBOARD_STATS_CACHE_TTL = 0
+        _create_request(member, organization, request_type)
+        api_client.force_authenticate(user=corporate_user)
+
+        _response, sql = _stats_queries(api_client, "get-organization-stats")
+
+        assert len(_queries_on(sql, "gym_app_organization")) == 1
+
+    def test_membership_change_invalidates_cached_stats(
+        self, api_client, corporate_user, organization, client_user
+    ):
+        api_client.force_authenticate(user=corporate_user)
+        assert api_client.get(reverse("get-organization-stats")).data["total_members"] == 0
+
+        OrganizationMembership.objects.create(
+            organization=organization, user=client_user, role="MEMBER", is_active=True,
+        )
+
+        assert api_client.get(reverse("get-organization-stats")).data["total_members"] == 1
+
+    def test_organization_change_invalidates_cached_stats(
+        self, api_client, corporate_user, organization
+    ):
+        api_client.force_authenticate(user=corporate_user)
+        assert api_client.get(reverse("get-organization-stats")).data["active_organizations_count"] == 1
+
+        organization.is_active = False
+        organization.save()
+
+        assert api_client.get(reverse("get-organization-stats")).data["active_organizations_count"] == 0
@@ -0,0 +1,197 @@
+"""Tests for the incremental autosave endpoint (content patches + revisions)."""
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from gym_app.models import DocumentVariable, DynamicDocument, User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def lawyer():
+    """Lawyer who owns the document."""
+    return User.objects.create_user(
+        email='autosave_lawyer@test.com',
+        password='testpassword',
+        role='lawyer',
+        is_gym_lawyer=True,
+    )
+
+
+@pytest.fixture
+def document(lawyer):
+    """Draft document with two variables at revision 3."""
+    doc = DynamicDocument.objects.create(
+        title='Contrato',
+        content='<p>Hola {{nombre}}, valor {{valor}}.</p>',
+        state='Draft',
+        created_by=lawyer,
+        revision=3,
+    )
+    DocumentVariable.objects.create(document=doc, name_en='nombre', value='Ana')
+    DocumentVariable.objects.create(
+        document=doc, name_en='valor', field_type='number', value='10'
+    )
+    return doc
+
+
+def _autosave(api_client, document, payload):
+    url = reverse('autosave_dynamic_document', kwargs={'pk': document.pk})
+    return api_client.patch(url, payload, format='json')
+
+
+class TestAutosaveDynamicDocument:
+    def test_applies_content_patch_and_bumps_revision(self, api_client, lawyer, document):
+        """A patch against the current revision is applied server-side."""
+        api_client.force_authenticate(user=lawyer)
+        start = document.content.index('Hola')
+        response = _autosave(api_client, document, {
+            'revision': 3,
+            'content_patch': [{'start': start, 'end': start + 4, 'text': 'Estimada'}],
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['revision'] == 4
+        document.refresh_from_db()
+        assert document.content == '<p>Estimada {{nombre}}, valor {{valor}}.</p>'
+        assert document.revision == 4
+
+    def test_stale_revision_returns_conflict(self, api_client, lawyer, document):
+        """A patch computed against an old revision is rejected with the current one."""
+        api_client.force_authenticate(user=lawyer)
+        response = _autosave(api_client, document, {
+            'revision': 2,
+            'content': '<p>Overwrite</p>',
+        })
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data['revision'] == 3
+        document.refresh_from_db()
+        assert document.content.startswith('<p>Hola')
+
+    def test_only_changed_variables_are_written(self, api_client, lawyer, document):
+        """Unchanged variable values are skipped."""
+        api_client.force_authenticate(user=lawyer)
+        nombre = document.variables.get(name_en='nombre')
+        valor = document.variables.get(name_en='valor')
+
+        response = _autosave(api_client, document, {
+            'revision': 3,
+            'variables': [
+                {'id': nombre.pk, 'value': 'Ana'},
+                {'id': valor.pk, 'value': '25'},
+            ],
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated_variables'] == [valor.pk]
+        valor.refresh_from_db()
+        assert valor.value == '25'
+
+    def test_invalid_variable_value_is_rejected(self, api_client, lawyer, document):
+        """Variable values are validated against their field type."""
+        api_client.force_authenticate(user=lawyer)
+        valor = document.variables.get(name_en='valor')
+
+        response = _autosave(api_client, document, {
+            'revision': 3,
+            'variables': [{'id': valor.pk, 'value': 'diez'}],
+        })
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        valor.refresh_from_db()
+        assert valor.value == '10'
+
+    def test_numeric_json_value_is_saved_as_text(self, api_client, lawyer, document):
+        """A JSON number is accepted for a variable and stored as its text."""
+        api_client.force_authenticate(user=lawyer)
+        valor = document.variables.get(name_en='valor')
+
+        response = _autosave(api_client, document, {
+            'revision': 3,
+            'variables': [{'id': valor.pk, 'value': 12.5}],
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        valor.refresh_from_db()
+        assert valor.value == '12.5'
+
+    @pytest.mark.parametrize('field_type, value', [
+        ('date', 20240101),
+        ('text', {'nombre': 'Ana'}),
+        ('text', True),
+    ])
+    def test_mistyped_variable_value_returns_field_errors(
+        self, api_client, lawyer, document, field_type, value
+    ):
+        """Values clean() cannot check are rejected per variable, not with a 500."""
+        api_client.force_authenticate(user=lawyer)
+        variable = DocumentVariable.objects.create(
+            document=document, name_en='campo', field_type=field_type, value='2024-01-01'
+        )
+
+        response = _autosave(api_client, document, {
+            'revision': 3,
+            'variables': [{'id': variable.pk, 'value': value}],
+        })
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data['variables']) == [variable.pk]
+        variable.refresh_from_db()
+        assert variable.value == '2024-01-01'
+
+    @pytest.mark.parametrize('payload, field', [
+        ({'content': None}, 'content'),
+        ({'content': 5}, 'content'),
+        ({'content': {}}, 'content'),
+        ({'title': ['Contrato']}, 'title'),
+        ({'title': 'x' * 201}, 'title'),
+    ])
+    def test_mistyped_content_or_title_returns_field_errors(
+        self, api_client, lawyer, document, payload, field
+    ):
+        """Content and title are type-checked here since no serializer runs."""
+        api_client.force_authenticate(user=lawyer)
+
+        response = _autosave(api_client, document, {'revision': 3, **payload})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(response.data) == [field]
+        document.refresh_from_db()
+        assert (document.revision, document.title) == (3, 'Contrato')
+
+    def test_noop_save_keeps_revision(self, api_client, lawyer, document):
+        """A payload without changes does not bump the revision."""
+        api_client.force_authenticate(user=lawyer)
+        response = _autosave(api_client, document, {'revision': 3, 'content_patch': []})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['revision'] == 3
+
+    def test_missing_revision_returns_bad_request(self, api_client, lawyer, document):
+        """The base revision is mandatory."""
+        api_client.force_authenticate(user=lawyer)
+        response = _autosave(api_client, document, {'content': '<p>x</p>'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_locked_document_is_forbidden(self, api_client, lawyer, document):
+        """Documents in signature states cannot be autosaved."""
+        document.state = 'PendingSignatures'
+        document.save(update_fields=['state'])
+        api_client.force_authenticate(user=lawyer)
+
+        response = _autosave(api_client, document, {'revision': 3, 'content': '<p>x</p>'})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_full_update_bumps_revision(self, api_client, lawyer, document):
+        """The regular update endpoint invalidates outstanding autosave patches."""
+        api_client.force_authenticate(user=lawyer)
+        url = reverse('update_dynamic_document', kwargs={'pk': document.pk})
+        response = api_client.patch(url, {'title': 'Nuevo'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['revision'] == 4
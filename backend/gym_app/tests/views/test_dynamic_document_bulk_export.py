@@ -0,0 +1,254 @@
+"""Tests for the bulk ZIP export of dynamic documents."""
+import io
+import json
+import threading
+import zipfile
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from gym_app.models import DocumentSignature, DocumentVariable, DynamicDocument, User
+from gym_app.utils import documents
+from gym_app.views.dynamic_documents import document_views, export_views
+
+pytestmark = pytest.mark.django_db
+
+URL_NAME = 'bulk-export-dynamic-documents'
+
+
+@pytest.fixture
+def lawyer():
+    """Lawyer who sees every document."""
+    return User.objects.create_user(
+        email='bulk_lawyer@test.com', password='pw', role='lawyer', is_gym_lawyer=True,
+    )
+
+
+@pytest.fixture
+def client_user():
+    """Client who only sees their own documents."""
+    return User.objects.create_user(email='bulk_client@test.com', password='pw', role='client')
+
+
+@pytest.fixture
+def contracts(lawyer, client_user):
+    """Two FullySigned contracts of the client and one draft."""
+    signed = []
+    for title in ('Contrato Beta', 'Contrato Alfa'):
+        document = DynamicDocument.objects.create(
+            title=title,
+            content='<p>Cliente: {{nombre}}</p>',
+            state='FullySigned',
+            created_by=lawyer,
+            assigned_to=client_user,
+            requires_signature=True,
+        )
+        DocumentVariable.objects.create(document=document, name_en='nombre', value='Ana')
+        DocumentSignature.objects.create(document=document, signer=lawyer, signed=True)
+        signed.append(document)
+    draft = DynamicDocument.objects.create(
+        title='Borrador', content='<p>x</p>', state='Draft', created_by=lawyer,
+    )
+    return signed + [draft]
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Replace WeasyPrint with a fake renderer; returns the rendered HTML list."""
+    rendered = []
+    lock = threading.Lock()
+
+    def fake_render(html_content, *, base_url):
+        with lock:
+            rendered.append(html_content)
+        return b'%PDF-fake ' + str(len(rendered)).encode()
+
+    monkeypatch.setattr(documents, 'render_html_to_pdf', fake_render)
+    return rendered
+
+
+def _export(api_client, user, **params):
+    api_client.force_authenticate(user=user)
+    return api_client.get(reverse(URL_NAME), params)
+
+
+def _archive(response):
+    return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+
+def _manifest(archive):
+    return json.loads(archive.read('manifest.json'))
+
+
+class TestBulkExport:
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_exports_the_list_filter_selection(
+        self, api_client, lawyer, client_user, contracts, renders, settings, workers
+    ):
+        """The list filters select the documents; inline and pooled renders agree."""
+        settings.BULK_EXPORT_WORKERS = workers
+        response = _export(
+            api_client, lawyer, state='FullySigned', client_id=client_user.pk, sort_by='name-asc',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/zip'
+        archive = _archive(response)
+        alfa, beta = contracts[1], contracts[0]
+        assert archive.namelist() == [
+            f'Contrato Alfa_{alfa.pk}.pdf', f'Contrato Beta_{beta.pk}.pdf', 'manifest.json',
+        ]
+        assert archive.read(f'Contrato Alfa_{alfa.pk}.pdf').startswith(b'%PDF-fake')
+        assert all('Cliente: Ana' in html for html in renders)
+
+    def test_manifest_describes_every_exported_document(self, api_client, lawyer, contracts, renders):
+        archive = _archive(_export(api_client, lawyer, state='FullySigned', sort_by='name-asc'))
+
+        manifest = _manifest(archive)
+        assert manifest['totals'] == {'ok': 2, 'skipped': 0, 'error': 0, 'cached': 0}
+        assert manifest['filters'] == {'state': 'FullySigned', 'sort_by': 'name-asc'}
+        assert [(entry['id'], entry['status'], entry['file']) for entry in manifest['documents']] == [
+            (contracts[1].pk, 'ok', f'Contrato Alfa_{contracts[1].pk}.pdf'),
+            (contracts[0].pk, 'ok', f'Contrato Beta_{contracts[0].pk}.pdf'),
+        ]
+
+    def test_ids_are_limited_to_visible_documents(self, api_client, client_user, contracts, renders):
+        own = DynamicDocument.objects.create(
+            title='Propio', content='<p>y</p>', state='Draft', created_by=client_user,
+        )
+        ids = ','.join(str(pk) for pk in (own.pk, contracts[2].pk))
+
+        archive = _archive(_export(api_client, client_user, ids=ids))
+
+        assert [entry['id'] for entry in _manifest(archive)['documents']] == [own.pk]
+
+    def test_reuses_renders_cached_by_single_downloads(self, api_client, lawyer, contracts, renders):
+        """A PDF already rendered by the single download is not rendered again."""
+        api_client.force_authenticate(user=lawyer)
+        single = api_client.get(
+            reverse('download_dynamic_document_pdf', kwargs={'pk': contracts[0].pk})
+        )
+        assert single.status_code == status.HTTP_200_OK
+        single_pdf = b''.join(single.streaming_content)
+
+        archive = _archive(_export(
+            api_client, lawyer, ids=f'{contracts[0].pk},{contracts[1].pk}', sort_by='name-asc',
+        ))
+
+        assert len(renders) == 2
+        assert archive.read(f'Contrato Beta_{contracts[0].pk}.pdf') == single_pdf
+        assert [entry['cached'] for entry in _manifest(archive)['documents']] == [False, True]
+
+    def test_export_cache_writes_are_capped(self, api_client, lawyer, contracts, renders, settings):
+        """Once an archive used its cache budget, later renders are not stored."""
+        settings.BULK_EXPORT_WORKERS = 1
+        settings.BULK_EXPORT_CACHE_MAX_BYTES = len(b'%PDF-fake 1')
+        ids = f'{contracts[0].pk},{contracts[1].pk}'
+        _archive(_export(api_client, lawyer, ids=ids, sort_by='name-asc'))
+
+        archive = _archive(_export(api_client, lawyer, ids=ids, sort_by='name-asc'))
+
+        assert [entry['cached'] for entry in _manifest(archive)['documents']] == [True, False]
+        assert len(renders) == 3
+
+    def test_signed_bundles_skip_documents_not_fully_signed(
+        self, api_client, lawyer, contracts, renders, monkeypatch
+    ):
+        """Signed bundles are built for FullySigned documents; the rest are skipped."""
+        monkeypatch.setattr(export_views, 'create_signatures_pdf', lambda document, request: io.BytesIO(b'firmas'))
+        monkeypatch.setattr(
+            export_views, 'assemble_signatures_bundle',
+            lambda document, original, signatures: io.BytesIO(original.read() + b'+' + signatures.read()),
+        )
+
+        archive = _archive(_export(api_client, lawyer, file_type='signed', sort_by='name-asc'))
+
+        alfa = contracts[1]
+        assert archive.read(f'Documento_Completo_Contrato Alfa_{alfa.pk}.pdf').endswith(b'+firmas')
+        statuses = {entry['title']: entry['status'] for entry in _manifest(archive)['documents']}
+        assert statuses == {'Borrador': 'skipped', 'Contrato Alfa': 'ok', 'Contrato Beta': 'ok'}
+
+    def test_render_failures_are_reported_in_the_manifest(self, api_client, lawyer, contracts, monkeypatch):
+        """A failed render is listed as an error and does not abort the archive."""
+        def flaky_render(html_content, *, base_url):
+            if 'Borrador' in html_content:
+                raise RuntimeError('render boom')
+            return b'%PDF-ok'
+
+        monkeypatch.setattr(documents, 'render_html_to_pdf', flaky_render)
+
+        archive = _archive(_export(api_client, lawyer))
+
+        manifest = _manifest(archive)
+        assert manifest['totals']['ok'] == 2
+        failed = [entry for entry in manifest['documents'] if entry['status'] == 'error']
+        assert [(entry['title'], entry['detail']) for entry in failed] == [('Borrador', 'render boom')]
+        assert len(archive.namelist()) == 3
+
+    def test_pool_keeps_the_selection_order(self, api_client, lawyer, contracts, settings, monkeypatch):
+        """Entries follow the selection order even when renders finish out of order."""
+        settings.BULK_EXPORT_WORKERS = 3
+
+        beta_rendered = threading.Event()
+
+        def alfa_finishes_last(html_content, *, base_url):
+            if 'Contrato Alfa' in html_content:
+                beta_rendered.wait(timeout=5)
+            elif 'Contrato Beta' in html_content:
+                beta_rendered.set()
+            return b'%PDF-ok'
+
+        monkeypatch.setattr(documents, 'render_html_to_pdf', alfa_finishes_last)
+
+        archive = _archive(_export(api_client, lawyer, sort_by='name-asc'))
+
+        assert [name.split('_')[0] for name in archive.namelist()] == [
+            'Borrador', 'Contrato Alfa', 'Contrato Beta', 'manifest.json',
+        ]
+
+    def test_word_export_uses_the_docx_engine(self, api_client, lawyer, contracts):
+        archive = _archive(_export(api_client, lawyer, file_type='word', ids=str(contracts[0].pk)))
+
+        assert archive.namelist() == [f'Contrato Beta_{contracts[0].pk}.docx', 'manifest.json']
+        assert archive.read(archive.namelist()[0])[:2] == b'PK'
+
+
+class TestBulkExportValidation:
+    def test_unsupported_file_type_returns_400(self, api_client, lawyer, contracts):
+        response = _export(api_client, lawyer, file_type='xlsx')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_ids_return_400(self, api_client, lawyer, contracts):
+        response = _export(api_client, lawyer, ids='1,abc')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_selection_above_the_limit_returns_400(self, api_client, lawyer, contracts, settings):
+        settings.BULK_EXPORT_MAX_DOCUMENTS = 2
+        response = _export(api_client, lawyer)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'limited to 2' in response.data['detail']
+
+    def test_empty_selection_returns_404(self, api_client, lawyer, contracts):
+        response = _export(api_client, lawyer, state='Rejected')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_requires_authentication(self, api_client):
+        response = api_client.get(reverse(URL_NAME))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_list_view_uses_the_shared_filters(api_client, lawyer, contracts, monkeypatch):
+    calls = []
+    original = document_views.filter_document_queryset
+
+    def spy(queryset, params, user):
+        calls.append(params.get('state'))
+        return original(queryset, params, user)
+
+    monkeypatch.setattr(document_views, 'filter_document_queryset', spy)
+    api_client.force_authenticate(user=lawyer)
+    response = api_client.get(reverse('list_dynamic_documents'), {'state': 'Draft'})
+
+    assert calls == ['Draft']
+    assert response.data['totalItems'] == 1
@@ -404,6 +404,44 @@ class TestListRelatedAndAvailableDocuments:
         assert response.status_code == status.HTTP_200_OK
         assert response.data == []
 
+    @pytest.mark.contract
+    def test_list_available_documents_paginated_compact(self, api_client, client_user):
+        """With ``page`` the picker gets a paginated, compact payload filtered by search."""
+        source = DynamicDocument.objects.create(title="Source", content="<p>src</p>", state="Completed", created_by=client_user)
+        for idx in range(3):
+            DynamicDocument.objects.create(title=f"Contrato {idx}", content="<p>x</p>", state="Completed", created_by=client_user)
+        DynamicDocument.objects.create(title="Otro", content="<p>x</p>", state="Completed", created_by=client_user)
+
+        api_client.force_authenticate(user=client_user)
+        url = reverse("list-available-documents-for-relationship", kwargs={"document_id": source.id})
+        response = api_client.get(url, {"page": 1, "limit": 2, "search": "contrato"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["totalItems"] == 3
+        assert response.data["totalPages"] == 2
+        assert len(response.data["items"]) == 2
+        assert "content" not in response.data["items"][0]
+        assert "variables" not in response.data["items"][0]
+
+    @pytest.mark.edge
+    def test_list_available_documents_query_count_is_constant(
+        self, api_client, client_user, django_assert_max_num_queries
+    ):
+        """Candidate count does not change the number of queries issued."""
+        source = DynamicDocument.objects.create(title="Source", content="<p>src</p>", state="Completed", created_by=client_user)
+        for idx in range(15):
+            doc = DynamicDocument.objects.create(title=f"Doc {idx}", content="<p>x</p>", state="Completed", created_by=client_user)
+            if idx % 3 == 0:
+                DocumentRelationship.objects.create(source_document=source, target_document=doc, created_by=client_user)
+
+        api_client.force_authenticate(user=client_user)
+        url = reverse("list-available-documents-for-relationship", kwargs={"document_id": source.id})
+        with django_assert_max_num_queries(8):
+            response = api_client.get(url, {"page": 1, "limit": 50})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["totalItems"] == 10
+
 
 @pytest.mark.django_db
 @pytest.mark.integration
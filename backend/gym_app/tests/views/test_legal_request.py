@@ -1032,10 +1032,10 @@ class TestLegalRequestRest:
         assert content_disposition.startswith('attachment; filename="')
         assert content_disposition.endswith('.txt"')
         assert response['Content-Type'] == 'text/plain'
-        assert response.content == b'Test file content'
+        assert b''.join(response.streaming_content) == b'Test file content'
 
     @patch('gym_app.views.legal_request.os.path.exists', return_value=True)
-    @patch('gym_app.views.legal_request.open', side_effect=Exception('IO error'))
+    @patch('gym_app.utils.file_delivery.open', side_effect=Exception('IO error'))
     @pytest.mark.edge
     def test_download_legal_request_file_read_error_returns_500(self, mock_open, mock_exists, api_client, user, legal_request):
         """If reading the file content fails, the endpoint should return 500."""
@@ -2230,6 +2230,118 @@ class TestListLegalRequestsEdges:
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
+# ---------------------------------------------------------------------------
+# list_legal_requests pagination, annotated counts and request-number search
+# ---------------------------------------------------------------------------
+@pytest.mark.django_db
+class TestListLegalRequestsPagination:
+    """The inbox is paginated and its per-row counts come from annotations."""
+
+    def _create_requests(self, user, legal_request_type, legal_discipline, count):
+        return [
+            LegalRequest.objects.create(
+                user=user,
+                request_type=legal_request_type,
+                discipline=legal_discipline,
+                description=f'Request {i}',
+            )
+            for i in range(count)
+        ]
+
+    def test_pages_are_bounded_and_report_has_more(
+        self, api_client, lawyer_user, user, legal_request_type, legal_discipline
+    ):
+        created = self._create_requests(user, legal_request_type, legal_discipline, 5)
+        api_client.force_authenticate(user=lawyer_user)
+        url = reverse('list-legal-requests')
+
+        first = api_client.get(url, {'page_size': 2})
+        last = api_client.get(url, {'page_size': 2, 'page': 3})
+
+        assert first.data['count'] == 5
+        assert first.data['total_pages'] == 3
+        assert first.data['has_more'] is True
+        assert [r['id'] for r in first.data['requests']] == [created[4].id, created[3].id]
+        assert [r['id'] for r in last.data['requests']] == [created[0].id]
+        assert last.data['has_more'] is False
+
+    def test_page_past_the_end_is_empty(
+        self, api_client, user, legal_request_type, legal_discipline
+    ):
+        self._create_requests(user, legal_request_type, legal_discipline, 3)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('list-legal-requests'), {'page': 3, 'page_size': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['requests'] == []
+        assert response.data['has_more'] is False
+        assert (response.data['count'], response.data['current_page']) == (3, 3)
+
+    def test_invalid_page_falls_back_to_first(
+        self, api_client, user, legal_request_type, legal_discipline
+    ):
+        self._create_requests(user, legal_request_type, legal_discipline, 1)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('list-legal-requests'), {'page': 'abc', 'page_size': 'x'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['current_page'] == 1
+        assert response.data['page_size'] == 20
+
+    def test_response_and_file_counts_are_annotated(
+        self, api_client, lawyer_user, user, legal_request_type, legal_discipline
+    ):
+        legal_request = self._create_requests(user, legal_request_type, legal_discipline, 1)[0]
+        for text in ('one', 'two'):
+            LegalRequestResponse.objects.create(
+                legal_request=legal_request, response_text=text, user=lawyer_user, user_type='lawyer',
+            )
+        legal_request.files.add(LegalRequestFiles.objects.create(
+            file=SimpleUploadedFile('a.pdf', b'%PDF-1.4', content_type='application/pdf'),
+        ))
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse('list-legal-requests'))
+
+        row = response.data['requests'][0]
+        assert row['response_count'] == 2
+        assert row['file_count'] == 1
+
+    def test_query_count_is_independent_of_history_size(
+        self, api_client, lawyer_user, user, legal_request_type, legal_discipline
+    ):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._create_requests(user, legal_request_type, legal_discipline, 3)
+        api_client.force_authenticate(user=lawyer_user)
+        url = reverse('list-legal-requests')
+        with CaptureQueriesContext(connection) as small:
+            api_client.get(url)
+        self._create_requests(user, legal_request_type, legal_discipline, 30)
+        with CaptureQueriesContext(connection) as large:
+            response = api_client.get(url)
+
+        assert len(response.data['requests']) == 20
+        assert len(large) == len(small)
+
+    def test_request_number_search_uses_prefix_match(
+        self, api_client, lawyer_user, user, legal_request_type, legal_discipline
+    ):
+        first, second = self._create_requests(user, legal_request_type, legal_discipline, 2)
+        LegalRequest.objects.filter(pk=first.pk).update(request_number='SOL-2031-001')
+        LegalRequest.objects.filter(pk=second.pk).update(
+            request_number='SOL-2031-002', description='mentions sol-2031-001',
+        )
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse('list-legal-requests'), {'search': 'sol-2031-001'})
+
+        assert [r['id'] for r in response.data['requests']] == [first.id]
+
+
 # ---------------------------------------------------------------------------
 # update_legal_request_status exception (lines 618-620)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,120 @@
+"""Organization and corporate-request list endpoints run without N+1 queries.
+
+The query inspector runs in raising mode, so any repeated per-row query or a
+view exceeding its ``@query_budget`` fails the request.
+"""
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from gym_app.models import (
+    CorporateRequest,
+    CorporateRequestResponse,
+    CorporateRequestType,
+    Organization,
+    OrganizationInvitation,
+    OrganizationMembership,
+    User,
+)
+
+ROWS = 6
+
+
+@pytest.fixture(autouse=True)
+def raising_inspector(settings):
+    settings.QUERY_INSPECTOR_ENABLED = True
+    settings.QUERY_INSPECTOR_RAISE = True
+    settings.QUERY_INSPECTOR_NPLUSONE_THRESHOLD = 3
+
+
+@pytest.fixture
+def populated(corporate_user, client_user):
+    """ROWS organizations with members, invitations and requests with responses."""
+    request_type = CorporateRequestType.objects.create(name="Budget Type")
+    organizations = []
+    for index in range(ROWS):
+        member = User.objects.create_user(
+            email=f"member{index}@budget.test", password="testpassword", role="client",
+        )
+        org = Organization.objects.create(
+            title=f"Org {index}", description="Desc", corporate_client=corporate_user,
+        )
+        OrganizationMembership.objects.create(organization=org, user=client_user, role="MEMBER")
+        OrganizationMembership.objects.create(organization=org, user=member, role="MEMBER")
+        OrganizationInvitation.objects.create(
+            organization=org, invited_user=member, invited_by=corporate_user,
+            status="PENDING", expires_at=timezone.now() + timezone.timedelta(days=10),
+        )
+        corporate_request = CorporateRequest.objects.create(
+            client=client_user, organization=org, corporate_client=corporate_user,
+            request_type=request_type, title=f"Req {index}", description="Desc",
+        )
+        for _ in range(index % 3):
+            CorporateRequestResponse.objects.create(
+                corporate_request=corporate_request, user=corporate_user,
+                user_type="corporate_client", response_text="Ok",
+            )
+        organizations.append(org)
+    return organizations
+
+
+@pytest.mark.django_db
+class TestOrganizationListBudgets:
+    def test_my_organizations_uses_annotated_counts(self, api_client, corporate_user, populated):
+        api_client.force_authenticate(user=corporate_user)
+
+        response = api_client.get(reverse("get-my-organizations"))
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data["results"]
+        assert len(results) == ROWS
+        assert {o["member_count"] for o in results} == {2}
+        assert {o["pending_invitations_count"] for o in results} == {1}
+
+    def test_my_memberships_uses_annotated_counts(self, api_client, client_user, populated):
+        api_client.force_authenticate(user=client_user)
+
+        response = api_client.get(reverse("get-my-memberships"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_count"] == ROWS
+        assert [o["title"] for o in response.data["organizations"]][0] == f"Org {ROWS - 1}"
+        assert {o["member_count"] for o in response.data["organizations"]} == {2}
+
+    def test_organization_detail_prefetches_members(self, api_client, corporate_user, populated):
+        api_client.force_authenticate(user=corporate_user)
+
+        response = api_client.get(reverse("get-organization-detail", args=[populated[0].id]))
+
+        organization = response.data["organization"]
+        assert len(organization["members"]) == 2
+        assert organization["member_count"] == 2
+        assert organization["recent_requests_count"] == 1
+
+    def test_client_organizations_join_corporate_client(self, api_client, client_user, populated):
+        api_client.force_authenticate(user=client_user)
+
+        response = api_client.get(reverse("client-get-my-organizations"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_count"] == ROWS
+
+
+@pytest.mark.django_db
+class TestCorporateRequestListBudgets:
+    @pytest.mark.parametrize(
+        ("url_name", "user_fixture"),
+        [
+            ("corporate-get-received-requests", "corporate_user"),
+            ("client-get-my-corporate-requests", "client_user"),
+        ],
+    )
+    def test_list_uses_annotated_response_count(self, api_client, populated, url_name, user_fixture, request):
+        api_client.force_authenticate(user=request.getfixturevalue(user_fixture))
+
+        response = api_client.get(reverse(url_name))
+
+        assert response.status_code == status.HTTP_200_OK
+        counts = {r["title"]: r["response_count"] for r in response.data["results"]}
+        assert counts == {f"Req {index}": index % 3 for index in range(ROWS)}
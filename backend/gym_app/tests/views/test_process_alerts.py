@@ -2,11 +2,12 @@
 import json
 
 import pytest
+from django.db import connection
 from django.urls import reverse
 from freezegun import freeze_time
 from rest_framework import status
 
-from gym_app.models import Case, Process, Stage, StageAlert, User
+from gym_app.models import Case, Notification, Process, Stage, StageAlert, User
 
 
 @pytest.fixture
@@ -211,6 +212,157 @@ class TestUpdateProcessAlerts:
         assert new_stages[-1].alert.description == 'Heads up'
 
 
+@pytest.mark.django_db
+class TestUpdateProcessStageDiff:
+    """update_process applies stages as a keyed diff instead of recreating them."""
+
+    @pytest.fixture
+    def process(self, lawyer_user, client_user, case_type):
+        process = Process.objects.create(
+            authority='C', plaintiff='P', defendant='D', ref='DIFF-1',
+            lawyer=lawyer_user, case=case_type, subcase='Sub',
+        )
+        process.clients.add(client_user)
+        for stage_status, stage_date in (('Apertura', '2099-06-01'), ('Audiencia', '2099-06-15')):
+            stage = Stage.objects.create(status=stage_status, date=stage_date)
+            process.stages.add(stage)
+            StageAlert.objects.create(stage=stage)
+        StageAlert.objects.filter(stage__status='Audiencia').update(notified_3_days=True)
+        return process
+
+    def _update(self, api_client, process, stages, **overrides):
+        payload = {'stages': stages, 'alertIsActive': True, **overrides}
+        return api_client.put(
+            reverse('update-process', args=[process.id]),
+            {'mainData': json.dumps(payload)},
+            format='multipart',
+        )
+
+    def _stages(self, process):
+        links = Process.stages.through.objects.filter(process=process).order_by('id')
+        return [link.stage for link in links.select_related('stage__alert')]
+
+    def test_unchanged_stages_keep_ids_and_alert_flags(self, api_client, admin_user, process):
+        api_client.force_authenticate(user=admin_user)
+        before = [s.id for s in self._stages(process)]
+
+        response = self._update(api_client, process, [
+            {'status': 'Apertura', 'date': '2099-06-01'},
+            {'status': 'Audiencia', 'date': '2099-06-15'},
+        ])
+
+        assert response.status_code == status.HTTP_200_OK
+        after = self._stages(process)
+        assert [s.id for s in after] == before
+        assert after[-1].alert.notified_3_days is True
+
+    def test_appended_stage_is_the_only_new_row_and_notification(
+        self, api_client, admin_user, client_user, process
+    ):
+        api_client.force_authenticate(user=admin_user)
+        before = [s.id for s in self._stages(process)]
+
+        response = self._update(api_client, process, [
+            {'status': 'Apertura', 'date': '2099-06-01'},
+            {'status': 'Audiencia', 'date': '2099-06-15'},
+            {'status': 'Alegatos', 'date': '2099-07-01'},
+        ])
+
+        assert response.status_code == status.HTTP_200_OK
+        after = self._stages(process)
+        assert [s.id for s in after[:2]] == before
+        assert after[-1].status == 'Alegatos'
+        assert after[-1].alert.next_fire_at is not None
+        messages = list(Notification.objects.filter(
+            user=client_user, title__startswith='Nueva etapa',
+        ).values_list('message', flat=True))
+        assert len(messages) == 1
+        assert 'Alegatos' in messages[0]
+
+    def test_appended_stage_is_linked_without_bulk_insert_ids(
+        self, api_client, admin_user, process, monkeypatch
+    ):
+        """Backends that return no ids from bulk inserts (MySQL) still link new stages."""
+        monkeypatch.setattr(type(connection.features), 'can_return_rows_from_bulk_insert', False)
+        api_client.force_authenticate(user=admin_user)
+
+        response = self._update(api_client, process, [
+            {'status': 'Apertura', 'date': '2099-06-01'},
+            {'status': 'Audiencia', 'date': '2099-06-15'},
+            {'status': 'Alegatos', 'date': '2099-07-01'},
+        ])
+
+        assert response.status_code == status.HTTP_200_OK
+        after = self._stages(process)
+        assert [s.status for s in after] == ['Apertura', 'Audiencia', 'Alegatos']
+        assert after[-1].alert.is_active is True
+
+    def test_edit_by_id_updates_in_place_and_resets_flags_on_new_date(
+        self, api_client, admin_user, process
+    ):
+        api_client.force_authenticate(user=admin_user)
+        first, last = self._stages(process)
+
+        response = self._update(api_client, process, [
+            {'id': first.id, 'status': 'Apertura', 'date': '2099-06-01'},
+            {'id': last.id, 'status': 'Audiencia aplazada', 'date': '2099-06-20'},
+        ])
+
+        assert response.status_code == status.HTTP_200_OK
+        last.refresh_from_db()
+        last.alert.refresh_from_db()
+        assert last.status == 'Audiencia aplazada'
+        assert str(last.date) == '2099-06-20'
+        assert last.alert.notified_3_days is False
+        assert not Notification.objects.filter(title__startswith='Nueva etapa').exists()
+
+    def test_removed_stage_is_deleted_and_reorder_moves_current_stage(
+        self, api_client, admin_user, process
+    ):
+        api_client.force_authenticate(user=admin_user)
+        first, last = self._stages(process)
+        extra = Stage.objects.create(status='Pruebas', date='2099-06-10')
+        process.stages.add(extra)
+
+        response = self._update(api_client, process, [
+            {'id': last.id, 'status': 'Audiencia', 'date': '2099-06-15'},
+            {'id': first.id, 'status': 'Apertura', 'date': '2099-06-01'},
+        ])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not Stage.objects.filter(id=extra.id).exists()
+        assert [s.id for s in self._stages(process)] == [last.id, first.id]
+
+    def test_omitted_stages_are_left_untouched(self, api_client, admin_user, process):
+        api_client.force_authenticate(user=admin_user)
+        before = [s.id for s in self._stages(process)]
+
+        response = api_client.put(
+            reverse('update-process', args=[process.id]), {'plaintiff': 'Nuevo'}, format='json',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [s.id for s in self._stages(process)] == before
+
+    def test_activation_is_notified_only_on_transition(
+        self, api_client, admin_user, lawyer_user, process
+    ):
+        api_client.force_authenticate(user=admin_user)
+        stages = [
+            {'status': 'Apertura', 'date': '2099-06-01'},
+            {'status': 'Audiencia', 'date': '2099-06-15'},
+        ]
+
+        self._update(api_client, process, stages)
+        self._update(api_client, process, stages, alertIsActive=False)
+        self._update(api_client, process, stages)
+
+        activations = Notification.objects.filter(
+            user=lawyer_user, title__startswith='Alerta activada',
+        )
+        assert activations.count() == 1
+
+
 @pytest.mark.django_db
 class TestStageAlertNotifications:
     """B2 regression: lawyer (actor) receives the process_alert notification.
@@ -0,0 +1,223 @@
+"""Tests for process_list filters, cursor pagination and process_detail.
+
+Covers:
+- Legacy (unpaginated) response is unchanged when no pagination params are sent.
+- cursor/page_size switch to the compact, cursor-paginated format.
+- Filters: lawyer, client, case type, current stage status, closed, search.
+- process_detail returns the full serializer and enforces access.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from gym_app.models import Case, Process, Stage, User
+
+
+@pytest.fixture
+def other_lawyer(db):
+    """Other lawyer."""
+    return User.objects.create_user(
+        email="other_lawyer@pagination.test",
+        password="testpassword",
+        role="lawyer",
+        is_gym_lawyer=True,
+    )
+
+
+def _make_process(ref, lawyer, case, clients=(), stages=(), **fields):
+    process = Process.objects.create(
+        authority="Court",
+        plaintiff=fields.pop("plaintiff", "Plaintiff"),
+        defendant=fields.pop("defendant", "Defendant"),
+        ref=ref,
+        lawyer=lawyer,
+        case=case,
+        **fields,
+    )
+    process.clients.add(*clients)
+    for status_label in stages:
+        process.stages.add(Stage.objects.create(status=status_label))
+    return process
+
+
+@pytest.fixture
+def processes(lawyer_user, other_lawyer, client_user, case_type):
+    """Five processes with mixed lawyers, clients, case types and stages."""
+    other_case = Case.objects.create(type="Laboral")
+    return [
+        _make_process("REF-0", lawyer_user, case_type, [client_user], ["Admisión", "Pruebas"]),
+        _make_process("REF-1", lawyer_user, other_case, [], ["Admisión", "Fallo"]),
+        _make_process("REF-2", other_lawyer, case_type, [client_user], ["Admisión"],
+                      plaintiff="Acme S.A.S."),
+        _make_process("REF-3", other_lawyer, other_case, [], []),
+        _make_process("REF-4", lawyer_user, case_type, [], ["Pruebas", "Admisión"],
+                      defendant="Banco Central"),
+    ]
+
+
+def _refs(response):
+    data = response.data
+    items = data["results"] if isinstance(data, dict) else data
+    return sorted(item["ref"] for item in items)
+
+
+@pytest.mark.django_db
+class TestProcessListLegacyFormat:
+    """Without pagination params the response keeps the full-array contract."""
+
+    def test_returns_full_array_with_stages(self, api_client, lawyer_user, processes):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == 5
+        assert "stages" in response.data[0]
+        assert "case_files" in response.data[0]
+
+    def test_filters_apply_to_legacy_format(self, api_client, lawyer_user, processes):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"), {"closed": "true"})
+
+        assert _refs(response) == ["REF-1"]
+
+
+@pytest.mark.django_db
+class TestProcessListPagination:
+    """cursor/page_size switch to the compact, cursor-paginated representation."""
+
+    def test_pages_follow_next_cursor_without_gaps(self, api_client, lawyer_user, processes):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"), {"page_size": 2})
+        seen = [item["ref"] for item in response.data["results"]]
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            seen.extend(item["ref"] for item in response.data["results"])
+
+        assert seen == ["REF-4", "REF-3", "REF-2", "REF-1", "REF-0"]
+
+    def test_compact_item_contains_only_current_stage(self, api_client, lawyer_user, processes):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"), {"page_size": 10})
+
+        item = next(i for i in response.data["results"] if i["ref"] == "REF-4")
+        assert "stages" not in item
+        assert "case_files" not in item
+        assert item["current_stage"]["status"] == "Admisión"
+        assert item["stage_count"] == 2
+        assert set(item["lawyer"]) == {"id", "email", "first_name", "last_name"}
+        empty = next(i for i in response.data["results"] if i["ref"] == "REF-3")
+        assert empty["current_stage"] is None
+        assert empty["stage_count"] == 0
+
+    def test_page_size_is_capped(self, api_client, lawyer_user, processes):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"), {"page_size": 10_000})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 5
+
+    def test_query_count_does_not_grow_with_page_size(self, api_client, lawyer_user, case_type):
+        api_client.force_authenticate(user=lawyer_user)
+        for i in range(3):
+            _make_process(f"Q-{i}", lawyer_user, case_type, [], ["Admisión"])
+
+        with CaptureQueriesContext(connection) as small:
+            api_client.get(reverse("process-list"), {"page_size": 10})
+        for i in range(3, 15):
+            _make_process(f"Q-{i}", lawyer_user, case_type, [], ["Admisión"])
+        with CaptureQueriesContext(connection) as large:
+            api_client.get(reverse("process-list"), {"page_size": 20})
+
+        assert len(large) == len(small)
+
+    def test_invalid_cursor_returns_404(self, api_client, lawyer_user, processes):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"), {"cursor": "not-a-cursor"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_client_only_pages_through_own_processes(self, api_client, client_user, processes):
+        api_client.force_authenticate(user=client_user)
+
+        response = api_client.get(reverse("process-list"), {"page_size": 10})
+
+        assert _refs(response) == ["REF-0", "REF-2"]
+
+
+@pytest.mark.django_db
+class TestProcessListFilters:
+    """Query-string filters narrow the listing in the paginated format."""
+
+    @pytest.mark.parametrize(
+        ("params", "expected"),
+        [
+            ({"status": "admisión"}, ["REF-2", "REF-4"]),
+            ({"closed": "false"}, ["REF-0", "REF-2", "REF-3", "REF-4"]),
+            ({"search": "acme"}, ["REF-2"]),
+            ({"search": "banco"}, ["REF-4"]),
+            ({"search": "ref-1"}, ["REF-1"]),
+        ],
+    )
+    def test_stage_and_search_filters(self, api_client, lawyer_user, processes, params, expected):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"), {"page_size": 10, **params})
+
+        assert _refs(response) == expected
+
+    def test_lawyer_client_and_case_type_filters(
+        self, api_client, lawyer_user, other_lawyer, client_user, case_type, processes
+    ):
+        api_client.force_authenticate(user=lawyer_user)
+        url = reverse("process-list")
+
+        by_lawyer = api_client.get(url, {"page_size": 10, "lawyer_id": other_lawyer.id})
+        by_client = api_client.get(url, {"page_size": 10, "client_id": client_user.id})
+        by_case = api_client.get(url, {"page_size": 10, "case_type_id": case_type.id})
+
+        assert _refs(by_lawyer) == ["REF-2", "REF-3"]
+        assert _refs(by_client) == ["REF-0", "REF-2"]
+        assert _refs(by_case) == ["REF-0", "REF-2", "REF-4"]
+
+    def test_non_integer_id_filter_returns_400(self, api_client, lawyer_user, processes):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-list"), {"lawyer_id": "abc"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestProcessDetail:
+    """process_detail returns the full representation to authorized users."""
+
+    def test_client_of_process_gets_full_representation(self, api_client, client_user, processes):
+        api_client.force_authenticate(user=client_user)
+
+        response = api_client.get(reverse("process-detail", args=[processes[0].id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [s["status"] for s in response.data["stages"]] == ["Admisión", "Pruebas"]
+
+    def test_unrelated_client_is_forbidden(self, api_client, client_user, processes):
+        api_client.force_authenticate(user=client_user)
+
+        response = api_client.get(reverse("process-detail", args=[processes[1].id]))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_missing_process_returns_404(self, api_client, lawyer_user):
+        api_client.force_authenticate(user=lawyer_user)
+
+        response = api_client.get(reverse("process-detail", args=[999999]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
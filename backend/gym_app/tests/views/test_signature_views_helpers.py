@@ -842,7 +842,7 @@ class TestSubscriptionEdgeCases:
         ).hexdigest()
 
         with mock.patch(
-            "gym_app.views.subscription.Subscription.objects.get",
+            "gym_app.views.subscription.WompiWebhookEvent.objects.get_or_create",
             side_effect=Exception("unexpected"),
         ):
             response = api_client.post(
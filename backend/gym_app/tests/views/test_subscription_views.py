@@ -12,7 +12,7 @@ from django.urls import reverse
 from requests.exceptions import RequestException
 from rest_framework import status
 
-from gym_app.models import PaymentHistory, Subscription
+from gym_app.models import PaymentHistory, Subscription, WompiWebhookEvent
 
 User = get_user_model()
 FIXED_BILLING_DATE = date(2099, 1, 1)
@@ -989,3 +989,94 @@ class TestSubscriptionRegressionScenarios:
                 raw, content_type='application/json',
                 HTTP_X_WOMPI_SIGNATURE=sig)
         assert r.status_code == 500
+
+
+@pytest.mark.django_db
+class TestWompiWebhookEventLog:
+    """Webhook deliveries are logged once per transaction status and processed via Huey."""
+
+    def _post(self, api_client, settings, transaction_id, transaction_status, reference):
+        raw = json.dumps({
+            "event": "transaction.updated",
+            "data": {"transaction": {
+                "id": transaction_id, "status": transaction_status, "reference": reference,
+            }},
+        })
+        sig = hmac.new(settings.WOMPI_EVENTS_KEY.encode(), raw.encode(), hashlib.sha256).hexdigest()
+        return api_client.post(
+            reverse("subscription-webhook"), raw,
+            content_type="application/json", HTTP_X_WOMPI_SIGNATURE=sig,
+        )
+
+    def test_event_is_logged_with_payload(self, api_client, settings, subscription_user):
+        sub = Subscription.objects.create(
+            user=subscription_user, plan_type="cliente", status="expired",
+            next_billing_date=FIXED_BILLING_DATE, amount=Decimal("50000.00"),
+        )
+
+        response = self._post(api_client, settings, "trx_log", "APPROVED", f"SUB-{sub.id}-1")
+
+        assert response.status_code == 200
+        event = WompiWebhookEvent.objects.get()
+        assert (event.transaction_id, event.transaction_status) == ("trx_log", "APPROVED")
+        assert event.event_type == "transaction.updated"
+        assert event.payload["data"]["transaction"]["reference"] == f"SUB-{sub.id}-1"
+        assert event.status == "processed"
+
+    def test_redelivered_event_is_processed_once(self, api_client, settings, subscription_user):
+        sub = Subscription.objects.create(
+            user=subscription_user, plan_type="cliente", status="expired",
+            next_billing_date=FIXED_BILLING_DATE, amount=Decimal("50000.00"),
+        )
+        reference = f"SUB-{sub.id}-1"
+
+        with mock.patch(
+            "gym_app.tasks.apply_wompi_transaction", return_value="processed"
+        ) as apply_transaction:
+            first = self._post(api_client, settings, "trx_dup", "APPROVED", reference)
+            second = self._post(api_client, settings, "trx_dup", "APPROVED", reference)
+
+        assert first.json()["message"] == "Webhook received"
+        assert second.status_code == 200
+        assert second.json()["message"] == "Duplicate event"
+        assert apply_transaction.call_count == 1
+        assert WompiWebhookEvent.objects.count() == 1
+
+    def test_new_status_of_same_transaction_is_processed(self, api_client, settings, subscription_user):
+        sub = Subscription.objects.create(
+            user=subscription_user, plan_type="cliente", status="active",
+            next_billing_date=FIXED_BILLING_DATE, amount=Decimal("50000.00"),
+        )
+        reference = f"SUB-{sub.id}-1"
+
+        self._post(api_client, settings, "trx_seq", "PENDING", reference)
+        self._post(api_client, settings, "trx_seq", "DECLINED", reference)
+
+        assert WompiWebhookEvent.objects.filter(transaction_id="trx_seq").count() == 2
+        sub.refresh_from_db()
+        assert sub.status == "expired"
+
+    def test_failed_event_is_requeued_on_redelivery(self, api_client, settings, subscription_user):
+        sub = Subscription.objects.create(
+            user=subscription_user, plan_type="cliente", status="expired",
+            next_billing_date=FIXED_BILLING_DATE, amount=Decimal("50000.00"),
+        )
+        WompiWebhookEvent.objects.create(
+            transaction_id="trx_retry", transaction_status="APPROVED",
+            reference=f"SUB-{sub.id}-1", status="failed", attempts=1,
+        )
+
+        response = self._post(api_client, settings, "trx_retry", "APPROVED", f"SUB-{sub.id}-1")
+
+        assert response.json()["message"] == "Webhook received"
+        event = WompiWebhookEvent.objects.get(transaction_id="trx_retry")
+        assert event.status == "processed"
+        assert event.attempts == 2
+        sub.refresh_from_db()
+        assert sub.status == "active"
+
+    def test_missing_transaction_id_is_rejected(self, api_client, settings):
+        response = self._post(api_client, settings, None, "APPROVED", "SUB-1-1")
+
+        assert response.status_code == 400
+        assert WompiWebhookEvent.objects.count() == 0
@@ -0,0 +1,239 @@
+"""Tests for chunked, resumable upload sessions."""
+import json
+import os
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from gym_app.models import (
+    Case,
+    LegalDiscipline,
+    LegalRequest,
+    LegalRequestType,
+    Process,
+    Service,
+    ServiceField,
+    ServiceRequestFieldFile,
+    ServiceStage,
+    UploadSession,
+    User,
+)
+
+pytestmark = pytest.mark.django_db
+
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 4000 + b"\n%%EOF\n"
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def client_user():
+    return User.objects.create_user(
+        email="uploader@example.com", password="testpassword", role="client",
+    )
+
+
+@pytest.fixture
+def legal_request(client_user):
+    return LegalRequest.objects.create(
+        user=client_user,
+        request_type=LegalRequestType.objects.create(name="Consulta"),
+        discipline=LegalDiscipline.objects.create(name="Civil"),
+        description="Necesito asesoría",
+    )
+
+
+def _create_session(api_client, target, target_id=None, filename="escaneo.pdf", size=len(PDF_BYTES)):
+    return api_client.post(
+        reverse("upload-session-create"),
+        {"filename": filename, "size": size, "target": target, "target_id": target_id},
+        format="json",
+    )
+
+
+def _put_chunk(api_client, session_id, offset, data):
+    return api_client.put(
+        reverse("upload-session-chunk", kwargs={"session_id": session_id}),
+        data=data,
+        content_type="application/octet-stream",
+        HTTP_UPLOAD_OFFSET=str(offset),
+    )
+
+
+def _upload_all(api_client, session_id, payload, chunk_size=1500):
+    for offset in range(0, len(payload), chunk_size):
+        response = _put_chunk(api_client, session_id, offset, payload[offset:offset + chunk_size])
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.integration
+class TestUploadSessionFlow:
+    """End-to-end init → chunks → complete."""
+
+    def test_legal_request_upload_is_attached(self, api_client, client_user, legal_request, media_root):
+        """Chunks are assembled, validated and linked to the legal request."""
+        api_client.force_authenticate(user=client_user)
+        session_id = _create_session(api_client, "legal_request", legal_request.id).data["id"]
+
+        _upload_all(api_client, session_id, PDF_BYTES)
+        response = api_client.post(reverse("upload-session-complete", kwargs={"session_id": session_id}))
+
+        assert response.status_code == status.HTTP_201_CREATED
+        attached = legal_request.files.get()
+        assert response.data["file_id"] == attached.id
+        assert attached.file.name.startswith("legal_request_files/")
+        with attached.file.open("rb") as handle:
+            assert handle.read() == PDF_BYTES
+        # The partial file was moved into place, not copied.
+        assert not os.path.exists(media_root / "upload_sessions" / f"{session_id}.part")
+
+    def test_process_upload_creates_case_file(self, api_client, lawyer_user):
+        """Process targets create a CaseFile on the process."""
+        client = User.objects.create_user(email="c@example.com", password="x", role="client")
+        process = Process.objects.create(
+            authority="Juzgado", plaintiff="A", defendant="B", ref="R-1",
+            lawyer=lawyer_user, case=Case.objects.create(type="Civil"),
+            subcase="Sub",
+        )
+        process.clients.add(client)
+        api_client.force_authenticate(user=lawyer_user)
+        session_id = _create_session(api_client, "process", process.id).data["id"]
+
+        _upload_all(api_client, session_id, PDF_BYTES)
+        response = api_client.post(reverse("upload-session-complete", kwargs={"session_id": session_id}))
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert process.case_files.filter(pk=response.data["file_id"]).exists()
+
+    def test_service_request_consumes_completed_session(self, api_client, client_user):
+        """Service request sessions are attached when the draft is saved."""
+        service = Service.objects.create(name="Marca", slug="marca-upload", is_active=True)
+        stage = ServiceStage.objects.create(service=service, title="Datos", order=1, is_active=True)
+        field = ServiceField.objects.create(
+            stage=stage, key="soporte", label="Soporte", field_type="file",
+            order=1, allowed_extensions=[".pdf"],
+        )
+        api_client.force_authenticate(user=client_user)
+        session_id = _create_session(api_client, "service_request").data["id"]
+        _upload_all(api_client, session_id, PDF_BYTES)
+        assert api_client.post(
+            reverse("upload-session-complete", kwargs={"session_id": session_id})
+        ).status_code == status.HTTP_201_CREATED
+
+        response = api_client.post(
+            reverse("service-request-save"),
+            {"payload": json.dumps({
+                "service_id": service.id,
+                "answers": [],
+                "upload_sessions": {str(field.id): [session_id]},
+            })},
+            format="multipart",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        stored = ServiceRequestFieldFile.objects.get(field=field)
+        assert stored.original_name == "escaneo.pdf"
+        assert not UploadSession.objects.filter(pk=session_id).exists()
+
+
+@pytest.mark.edge
+class TestUploadSessionResume:
+    """Offset bookkeeping that makes uploads resumable."""
+
+    def test_wrong_offset_returns_expected_offset(self, api_client, client_user, legal_request):
+        """A chunk that does not continue the upload is rejected with the resume point."""
+        api_client.force_authenticate(user=client_user)
+        session_id = _create_session(api_client, "legal_request", legal_request.id).data["id"]
+        _put_chunk(api_client, session_id, 0, PDF_BYTES[:1000])
+
+        response = _put_chunk(api_client, session_id, 2000, PDF_BYTES[2000:3000])
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["received_bytes"] == 1000
+        detail = api_client.get(reverse("upload-session-detail", kwargs={"session_id": session_id}))
+        assert detail.data["received_bytes"] == 1000
+
+    def test_complete_before_all_bytes_is_rejected(self, api_client, client_user, legal_request):
+        """Finalizing a partial upload keeps the session for resuming."""
+        api_client.force_authenticate(user=client_user)
+        session_id = _create_session(api_client, "legal_request", legal_request.id).data["id"]
+        _put_chunk(api_client, session_id, 0, PDF_BYTES[:1000])
+
+        response = api_client.post(reverse("upload-session-complete", kwargs={"session_id": session_id}))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert UploadSession.objects.filter(pk=session_id).exists()
+
+    def test_invalid_content_discards_session(self, api_client, client_user, legal_request, media_root):
+        """The assembled file goes through validate_file_security once."""
+        api_client.force_authenticate(user=client_user)
+        payload = b"MZ" + b"\x00" * 500
+        session_id = _create_session(api_client, "legal_request", legal_request.id, size=len(payload)).data["id"]
+        _put_chunk(api_client, session_id, 0, payload)
+
+        response = api_client.post(reverse("upload-session-complete", kwargs={"session_id": session_id}))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not UploadSession.objects.filter(pk=session_id).exists()
+        assert not os.path.exists(media_root / "upload_sessions" / f"{session_id}.part")
+        assert legal_request.files.count() == 0
+
+
+@pytest.mark.edge
+class TestUploadSessionPermissions:
+    """Targets are authorized when the session is created."""
+
+    def test_foreign_legal_request_is_forbidden(self, api_client, legal_request):
+        other = User.objects.create_user(email="other@example.com", password="x", role="client")
+        api_client.force_authenticate(user=other)
+
+        response = _create_session(api_client, "legal_request", legal_request.id)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_non_client_owner_cannot_upload_to_legal_request(self, api_client):
+        """Like add_files_to_legal_request, only clients can add request files."""
+        lawyer = User.objects.create_user(email="owner-lawyer@example.com", password="x", role="lawyer")
+        legal_request = LegalRequest.objects.create(
+            user=lawyer,
+            request_type=LegalRequestType.objects.create(name="Consulta"),
+            discipline=LegalDiscipline.objects.create(name="Civil"),
+            description="Solicitud registrada por un abogado",
+        )
+        api_client.force_authenticate(user=lawyer)
+
+        response = _create_session(api_client, "legal_request", legal_request.id)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert UploadSession.objects.count() == 0
+
+    @pytest.mark.parametrize("target_id", ["abc", None, [1]])
+    def test_invalid_target_id_returns_400(self, api_client, client_user, target_id):
+        api_client.force_authenticate(user=client_user)
+
+        response = _create_session(api_client, "legal_request", target_id)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert UploadSession.objects.count() == 0
+
+    def test_disallowed_extension_rejected_up_front(self, api_client, client_user, legal_request):
+        api_client.force_authenticate(user=client_user)
+
+        response = _create_session(api_client, "legal_request", legal_request.id, filename="script.exe")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_sessions_are_private_to_their_owner(self, api_client, client_user, legal_request):
+        api_client.force_authenticate(user=client_user)
+        session_id = _create_session(api_client, "legal_request", legal_request.id).data["id"]
+        other = User.objects.create_user(email="other@example.com", password="x", role="client")
+        api_client.force_authenticate(user=other)
+
+        response = _put_chunk(api_client, session_id, 0, PDF_BYTES[:10])
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -5,6 +5,7 @@ from unittest.mock import patch
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.urls import reverse
 from PIL import Image
 from rest_framework import status
@@ -242,6 +243,112 @@ class TestUserViews:
         assert len(response.data) == 1
         assert response.data[0]['description'] == 'User action'
 
+    def test_get_user_activities_legacy_list_is_bounded(self, api_client, user, settings):
+        """Without pagination params only the newest page is returned as a list."""
+        ActivityFeed.objects.bulk_create([
+            ActivityFeed(user=user, action_type='create', description=f'Action {i}')
+            for i in range(25)
+        ])
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('user-activities'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == 20
+
+    def test_get_user_activities_cursor_pagination(self, api_client, user):
+        """page_size/cursor walk the whole feed newest first without gaps."""
+        ActivityFeed.objects.bulk_create([
+            ActivityFeed(user=user, action_type='create', description=f'Action {i}')
+            for i in range(7)
+        ])
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('user-activities'), {'page_size': 3})
+        seen = [item['description'] for item in response.data['results']]
+        while response.data['next']:
+            response = api_client.get(response.data['next'])
+            seen.extend(item['description'] for item in response.data['results'])
+
+        assert seen == [f'Action {i}' for i in reversed(range(7))]
+
+    def test_create_activities_records_every_entry(self, api_client, user, another_user):
+        """A batch is written in one request and always attributed to the requester."""
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            reverse('create-activities'),
+            {'activities': [
+                {'action_type': 'create', 'description': 'First', 'user': another_user.id},
+                {'action_type': 'download', 'description': 'Second'},
+            ]},
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [item['description'] for item in response.data] == ['First', 'Second']
+        assert all(item['id'] for item in response.data)
+        assert ActivityFeed.objects.filter(user=user).count() == 2
+        assert not ActivityFeed.objects.filter(user=another_user).exists()
+
+    def test_create_activities_returns_ids_without_bulk_insert_ids(self, api_client, user, monkeypatch):
+        """On MySQL bulk inserts return no ids; the response still carries them."""
+        monkeypatch.setattr(type(connection.features), 'can_return_rows_from_bulk_insert', False)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            reverse('create-activities'),
+            {'activities': [
+                {'action_type': 'create', 'description': 'First'},
+                {'action_type': 'edit', 'description': 'Second'},
+            ]},
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [item['id'] for item in response.data] == list(
+            ActivityFeed.objects.filter(user=user).order_by('id').values_list('id', flat=True)
+        )
+
+    def test_create_activities_is_all_or_nothing(self, api_client, user):
+        """One invalid entry rejects the whole batch."""
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            reverse('create-activities'),
+            {'activities': [
+                {'action_type': 'create', 'description': 'Valid'},
+                {'action_type': 'bogus', 'description': 'Invalid'},
+            ]},
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not ActivityFeed.objects.filter(user=user).exists()
+
+    @pytest.mark.parametrize('payload', [{'activities': []}, {'activities': 'x'}, {}])
+    def test_create_activities_rejects_non_list(self, api_client, user, payload):
+        """The batch must be a non-empty list."""
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(reverse('create-activities'), payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_create_activities_enforces_entry_limit(self, api_client, user, settings):
+        """Batches above ACTIVITY_FEED_BATCH_MAX are rejected."""
+        settings.ACTIVITY_FEED_BATCH_MAX = 2
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            reverse('create-activities'),
+            [{'action_type': 'create', 'description': str(i)} for i in range(3)],
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_create_activity_success(self, api_client, user):
         """Authenticated users can create activities and they are linked to the user."""
         api_client.force_authenticate(user=user)
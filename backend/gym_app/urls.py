@@ -6,6 +6,7 @@ This module defines all the URL patterns for the gym application, organized into
 - User management (profiles, activities, signatures)
 - Process and case management (cases, processes, files)
 - Legal requests and documents (requests, files, options)
+- Chunked upload sessions (resumable attachments)
 - Intranet documents (legal documents, reports)
 - Dynamic documents (documents, signatures, downloads)
 - Legal updates (notifications and updates)
@@ -13,9 +14,9 @@ This module defines all the URL patterns for the gym application, organized into
 - Reports (Excel report generation)
 - SECOP public procurement (processes, classifications, alerts)
 """
-from .views import intranet_gym, userAuth, user, case_type, process, legal_request, corporate_request, organization, organization_posts, legal_update, reports, captcha, subscription, secop, service_tramite, notification
+from .views import intranet_gym, userAuth, user, case_type, process, legal_request, corporate_request, organization, organization_posts, legal_update, reports, captcha, subscription, secop, service_tramite, notification, upload_session
 from .views.layouts import sendEmail
-from .views.dynamic_documents import document_views, signature_views, tag_folder_views, permission_views, relationship_views
+from .views.dynamic_documents import document_views, export_views, signature_views, tag_folder_views, permission_views, relationship_views
 from django.urls import path
 
 # Authentication URLs
@@ -38,6 +39,7 @@ user_urls = [
     path('users/update_signature/<int:user_id>/', user.update_signature, name='update-signature'),
     path('user-activities/', user.get_user_activities, name='user-activities'),
     path('create-activity/', user.create_activity, name='create-activity'),
+    path('create-activities/', user.create_activities, name='create-activities'),
     
     # User global letterhead management
     path('user/letterhead/upload/', document_views.upload_user_letterhead_image, name='upload-user-letterhead-image'),
@@ -54,6 +56,7 @@ user_urls = [
 process_urls = [
     path('case_types/', case_type.case_list, name='case-list'),
     path('processes/', process.process_list, name='process-list'),
+    path('processes/<int:pk>/', process.process_detail, name='process-detail'),
     path('processes/pending-alerts-count/', process.process_pending_alerts_count, name='process-pending-alerts-count'),
     path('create_process/', process.create_process, name='create-process'),
     path('update_process/<int:pk>/', process.update_process, name='update-process'),
@@ -78,6 +81,14 @@ legal_request_urls = [
     path('legal_requests/<int:request_id>/delete/', legal_request.delete_legal_request, name='delete-legal-request'),
 ]
 
+# Chunked, resumable upload sessions (legal requests, processes, service requests)
+upload_session_urls = [
+    path('upload-sessions/', upload_session.create_upload_session, name='upload-session-create'),
+    path('upload-sessions/<uuid:session_id>/', upload_session.upload_session_detail, name='upload-session-detail'),
+    path('upload-sessions/<uuid:session_id>/chunk/', upload_session.upload_session_chunk, name='upload-session-chunk'),
+    path('upload-sessions/<uuid:session_id>/complete/', upload_session.complete_upload_session, name='upload-session-complete'),
+]
+
 # Corporate request management URLs  
 corporate_request_urls = [
     # Client endpoints (normal clients)
@@ -158,12 +169,14 @@ dynamic_document_urls = [
     path('dynamic-documents/<int:pk>/', document_views.get_dynamic_document, name='get_dynamic_document'),
     path('dynamic-documents/create/', document_views.create_dynamic_document, name='create_dynamic_document'),
     path('dynamic-documents/<int:pk>/update/', document_views.update_dynamic_document, name='update_dynamic_document'),
+    path('dynamic-documents/<int:pk>/autosave/', document_views.autosave_dynamic_document, name='autosave_dynamic_document'),
     path('dynamic-documents/<int:pk>/delete/', document_views.delete_dynamic_document, name='delete_dynamic_document'),
     
     # Document operations
     path('dynamic-documents/send_email_with_attachments/', sendEmail.send_email_with_attachments, name='send_email_with_attachments'),
     path('dynamic-documents/<int:pk>/download-pdf/', document_views.download_dynamic_document_pdf, name='download_dynamic_document_pdf'),
     path('dynamic-documents/<int:pk>/download-word/', document_views.download_dynamic_document_word, name='download_dynamic_document_word'),
+    path('dynamic-documents/bulk-export/', export_views.bulk_export_dynamic_documents, name='bulk-export-dynamic-documents'),
     
     # Recent documents
     path('dynamic-documents/recent/', document_views.get_recent_documents, name='get-recent-documents'),
@@ -353,6 +366,7 @@ urlpatterns = (
     user_urls +
     process_urls +
     legal_request_urls +
+    upload_session_urls +
     corporate_request_urls +
     organization_urls +
     organization_posts_urls +
@@ -0,0 +1,84 @@
+"""Short-lived shared cache of the users resolved from JWT access tokens.
+
+``gym_app.authentication.CachedJWTAuthentication`` resolves the user of every
+authenticated API call through :func:`get_or_load`, so the SPA's polling
+requests stop loading the same ``User`` row over and over. Entries live for
+``USER_AUTH_CACHE_TTL`` seconds and are keyed by user id plus a per-user
+version counter:
+
+- :func:`invalidate` bumps the version, which orphans the cached entry at
+  once (see the receivers in ``gym_app/models/user.py``: any user save or
+  delete, role and activation changes included, and refresh-token
+  blacklisting).
+- A loader reads the version *before* hitting the database and stores its
+  result under that version, so a load that raced with an invalidation can
+  only write to the orphaned key and never resurrect stale data.
+
+Any cache failure falls back to the database.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Versions outlive every entry by far; once one expires readers restart at 0,
+# whose entries have long expired too.
+VERSION_TIMEOUT = 24 * 60 * 60
+
+
+def _version_key(user_id):
+    return f'auth-user-version:{user_id}'
+
+
+def _entry_key(user_id, version):
+    return f'auth-user:{user_id}:{version}'
+
+
+def get_or_load(user_id, load):
+    """Return the cached user for ``user_id``, calling ``load()`` on a miss."""
+    timeout = getattr(settings, 'USER_AUTH_CACHE_TTL', 60)
+    if timeout <= 0:
+        return load()
+    try:
+        version = cache.get(_version_key(user_id), 0)
+        user = cache.get(_entry_key(user_id, version))
+    except Exception as exc:
+        logger.debug(f"Auth user cache unavailable: {exc}")
+        return load()
+    if user is None:
+        user = load()
+        try:
+            cache.set(_entry_key(user_id, version), user, timeout)
+        except Exception as exc:
+            logger.debug(f"Could not cache auth user: {exc}")
+    return user
+
+
+def _bump(user_ids):
+    for user_id in user_ids:
+        key = _version_key(user_id)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                # No version yet: readers used 0, so 1 orphans their entry
+                cache.add(key, 1, VERSION_TIMEOUT) or cache.incr(key)
+        except Exception as exc:
+            logger.debug(f"Could not invalidate auth user {user_id}: {exc}")
+
+
+def invalidate(*user_ids):
+    """Drop the cached user of every given id, now and once the transaction commits.
+
+    The second bump covers requests that reloaded the row from the database
+    between the write and its commit.
+    """
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids:
+        return
+    _bump(user_ids)
+    transaction.on_commit(lambda: _bump(user_ids))
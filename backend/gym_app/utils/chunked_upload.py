@@ -0,0 +1,151 @@
+"""Helpers for resumable, chunked uploads (see ``gym_app.models.UploadSession``).
+
+Chunks are appended straight to the session's partial file in media storage
+and never buffered in full: the request body is copied in
+``FILE_DELIVERY_CHUNK_SIZE`` blocks. Once the upload is finalized the partial
+file is *moved* (not copied) to the location the target ``FileField`` would
+have used, so a large scan is written to disk exactly once.
+"""
+
+import logging
+import os
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from gym_app.models import UploadSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+DEFAULT_COPY_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkOffsetMismatch(Exception):
+    """Raised when a chunk does not start where the session left off."""
+
+    def __init__(self, expected_offset):
+        super().__init__(f"Expected offset {expected_offset}")
+        self.expected_offset = expected_offset
+
+
+def max_chunk_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_MAX_CHUNK_SIZE', DEFAULT_MAX_CHUNK_SIZE)
+
+
+def append_chunk(session, offset, stream, length):
+    """Append ``length`` bytes read from ``stream`` to the session's partial file.
+
+    The caller must hold a row lock on ``session`` (``select_for_update``) so
+    concurrent retries of the same chunk cannot interleave. Bytes that did
+    arrive before a dropped connection are kept, and ``received_bytes`` is
+    advanced by what was actually written so the client can resume from there.
+
+    Returns:
+        int: Number of bytes written.
+
+    Raises:
+        ChunkOffsetMismatch: If ``offset`` is not ``session.received_bytes``.
+        ValueError: If the chunk would exceed the declared ``total_size``.
+    """
+    if offset != session.received_bytes:
+        raise ChunkOffsetMismatch(session.received_bytes)
+    if offset + length > session.total_size:
+        raise ValueError("Chunk exceeds the declared file size.")
+
+    path = session.part_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    block_size = getattr(settings, 'FILE_DELIVERY_CHUNK_SIZE', DEFAULT_COPY_BLOCK_SIZE)
+
+    written = 0
+    mode = 'r+b' if os.path.exists(path) else 'wb'
+    with open(path, mode) as handle:
+        # Drop any tail left by a chunk whose bookkeeping never committed.
+        handle.seek(offset)
+        handle.truncate()
+        while written < length:
+            block = stream.read(min(block_size, length - written))
+            if not block:
+                break
+            handle.write(block)
+            written += len(block)
+
+    session.received_bytes = offset + written
+    session.save(update_fields=['received_bytes', 'updated_at'])
+    return written
+
+
+def open_assembled_file(session):
+    """Return a Django ``File`` over the assembled upload, named as the client declared.
+
+    The caller is responsible for closing it.
+    """
+    return File(open(session.part_path, 'rb'), name=session.filename)
+
+
+def attach_session_file(session, instance, field_name='file'):
+    """Move the assembled file into ``instance.<field_name>`` and save ``instance``.
+
+    The destination name is produced by the field's own ``upload_to`` so the
+    file ends up exactly where a regular multipart upload would have put it.
+    """
+    field = instance._meta.get_field(field_name)
+    storage = field.storage
+    name = storage.get_available_name(
+        field.generate_filename(instance, session.filename),
+        max_length=field.max_length,
+    )
+    if hasattr(storage, 'adopt_file'):
+        # Content-addressed storage: hash and link instead of moving blindly.
+        name = storage.adopt_file(session.part_path, name)
+    else:
+        destination = storage.path(name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(session.part_path, destination)
+
+    setattr(instance, field_name, name)
+    instance.save()
+    logger.info(f"Upload session {session.id} attached as {name}")
+    return instance
+
+
+def discard_part(session):
+    """Remove the session's partial file from storage, if present."""
+    if session.part_name and default_storage.exists(session.part_name):
+        default_storage.delete(session.part_name)
+
+
+def consume_service_request_sessions(user, session_ids):
+    """Open completed service-request sessions owned by ``user`` as Django files.
+
+    Returns:
+        tuple: ``(files, sessions)``. The caller saves the files through the
+        regular field-file path, closes them and deletes the sessions.
+
+    Raises:
+        ValidationError: If any ID is unknown, foreign or not yet completed.
+    """
+    ids = [str(session_id) for session_id in session_ids or []]
+    if not ids:
+        return [], []
+    try:
+        sessions = list(UploadSession.objects.filter(
+            pk__in=ids,
+            user=user,
+            target=UploadSession.TARGET_SERVICE_REQUEST,
+            status=UploadSession.STATUS_COMPLETED,
+        ))
+    except ValidationError:
+        raise ValidationError("Sesion de carga invalida")
+    if len(sessions) != len(set(ids)):
+        raise ValidationError("Sesion de carga invalida o incompleta")
+    return [open_assembled_file(session) for session in sessions], sessions
+
+
+def delete_upload_sessions(sessions):
+    """Delete consumed sessions together with their partial files."""
+    for session in sessions:
+        discard_part(session)
+    UploadSession.objects.filter(pk__in=[session.pk for session in sessions]).delete()
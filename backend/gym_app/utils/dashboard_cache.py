@@ -0,0 +1,54 @@
+"""Short-lived per-user cache for dashboard statistics.
+
+Dashboard stats are aggregate queries that run on every dashboard visit.
+They are cached per user for ``DASHBOARD_STATS_CACHE_TTL`` seconds and
+dropped as soon as a corporate request, organization, membership or
+invitation of that user changes (see the signal receivers in
+``gym_app/models/corporate_request.py`` and ``gym_app/models/organization.py``).
+Time-window counts ("last 7 days", "overdue") may lag by at most the TTL.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CORPORATE_REQUEST_STATS = 'corporate-requests'
+ORGANIZATION_STATS = 'organizations'
+
+
+def _key(kind, user_id):
+    return f'dashboard-stats:{kind}:{user_id}'
+
+
+def get_or_compute(kind, user_id, compute):
+    """Return the cached stats of ``kind`` for ``user_id``, computing them on a miss."""
+    timeout = getattr(settings, 'DASHBOARD_STATS_CACHE_TTL', 60)
+    if timeout <= 0:
+        return compute()
+    key = _key(kind, user_id)
+    try:
+        stats = cache.get(key)
+    except Exception as exc:
+        logger.debug(f"Dashboard stats cache unavailable: {exc}")
+        return compute()
+    if stats is None:
+        stats = compute()
+        try:
+            cache.set(key, stats, timeout)
+        except Exception as exc:
+            logger.debug(f"Could not cache dashboard stats: {exc}")
+    return stats
+
+
+def invalidate(kind, *user_ids):
+    """Drop the cached stats of ``kind`` for every given user id."""
+    keys = [_key(kind, user_id) for user_id in user_ids if user_id]
+    if not keys:
+        return
+    try:
+        cache.delete_many(keys)
+    except Exception as exc:
+        logger.debug(f"Could not invalidate dashboard stats: {exc}")
@@ -13,6 +13,8 @@ from django.conf import settings
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from gym_app.utils import render_cache, render_pool
+
 logger = logging.getLogger(__name__)
 
 # Matches ``{{variable}}`` even when TinyMCE fragments it across inline tags,
@@ -71,6 +73,49 @@ def normalize_fragmented_variables(html_content):
     return _VARIABLE_PATTERN.sub(_clean_match, html_content)
 
 
+def apply_content_patch(content, operations):
+    """Apply a list of splice operations to ``content`` and return the result.
+
+    Each operation is a dict ``{"start": int, "end": int, "text": str}`` that
+    replaces ``content[start:end]`` with ``text``. Offsets always refer to the
+    *base* content the client diffed against (not to the partially patched
+    string), so operations must not overlap; they are applied back-to-front
+    to keep earlier offsets valid.
+
+    Raises:
+        ValueError: If an operation is malformed, out of range or overlaps
+            another operation.
+    """
+    content = content or ''
+    if not isinstance(operations, list):
+        raise ValueError('content_patch must be a list of operations.')
+
+    normalized = []
+    for op in operations:
+        if not isinstance(op, dict):
+            raise ValueError('Each patch operation must be an object.')
+        start, end, text = op.get('start'), op.get('end'), op.get('text', '')
+        if (
+            not isinstance(start, int) or not isinstance(end, int)
+            or isinstance(start, bool) or isinstance(end, bool)
+        ):
+            raise ValueError('Patch offsets must be integers.')
+        if not isinstance(text, str):
+            raise ValueError('Patch text must be a string.')
+        if start < 0 or end < start or end > len(content):
+            raise ValueError(f'Patch range [{start}, {end}) is out of bounds.')
+        normalized.append((start, end, text))
+
+    normalized.sort(key=lambda item: (item[0], item[1]))
+    for (_, prev_end, _), (next_start, _, _) in zip(normalized, normalized[1:]):
+        if next_start < prev_end:
+            raise ValueError('Patch operations must not overlap.')
+
+    for start, end, text in reversed(normalized):
+        content = content[:start] + text + content[end:]
+    return content
+
+
 def _is_empty_block(node):
     """Return ``True`` when a block-level node carries no real reader content.
 
@@ -290,6 +335,37 @@ def sanitize_html_for_pdf(html_content):
     return str(sanitize_soup_for_export(BeautifulSoup(html_content, 'html.parser')))
 
 
+def substitute_document_variables(document, html_content):
+    """Replace every ``{{ name_en }}`` marker with the variable's formatted value.
+
+    Whitespace inside the braces is tolerated (the editor and paste
+    post-processing may introduce it). Uses ``document.variables.all()``, so
+    prefetch ``variables`` when exporting many documents.
+    """
+    for variable in document.variables.all():
+        try:
+            replacement_value = variable.get_formatted_value() or ""
+        except AttributeError:  # pragma: no cover – defensive fallback for missing method
+            replacement_value = variable.value or ""
+        pattern = re.compile(r'\{\{\s*' + re.escape(variable.name_en) + r'\s*\}\}')
+        html_content = pattern.sub(lambda _match: replacement_value, html_content)
+    return html_content
+
+
+def prepare_export_soup(document):
+    """Return the export-ready soup of ``document`` (content-preparation stage).
+
+    Shared by the PDF and Word downloads: reassembles fragmented variable
+    markers, substitutes the variable values and sanitizes paste-from-Word
+    markup, parsing the content once. The PDF path renders ``str(soup)``; the
+    Word path walks the soup directly (see :mod:`gym_app.utils.docx_export`).
+    """
+    processed_content = substitute_document_variables(
+        document, normalize_fragmented_variables(document.content or ''),
+    )
+    return sanitize_soup_for_export(BeautifulSoup(processed_content, 'html.parser'))
+
+
 def get_carlito_font_paths():
     """Return the four Carlito TTF file paths, validating each exists.
 
@@ -468,15 +544,12 @@ def render_html_to_pdf(html_content, *, base_url):
     return HTML(string=html_content, base_url=str(base_url)).write_pdf()
 
 
-def render_document_pdf(*, title, body_html, letterhead_image=None, top_padding="1cm"):
-    """Assemble the shared document HTML (stylesheet + letterhead + body) and
-    render it to PDF bytes with WeasyPrint.
+def build_document_html(*, title, body_html, letterhead_image=None, top_padding="1cm"):
+    """Assemble the shared document HTML (stylesheet + letterhead + body).
 
-    Single source of truth for the document-PDF skeleton used by both the
-    standard download and the signed original, so the ``<head>``/``<body>``
-    wrapper cannot drift between the two paths. Callers keep their own
-    variable-substitution and letterhead-resolution logic (which differ) and pass
-    the already-substituted ``body_html`` plus the resolved ``letterhead_image``.
+    This is the complete input of a document render: it is what
+    :func:`render_document_pdf` hands to WeasyPrint, and what the render cache
+    and the bulk ZIP export key on.
     """
     font_paths = get_carlito_font_paths()
     letterhead_html = build_letterhead_layer_html(letterhead_image)
@@ -484,7 +557,7 @@ def render_document_pdf(*, title, body_html, letterhead_image=None, top_padding=
         font_paths,
         top_padding=top_padding if letterhead_html else None,
     )
-    html_content = f"""<!DOCTYPE html>
+    return f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -496,7 +569,41 @@ def render_document_pdf(*, title, body_html, letterhead_image=None, top_padding=
     {body_html}
 </body>
 </html>"""
-    return render_html_to_pdf(html_content, base_url=settings.BASE_DIR)
+
+
+def render_document_html(html_content, cache_budget=None):
+    """Render the output of :func:`build_document_html` to PDF bytes, reusing
+    a cached render of the same HTML when there is one (see
+    :mod:`gym_app.utils.render_cache`; ``cache_budget`` limits what a bulk
+    caller adds to it). Cache misses are rendered on the render pool
+    (:mod:`gym_app.utils.render_pool`)."""
+    return render_cache.get_or_render(
+        render_cache.PDF,
+        html_content,
+        lambda: render_pool.run(
+            'document_pdf', render_html_to_pdf, html_content, base_url=settings.BASE_DIR,
+        ),
+        cache_budget,
+    )
+
+
+def render_document_pdf(*, title, body_html, letterhead_image=None, top_padding="1cm"):
+    """Assemble the shared document HTML (stylesheet + letterhead + body) and
+    render it to PDF bytes with WeasyPrint.
+
+    Single source of truth for the document-PDF skeleton used by both the
+    standard download and the signed original, so the ``<head>``/``<body>``
+    wrapper cannot drift between the two paths. Callers keep their own
+    variable-substitution and letterhead-resolution logic (which differ) and pass
+    the already-substituted ``body_html`` plus the resolved ``letterhead_image``.
+    Identical inputs are served from the render cache.
+    """
+    return render_document_html(build_document_html(
+        title=title,
+        body_html=body_html,
+        letterhead_image=letterhead_image,
+        top_padding=top_padding,
+    ))
 
 
 LETTERHEAD_LOCKED_STATES = ('PendingSignatures', 'FullySigned', 'Rejected', 'Expired')
@@ -0,0 +1,605 @@
+"""Word (.docx) export engine for dynamic documents.
+
+``download_dynamic_document_word`` hands the export soup (see
+:func:`gym_app.utils.documents.prepare_export_soup`, shared with the PDF
+download) and the resolved letterhead template to :func:`render_document_docx`:
+
+- Letterhead templates are parsed and style-configured once per file identity
+  (real path, mtime, size) and kept in a small in-process LRU cache. Each
+  export clones only the template's body part; styles, numbering, headers,
+  footers and images are shared read-only with the cached prototype, so a
+  download no longer re-reads and re-parses the template package.
+- HTML is converted by walking the soup once and dispatching every block tag
+  through :data:`_BLOCK_HANDLERS`. Inline formatting is resolved once per
+  element and inherited down the tree instead of being re-parsed for every
+  text node.
+- The package is written straight into a ``SpooledTemporaryFile`` that only
+  touches disk above ``DOCX_EXPORT_SPOOL_MAX_SIZE`` bytes.
+"""
+
+import copy
+import functools
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from django.conf import settings
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import OxmlElement
+from docx.oxml.table import CT_Tbl
+from docx.package import Package
+from docx.parts.document import DocumentPart
+from docx.shared import Emu, Inches, Pt, RGBColor
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+logger = logging.getLogger(__name__)
+
+FONT_NAME = 'Calibri'
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Style names as the Word export has always configured them.
+_HEADING_STYLE_NAMES = ('Heading1', 'Heading2', 'Heading3', 'Heading4', 'Heading5', 'Heading6')
+
+_HEADING_LEVELS = {f'h{level}': level for level in range(1, 7)}
+_CONTAINER_TAGS = frozenset(('p', 'div'))
+_BLOCK_TAGS = [*_HEADING_LEVELS, 'p', 'div', 'hr', 'table']
+
+# First match wins, in this order.
+_ALIGNMENTS = (
+    ('text-align: center', WD_PARAGRAPH_ALIGNMENT.CENTER),
+    ('text-align: right', WD_PARAGRAPH_ALIGNMENT.RIGHT),
+    ('text-align: left', WD_PARAGRAPH_ALIGNMENT.LEFT),
+    ('text-align: justify', WD_PARAGRAPH_ALIGNMENT.JUSTIFY),
+)
+
+_INLINE_TAG_FORMATS = {
+    'strong': {'bold': True},
+    'b': {'bold': True},
+    'em': {'italic': True},
+    'i': {'italic': True},
+    's': {'strike': True},
+    'u': {'underline': True},
+}
+
+_COLOR_MAP = {
+    'red': (255, 0, 0),
+    'green': (0, 128, 0),
+    'blue': (0, 0, 255),
+    'black': (0, 0, 0),
+    'white': (255, 255, 255),
+    'yellow': (255, 255, 0),
+    'purple': (128, 0, 128),
+    'orange': (255, 165, 0),
+    'gray': (128, 128, 128),
+    'pink': (255, 192, 203),
+    'brown': (165, 42, 42),
+    'cyan': (0, 255, 255),
+    'magenta': (255, 0, 255),
+    'lime': (0, 255, 0),
+    'navy': (0, 0, 128),
+    'teal': (0, 128, 128),
+    'olive': (128, 128, 0),
+    'maroon': (128, 0, 0),
+    'silver': (192, 192, 192),
+    'gold': (255, 215, 0),
+}
+
+_BLANK_TEMPLATE = None
+_templates = OrderedDict()
+_templates_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Template cache
+# ---------------------------------------------------------------------------
+
+def _template_identity(path):
+    stat = os.stat(path)
+    return (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class _Template:
+    """A parsed, style-configured letterhead template shared by every export."""
+
+    def __init__(self, document, from_template):
+        self.document = document
+        self.from_template = from_template
+        self._style_ids = {}
+
+    @classmethod
+    def load(cls, path=None):
+        """Parse ``path`` (a blank document when ``None``) and configure it."""
+        doc = Document(path) if path else Document()
+        if not path:
+            # Blank documents get Letter (Carta) page size and 1in margins
+            section = doc.sections[0]
+            section.page_width = Inches(8.5)
+            section.page_height = Inches(11)
+            section.top_margin = Inches(1)
+            section.bottom_margin = Inches(1)
+            section.left_margin = Inches(1)
+            section.right_margin = Inches(1)
+        doc.styles['Normal'].font.name = FONT_NAME
+        for style_name in _HEADING_STYLE_NAMES:
+            if style_name in doc.styles:
+                doc.styles[style_name].font.name = FONT_NAME
+        return cls(doc, from_template=bool(path))
+
+    def style_id(self, name, style_type):
+        """Return the id of style ``name``, looked up once per template."""
+        key = (name, style_type)
+        if key not in self._style_ids:
+            self._style_ids[key] = self.document.part.get_style_id(name, style_type)
+        return self._style_ids[key]
+
+
+def _cache_template(key, template):
+    max_size = getattr(settings, 'DOCX_TEMPLATE_CACHE_SIZE', 16)
+    if max_size <= 0:
+        return
+    with _templates_lock:
+        _templates[key] = template
+        _templates.move_to_end(key)
+        while len(_templates) > max_size:
+            _templates.popitem(last=False)
+
+
+def _cached_template(key):
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is not None:
+            _templates.move_to_end(key)
+    return template
+
+
+def get_template(template_path=None):
+    """Return the :class:`_Template` for ``template_path`` (``None`` = blank document).
+
+    A template that cannot be parsed falls back to the blank document and is
+    not cached, so replacing the file takes effect on the next download.
+    """
+    if template_path:
+        try:
+            key = _template_identity(template_path)
+        except OSError:
+            key = None
+        if key is not None:
+            template = _cached_template(key)
+            if template is not None:
+                return template
+            try:
+                template = _Template.load(template_path)
+            except Exception as exc:
+                logger.warning("Failed to open Word letterhead template %s: %s", template_path, exc)
+            else:
+                _cache_template(key, template)
+                return template
+
+    template = _cached_template(_BLANK_TEMPLATE)
+    if template is None:
+        template = _Template.load()
+        _cache_template(_BLANK_TEMPLATE, template)
+    return template
+
+
+def _clone_document(prototype):
+    """Return a new document whose body is a copy of ``prototype``'s.
+
+    Every other part (styles, numbering, settings, headers/footers, images…)
+    is shared with the prototype. The export only reads them, so they are
+    never mutated after :meth:`_Template.load`.
+    """
+    source = prototype.part
+    package = Package()
+    body = DocumentPart(
+        source.partname, source.content_type, copy.deepcopy(source.element), package,
+    )
+    for rel in source.rels.values():
+        target = rel.target_ref if rel.is_external else rel.target_part
+        body.rels.add_relationship(rel.reltype, target, rel.rId, rel.is_external)
+    for rel in source.package.rels.values():
+        if rel.is_external:
+            target = rel.target_ref
+        else:
+            target = body if rel.target_part is source else rel.target_part
+        package.rels.add_relationship(rel.reltype, target, rel.rId, rel.is_external)
+    return body.document
+
+
+def clear_template_cache():
+    """Drop every cached letterhead template."""
+    with _templates_lock:
+        _templates.clear()
+
+
+# ---------------------------------------------------------------------------
+# HTML → DOCX conversion
+# ---------------------------------------------------------------------------
+
+def _parse_color(style):
+    """Return the ``(r, g, b)`` of the first ``color:`` declaration, or ``None``."""
+    color_part = style.replace(" :", ":").split("color:")[1].split(";")[0].strip()
+    try:
+        if color_part.startswith("rgb("):
+            values = color_part.replace("rgb(", "").replace(")", "").split(",")
+            return int(values[0].strip()), int(values[1].strip()), int(values[2].strip())
+        if color_part in _COLOR_MAP:
+            return _COLOR_MAP[color_part]
+        if color_part.startswith("#"):
+            hex_color = color_part.lstrip("#")
+            return int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+    except (ValueError, IndexError):
+        pass
+    return None
+
+
+def _element_format(element):
+    """Return the run formatting that ``element`` contributes to its text."""
+    fmt = dict(_INLINE_TAG_FORMATS.get(element.name, ()))
+    style = element.get("style", "")
+    if not style:
+        return fmt
+    if "text-decoration: line-through" in style:
+        fmt['strike'] = True
+    if "text-decoration: underline" in style:
+        fmt['underline'] = True
+    if element.name != "span":
+        return fmt
+    if "font-size" in style:
+        try:
+            size = style.split("font-size:")[1].split(";")[0].strip()
+            if "pt" in size:
+                fmt['size'] = Pt(int(size.split("pt")[0].strip()))
+        except (ValueError, IndexError):
+            pass
+    if "color:" in style or "color :" in style:
+        rgb = _parse_color(style)
+        if rgb is not None:
+            fmt['color'] = RGBColor(*rgb)
+    return fmt
+
+
+def _apply_format(run, fmt):
+    font = run.font
+    font.name = FONT_NAME
+    if fmt.get('bold'):
+        run.bold = True
+    if fmt.get('italic'):
+        run.italic = True
+    if fmt.get('strike'):
+        font.strike = True
+    if fmt.get('underline'):
+        run.underline = True
+    if 'size' in fmt:
+        font.size = fmt['size']
+    if 'color' in fmt:
+        font.color.rgb = fmt['color']
+
+
+def _apply_body_spacing(paragraph):
+    # Mirrors the PDF stylesheet (p { margin: 0 0 6pt 0; line-height: 1.35 })
+    # and the editor content_style so all three renderers agree on spacing.
+    pf = paragraph.paragraph_format
+    pf.space_before = Pt(0)
+    pf.space_after = Pt(6)
+    if pf.line_spacing is None:
+        pf.line_spacing = 1.35
+
+
+# Every element the writer emits is a deep copy of one of these fragments,
+# built once through the regular python-docx API, so the XML is exactly what
+# the equivalent python-docx calls produce without paying for them per element.
+
+@functools.lru_cache(maxsize=None)
+def _run_fragment(fmt_items):
+    """``<w:r>`` carrying the run properties of ``fmt_items`` (sorted format items)."""
+    run = Run(OxmlElement('w:r'), None)
+    _apply_format(run, dict(fmt_items))
+    return run._r
+
+
+def _paragraph_fragment_body(paragraph):
+    _apply_body_spacing(paragraph)
+
+
+def _paragraph_fragment_spacer(paragraph):
+    paragraph.paragraph_format.space_before = Pt(0)
+    paragraph.paragraph_format.space_after = Pt(0)
+
+
+def _paragraph_fragment_rule(paragraph):
+    paragraph.add_run("_" * 71)
+    _apply_body_spacing(paragraph)
+    for run in paragraph.runs:
+        run.font.name = FONT_NAME
+
+
+def _paragraph_fragment_cell(paragraph, header=False):
+    # Cell paragraphs must not inherit body spacing: the editor and PDF
+    # render cells with padding only. The run receives the cell text.
+    run = paragraph.add_run()
+    paragraph.paragraph_format.space_before = Pt(0)
+    paragraph.paragraph_format.space_after = Pt(0)
+    run.font.name = FONT_NAME
+    if header:
+        run.bold = True
+
+
+_PARAGRAPH_FRAGMENT_BUILDERS = {
+    'body': _paragraph_fragment_body,
+    'spacer': _paragraph_fragment_spacer,
+    'rule': _paragraph_fragment_rule,
+    'td': _paragraph_fragment_cell,
+    'th': functools.partial(_paragraph_fragment_cell, header=True),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _paragraph_fragment(kind):
+    paragraph = Paragraph(OxmlElement('w:p'), None)
+    _PARAGRAPH_FRAGMENT_BUILDERS[kind](paragraph)
+    return paragraph._p
+
+
+def _new_paragraph(kind):
+    return copy.deepcopy(_paragraph_fragment(kind))
+
+
+def _new_run(text, fmt=None):
+    r = copy.deepcopy(_run_fragment(tuple(sorted(fmt.items())) if fmt else ()))
+    _set_run_text(r, text)
+    return r
+
+
+def _set_run_text(r, text):
+    """Append ``text`` to the run exactly like python-docx's ``Run.text`` setter."""
+    if '\t' in text or '\n' in text or '\r' in text:
+        r.text = text
+    elif text:
+        r.add_t(text)
+
+
+class _DocxWriter:
+    """Writes one export soup into a document cloned from a :class:`_Template`."""
+
+    def __init__(self, template):
+        self.template = template
+        self.doc = _clone_document(template.document)
+        self.body = self.doc.element.body
+        # Body content goes before the section properties that close <w:body>
+        self._sect_pr = self.body.sectPr
+        self._tables = {}
+        self.first_body_paragraph_used = False
+        # Two docx tables with nothing between them auto-merge when opened in
+        # Word, so a spacer paragraph is required.
+        self.last_block_was_table = False
+
+    def _append(self, element):
+        if self._sect_pr is not None:
+            self._sect_pr.addprevious(element)
+        else:
+            self.body.append(element)
+        return element
+
+    def write(self, node):
+        """Emit every block of ``node`` in document order.
+
+        Table contents are emitted by the table handler only, and ``<p>``/
+        ``<div>`` blocks that wrap other blocks only contribute their children.
+        Text and inline elements at the top of the soup (content saved without
+        a wrapping block) are gathered into paragraphs.
+        """
+        top_level = isinstance(node, BeautifulSoup)
+        inline_run = []
+        for child in node.children:
+            if top_level and _is_inline(child):
+                inline_run.append(child)
+                continue
+            if inline_run:
+                self._inline_paragraph(inline_run)
+                inline_run = []
+            if not isinstance(child, Tag):
+                continue
+            handler = _BLOCK_HANDLERS.get(child.name)
+            if handler is None:
+                self.write(child)
+            elif child.name in _CONTAINER_TAGS and child.find(_BLOCK_TAGS):
+                self.write(child)
+            else:
+                handler(self, child)
+                if child.name in _HEADING_LEVELS:
+                    self.write(child)
+        if inline_run:
+            self._inline_paragraph(inline_run)
+        return self.doc
+
+    def heading(self, tag):
+        p = OxmlElement('w:p')
+        text = tag.get_text().strip()
+        if text:
+            p.append(_new_run(text))
+        p.style = self.template.style_id(
+            f"Heading {_HEADING_LEVELS[tag.name]}", WD_STYLE_TYPE.PARAGRAPH,
+        )
+        self._append(p)
+        self.last_block_was_table = False
+
+    def paragraph(self, tag):
+        paragraph = self._open_paragraph()
+
+        if tag.get_text().strip() == "":
+            # Keep the (single, post-sanitize) intentional blank line as an
+            # empty paragraph; it also keeps adjacent tables apart.
+            return
+
+        style = tag.get("style", "")
+        if style:
+            self._apply_paragraph_style(paragraph, style)
+        p = paragraph._p
+        for child in tag.children:
+            self._emit_inline(p, child, {})
+
+    def _inline_paragraph(self, nodes):
+        """Emit a run of top-level text/inline nodes as one paragraph."""
+        if not any(node.get_text().strip() for node in nodes):
+            return
+        p = self._open_paragraph()._p
+        for node in nodes:
+            self._emit_inline(p, node, {})
+
+    def _open_paragraph(self):
+        """Return the body paragraph the next block writes into."""
+        doc = self.doc
+        self.last_block_was_table = False
+
+        # Reuse the single empty paragraph a letterhead template ships with
+        # for the first body paragraph, so the text does not start on line two.
+        if (
+            self.template.from_template
+            and not self.first_body_paragraph_used
+            and len(doc.paragraphs) == 1
+            and not doc.paragraphs[0].text.strip()
+        ):
+            paragraph = doc.paragraphs[0]
+            _apply_body_spacing(paragraph)
+        else:
+            paragraph = Paragraph(self._append(_new_paragraph('body')), None)
+        self.first_body_paragraph_used = True
+        return paragraph
+
+    @staticmethod
+    def _apply_paragraph_style(paragraph, style):
+        for declaration, alignment in _ALIGNMENTS:
+            if declaration in style:
+                paragraph.alignment = alignment
+                break
+        if "padding-left" in style:
+            try:
+                padding = int(style.split("padding-left:")[1].split("px")[0].strip())
+                paragraph.paragraph_format.left_indent = Pt(padding)
+            except (ValueError, IndexError):
+                pass
+        if "line-height" in style:
+            try:
+                line_height = float(style.split("line-height:")[1].split(";")[0].strip())
+                paragraph.paragraph_format.line_spacing = line_height
+            except (ValueError, IndexError):
+                pass
+
+    def _emit_inline(self, p, node, fmt):
+        """Add one run per non-blank text node, formatted by all its ancestors."""
+        if isinstance(node, NavigableString):
+            if node.strip():
+                p.append(_new_run(str(node), fmt))
+            return
+        if not node.name:
+            return
+        own = _element_format(node)
+        if own:
+            fmt = {**fmt, **own}
+        for child in node.children:
+            self._emit_inline(p, child, fmt)
+
+    def rule(self, tag):
+        self._append(_new_paragraph('rule'))
+        self.last_block_was_table = False
+
+    def _table_fragments(self, num_cols):
+        """Return the empty styled ``<w:tbl>`` and blank ``<w:tr>`` for ``num_cols``."""
+        fragments = self._tables.get(num_cols)
+        if fragments is None:
+            tbl = CT_Tbl.new_tbl(0, num_cols, self._block_width())
+            tbl.tblStyle_val = self.template.style_id('Table Grid', WD_STYLE_TYPE.TABLE)
+            tr = tbl.add_tr()
+            for grid_col in tbl.tblGrid.gridCol_lst:
+                tc = tr.add_tc()
+                if grid_col.w is not None:
+                    tc.width = grid_col.w
+            tbl.remove(tr)
+            fragments = self._tables[num_cols] = (tbl, tr)
+        return fragments
+
+    def _block_width(self):
+        section = self.doc.sections[-1]
+        page_width = section.page_width or Inches(8.5)
+        left_margin = section.left_margin or Inches(1)
+        right_margin = section.right_margin or Inches(1)
+        return Emu(page_width - left_margin - right_margin)
+
+    def table(self, tag):
+        rows = tag.find_all("tr")
+        if not rows:
+            return
+        if self.last_block_was_table:
+            self._append(_new_paragraph('spacer'))
+
+        first_row_cells = rows[0].find_all(["td", "th"])
+        num_cols = len(first_row_cells) if first_row_cells else 1
+        tbl_fragment, tr_fragment = self._table_fragments(num_cols)
+        tbl = self._append(copy.deepcopy(tbl_fragment))
+
+        for row_tag in rows:
+            cells = row_tag.find_all(["td", "th"])
+            if not cells:
+                continue
+            tr = copy.deepcopy(tr_fragment)
+            tbl.append(tr)
+            for cell_tag, tc in zip(cells, tr.tc_lst):
+                # Same result as ``cell.text = ...``: the blank paragraph is
+                # replaced by one holding the text in a single run.
+                tc.remove(tc.p_lst[-1])
+                p = _new_paragraph(cell_tag.name)
+                _set_run_text(p.r_lst[-1], cell_tag.get_text(strip=True))
+                tc.append(p)
+
+        self.last_block_was_table = True
+
+
+def _is_inline(node):
+    """Whether ``node`` is text or an element holding no block tags."""
+    if isinstance(node, Tag):
+        return node.name not in _BLOCK_HANDLERS and not node.find(_BLOCK_TAGS)
+    return type(node) is NavigableString
+
+
+_BLOCK_HANDLERS = {
+    **{name: _DocxWriter.heading for name in _HEADING_LEVELS},
+    'p': _DocxWriter.paragraph,
+    'div': _DocxWriter.paragraph,
+    'hr': _DocxWriter.rule,
+    'table': _DocxWriter.table,
+}
+
+
+def _template_path(word_template):
+    if not word_template:
+        return None
+    path = getattr(word_template, 'path', None)
+    if path and os.path.exists(path):
+        return path
+    return None
+
+
+def render_document_docx(soup, word_template=None):
+    """Convert an export soup to a .docx file and return it rewound.
+
+    ``word_template`` is the letterhead template ``FieldFile`` resolved by
+    :func:`gym_app.utils.documents.get_letterhead_word_template` (or ``None``
+    for a blank Letter-sized document). The result is a
+    ``SpooledTemporaryFile`` the caller hands to ``FileResponse``.
+    """
+    doc = _DocxWriter(get_template(_template_path(word_template))).write(soup)
+
+    output = tempfile.SpooledTemporaryFile(
+        max_size=getattr(settings, 'DOCX_EXPORT_SPOOL_MAX_SIZE', 8 * 1024 * 1024),
+    )
+    doc.save(output)
+    output.seek(0)
+    return output
@@ -0,0 +1,196 @@
+"""Streaming, range-aware delivery of uploaded files.
+
+Every download view funnels through :func:`serve_file` so that attachments are
+never read fully into worker memory and all of them behave the same way:
+
+- Bodies are streamed from disk in ``FILE_DELIVERY_CHUNK_SIZE`` blocks.
+- Single ``Range: bytes=...`` requests are answered with ``206 Partial
+  Content`` (PDF viewers and download managers rely on this to resume).
+- ``ETag`` / ``Last-Modified`` are emitted and conditional requests
+  (``If-None-Match``, ``If-Modified-Since``, ``If-Range``) short-circuit to
+  ``304`` or fall back to the full body as mandated by RFC 9110.
+- When ``FILE_DELIVERY_X_ACCEL_PREFIX`` is configured, files under
+  ``MEDIA_ROOT`` are handed off to nginx through ``X-Accel-Redirect`` (see
+  the ``/protected-media/`` location in ``scripts/nginx/gym_project.conf``);
+  Django then only performs the permission checks.
+"""
+
+import logging
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_CACHE_CONTROL = 'private, no-cache'
+
+_RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _chunk_size():
+    return getattr(settings, 'FILE_DELIVERY_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def build_etag(stat_result):
+    """Return a strong validator derived from file size and mtime."""
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_range_header(header, size):
+    """Parse a single-range ``Range`` header against a file of ``size`` bytes.
+
+    Returns:
+        ``(start, end)`` inclusive byte offsets, ``None`` when the header is
+        absent/unsupported (multi-range, other units) and the full body should
+        be served, or ``False`` when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def _range_allowed(request, etag, last_modified):
+    """Honour ``If-Range``: only serve a partial body if the validator still matches."""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    parsed = parse_http_date_safe(if_range)
+    return parsed is not None and parsed >= last_modified
+
+
+def _iter_file_range(path, start, length, chunk_size):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _x_accel_location(path):
+    prefix = getattr(settings, 'FILE_DELIVERY_X_ACCEL_PREFIX', '')
+    if not prefix:
+        return None
+    media_root = os.path.realpath(settings.MEDIA_ROOT)
+    real_path = os.path.realpath(path)
+    if os.path.commonpath([media_root, real_path]) != media_root:
+        return None
+    relative = os.path.relpath(real_path, media_root).replace(os.sep, '/')
+    return prefix.rstrip('/') + '/' + relative
+
+
+def serve_file(request, path, *, filename=None, content_type=None,
+               as_attachment=True, cache_control=DEFAULT_CACHE_CONTROL):
+    """Build a streaming response for the file at ``path``.
+
+    Callers are expected to have performed their own permission and
+    existence checks; ``FileNotFoundError``/``OSError`` raised here mean the
+    file vanished or could not be opened.
+
+    Args:
+        request: The incoming request (used for Range/conditional headers).
+        path: Absolute filesystem path of the file to send.
+        filename: Name advertised in ``Content-Disposition`` (defaults to
+            the basename of ``path``).
+        content_type: MIME type; guessed from ``filename`` when omitted.
+        as_attachment: ``attachment`` vs ``inline`` disposition.
+        cache_control: Value for the ``Cache-Control`` header.
+
+    Returns:
+        An ``HttpResponse`` subclass (200, 206, 304, 412 or 416).
+    """
+    filename = filename or os.path.basename(path)
+    if content_type is None:
+        content_type, _ = mimetypes.guess_type(filename)
+        content_type = content_type or 'application/octet-stream'
+
+    stat_result = os.stat(path)
+    size = stat_result.st_size
+    last_modified = int(stat_result.st_mtime)
+    etag = build_etag(stat_result)
+
+    def _apply_common_headers(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        if cache_control:
+            response['Cache-Control'] = cache_control
+        return response
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        return _apply_common_headers(conditional)
+
+    disposition = content_disposition_header(as_attachment, filename)
+
+    accel_location = _x_accel_location(path)
+    if accel_location:
+        # nginx serves the body (including Range handling) from the internal location.
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = accel_location
+        response['Content-Disposition'] = disposition
+        return _apply_common_headers(response)
+
+    byte_range = None
+    if request.method == 'GET' and _range_allowed(request, etag, last_modified):
+        byte_range = parse_range_header(request.headers.get('Range'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return _apply_common_headers(response)
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_file_range(path, start, length, _chunk_size()),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+        response['Content-Disposition'] = disposition
+        return _apply_common_headers(response)
+
+    response = FileResponse(
+        open(path, 'rb'),
+        as_attachment=as_attachment,
+        filename=filename,
+        content_type=content_type,
+    )
+    response.block_size = _chunk_size()
+    return _apply_common_headers(response)
+
+
+def serve_field_file(request, field_file, **kwargs):
+    """Convenience wrapper around :func:`serve_file` for ``FieldFile`` values."""
+    kwargs.setdefault('filename', os.path.basename(field_file.name))
+    return serve_file(request, field_file.path, **kwargs)
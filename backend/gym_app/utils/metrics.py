@@ -0,0 +1,286 @@
+"""Lightweight, always-on application metrics in Prometheus text format.
+
+Silk records every intercepted request (bodies, full SQL) into the database,
+which is too heavy to leave on in production. This module keeps only
+aggregates — histogram buckets, sums and counts per label set — so the
+per-request cost is a handful of dictionary (or Redis ``HINCRBYFLOAT``)
+updates:
+
+- ``memory`` backend: per-process dictionaries. Enough for ``runserver``
+  and tests; with several gunicorn workers each worker reports only its own
+  traffic.
+- ``redis`` backend: one Redis hash shared by every web worker and the Huey
+  consumer, so ``/api/metrics/`` shows the whole deployment.
+
+Metrics are recorded by :class:`gym_app.middleware.RequestMetricsMiddleware`
+(HTTP), by Huey signal handlers in ``gym_project/tasks.py`` (tasks) and by
+:mod:`gym_app.utils.render_pool` (document renders), and rendered by
+:func:`render_prometheus`. Gauges are set by each process to its own current
+value (:func:`set_gauge`). The Redis backend keeps every process's value
+under its own key, expiring ``METRICS_GAUGE_TTL`` seconds after the last
+update, and reports their sum: a process that dies without resetting its
+gauges stops counting once its keys expire.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'http_request_duration_seconds': (
+        'histogram', 'Request latency by view, method and status.', DURATION_BUCKETS,
+    ),
+    'http_request_db_queries': (
+        'histogram', 'SQL queries executed per request.', QUERY_COUNT_BUCKETS,
+    ),
+    'http_request_db_duration_seconds': (
+        'histogram', 'Time spent in SQL per request.', DURATION_BUCKETS,
+    ),
+    'http_response_size_bytes': (
+        'histogram', 'Response body size (when known without consuming a stream).', SIZE_BUCKETS,
+    ),
+    'http_slow_requests_total': (
+        'counter', 'Requests slower than METRICS_SLOW_REQUEST_MS.', None,
+    ),
+    'huey_task_duration_seconds': (
+        'histogram', 'Huey task execution time by task and outcome.', DURATION_BUCKETS,
+    ),
+    'document_render_duration_seconds': (
+        'histogram', 'Document render time in the render pool by kind and outcome.', DURATION_BUCKETS,
+    ),
+    'document_render_queue_wait_seconds': (
+        'histogram', 'Time a render job waited for a free render worker.', DURATION_BUCKETS,
+    ),
+    'document_render_queue_depth': (
+        'gauge', 'Render jobs submitted and not finished yet (queued or running).', None,
+    ),
+}
+
+
+class MemoryBackend:
+    """Per-process counters guarded by a lock."""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def increment_many(self, increments):
+        with self._lock:
+            for key, amount in increments:
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def set_gauge(self, key, value, ttl):
+        with self._lock:
+            self._values[key] = value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class RedisBackend:
+    """Counters in a single Redis hash, shared across processes."""
+
+    def __init__(self, url, key):
+        from redis import Redis
+
+        self._redis = Redis.from_url(url)
+        self._key = key
+
+    @staticmethod
+    def _field(key):
+        return json.dumps(key, separators=(',', ':'))
+
+    @staticmethod
+    def _parse(field):
+        name, labels, suffix = json.loads(field)
+        return name, tuple(tuple(pair) for pair in labels), suffix
+
+    def _gauge_prefix(self):
+        return f'{self._key}:gauge:'
+
+    def increment_many(self, increments):
+        pipe = self._redis.pipeline(transaction=False)
+        for key, amount in increments:
+            pipe.hincrbyfloat(self._key, self._field(key), amount)
+        pipe.execute()
+
+    def set_gauge(self, key, value, ttl):
+        # The process id is read per call: the backend may have been built
+        # in a gunicorn master before the workers were forked.
+        process = f'{socket.gethostname()}-{os.getpid()}'
+        self._redis.set(f'{self._gauge_prefix()}{process}:{self._field(key)}', value, ex=ttl)
+
+    def _gauge_keys(self):
+        return list(self._redis.scan_iter(match=f'{self._gauge_prefix()}*', count=500))
+
+    def snapshot(self):
+        values = {}
+        for field, value in self._redis.hgetall(self._key).items():
+            values[self._parse(field)] = float(value)
+        keys = self._gauge_keys()
+        prefix = len(self._gauge_prefix())
+        for redis_key, value in zip(keys, self._redis.mget(keys) if keys else []):
+            if value is None:
+                continue  # expired between SCAN and MGET
+            redis_key = redis_key.decode() if isinstance(redis_key, bytes) else redis_key
+            _process, field = redis_key[prefix:].split(':', 1)
+            key = self._parse(field)
+            values[key] = values.get(key, 0) + float(value)
+        return values
+
+    def clear(self):
+        self._redis.delete(self._key, *self._gauge_keys())
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the configured backend, building it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if getattr(settings, 'METRICS_BACKEND', 'memory') == 'redis':
+                    _backend = RedisBackend(
+                        settings.METRICS_REDIS_URL,
+                        getattr(settings, 'METRICS_REDIS_KEY', 'gym:metrics'),
+                    )
+                else:
+                    _backend = MemoryBackend()
+    return _backend
+
+
+def reset_backend():
+    """Drop the cached backend (tests, settings changes)."""
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+def _labels(labels):
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def histogram_increments(name, value, labels):
+    """Increments recording ``value`` in histogram ``name`` (non-cumulative buckets)."""
+    buckets = METRICS[name][2]
+    label_key = _labels(labels)
+    index = bisect_left(buckets, value)
+    bucket = repr(float(buckets[index])) if index < len(buckets) else '+Inf'
+    return [
+        ((name, label_key + (('le', bucket),), 'bucket'), 1),
+        ((name, label_key, 'sum'), value),
+        ((name, label_key, 'count'), 1),
+    ]
+
+
+def counter_increments(name, labels, amount=1):
+    return [((name, _labels(labels), 'total'), amount)]
+
+
+def record(increments):
+    """Apply a batch of increments; metrics must never break the caller."""
+    if not increments or not getattr(settings, 'METRICS_ENABLED', True):
+        return
+    try:
+        get_backend().increment_many(increments)
+    except Exception as exc:
+        logger.debug(f"Could not record metrics: {exc}")
+
+
+def observe(name, value, **labels):
+    record(histogram_increments(name, value, labels))
+
+
+def set_gauge(name, value, **labels):
+    """Set this process's value of gauge ``name``; never breaks the caller."""
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        return
+    try:
+        get_backend().set_gauge(
+            (name, _labels(labels), 'value'), value, getattr(settings, 'METRICS_GAUGE_TTL', 300),
+        )
+    except Exception as exc:
+        logger.debug(f"Could not record metrics: {exc}")
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_prometheus(snapshot=None):
+    """Render the current aggregate in the Prometheus text exposition format."""
+    if snapshot is None:
+        snapshot = get_backend().snapshot()
+
+    by_metric = {}
+    for (name, labels, suffix), value in snapshot.items():
+        by_metric.setdefault(name, []).append((labels, suffix, value))
+
+    lines = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        series = by_metric.get(name)
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        if metric_type == 'counter':
+            for labels, _suffix, value in sorted(series):
+                lines.append(f'{name}_total{_format_labels(labels)} {_format_value(value)}')
+            continue
+        if metric_type == 'gauge':
+            for labels, _suffix, value in sorted(series):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            continue
+
+        # Histogram: buckets are stored non-cumulatively; Prometheus wants
+        # cumulative ``le`` buckets ending with +Inf == count.
+        groups = {}
+        for labels, suffix, value in series:
+            if suffix == 'bucket':
+                base = tuple(pair for pair in labels if pair[0] != 'le')
+                le = dict(labels)['le']
+                groups.setdefault(base, {}).setdefault('buckets', {})[le] = value
+            else:
+                groups.setdefault(labels, {})[suffix] = value
+        bounds = [repr(float(b)) for b in buckets] + ['+Inf']
+        for labels in sorted(groups):
+            group = groups[labels]
+            cumulative = 0
+            for bound in bounds:
+                cumulative += group.get('buckets', {}).get(bound, 0)
+                bucket_labels = labels + (('le', bound),)
+                lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(group.get("sum", 0))}')
+            lines.append(f'{name}_count{_format_labels(labels)} {_format_value(group.get("count", 0))}')
+    return '\n'.join(lines) + '\n'
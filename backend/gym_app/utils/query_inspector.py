@@ -0,0 +1,151 @@
+"""Development/test-time N+1 query detection and per-view query budgets.
+
+:class:`QueryInspector` is a ``connection.execute_wrapper`` that groups every
+SQL statement of a request by its normalized template (literals and ``IN``
+lists replaced by ``?``). A template executed ``QUERY_INSPECTOR_NPLUSONE_THRESHOLD``
+times or more is reported as an N+1 together with the project stack that
+issued it (e.g. the serializer ``get_*`` method running one query per row).
+
+Views can declare how many queries they may run with :func:`query_budget`.
+:class:`gym_app.middleware.QueryInspectorMiddleware` applies both checks to
+every request when ``QUERY_INSPECTOR_ENABLED`` is set, logging to
+``gym_app.query_inspector`` or, with ``QUERY_INSPECTOR_RAISE``, raising
+:class:`NPlusOneDetected` / :class:`QueryBudgetExceeded` so tests fail.
+"""
+
+import logging
+import os
+import re
+import traceback
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger('gym_app.query_inspector')
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class QueryInspectionError(AssertionError):
+    """Base class for query inspection failures (raised only when configured)."""
+
+
+class NPlusOneDetected(QueryInspectionError):
+    """A query template repeated more often than the N+1 threshold."""
+
+
+class QueryBudgetExceeded(QueryInspectionError):
+    """A view ran more queries than its declared budget."""
+
+
+def normalize_sql(sql):
+    """Reduce ``sql`` to a template shared by statements that differ only in literals."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+def query_budget(max_queries):
+    """Declare the maximum number of SQL queries a view may execute.
+
+    Apply it as the outermost decorator so the attribute lands on the
+    function Django resolves (e.g. above ``@api_view``).
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def _project_stack():
+    """Frames of project code that led to the current query, outermost first."""
+    base_dir = str(settings.BASE_DIR)
+    this_file = os.path.abspath(__file__)
+    frames = []
+    for frame in traceback.extract_stack():
+        filename = os.path.abspath(frame.filename)
+        if (
+            not filename.startswith(base_dir)
+            or 'site-packages' in filename
+            or filename == this_file
+            or os.sep + 'tests' + os.sep in filename
+        ):
+            continue
+        frames.append(f"{os.path.relpath(filename, base_dir)}:{frame.lineno} in {frame.name}")
+    return frames
+
+
+class QueryInspector:
+    """``connection.execute_wrapper`` that counts statements per normalized template.
+
+    The project stack is captured only when a template reaches the
+    threshold, so fast paths pay for a regex normalization per statement
+    and nothing else.
+    """
+
+    def __init__(self, threshold=None):
+        if threshold is None:
+            threshold = getattr(settings, 'QUERY_INSPECTOR_NPLUSONE_THRESHOLD', 5)
+        self.threshold = max(2, threshold)
+        self.count = 0
+        self.templates = {}
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        template = normalize_sql(sql)
+        seen = self.templates.get(template, 0) + 1
+        self.templates[template] = seen
+        if seen == self.threshold:
+            self.stacks[template] = _project_stack()
+        return execute(sql, params, many, context)
+
+    def repeated(self):
+        """``[(template, count, stack)]`` for templates at or above the threshold, worst first."""
+        return sorted(
+            (
+                (template, count, self.stacks.get(template, []))
+                for template, count in self.templates.items()
+                if count >= self.threshold
+            ),
+            key=lambda item: -item[1],
+        )
+
+    def report(self, label, budget=None):
+        """Log (or raise, per ``QUERY_INSPECTOR_RAISE``) N+1 patterns and budget overruns."""
+        problems = []
+        for template, count, stack in self.repeated():
+            origin = '\n    '.join(stack) or '(no project frames)'
+            problems.append((
+                NPlusOneDetected,
+                f"Possible N+1 in {label}: {count} x {template}\n  originating stack:\n    {origin}",
+            ))
+        if budget is not None and self.count > budget:
+            problems.append((
+                QueryBudgetExceeded,
+                f"{label} ran {self.count} queries, budget is {budget}",
+            ))
+
+        for _exc_class, message in problems:
+            logger.warning(message)
+        if problems and getattr(settings, 'QUERY_INSPECTOR_RAISE', False):
+            raise problems[0][0]('\n'.join(message for _exc_class, message in problems))
+        return problems
+
+
+@contextmanager
+def inspect_queries(label='block', budget=None, threshold=None):
+    """Inspect the queries run inside the block, reporting like the middleware.
+
+    Yields the :class:`QueryInspector`; useful in tests and shell sessions
+    for code paths that are not HTTP requests (tasks, serializers).
+    """
+    inspector = QueryInspector(threshold)
+    with connection.execute_wrapper(inspector):
+        yield inspector
+    inspector.report(label, budget)
@@ -0,0 +1,97 @@
+"""Shared cache of rendered document PDFs.
+
+A WeasyPrint pass is by far the most expensive step of a document download,
+and the same documents are downloaded again and again (a FullySigned contract
+is never edited, yet it is exported for every client request). The output of a
+render depends only on the assembled HTML (stylesheet, embedded letterhead and
+substituted body), so renders are cached under the SHA-256 of that HTML for
+``DOCUMENT_RENDER_CACHE_TTL`` seconds. Any change to the content, a variable
+or the letterhead produces a different key; stale entries simply age out.
+Renders larger than ``DOCUMENT_RENDER_CACHE_MAX_BYTES`` are not cached.
+
+Entries live in their own cache (``DOCUMENT_RENDER_CACHE_ALIAS``, on disk in
+production) so they never evict sessions, throttle counters or dashboard
+stats from the default cache.
+
+The single downloads (``render_document_pdf``) and the bulk ZIP export share
+the cache, so whichever path renders a document first warms it for the other.
+An export passes a :class:`StoreBudget` so a single archive cannot flush the
+cache with its own renders.
+"""
+
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+PDF = 'pdf'
+
+
+class StoreBudget:
+    """Bytes of new renders one operation may still add to the cache."""
+
+    def __init__(self, max_bytes):
+        self.remaining = max_bytes
+        self._lock = threading.Lock()
+
+    def reserve(self, size):
+        """Take ``size`` bytes from the budget; ``False`` when it is exhausted."""
+        with self._lock:
+            if size > self.remaining:
+                return False
+            self.remaining -= size
+            return True
+
+
+def _backend():
+    return caches[getattr(settings, 'DOCUMENT_RENDER_CACHE_ALIAS', 'document_renders')]
+
+
+def render_key(kind, source):
+    """Cache key of the ``kind`` render of ``source`` (the full render input)."""
+    digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+    return f'document-render:{kind}:{digest}'
+
+
+def _timeout():
+    return getattr(settings, 'DOCUMENT_RENDER_CACHE_TTL', 6 * 60 * 60)
+
+
+def lookup(key):
+    """Return the cached render stored under ``key``, or ``None``."""
+    if _timeout() <= 0:
+        return None
+    try:
+        return _backend().get(key)
+    except Exception as exc:
+        logger.debug(f"Document render cache unavailable: {exc}")
+        return None
+
+
+def store(key, data, budget=None):
+    """Cache ``data`` under ``key`` unless caching is off, it is too large or
+    it does not fit in ``budget``."""
+    timeout = _timeout()
+    max_bytes = getattr(settings, 'DOCUMENT_RENDER_CACHE_MAX_BYTES', 5 * 1024 * 1024)
+    if timeout <= 0 or len(data) > max_bytes:
+        return
+    if budget is not None and not budget.reserve(len(data)):
+        return
+    try:
+        _backend().set(key, data, timeout)
+    except Exception as exc:
+        logger.debug(f"Could not cache document render: {exc}")
+
+
+def get_or_render(kind, source, render, budget=None):
+    """Return the cached ``kind`` render of ``source``, calling ``render()`` on a miss."""
+    key = render_key(kind, source)
+    data = lookup(key)
+    if data is None:
+        data = render()
+        store(key, data, budget)
+    return data
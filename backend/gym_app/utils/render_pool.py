@@ -0,0 +1,220 @@
+"""Process pool for CPU-bound document rendering.
+
+WeasyPrint (document PDFs) and xhtml2pdf (service request summaries) are pure
+CPU work that holds the GIL for the whole render, so renders running on the
+web worker itself serialize behind each other and stall every other request
+served by that process. Renders are handed to this module instead:
+
+- ``RENDER_POOL_WORKERS`` warm worker processes per web process. Each worker
+  starts (:func:`gym_project.render_worker.initialize`) with Django
+  configured, the Carlito fonts resolved and the document stylesheet built,
+  and runs one throw-away render so WeasyPrint's own imports, font
+  configuration and ``@font-face`` loading are paid once at start-up instead
+  of on the first user-facing download.
+- Workers are started with ``spawn`` (no database connections or locks are
+  inherited from the web process) and replaced after
+  ``RENDER_POOL_MAX_TASKS_PER_WORKER`` jobs to bound memory growth.
+- The pool belongs to the process that first renders: it is created on first
+  use and recreated when the process id changes, so a pool is never shared
+  across a fork (gunicorn ``--preload`` starts nothing in the master). To
+  start workers before the first download, call :func:`warm_up` from a
+  gunicorn ``post_fork`` hook.
+- ``RENDER_POOL_WORKERS = 0`` (the default outside production) renders in the
+  calling thread, with the same metrics.
+
+Memory: every render worker is a full Django process with WeasyPrint loaded,
+about as large as a web worker, so a deployment runs
+``gunicorn workers x (1 + RENDER_POOL_WORKERS)`` such processes once each web
+worker has rendered.
+
+Jobs are submitted through :func:`submit` / :func:`run` with a module-level
+render callable and its arguments (both are pickled to the worker). Every job
+records its render time (``document_render_duration_seconds``) and the time it
+waited for a free worker (``document_render_queue_wait_seconds``); each
+process publishes its number of jobs in flight as the
+``document_render_queue_depth`` gauge. All are labelled by kind.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from gym_app.utils import metrics
+from gym_project import render_worker
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+# kind -> jobs submitted by this process and not finished yet
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def _workers():
+    return getattr(settings, 'RENDER_POOL_WORKERS', 0)
+
+
+def _get_executor():
+    """Return this process's pool (created on first use), or ``None`` when inline."""
+    global _executor, _executor_pid
+    workers = _workers()
+    if workers <= 0:
+        return None
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=render_worker.initialize,
+                max_tasks_per_child=getattr(settings, 'RENDER_POOL_MAX_TASKS_PER_WORKER', 200) or None,
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _discard_executor(executor):
+    """Forget ``executor`` (broken) so the next job starts a fresh pool.
+
+    A broken pool has already terminated its workers. It is not shut down
+    here: this runs in its done-callbacks, under the pool's own shutdown lock.
+    """
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+
+
+def shutdown():
+    """Stop the worker processes of this process's pool, if any."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None and _executor_pid == os.getpid():
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown)
+
+
+def _track(kind, amount):
+    """Move this process's count of ``kind`` jobs in flight and publish it."""
+    with _in_flight_lock:
+        depth = _in_flight[kind] = _in_flight.get(kind, 0) + amount
+        metrics.set_gauge('document_render_queue_depth', depth, kind=kind)
+
+
+def _run_job(fn, args, kwargs, submitted_at):
+    """Worker side of a job: return ``(queue_wait, render_time, result)``.
+
+    On failure the timings travel back on the exception (``render_timing``);
+    exception attributes survive pickling.
+    """
+    started = time.time()
+    queue_wait = max(0.0, started - submitted_at)
+    start = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as exc:
+        exc.render_timing = (queue_wait, time.perf_counter() - start)
+        raise
+    return queue_wait, time.perf_counter() - start, result
+
+
+def _run_inline(fn, args, kwargs):
+    future = Future()
+    try:
+        future.set_result(_run_job(fn, args, kwargs, time.time()))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _resolve(kind, job, outer, executor):
+    """Record the job's metrics and pass its outcome on to ``outer``."""
+    _track(kind, -1)
+    error = None
+    try:
+        queue_wait, render_time, result = job.result()
+    except Exception as exc:
+        error = exc
+        if isinstance(exc, BrokenProcessPool) and executor is not None:
+            logger.error(f"Render pool broken ({exc}); starting a new one on the next job")
+            _discard_executor(executor)
+        queue_wait, render_time = getattr(exc, 'render_timing', (None, None))
+
+    if render_time is not None:
+        metrics.observe('document_render_queue_wait_seconds', queue_wait, kind=kind)
+        metrics.observe(
+            'document_render_duration_seconds', render_time,
+            kind=kind, outcome='error' if error else 'ok',
+        )
+    if not outer.set_running_or_notify_cancel():
+        return  # the caller gave up on this job
+    if error is not None:
+        outer.set_exception(error)
+    else:
+        outer.set_result(result)
+
+
+def submit(kind, fn, *args, **kwargs):
+    """Queue ``fn(*args, **kwargs)`` as a ``kind`` render and return a Future.
+
+    ``fn`` must be a module-level callable; it and its arguments are pickled
+    to a worker process unless the pool is disabled.
+    """
+    outer = Future()
+    _track(kind, 1)
+    executor = _get_executor()
+    if executor is None:
+        job = _run_inline(fn, args, kwargs)
+    else:
+        try:
+            try:
+                job = executor.submit(_run_job, fn, args, kwargs, time.time())
+            except BrokenProcessPool:
+                _discard_executor(executor)
+                executor = _get_executor()
+                job = executor.submit(_run_job, fn, args, kwargs, time.time())
+        except Exception:
+            _track(kind, -1)
+            raise
+    job.add_done_callback(lambda done: _resolve(kind, done, outer, executor))
+    outer.add_done_callback(lambda done: done.cancelled() and job.cancel())
+    return outer
+
+
+def run(kind, fn, *args, **kwargs):
+    """Render through the pool and wait for the result (see :func:`submit`).
+
+    Waits at most ``RENDER_POOL_TIMEOUT`` seconds; a job still queued at that
+    point is cancelled and :class:`TimeoutError` is raised.
+    """
+    future = submit(kind, fn, *args, **kwargs)
+    try:
+        return future.result(timeout=getattr(settings, 'RENDER_POOL_TIMEOUT', 120))
+    except TimeoutError:
+        future.cancel()
+        raise
+
+
+def warm_up():
+    """Start every worker of this process's pool now instead of on the first
+    render; a no-op when the pool is disabled.
+
+    Meant for a gunicorn ``post_fork`` hook. Never call it in a process that
+    forks web workers afterwards: each of them would start its own pool anyway.
+    """
+    executor = _get_executor()
+    if executor is None:
+        return []
+    return [executor.submit(os.getpid) for _ in range(_workers())]
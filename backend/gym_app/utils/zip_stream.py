@@ -0,0 +1,58 @@
+"""Incremental ZIP writer for streamed downloads.
+
+:class:`ZipStream` builds a ZIP archive entry by entry and hands back the bytes
+produced by every step, so a view can feed them to a
+``StreamingHttpResponse`` without ever holding the whole archive in memory.
+``zipfile`` writes to a non-seekable sink in streaming mode: each entry's CRC
+and sizes follow its data in a data descriptor, and the central directory is
+emitted by :meth:`ZipStream.finish`. ZIP64 records are used when needed.
+"""
+
+import io
+import time
+import zipfile
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable file that collects what ``ZipFile`` writes."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStream:
+    """Write a ZIP archive incrementally (see module docs)."""
+
+    def __init__(self):
+        self._sink = _ChunkSink()
+        self._archive = zipfile.ZipFile(self._sink, mode='w', allowZip64=True)
+
+    def add(self, name, data, *, compress=False):
+        """Append entry ``name`` holding ``data`` and return the bytes written.
+
+        Entries are stored as-is by default: PDFs and Office files are already
+        compressed. Pass ``compress=True`` for text such as a manifest.
+        """
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        info.external_attr = 0o644 << 16
+        self._archive.writestr(info, data)
+        return self._sink.drain()
+
+    def finish(self):
+        """Write the central directory and return the final bytes."""
+        self._archive.close()
+        return self._sink.drain()
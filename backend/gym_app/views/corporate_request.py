@@ -3,7 +3,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from gym_app.models import (
@@ -16,6 +17,8 @@ from gym_app.serializers.corporate_request import (
     CorporateRequestTypeSerializer, CorporateRequestFilesSerializer,
     CorporateRequestResponseSerializer, UserBasicInfoSerializer
 )
+from gym_app.utils import dashboard_cache
+from gym_app.utils.query_inspector import query_budget
 
 # Custom pagination class
 class CorporateRequestPagination(PageNumberPagination):
@@ -23,6 +26,20 @@ class CorporateRequestPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+def _with_list_data(queryset):
+    """
+    Load what CorporateRequestListSerializer reads in the list query itself:
+    related rows via joins and the response count as a correlated subquery.
+    """
+    response_counts = CorporateRequestResponse.objects.filter(
+        corporate_request=OuterRef('pk')
+    ).order_by().values('corporate_request').annotate(total=Count('*')).values('total')
+    return queryset.select_related(
+        'client', 'corporate_client', 'organization', 'request_type'
+    ).annotate(
+        response_count=Coalesce(Subquery(response_counts, output_field=IntegerField()), 0)
+    )
+
 # Decorators for role-based access
 def require_client_only(view_func):
     """Decorator to ensure only normal clients and basic users can access the view"""
@@ -61,6 +78,7 @@ def require_client_or_corporate_client(view_func):
 # ENDPOINTS FOR NORMAL CLIENTS
 # =============================================================================
 
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @require_client_only
@@ -73,7 +91,7 @@ def client_get_my_organizations(request):
     memberships = OrganizationMembership.objects.filter(
         user=request.user,
         is_active=True
-    ).select_related('organization')
+    ).select_related('organization__corporate_client')
     
     organizations_data = []
     for membership in memberships:
@@ -146,6 +164,7 @@ def client_create_corporate_request(request):
         'details': serializer.errors
     }, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @require_client_only
@@ -159,7 +178,7 @@ def client_get_my_corporate_requests(request):
     search = request.GET.get('search', None)
     
     # Base queryset - only requests created by current client
-    queryset = CorporateRequest.objects.filter(client=request.user)
+    queryset = _with_list_data(CorporateRequest.objects.filter(client=request.user))
     
     # Apply filters
     if status_filter:
@@ -264,6 +283,7 @@ def client_add_response_to_request(request, request_id):
 # ENDPOINTS FOR CORPORATE CLIENTS
 # =============================================================================
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @require_corporate_client_only
@@ -278,7 +298,7 @@ def corporate_get_received_requests(request):
     assigned_to_me = request.GET.get('assigned_to_me', None)
     
     # Base queryset - only requests for current corporate client
-    queryset = CorporateRequest.objects.filter(corporate_client=request.user)
+    queryset = _with_list_data(CorporateRequest.objects.filter(corporate_client=request.user))
     
     # Apply filters
     if status_filter:
@@ -455,41 +475,51 @@ def corporate_add_response_to_request(request, request_id):
 def corporate_get_dashboard_stats(request):
     """
     Get dashboard statistics for corporate client.
+
+    All counts come from a single conditional aggregate over the client's
+    requests, cached per user (see ``gym_app.utils.dashboard_cache``).
     """
-    # Base queryset for current corporate client
-    base_queryset = CorporateRequest.objects.filter(corporate_client=request.user)
-    
-    # Status counts
-    status_counts = {}
-    for status_code, status_name in CorporateRequest.STATUS_CHOICES:
-        status_counts[status_code] = base_queryset.filter(status=status_code).count()
-    
-    # Priority counts
-    priority_counts = {}
-    for priority_code, priority_name in CorporateRequest.PRIORITY_CHOICES:
-        priority_counts[priority_code] = base_queryset.filter(priority=priority_code).count()
-    
-    # Recent requests (last 7 days)
-    recent_date = timezone.now() - timezone.timedelta(days=7)
-    recent_requests_count = base_queryset.filter(created_at__gte=recent_date).count()
-    
-    # Assigned to current user
-    assigned_to_me_count = base_queryset.filter(assigned_to=request.user).count()
-    
-    # Overdue requests (past estimated completion date)
-    overdue_count = base_queryset.filter(
-        estimated_completion_date__lt=timezone.now(),
-        status__in=['PENDING', 'IN_REVIEW']
-    ).count()
-    
-    return Response({
-        'total_requests': base_queryset.count(),
-        'status_counts': status_counts,
-        'priority_counts': priority_counts,
-        'recent_requests_count': recent_requests_count,
-        'assigned_to_me_count': assigned_to_me_count,
-        'overdue_count': overdue_count
-    }, status=status.HTTP_200_OK)
+    stats = dashboard_cache.get_or_compute(
+        dashboard_cache.CORPORATE_REQUEST_STATS,
+        request.user.id,
+        lambda: _corporate_dashboard_stats(request.user),
+    )
+    return Response(stats, status=status.HTTP_200_OK)
+
+
+def _corporate_dashboard_stats(user):
+    now = timezone.now()
+    aggregates = {
+        'total_requests': Count('id'),
+        # Recent requests (last 7 days)
+        'recent_requests_count': Count('id', filter=Q(created_at__gte=now - timezone.timedelta(days=7))),
+        # Assigned to current user
+        'assigned_to_me_count': Count('id', filter=Q(assigned_to=user)),
+        # Overdue requests (past estimated completion date)
+        'overdue_count': Count('id', filter=Q(
+            estimated_completion_date__lt=now,
+            status__in=['PENDING', 'IN_REVIEW'],
+        )),
+    }
+    for status_code, _status_name in CorporateRequest.STATUS_CHOICES:
+        aggregates[f'status:{status_code}'] = Count('id', filter=Q(status=status_code))
+    for priority_code, _priority_name in CorporateRequest.PRIORITY_CHOICES:
+        aggregates[f'priority:{priority_code}'] = Count('id', filter=Q(priority=priority_code))
+
+    counts = CorporateRequest.objects.filter(corporate_client=user).aggregate(**aggregates)
+
+    return {
+        'total_requests': counts['total_requests'],
+        'status_counts': {
+            code: counts[f'status:{code}'] for code, _name in CorporateRequest.STATUS_CHOICES
+        },
+        'priority_counts': {
+            code: counts[f'priority:{code}'] for code, _name in CorporateRequest.PRIORITY_CHOICES
+        },
+        'recent_requests_count': counts['recent_requests_count'],
+        'assigned_to_me_count': counts['assigned_to_me_count'],
+        'overdue_count': counts['overdue_count'],
+    }
 
 # =============================================================================
 # SHARED ENDPOINTS
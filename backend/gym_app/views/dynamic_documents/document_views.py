@@ -1,35 +1,34 @@
 import io
-import re
 import os
 import logging
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.models import Q
 from django.db.models.functions import Lower
 from django.http import FileResponse, Http404
-from django.template.loader import get_template
 from PIL import Image
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from bs4 import BeautifulSoup, NavigableString
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from django.db.models import Prefetch
 from gym_app.models.dynamic_document import (
-    DynamicDocument, RecentDocument, DocumentSignature,
+    DynamicDocument, DocumentVariable, RecentDocument, DocumentSignature,
     DocumentVisibilityPermission, DocumentUsabilityPermission, Tag,
 )
 from gym_app.serializers.dynamic_document import DynamicDocumentSerializer, DynamicDocumentListSerializer, RecentDocumentSerializer
 from gym_app.utils.documents import (
+    apply_content_patch,
     normalize_fragmented_variables,
-    sanitize_soup_for_export,
+    prepare_export_soup,
     render_document_pdf,
     get_letterhead_for_document,
     get_letterhead_word_template,
     ensure_letterhead_snapshot,
 )
+from gym_app.utils.docx_export import DOCX_CONTENT_TYPE, render_document_docx
+from gym_app.utils.file_delivery import serve_field_file
 from django.utils import timezone
 from .permissions import (
     apply_visibility_filter,
@@ -105,28 +104,18 @@ def create_dynamic_document(request):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def list_dynamic_documents(request):
-    """
-    Get a list of all dynamic documents.
-    """
-    # Base queryset with all related data needed by the serializer.
-    # Uses shared helper so that N+1 queries are avoided.
-    queryset = get_optimized_document_queryset().order_by('-updated_at')
-
-    # Queryset-level visibility filtering — lawyers see everything,
-    # non-lawyers see only documents they are permitted to view.
-    # This replaces the old post-serialization filter_documents_by_visibility
-    # decorator, eliminating a redundant DB round-trip.
-    queryset = apply_visibility_filter(queryset, request.user)
+def filter_document_queryset(queryset, params, user):
+    """Apply the ``list_dynamic_documents`` query filters and sort order.
 
+    ``params`` is the request's query dict. Shared by the list endpoint and the
+    bulk ZIP export so both select exactly the same documents.
+    """
     # Optional filters used by the frontend store
-    state = request.query_params.get('state')
+    state = params.get('state')
     # Optional multi-state filter: comma-separated list of states, e.g. "Draft,Published"
-    states_param = request.query_params.get('states')
-    client_id = request.query_params.get('client_id')
-    lawyer_id = request.query_params.get('lawyer_id')
+    states_param = params.get('states')
+    client_id = params.get('client_id')
+    lawyer_id = params.get('lawyer_id')
 
     # If a multi-state filter is provided, it takes precedence over the single state filter
     if states_param:
@@ -143,31 +132,31 @@ def list_dynamic_documents(request):
         queryset = queryset.filter(created_by_id=lawyer_id)
 
     # Filter minutas flagged as collaboratively editable ("Compartidas" scope)
-    shared = request.query_params.get('shared', '')
+    shared = params.get('shared', '')
     if shared.lower() in ('1', 'true'):
         queryset = queryset.filter(allow_shared_edit=True)
 
     # When true, restrict results to documents where the requesting user is
     # the creator (created_by) OR a signer (has a DocumentSignature row).
-    user_related = request.query_params.get('user_related', '').lower() in ('true', '1')
+    user_related = params.get('user_related', '').lower() in ('true', '1')
     # When true (only meaningful with user_related), require the signer to
     # have signed=True.  Used by the FullySigned tab to exclude unsigned signers.
-    signer_signed = request.query_params.get('signer_signed', '').lower() in ('true', '1')
+    signer_signed = params.get('signer_signed', '').lower() in ('true', '1')
     # When true, return only documents without an assigned client.
-    unassigned = request.query_params.get('unassigned', '').lower() in ('true', '1')
+    unassigned = params.get('unassigned', '').lower() in ('true', '1')
 
     if user_related:
-        signer_q = Q(signatures__signer=request.user)
+        signer_q = Q(signatures__signer=user)
         if signer_signed:
-            signer_q = Q(signatures__signer=request.user, signatures__signed=True)
-        queryset = queryset.filter(Q(created_by=request.user) | signer_q).distinct()
+            signer_q = Q(signatures__signer=user, signatures__signed=True)
+        queryset = queryset.filter(Q(created_by=user) | signer_q).distinct()
 
     if unassigned:
         queryset = queryset.filter(assigned_to__isnull=True)
 
     # Full-text search across title, variable values, assigned user name,
     # and the creator's name (so lawyers can search shared minutas by author).
-    search = request.query_params.get('search', '').strip()
+    search = params.get('search', '').strip()
     if search:
         queryset = queryset.filter(
             Q(title__icontains=search)
@@ -179,7 +168,7 @@ def list_dynamic_documents(request):
         ).distinct()
 
     # Filter by tag
-    tag_id = request.query_params.get('tag_id')
+    tag_id = params.get('tag_id')
     if tag_id:
         try:
             queryset = queryset.filter(tags__id=int(tag_id))
@@ -187,8 +176,8 @@ def list_dynamic_documents(request):
             pass  # Ignore invalid tag_id values
 
     # Date range filter (subscription date variable, falling back to created_at)
-    date_from = request.query_params.get('date_from')
-    date_to = request.query_params.get('date_to')
+    date_from = params.get('date_from')
+    date_to = params.get('date_to')
     if date_from or date_to:
         # IDs of documents that have a subscription_date variable within range
         date_q = Q(variables__summary_field='subscription_date')
@@ -212,7 +201,7 @@ def list_dynamic_documents(request):
         queryset = queryset.filter(pk__in=set(docs_with_date_var) | set(docs_fallback))
 
     # Sort parameter
-    sort_by = request.query_params.get('sort_by', 'recent')
+    sort_by = params.get('sort_by', 'recent')
     # Lower() keeps name ordering case-insensitive on every backend (MySQL's
     # _ci collation already behaves this way; SQLite's binary collation does not).
     sort_map = {
@@ -223,6 +212,27 @@ def list_dynamic_documents(request):
     }
     order_field = sort_map.get(sort_by, '-updated_at')
     queryset = queryset.order_by(order_field)
+    return queryset
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def list_dynamic_documents(request):
+    """
+    Get a list of all dynamic documents.
+    """
+    # Base queryset with all related data needed by the serializer.
+    # Uses shared helper so that N+1 queries are avoided.
+    queryset = get_optimized_document_queryset().order_by('-updated_at')
+
+    # Queryset-level visibility filtering — lawyers see everything,
+    # non-lawyers see only documents they are permitted to view.
+    # This replaces the old post-serialization filter_documents_by_visibility
+    # decorator, eliminating a redundant DB round-trip.
+    queryset = apply_visibility_filter(queryset, request.user)
+
+    # Query-string filters and sort order (shared with the bulk ZIP export)
+    queryset = filter_document_queryset(queryset, request.query_params, request.user)
 
     # Pagination parameters (fallback to sensible defaults)
     try:
@@ -252,16 +262,17 @@ def list_dynamic_documents(request):
 
     serializer = DynamicDocumentListSerializer(page_obj.object_list, many=True, context={'request': request})
 
+    params = request.query_params
     logger.debug(
         "list_dynamic_documents: user=%s role=%s page=%s limit=%s state=%s client_id=%s lawyer_id=%s search=%s total_items=%s items_on_page=%s total_pages=%s",
         getattr(request.user, "id", None),
         getattr(request.user, "role", None),
         page,
         limit,
-        state,
-        client_id,
-        lawyer_id,
-        search,
+        params.get('state'),
+        params.get('client_id'),
+        params.get('lawyer_id'),
+        params.get('search', '').strip(),
         paginator.count,
         len(page_obj.object_list),
         paginator.num_pages,
@@ -358,6 +369,161 @@ def update_dynamic_document(request, pk):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+@require_document_usability('usability')
+def autosave_dynamic_document(request, pk):
+    """
+    Incrementally save a document's content and variable values.
+
+    Meant for the editor's autosave loop: instead of re-uploading the full HTML
+    and every variable, the client sends only what changed since the revision
+    it last received.
+
+    Payload:
+    - revision (int, required): revision the client's copy is based on.
+    - content_patch (list, optional): splice operations
+      ``[{"start": int, "end": int, "text": str}, ...]`` against that revision.
+    - content (str, optional): full replacement, used when no patch is sent.
+    - title (str, optional)
+    - variables (list, optional): ``[{"id": int, "value": str}, ...]``; only
+      variables whose value actually changed are written.
+
+    Returns 409 with the current ``revision`` when the client's copy is stale,
+    so it can reload and rebase instead of overwriting a concurrent editor.
+    """
+    try:
+        base_revision = int(request.data.get('revision'))
+    except (TypeError, ValueError):
+        return Response(
+            {'detail': 'revision is required and must be an integer.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    content_patch = request.data.get('content_patch')
+    variables_data = request.data.get('variables') or []
+    if not isinstance(variables_data, list):
+        return Response(
+            {'detail': 'variables must be a list.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # This endpoint bypasses the serializer, so check the raw field types here.
+    field_errors = {}
+    if 'content' in request.data and not isinstance(request.data['content'], str):
+        field_errors['content'] = ['content must be a string.']
+    title = request.data.get('title')
+    title_max_length = DynamicDocument._meta.get_field('title').max_length
+    if title is not None and not isinstance(title, str):
+        field_errors['title'] = ['title must be a string.']
+    elif title is not None and len(title) > title_max_length:
+        field_errors['title'] = [f'title must be at most {title_max_length} characters.']
+    if field_errors:
+        return Response(field_errors, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        try:
+            document = DynamicDocument.objects.select_for_update().get(pk=pk)
+        except DynamicDocument.DoesNotExist:  # pragma: no cover – decorator intercepts first
+            return Response({'detail': 'Dynamic document not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if document.state in LOCKED_STATES:
+            return Response(
+                {'detail': 'No se puede modificar un documento en estado de firma.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if not can_modify_minuta(document, request.user, request.data):
+            return Response(
+                {'detail': 'Solo el creador de la minuta puede realizar esta acción.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if document.revision != base_revision:
+            return Response(
+                {
+                    'detail': 'El documento fue modificado por otro usuario.',
+                    'revision': document.revision,
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+
+        update_fields = []
+
+        if content_patch is not None:
+            try:
+                new_content = apply_content_patch(document.content, content_patch)
+            except ValueError as e:
+                return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            new_content = request.data.get('content', document.content)
+
+        new_content = normalize_fragmented_variables(new_content)
+        if new_content != document.content:
+            document.content = new_content
+            update_fields.append('content')
+
+        if title is not None and title != document.title:
+            document.title = title
+            update_fields.append('title')
+
+        changed_variables = []
+        submitted_values = {}
+        invalid_values = {}
+        for item in variables_data:
+            try:
+                variable_id = int(item['id'])
+                value = item.get('value')
+            except (TypeError, KeyError, ValueError, AttributeError):
+                return Response(
+                    {'detail': 'Each variable must include its id.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # Values are stored as text; JSON numbers are accepted as such,
+            # anything else would break the type checks in clean().
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                value = str(value)
+            elif value is not None and not isinstance(value, str):
+                invalid_values[variable_id] = ['El valor debe ser un texto.']
+                continue
+            submitted_values[variable_id] = value
+
+        if invalid_values:
+            return Response({'variables': invalid_values}, status=status.HTTP_400_BAD_REQUEST)
+
+        if submitted_values:
+            existing = document.variables.filter(pk__in=submitted_values.keys())
+            for variable in existing:
+                new_value = submitted_values[variable.pk]
+                if new_value == variable.value:
+                    continue
+                variable.value = new_value
+                try:
+                    variable.clean()
+                except ValidationError as e:
+                    return Response(
+                        {'variables': {variable.pk: e.message_dict.get('value', e.messages)}},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                changed_variables.append(variable)
+            if changed_variables:
+                DocumentVariable.objects.bulk_update(changed_variables, ['value'])
+
+        if update_fields or changed_variables:
+            document.revision = base_revision + 1
+            document.save(update_fields=update_fields + ['revision', 'updated_at'])
+
+    return Response(
+        {
+            'id': document.pk,
+            'revision': document.revision,
+            'updated_at': document.updated_at,
+            'updated_variables': [variable.pk for variable in changed_variables],
+        },
+        status=status.HTTP_200_OK
+    )
+
+
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 @require_document_usability('owner')
@@ -380,6 +546,42 @@ def delete_dynamic_document(request, pk):
     return Response({'detail': 'Dynamic document deleted successfully.'}, status=status.HTTP_200_OK)
 
 
+def document_pdf_render_args(document, fallback_user=None):
+    """Return the ``render_document_pdf`` keyword arguments of the PDF download.
+
+    Substitutes variables and sanitizes Word-pasted markup (shared with the
+    Word export) so the renderer preserves table formatting, and resolves the
+    letterhead. Also used by the bulk ZIP export.
+    """
+    soup = prepare_export_soup(document)
+
+    ensure_letterhead_snapshot(document)
+    letterhead_image = get_letterhead_for_document(
+        document, fallback_user=fallback_user
+    )
+    return {
+        'title': document.title,
+        'body_html': str(soup),
+        'letterhead_image': letterhead_image,
+        'top_padding': "1cm",
+    }
+
+
+def document_word_render_args(document, fallback_user=None):
+    """Return the ``render_document_docx`` keyword arguments of the Word download.
+
+    Goes through the same preparation stage as the PDF download and resolves
+    the letterhead Word template. Also used by the bulk ZIP export.
+    """
+    soup = prepare_export_soup(document)
+
+    ensure_letterhead_snapshot(document)
+    word_template = get_letterhead_word_template(
+        document, fallback_user=fallback_user,
+    )
+    return {'soup': soup, 'word_template': word_template}
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 @require_document_visibility
@@ -412,37 +614,9 @@ def download_dynamic_document_pdf(request, pk, for_version=False):
             'created_by', 'formalized_by'
         ).prefetch_related('variables', 'signatures__signer', 'tags').get(pk=pk)
 
-        # Normalize any {{ }} patterns that TinyMCE may have split across HTML tags
-        processed_content = normalize_fragmented_variables(document.content)
-
-        # Replace variables within the content (use formatted values when available).
-        # Use a regex so we tolerate whitespace inside ``{{ name }}`` markers that
-        # the editor or paste-postprocessing may have introduced.
-        for variable in document.variables.all():
-            try:
-                replacement_value = variable.get_formatted_value()
-            except AttributeError:  # pragma: no cover – defensive fallback for missing method
-                replacement_value = variable.value or ""
-            pattern = re.compile(
-                r'\{\{\s*' + re.escape(variable.name_en) + r'\s*\}\}'
-            )
-            processed_content = pattern.sub(replacement_value or "", processed_content)
-
-        # Parse once; sanitize Word-pasted markup in place so the renderer
-        # preserves table formatting and alignment.
-        soup = sanitize_soup_for_export(BeautifulSoup(processed_content, 'html.parser'))
-
-        ensure_letterhead_snapshot(document)
-        letterhead_image = get_letterhead_for_document(
-            document, fallback_user=request.user
-        )
-
         # Render with WeasyPrint (browser-grade CSS/table layout → matches editor)
         pdf_buffer = io.BytesIO(render_document_pdf(
-            title=document.title,
-            body_html=str(soup),
-            letterhead_image=letterhead_image,
-            top_padding="1cm",
+            **document_pdf_render_args(document, fallback_user=request.user)
         ))
 
         # If this is for a version, return the buffer
@@ -473,9 +647,9 @@ def download_dynamic_document_pdf(request, pk, for_version=False):
 def download_dynamic_document_word(request, pk):
     """
     Generates and returns a Word (.docx) file for the given document using python-docx.
-    The document content is retrieved from the database, and its variables are dynamically replaced.
-    The content is then parsed from HTML using BeautifulSoup and converted into a Word document,
-    applying appropriate formatting, including headings, paragraphs, and styles.
+    The document content goes through the same preparation stage as the PDF download
+    (variable substitution and sanitizing) and is converted by the DOCX export engine
+    (see gym_app.utils.docx_export) on top of the resolved letterhead template.
     
     Parameters:
         request (HttpRequest): The HTTP request object.
@@ -490,385 +664,15 @@ def download_dynamic_document_word(request, pk):
             'created_by', 'formalized_by'
         ).prefetch_related('variables', 'signatures__signer', 'tags').get(pk=pk)
 
-        # Normalize any {{ }} patterns that TinyMCE may have split across HTML tags
-        normalized_content = normalize_fragmented_variables(document.content)
-
-        # Replace variables dynamically
-        def replace_variables(text):
-            processed_text = text
-            for variable in document.variables.all():
-                pattern = re.compile(rf"{{{{{variable.name_en}}}}}")
-                try:
-                    replacement_value = variable.get_formatted_value()
-                except AttributeError:  # pragma: no cover – defensive fallback for missing method
-                    replacement_value = variable.value or ""
-                processed_text = pattern.sub(replacement_value or "", processed_text)
-            return processed_text
-
-        processed_content = replace_variables(normalized_content)
-        
-        # Render HTML with template
-        template = get_template("pdf_template.html")
-        html_content = template.render({"content": processed_content})
-
-        # Parse HTML with BeautifulSoup and clean paste-from-Word artifacts
-        # (empty block runs, <o:p> tags, excessive inline margins) so the
-        # docx output keeps the same vertical rhythm as the editor and PDF.
-        soup = sanitize_soup_for_export(BeautifulSoup(html_content, "html.parser"))
-
-        from docx.shared import Inches, Pt
-        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-
-        ensure_letterhead_snapshot(document)
-        use_word_template = False
-
-        word_template = get_letterhead_word_template(
-            document, fallback_user=request.user,
+        docx_file = render_document_docx(
+            **document_word_render_args(document, fallback_user=request.user)
         )
 
-        if word_template and hasattr(word_template, 'path') and os.path.exists(word_template.path):
-            try:
-                doc = Document(word_template.path)
-                use_word_template = True
-            except Exception as e:
-                logger.warning(
-                    "Failed to open Word letterhead template for doc_id=%s: %s",
-                    document.pk, e,
-                )
-                doc = Document()
-        else:
-            doc = Document()
-
-        # If we are using a blank document, configure Letter page size and margins
-        section = doc.sections[0]
-        if not use_word_template:
-            section.page_width = Inches(8.5)   # 8.5 inches width
-            section.page_height = Inches(11)   # 11 inches height (Letter/Carta)
-            section.top_margin = Inches(1)
-            section.bottom_margin = Inches(1)
-            section.left_margin = Inches(1)
-            section.right_margin = Inches(1)
-        
-        # Configure default font for the document to Calibri
-        font_name = 'Calibri'
-        
-        # Set default font for the document
-        style = doc.styles['Normal']
-        style.font.name = font_name
-        
-        # Configure other default styles to use Calibri
-        for style_name in ['Heading1', 'Heading2', 'Heading3', 'Heading4', 'Heading5', 'Heading6']:
-            if style_name in doc.styles:
-                doc.styles[style_name].font.name = font_name
-
-        # Track whether we've already placed the first body paragraph
-        first_body_paragraph_used = False
-
-        # Mirrors the PDF stylesheet (p { margin: 0 0 6pt 0; line-height: 1.35 })
-        # and the editor content_style so all three renderers agree on spacing.
-        def apply_body_paragraph_spacing(paragraph):
-            pf = paragraph.paragraph_format
-            pf.space_before = Pt(0)
-            pf.space_after = Pt(6)
-            if pf.line_spacing is None:
-                pf.line_spacing = 1.35
-
-        # Track table adjacency: two docx tables with nothing between them
-        # auto-merge when opened in Word, so a spacer paragraph is required.
-        last_block_was_table = False
-
-        # Process HTML content
-        # Include both <p> and <div> tags as paragraph blocks so that
-        # templates that wrap content in <div> elements are still rendered.
-        block_tags = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "div", "hr", "table"]
-        for tag in soup.find_all(block_tags):
-            # find_all is recursive: skip blocks whose content is emitted by
-            # another branch, otherwise text gets duplicated in the output.
-            if tag.find_parent("table"):
-                # Cell content is handled by the <table> branch below.
-                continue
-            if tag.name in ("p", "div") and tag.find(block_tags):
-                # Container block (e.g. the template wrapper <div>): its block
-                # children are matched by find_all on their own iteration.
-                continue
-
-            if tag.name in ["h1", "h2", "h3", "h4", "h5", "h6"]:
-                level = int(tag.name[1])
-                heading = doc.add_heading(tag.get_text().strip(), level=level)
-                last_block_was_table = False
-
-                # Ensure heading uses Calibri
-                for run in heading.runs:
-                    run.font.name = font_name
-
-            elif tag.name in ["p", "div"]:
-                last_block_was_table = False
-
-                # For the very first body paragraph when using a template that has
-                # only the default empty paragraph, reuse that paragraph instead
-                # of creating a new one. This avoids starting on the "second" line
-                # while preserving any content the user may have added to the body.
-                if (
-                    use_word_template
-                    and not first_body_paragraph_used
-                    and len(doc.paragraphs) == 1
-                    and not doc.paragraphs[0].text.strip()
-                ):  # pragma: no cover – word template first paragraph reuse
-                    paragraph = doc.paragraphs[0]
-                else:
-                    paragraph = doc.add_paragraph()
-
-                first_body_paragraph_used = True
-                apply_body_paragraph_spacing(paragraph)
-
-                if tag.get_text().strip() == "":
-                    # Keep the (single, post-sanitize) intentional blank line as
-                    # an empty paragraph — it also prevents adjacent docx tables
-                    # from auto-merging in Word.
-                    continue
-
-                # Apply paragraph style attributes
-                style = tag.get("style", "")
-
-                if "text-align: center" in style:
-                    paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                elif "text-align: right" in style:
-                    paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-                elif "text-align: left" in style:
-                    paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-                elif "text-align: justify" in style:
-                    paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-
-                if "padding-left" in style:
-                    try:
-                        padding_value = int(style.split("padding-left:")[1].split("px")[0].strip())
-                        paragraph.paragraph_format.left_indent = Pt(padding_value)
-                    except (ValueError, IndexError) as e:
-                        pass
-
-                if "line-height" in style:
-                    try:
-                        line_height = float(style.split("line-height:")[1].split(";")[0].strip())
-                        paragraph.paragraph_format.line_spacing = line_height
-                    except (ValueError, IndexError) as e:
-                        pass
-
-                # Define a helper function to apply styles to runs
-                def apply_styles_to_run(run, element):
-                    """Apply appropriate styles to a run based on the element and its style attributes"""
-                    try:
-                        from docx.shared import RGBColor
-                        
-                        element_name = element.name if hasattr(element, 'name') else None
-                        element_style = element.get("style", "") if hasattr(element, 'get') else ""
-                        
-                        # Always apply Calibri font
-                        run.font.name = font_name
-                        
-                        # Apply styles based on element type
-                        if element_name == "strong" or element_name == "b":
-                            run.bold = True
-                        
-                        if element_name == "em" or element_name == "i":
-                            run.italic = True
-                        
-                        if element_name == "s" or "text-decoration: line-through" in element_style:
-                            run.font.strike = True
-                        
-                        if element_name == "u" or "text-decoration: underline" in element_style:
-                            run.underline = True
-                        
-                        # Apply span-specific styles
-                        if element_name == "span":
-                            if "text-decoration: underline" in element_style:
-                                run.underline = True
-                                
-                            if "text-decoration: line-through" in element_style:
-                                run.font.strike = True
-                                
-                            if "font-size" in element_style:
-                                try:
-                                    font_size_part = element_style.split("font-size:")[1].split(";")[0].strip()
-                                    if "pt" in font_size_part:
-                                        font_size = int(font_size_part.split("pt")[0].strip())
-                                        run.font.size = Pt(font_size)
-                                except (ValueError, IndexError) as e:  # pragma: no cover
-                                    pass
-                                    
-                            if "color:" in element_style or "color :" in element_style:
-                                COLOR_MAP = {
-                                    "red": (255, 0, 0),
-                                    "green": (0, 128, 0),
-                                    "blue": (0, 0, 255),
-                                    "black": (0, 0, 0),
-                                    "white": (255, 255, 255),
-                                    "yellow": (255, 255, 0),
-                                    "purple": (128, 0, 128),
-                                    "orange": (255, 165, 0),
-                                    "gray": (128, 128, 128),
-                                    "pink": (255, 192, 203),
-                                    "brown": (165, 42, 42),
-                                    "cyan": (0, 255, 255),
-                                    "magenta": (255, 0, 255),
-                                    "lime": (0, 255, 0),
-                                    "navy": (0, 0, 128),
-                                    "teal": (0, 128, 128),
-                                    "olive": (128, 128, 0),
-                                    "maroon": (128, 0, 0),
-                                    "silver": (192, 192, 192),
-                                    "gold": (255, 215, 0)
-                                }
-
-                                try:
-                                    normalized_style = element_style.replace(" :", ":")
-                                    
-                                    # Search color
-                                    if "color:" in normalized_style:
-                                        color_part = normalized_style.split("color:")[1].split(";")[0].strip()
-                                    else:  # pragma: no cover
-                                        return run  # Color not found
-                                    
-                                    # Handle RGB colors
-                                    if color_part.startswith("rgb("):
-                                        color_values = color_part.replace("rgb(", "").replace(")", "").split(",")
-                                        r = int(color_values[0].strip())
-                                        g = int(color_values[1].strip())
-                                        b = int(color_values[2].strip())
-                                        run.font.color.rgb = RGBColor(r, g, b)
-                                    
-                                    # Handle color with name (red, blue, etc.)
-                                    elif color_part in COLOR_MAP:
-                                        r, g, b = COLOR_MAP[color_part]
-                                        run.font.color.rgb = RGBColor(r, g, b)
-                                    
-                                    # Handle hexadecimal colors (#FF0000, etc.)
-                                    elif color_part.startswith("#"):
-                                        hex_color = color_part.lstrip("#")
-                                        r = int(hex_color[0:2], 16)
-                                        g = int(hex_color[2:4], 16)
-                                        b = int(hex_color[4:6], 16)
-                                        run.font.color.rgb = RGBColor(r, g, b)
-                                        
-                                except (ValueError, IndexError) as e:
-                                    pass
-                        
-                        return run
-                    except Exception as e:  # pragma: no cover – defensive fallback
-                        return run
-
-                # Improved recursive function to flatten the HTML structure
-                def process_element_flat(element, current_styles=None):
-                    """
-                    Process elements by flattening the structure and tracking styles
-                    This approach creates separate runs for each text node but applies all parent styles
-                    """
-                    from bs4 import NavigableString
-                    
-                    if current_styles is None:
-                        current_styles = []
-                    
-                    # Skip None elements
-                    if element is None:  # pragma: no cover – defensive guard
-                        return
-                        
-                    # For text nodes, create a run with all accumulated styles
-                    if isinstance(element, NavigableString) and str(element).strip():
-                        # Skip empty strings
-                        if not str(element).strip():  # pragma: no cover – unreachable, outer if already checks
-                            return
-                            
-                        text = str(element)
-                        
-                        # Create a new run for this text
-                        run = paragraph.add_run(text)
-                        
-                        # Apply all parent styles to this run
-                        for style_element in current_styles:
-                            run = apply_styles_to_run(run, style_element)
-                            
-                        # Ensure Calibri is applied even if no styles were applied
-                        if not current_styles:
-                            run.font.name = font_name
-                            
-                        return
-                    
-                    # If it's a tag element, add it to current styles and process children
-                    if hasattr(element, 'name') and element.name:
-                        # Add this element to the current style context
-                        new_styles = current_styles + [element]
-                        
-                        # Process all children with updated styles
-                        for child in element.children:
-                            process_element_flat(child, new_styles)
-                
-                # Process paragraph using the flat approach
-                for child in tag.children:
-                    process_element_flat(child)
-
-            elif tag.name == "hr":
-                hr_paragraph = doc.add_paragraph("_" * 71)
-                apply_body_paragraph_spacing(hr_paragraph)
-                last_block_was_table = False
-                # Ensure Calibri is applied to the horizontal rule
-                for run in hr_paragraph.runs:
-                    run.font.name = font_name
-
-            elif tag.name == "table":
-                # Process HTML <table> into a python-docx Table
-                rows = tag.find_all("tr")
-                if not rows:
-                    continue
-
-                # Two directly adjacent docx tables auto-merge when the file is
-                # opened in Word — separate them with a zero-spacing paragraph.
-                if last_block_was_table:
-                    spacer = doc.add_paragraph()
-                    spacer.paragraph_format.space_before = Pt(0)
-                    spacer.paragraph_format.space_after = Pt(0)
-
-                # Determine number of columns from the first row
-                first_row_cells = rows[0].find_all(["td", "th"])
-                num_cols = len(first_row_cells) if first_row_cells else 1
-
-                docx_table = doc.add_table(rows=0, cols=num_cols)
-                docx_table.style = 'Table Grid'
-
-                for row_tag in rows:
-                    cells = row_tag.find_all(["td", "th"])
-                    if not cells:
-                        continue
-                    docx_row = docx_table.add_row()
-                    for idx, cell_tag in enumerate(cells):
-                        if idx >= num_cols:
-                            break
-                        cell = docx_row.cells[idx]
-                        cell_text = cell_tag.get_text(strip=True)
-                        cell.text = cell_text
-                        # Cell paragraphs must not inherit body spacing — the
-                        # editor and PDF render cells with padding only.
-                        for para in cell.paragraphs:
-                            para.paragraph_format.space_before = Pt(0)
-                            para.paragraph_format.space_after = Pt(0)
-                            for run in para.runs:
-                                run.font.name = font_name
-                        # Bold for <th> header cells
-                        if cell_tag.name == "th":
-                            for para in cell.paragraphs:
-                                for run in para.runs:
-                                    run.bold = True
-
-                last_block_was_table = True
-
-        # Save the document to a buffer
-        docx_buffer = io.BytesIO()
-        doc.save(docx_buffer)
-        docx_buffer.seek(0)
-
         return FileResponse(
-            docx_buffer, 
-            as_attachment=True, 
-            filename=f"{document.title}.docx", 
-            content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            docx_file,
+            as_attachment=True,
+            filename=f"{document.title}.docx",
+            content_type=DOCX_CONTENT_TYPE,
         )
     except DynamicDocument.DoesNotExist:  # pragma: no cover – decorator intercepts first
         return Response({'detail': 'Document not found.'}, status=status.HTTP_404_NOT_FOUND)
@@ -1071,11 +875,11 @@ def get_letterhead_image(request, pk):
             )
         
         # Return the image file
-        return FileResponse(
-            open(document.letterhead_image.path, 'rb'),
+        return serve_field_file(
+            request,
+            document.letterhead_image,
             as_attachment=False,
-            filename=os.path.basename(document.letterhead_image.name),
-            content_type='image/png'
+            content_type='image/png',
         )
         
     except DynamicDocument.DoesNotExist:  # pragma: no cover – decorator intercepts first
@@ -1235,11 +1039,11 @@ def get_document_letterhead_word_template(request, pk):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        return FileResponse(
-            open(document.letterhead_word_template.path, 'rb'),
+        return serve_field_file(
+            request,
+            document.letterhead_word_template,
             as_attachment=False,
-            filename=os.path.basename(document.letterhead_word_template.name),
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
         )
 
     except DynamicDocument.DoesNotExist:  # pragma: no cover – decorator intercepts first
@@ -1384,11 +1188,11 @@ def get_user_letterhead_word_template(request):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        return FileResponse(
-            open(user.letterhead_word_template.path, 'rb'),
+        return serve_field_file(
+            request,
+            user.letterhead_word_template,
             as_attachment=False,
-            filename=os.path.basename(user.letterhead_word_template.name),
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
         )
 
     except Exception as e:
@@ -1582,11 +1386,11 @@ def get_user_letterhead_image(request):
             )
         
         # Return the image file
-        return FileResponse(
-            open(user.letterhead_image.path, 'rb'),
+        return serve_field_file(
+            request,
+            user.letterhead_image,
             as_attachment=False,
-            filename=os.path.basename(user.letterhead_image.name),
-            content_type='image/png'
+            content_type='image/png',
         )
         
     except Exception as e:
@@ -0,0 +1,268 @@
+"""
+Bulk export of dynamic documents as a single streamed ZIP archive.
+
+Lawyers select documents with the same query parameters as
+``list_dynamic_documents`` (or an explicit ``ids`` list). The archive is
+streamed while it is produced:
+
+- Documents are prepared one by one on the request thread (database work:
+  variable substitution, letterhead resolution, the signatures page).
+- The rendering itself (WeasyPrint, PDF assembly, DOCX conversion) runs on a
+  pool of ``BULK_EXPORT_WORKERS`` threads, a bounded number of documents
+  ahead of the one currently being written. WeasyPrint renders are handed on
+  to the render process pool (:mod:`gym_app.utils.render_pool`), so they run
+  on several cores while the threads wait.
+- Finished files are appended to the ZIP in selection order, and a
+  ``manifest.json`` describing every selected document closes the archive.
+
+PDF renders go through the shared render cache, so documents already
+downloaded recently are not rendered again (and the export warms the cache
+for later single downloads, up to ``BULK_EXPORT_CACHE_MAX_BYTES`` per
+archive).
+"""
+import json
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from gym_app.models.dynamic_document import DynamicDocument
+from gym_app.utils import render_cache
+from gym_app.utils.docx_export import render_document_docx
+from gym_app.utils.documents import build_document_html, render_document_html
+from gym_app.utils.zip_stream import ZipStream
+from .document_views import (
+    document_pdf_render_args,
+    document_word_render_args,
+    filter_document_queryset,
+)
+from .permissions import apply_visibility_filter
+from .signature_views import (
+    assemble_signatures_bundle,
+    create_signatures_pdf,
+    original_document_render_args,
+)
+
+logger = logging.getLogger(__name__)
+
+# file_type -> (extension, filename prefix)
+EXPORT_FILE_TYPES = {
+    'pdf': ('pdf', ''),
+    'signed': ('pdf', 'Documento_Completo_'),
+    'word': ('docx', ''),
+}
+
+# Documents loaded (with their relations) per query while streaming.
+_LOAD_BATCH_SIZE = 50
+
+
+class _Skip(Exception):
+    """The document cannot be exported in the requested file type."""
+
+
+def _render_pdf(html_content, cached_pdf, cache_budget):
+    if cached_pdf is not None:
+        return cached_pdf
+    return render_document_html(html_content, cache_budget=cache_budget)
+
+
+def _render_signed(document, html_content, cached_pdf, cache_budget, signatures_pdf):
+    original_pdf = _render_pdf(html_content, cached_pdf, cache_budget)
+    return assemble_signatures_bundle(
+        document, BytesIO(original_pdf), BytesIO(signatures_pdf)
+    ).getvalue()
+
+
+def _render_word(soup, word_template):
+    with render_document_docx(soup, word_template=word_template) as docx_file:
+        return docx_file.read()
+
+
+def _lookup_cached_pdf(html_content, entry):
+    cached_pdf = render_cache.lookup(render_cache.render_key(render_cache.PDF, html_content))
+    entry['cached'] = cached_pdf is not None
+    return cached_pdf
+
+
+def _prepare_job(document, file_type, request, entry, cache_budget):
+    """Do the database work for ``document`` and return ``(render, args)``.
+
+    ``render(*args)`` only touches its arguments, so it can run on a worker
+    thread. Raises :class:`_Skip` when the document does not qualify.
+    """
+    if file_type == 'word':
+        kwargs = document_word_render_args(document, fallback_user=request.user)
+        return _render_word, (kwargs['soup'], kwargs['word_template'])
+
+    if file_type == 'signed':
+        if document.state != 'FullySigned':
+            raise _Skip('El documento no está completamente formalizado.')
+        if not document.signatures.all():
+            raise _Skip('El documento no tiene firmas registradas.')
+        html_content = build_document_html(
+            **original_document_render_args(document, fallback_user=request.user)
+        )
+        cached_pdf = _lookup_cached_pdf(html_content, entry)
+        signatures_pdf = create_signatures_pdf(document, request).getvalue()
+        return _render_signed, (document, html_content, cached_pdf, cache_budget, signatures_pdf)
+
+    html_content = build_document_html(
+        **document_pdf_render_args(document, fallback_user=request.user)
+    )
+    return _render_pdf, (html_content, _lookup_cached_pdf(html_content, entry), cache_budget)
+
+
+def _run_inline(render, *args):
+    future = Future()
+    try:
+        future.set_result(render(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _entry_name(document, file_type):
+    extension, prefix = EXPORT_FILE_TYPES[file_type]
+    clean_title = "".join(c for c in document.title if c.isalnum() or c in (' ', '-', '_')).strip()
+    return f"{prefix}{clean_title or 'documento'}_{document.pk}.{extension}"
+
+
+def _iter_documents(pks):
+    queryset = DynamicDocument.objects.select_related(
+        'created_by', 'formalized_by'
+    ).prefetch_related('variables', 'signatures__signer')
+    for start in range(0, len(pks), _LOAD_BATCH_SIZE):
+        chunk = pks[start:start + _LOAD_BATCH_SIZE]
+        documents = queryset.in_bulk(chunk)
+        for pk in chunk:
+            if pk in documents:  # skip documents deleted since the selection
+                yield documents[pk]
+
+
+def _iter_export_archive(request, pks, file_type):
+    """Yield the ZIP archive of the documents ``pks`` as it is produced."""
+    workers = getattr(settings, 'BULK_EXPORT_WORKERS', 4)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bulk-export') if workers > 1 else None
+    window = max(1, workers * 2)
+    cache_budget = render_cache.StoreBudget(getattr(settings, 'BULK_EXPORT_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+    archive = ZipStream()
+    entries = []
+    pending = deque()
+
+    def write_next():
+        entry, document, future = pending.popleft()
+        try:
+            data = future.result()
+        except Exception as exc:
+            logger.exception("Bulk export failed to render doc_id=%s: %s", document.pk, exc)
+            entry.update(status='error', detail=str(exc))
+            return b''
+        name = _entry_name(document, file_type)
+        entry.update(status='ok', file=name, size=len(data))
+        return archive.add(name, data)
+
+    try:
+        for document in _iter_documents(pks):
+            entry = {'id': document.pk, 'title': document.title, 'state': document.state, 'cached': False}
+            entries.append(entry)
+            try:
+                render, args = _prepare_job(document, file_type, request, entry, cache_budget)
+            except _Skip as exc:
+                entry.update(status='skipped', detail=str(exc))
+                continue
+            except Exception as exc:
+                logger.exception("Bulk export failed to prepare doc_id=%s: %s", document.pk, exc)
+                entry.update(status='error', detail=str(exc))
+                continue
+            future = executor.submit(render, *args) if executor else _run_inline(render, *args)
+            pending.append((entry, document, future))
+
+            # Write whatever is finished at the head of the queue; block only
+            # once the pool is a full window ahead of the archive.
+            while pending and (len(pending) >= window or pending[0][2].done()):
+                yield write_next()
+
+        while pending:
+            yield write_next()
+
+        totals = {key: sum(1 for entry in entries if entry['status'] == key) for key in ('ok', 'skipped', 'error')}
+        totals['cached'] = sum(1 for entry in entries if entry['cached'])
+        manifest = {
+            'generated_at': timezone.now().isoformat(),
+            'generated_by': request.user.email,
+            'file_type': file_type,
+            'filters': request.query_params.dict(),
+            'totals': totals,
+            'documents': entries,
+        }
+        yield archive.add('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'), compress=True)
+        yield archive.finish()
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bulk_export_dynamic_documents(request):
+    """
+    Download many documents at once as a streamed ZIP archive.
+
+    Query parameters:
+    - Any filter/sort parameter accepted by ``list_dynamic_documents``
+      (``state``, ``states``, ``client_id``, ``search``, ``date_from``, ...).
+    - ``ids``: optional comma-separated list of document ids to restrict the
+      selection to.
+    - ``file_type``: ``pdf`` (default), ``signed`` (original plus signatures
+      page, as ``generate_signatures_pdf``; only FullySigned documents) or
+      ``word``.
+
+    Only documents the user can view are exported, at most
+    ``BULK_EXPORT_MAX_DOCUMENTS`` per archive. The archive ends with a
+    ``manifest.json`` listing every selected document with its status
+    (``ok``, ``skipped`` or ``error``), its file name and whether a cached
+    render was reused.
+    """
+    file_type = request.query_params.get('file_type', 'pdf')
+    if file_type not in EXPORT_FILE_TYPES:
+        return Response(
+            {'detail': f"Unsupported file_type '{file_type}'. Use one of: {', '.join(EXPORT_FILE_TYPES)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    queryset = apply_visibility_filter(DynamicDocument.objects.all(), request.user)
+
+    ids_param = request.query_params.get('ids', '')
+    if ids_param:
+        try:
+            ids = [int(value) for value in ids_param.split(',') if value.strip()]
+        except ValueError:
+            return Response({'detail': 'ids must be a comma-separated list of integers.'}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(pk__in=ids)
+
+    queryset = filter_document_queryset(queryset, request.query_params, request.user)
+
+    max_documents = getattr(settings, 'BULK_EXPORT_MAX_DOCUMENTS', 200)
+    pks = list(queryset.values_list('pk', flat=True)[:max_documents + 1])
+    if not pks:
+        return Response({'detail': 'No documents match the export filters.'}, status=status.HTTP_404_NOT_FOUND)
+    if len(pks) > max_documents:
+        return Response(
+            {'detail': f'The export is limited to {max_documents} documents; narrow the filters.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    response = StreamingHttpResponse(
+        _iter_export_archive(request, pks, file_type),
+        content_type='application/zip',
+    )
+    response['Content-Disposition'] = f'attachment; filename="documentos_{timezone.localtime():%Y%m%d_%H%M%S}.zip"'
+    return response
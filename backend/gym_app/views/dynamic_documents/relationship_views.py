@@ -32,10 +32,16 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q
+from django.core.paginator import Paginator, EmptyPage
+from django.db.models import Exists, OuterRef, Q
 from gym_app.models.dynamic_document import DynamicDocument, DocumentRelationship
-from gym_app.serializers.dynamic_document import DynamicDocumentSerializer, DocumentRelationshipSerializer
-from gym_app.views.dynamic_documents.permissions import require_document_visibility
+from gym_app.serializers.dynamic_document import (
+    DynamicDocumentSerializer,
+    DocumentRelationshipSerializer,
+    RelationshipCandidateSerializer,
+)
+from gym_app.views.dynamic_documents.document_views import get_optimized_document_queryset
+from gym_app.views.dynamic_documents.permissions import apply_visibility_filter, require_document_visibility
 
 
 @api_view(['GET'])
@@ -89,7 +95,9 @@ def list_related_documents(request, document_id):
             )
 
         # Get related documents using the model method
-        related_documents = document.get_related_documents(user=request.user)
+        related_documents = get_optimized_document_queryset(
+            document.get_related_documents(user=request.user)
+        )
 
         serializer = DynamicDocumentSerializer(related_documents, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -107,63 +115,99 @@ def list_available_documents_for_relationship(request, document_id):
     """
     Get all documents that can be related to a specific document.
     
-    Returns documents that the user can view, excluding:
+    Returns documents that the user owns and can view, excluding:
     - The document itself
-    - Documents already related to this document
+    - Documents already related to this document (in either direction)
+
+    Candidates are resolved with a single queryset: ownership, state,
+    visibility and the "already related" exclusion are all evaluated in SQL.
+
+    Query params:
+    - allow_pending_signatures: also offer PendingSignatures/FullySigned documents
+    - search: case-insensitive match on the document title
+    - page / limit: when ``page`` is given, the response is paginated as
+      ``{items, totalItems, totalPages, currentPage}`` and each item uses the
+      compact picker representation; otherwise the full list is returned.
     """
     try:
         source_document = DynamicDocument.objects.get(pk=document_id)
-        
-        # Check if user can view this document
-        if not source_document.can_view(request.user):
-            return Response(
-                {'detail': 'You do not have permission to view this document.'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        allow_pending_signatures = str(
-            request.query_params.get('allow_pending_signatures', '')
-        ).lower() in {'1', 'true', 'yes'}
-
-        allowed_states = ['Completed']
-        if allow_pending_signatures:
-            allowed_states.extend(['PendingSignatures', 'FullySigned'])
-
-        # Get documents that belong to the user and are in allowed states.
-        user_documents = DynamicDocument.objects.filter(
-            Q(created_by=request.user) | Q(assigned_to=request.user),
-            state__in=allowed_states
-        )
-        
-        available_documents = []
-        
-        for doc in user_documents:
-            # Skip the source document itself
-            if doc.id == source_document.id:
-                continue
-                
-            # Double-check if user can view this document (additional security)
-            if not doc.can_view(request.user):
-                continue
-            
-            # Check if already related - Only exclude if EXACT same relationship exists
-            existing_relationship = DocumentRelationship.objects.filter(
-                Q(source_document=source_document, target_document=doc) |
-                Q(source_document=doc, target_document=source_document)
-            ).exists()
-            
-            if not existing_relationship:
-                available_documents.append(doc)
-        
-        serializer = DynamicDocumentSerializer(available_documents, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
-        
     except DynamicDocument.DoesNotExist:
         return Response(
             {'detail': 'Document not found.'}, 
             status=status.HTTP_404_NOT_FOUND
         )
 
+    # Check if user can view this document
+    if not source_document.can_view(request.user):
+        return Response(
+            {'detail': 'You do not have permission to view this document.'}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    allow_pending_signatures = str(
+        request.query_params.get('allow_pending_signatures', '')
+    ).lower() in {'1', 'true', 'yes'}
+
+    allowed_states = ['Completed']
+    if allow_pending_signatures:
+        allowed_states.extend(['PendingSignatures', 'FullySigned'])
+
+    already_related = DocumentRelationship.objects.filter(
+        Q(source_document=source_document, target_document=OuterRef('pk'))
+        | Q(source_document=OuterRef('pk'), target_document=source_document)
+    )
+
+    # Documents that belong to the user, are in allowed states, are viewable
+    # by the user and are not yet related to the source document.
+    candidates = DynamicDocument.objects.filter(
+        Q(created_by=request.user) | Q(assigned_to=request.user),
+        state__in=allowed_states,
+    ).exclude(
+        pk=source_document.pk
+    ).exclude(
+        Exists(already_related)
+    )
+    candidates = apply_visibility_filter(candidates, request.user)
+
+    search = request.query_params.get('search', '').strip()
+    if search:
+        candidates = candidates.filter(title__icontains=search)
+
+    candidates = candidates.order_by('-updated_at', '-pk')
+
+    if 'page' not in request.query_params:
+        candidates = get_optimized_document_queryset(candidates)
+        serializer = DynamicDocumentSerializer(candidates, many=True, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    try:
+        page = int(request.query_params.get('page', 1))
+    except (TypeError, ValueError):
+        page = 1
+
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except (TypeError, ValueError):
+        limit = 10
+
+    if limit <= 0:
+        limit = 10
+
+    paginator = Paginator(candidates.prefetch_related('tags'), limit)
+    try:
+        page_obj = paginator.page(page)
+    except EmptyPage:
+        page_obj = paginator.page(paginator.num_pages)
+        page = paginator.num_pages
+
+    serializer = RelationshipCandidateSerializer(page_obj.object_list, many=True)
+    return Response({
+        'items': serializer.data,
+        'totalItems': paginator.count,
+        'totalPages': paginator.num_pages,
+        'currentPage': page,
+    }, status=status.HTTP_200_OK)
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -1168,8 +1168,8 @@ def get_user_signature(request, user_id):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-def generate_original_document_pdf(document, fallback_user=None):
-    """Generate the original document PDF and return its BytesIO buffer.
+def original_document_render_args(document, fallback_user=None):
+    """Return the ``render_document_pdf`` keyword arguments of the signed original.
 
     Letterhead resolution reads ``document.formalized_by`` (with
     ``created_by`` as legacy fallback) internally via
@@ -1197,12 +1197,19 @@ def generate_original_document_pdf(document, fallback_user=None):
 
     letterhead_image = get_letterhead_for_document(document, fallback_user=fallback_user)
 
+    return {
+        'title': document.title,
+        'body_html': str(soup),
+        'letterhead_image': letterhead_image,
+        'top_padding': "1.5cm",
+    }
+
+
+def generate_original_document_pdf(document, fallback_user=None):
+    """Generate the original document PDF and return its BytesIO buffer."""
     # Render with WeasyPrint (browser-grade CSS/table layout → matches editor)
     return BytesIO(render_document_pdf(
-        title=document.title,
-        body_html=str(soup),
-        letterhead_image=letterhead_image,
-        top_padding="1.5cm",
+        **original_document_render_args(document, fallback_user=fallback_user)
     ))
 
 def create_signatures_pdf(document, request):
@@ -1546,6 +1553,20 @@ def add_identifier_footer(pdf_buffer, identifier):
     output_buffer.seek(0)
     return output_buffer
 
+def assemble_signatures_bundle(document, original_pdf_buffer, signatures_pdf_buffer):
+    """
+    Combines the original document and its signatures page and stamps the
+    document's unique identifier on every page.
+    Returns a BytesIO buffer containing the complete PDF.
+    """
+    combined_pdf_buffer = combine_pdfs(original_pdf_buffer, signatures_pdf_buffer)
+
+    # Generar el mismo identificador único
+    encrypted_id = generate_encrypted_document_id(document.pk, document.created_at)
+
+    # Añadir el identificador como pie de página en todas las hojas
+    return add_identifier_footer(combined_pdf_buffer, encrypted_id)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 @require_document_visibility
@@ -1592,14 +1613,10 @@ def generate_signatures_pdf(request, pk):
         # Create the signatures PDF
         signatures_pdf_buffer = create_signatures_pdf(document, request)
         
-        # Combine both PDFs
-        combined_pdf_buffer = combine_pdfs(original_pdf_buffer, signatures_pdf_buffer)
-        
-        # Generar el mismo identificador único
-        encrypted_id = generate_encrypted_document_id(document.pk, document.created_at)
-        
-        # Añadir el identificador como pie de página en todas las hojas
-        combined_pdf_buffer = add_identifier_footer(combined_pdf_buffer, encrypted_id)
+        # Combine both PDFs and stamp the document identifier
+        combined_pdf_buffer = assemble_signatures_bundle(
+            document, original_pdf_buffer, signatures_pdf_buffer
+        )
         
         # Create the HTTP response with proper headers
         response = HttpResponse(content_type='application/pdf')
@@ -1,12 +1,15 @@
+import hmac
 import os
 import time
 
 from django.db import connection
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from redis import Redis
 
 from django.conf import settings
 
+from gym_app.utils.metrics import render_prometheus
+
 
 def health_check(request):
     """
@@ -53,3 +56,30 @@ def health_check(request):
         healthy = False
 
     return JsonResponse(status, status=200 if healthy else 503)
+
+
+def _metrics_access_allowed(request):
+    """Scrapers send ``METRICS_AUTH_TOKEN``; staff sessions may browse the page."""
+    if getattr(settings, "METRICS_PUBLIC", False):
+        return True
+    token = getattr(settings, "METRICS_AUTH_TOKEN", "")
+    if token and hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return True
+    user = getattr(request, "user", None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint (text exposition format).
+    Requires ``Authorization: Bearer <METRICS_AUTH_TOKEN>`` or a staff session,
+    unless METRICS_PUBLIC explicitly opens it.
+    """
+    if not _metrics_access_allowed(request):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -2,6 +2,8 @@ import json
 import traceback
 import logging
 import os
+import re
+from datetime import datetime, timedelta
 import magic
 from rest_framework import status
 from rest_framework.response import Response
@@ -10,7 +12,10 @@ from rest_framework.decorators import api_view, permission_classes
 from django.shortcuts import get_object_or_404
 from django.db import transaction, models
 from django.core.exceptions import ValidationError
-from django.http import FileResponse, Http404, HttpResponse
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.http import Http404
 from django.conf import settings
 from gym_app.models import LegalRequest, LegalRequestType, LegalDiscipline, LegalRequestFiles, LegalRequestResponse
 from gym_app.serializers import (
@@ -18,6 +23,7 @@ from gym_app.serializers import (
     LegalRequestListSerializer, LegalRequestResponseSerializer
 )
 from gym_app.views.layouts.sendEmail import send_template_email
+from gym_app.utils.file_delivery import serve_file
 from gym_app.utils.email_notifications import (
     send_status_update_notification,
     notify_client_of_lawyer_response,
@@ -27,6 +33,28 @@ from gym_app.utils.email_notifications import (
 # Configure logger for professional error handling
 logger = logging.getLogger(__name__)
 
+
+# Searches shaped like a request number (SOL-2024-001) use the indexed prefix path.
+REQUEST_NUMBER_SEARCH_RE = re.compile(r'^SOL-[\d-]*$', re.IGNORECASE)
+
+
+def _legal_request_page_size(params):
+    """Return the requested page size, clamped to ``LEGAL_REQUEST_MAX_PAGE_SIZE``."""
+    default = getattr(settings, 'LEGAL_REQUEST_PAGE_SIZE', 20)
+    try:
+        page_size = int(params.get('page_size', default))
+    except (TypeError, ValueError):
+        page_size = default
+    return max(1, min(page_size, getattr(settings, 'LEGAL_REQUEST_MAX_PAGE_SIZE', 100)))
+
+
+def _count_subquery(model, fk_name):
+    """Correlated ``COUNT(*)`` of ``model`` rows pointing at the outer legal request."""
+    counts = model.objects.filter(**{fk_name: models.OuterRef('pk')}).order_by().values(fk_name).annotate(
+        total=models.Count('*'),
+    ).values('total')
+    return Coalesce(models.Subquery(counts, output_field=models.IntegerField()), 0)
+
 # File validation configuration
 ALLOWED_FILE_TYPES = {
     'application/pdf': ['.pdf'],
@@ -422,72 +450,100 @@ def list_legal_requests(request):
     """
     List legal requests filtered by user role.
     Lawyers see all requests, clients see only their own.
+
+    Results are paginated (``page``, ``page_size`` up to
+    ``LEGAL_REQUEST_MAX_PAGE_SIZE``); response and file counts are annotated
+    per row instead of prefetching the related rows. A search that looks
+    like a request number (``SOL-...``) is resolved as a prefix match on the
+    indexed ``request_number`` column.
     """
     try:
         user = request.user
         
-        # Base queryset with related data for performance
         queryset = LegalRequest.objects.select_related(
-            'request_type', 'discipline'
-        ).prefetch_related('responses', 'files')
+            'request_type', 'discipline', 'user'
+        )
         
         # Filter based on user role
         if hasattr(user, 'role') and user.role == 'lawyer':
             # Lawyers see all requests
             requests = queryset.all()
-            logger.info(f"Lawyer {user.id} requested all legal requests")
         else:
             # Clients see only their own requests (filter by user)
             requests = queryset.filter(user=user)
-            logger.info(f"Client {user.id} requested their legal requests")
         
         # Apply search filter if provided
         search = request.GET.get('search', '').strip()
         if search:
-            requests = requests.filter(
-                models.Q(request_number__icontains=search) |
-                models.Q(user__first_name__icontains=search) |
-                models.Q(user__last_name__icontains=search) |
-                models.Q(user__email__icontains=search) |
-                models.Q(description__icontains=search)
-            )
+            if REQUEST_NUMBER_SEARCH_RE.match(search):
+                requests = requests.filter(request_number__startswith=search.upper())
+            else:
+                requests = requests.filter(
+                    models.Q(request_number__icontains=search) |
+                    models.Q(user__first_name__icontains=search) |
+                    models.Q(user__last_name__icontains=search) |
+                    models.Q(user__email__icontains=search) |
+                    models.Q(description__icontains=search)
+                )
         
         # Apply status filter if provided
         status_filter = request.GET.get('status', '').strip()
         if status_filter:
             requests = requests.filter(status=status_filter)
         
-        # Apply date filters if provided
+        # Apply date filters if provided. Bounds are compared on the raw
+        # timestamp (not ``created_at__date``) so the created_at index applies.
         date_from = request.GET.get('date_from', '').strip()
         date_to = request.GET.get('date_to', '').strip()
         
         if date_from:
             try:
-                from datetime import datetime
-                date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-                requests = requests.filter(created_at__date__gte=date_from_obj)
-                logger.info(f"Applied date_from filter: {date_from}")
+                date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
+                requests = requests.filter(created_at__gte=timezone.make_aware(date_from_obj))
             except ValueError:
                 logger.warning(f"Invalid date_from format: {date_from}")
         
         if date_to:
             try:
-                from datetime import datetime
-                date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-                requests = requests.filter(created_at__date__lte=date_to_obj)
-                logger.info(f"Applied date_to filter: {date_to}")
+                date_to_obj = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
+                requests = requests.filter(created_at__lt=timezone.make_aware(date_to_obj))
             except ValueError:
                 logger.warning(f"Invalid date_to format: {date_to}")
         
-        # Order by creation date (newest first)
-        requests = requests.order_by('-created_at')
-        
-        # Use list serializer for better performance
-        serializer = LegalRequestListSerializer(requests, many=True)
+        # Order by creation date (newest first); id keeps pages stable. The
+        # count subqueries are only evaluated for the rows of the page and
+        # are dropped from the paginator's COUNT query.
+        requests = requests.annotate(
+            response_count=_count_subquery(LegalRequestResponse, 'legal_request'),
+            file_count=_count_subquery(LegalRequest.files.through, 'legalrequest'),
+        ).order_by('-created_at', '-id')
+
+        page_size = _legal_request_page_size(request.GET)
+        paginator = Paginator(requests, page_size)
+        try:
+            page_number = paginator.validate_number(request.GET.get('page', 1))
+        except EmptyPage:
+            page_number = max(int(request.GET['page']), 1)
+        except PageNotAnInteger:
+            page_number = 1
+
+        if page_number > paginator.num_pages:
+            # Past the last page: an empty page, so clients paging with
+            # ``has_more`` stop instead of getting page 1 again.
+            rows, has_more = [], False
+        else:
+            page = paginator.page(page_number)
+            rows, has_more = page.object_list, page.has_next()
+
+        serializer = LegalRequestListSerializer(rows, many=True)
         
         return Response({
             'requests': serializer.data,
-            'count': requests.count(),
+            'count': paginator.count,
+            'total_pages': paginator.num_pages,
+            'current_page': page_number,
+            'page_size': page_size,
+            'has_more': has_more,
             'user_role': getattr(user, 'role', 'client')
         }, status=status.HTTP_200_OK)
         
@@ -885,10 +941,14 @@ def download_legal_request_file(request, request_id, file_id):
         else:
             content_type = 'application/octet-stream'
         
-        # Read file content
+        # Stream the file (supports Range and conditional requests)
         try:
-            with open(file_obj.file.path, 'rb') as file_handle:
-                file_content = file_handle.read()
+            response = serve_file(
+                request,
+                file_obj.file.path,
+                filename=original_filename,
+                content_type=content_type,
+            )
         except Exception as read_error:
             logger.error(f"Error reading file content: {str(read_error)}")
             return Response(
@@ -896,20 +956,6 @@ def download_legal_request_file(request, request_id, file_id):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Create HttpResponse with file content
-        response = HttpResponse(
-            file_content,
-            content_type=content_type
-        )
-        
-        # Set headers for download
-        response['Content-Disposition'] = f'attachment; filename="{original_filename}"'
-        response['Content-Length'] = len(file_content)
-        response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response['Pragma'] = 'no-cache'
-        response['Expires'] = '0'
-        response['Accept-Ranges'] = 'bytes'
-        
         return response
         
     except Http404:
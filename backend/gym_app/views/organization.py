@@ -3,7 +3,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core.exceptions import ValidationError as DjangoValidationError
 
@@ -20,6 +21,8 @@ from gym_app.serializers.organization import (
     OrganizationPostSerializer, OrganizationPostListSerializer,
     OrganizationPostCreateSerializer, OrganizationPostUpdateSerializer
 )
+from gym_app.utils import dashboard_cache
+from gym_app.utils.query_inspector import query_budget
 
 # Custom pagination class
 class OrganizationPagination(PageNumberPagination):
@@ -97,6 +100,7 @@ def create_organization(request):
         'details': serializer.errors
     }, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @require_corporate_client_only
@@ -109,7 +113,7 @@ def get_my_organizations(request):
     is_active = request.GET.get('is_active', None)
     
     # Base queryset - only organizations led by current user
-    queryset = Organization.objects.filter(corporate_client=request.user)
+    queryset = _with_list_counts(Organization.objects.filter(corporate_client=request.user))
     
     # Apply filters
     if search:
@@ -145,6 +149,7 @@ def get_my_organizations(request):
         'total_count': len(serializer.data)
     }, status=status.HTTP_200_OK)
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @require_corporate_client_only
@@ -154,7 +159,7 @@ def get_organization_detail(request, organization_id):
     Only the corporate client who leads the organization can view it.
     """
     organization = get_object_or_404(
-        Organization,
+        _with_detail_data(Organization.objects.all()),
         id=organization_id,
         corporate_client=request.user
     )
@@ -443,54 +448,95 @@ def remove_organization_member(request, organization_id, user_id):
 def get_organization_stats(request):
     """
     Get dashboard statistics for organization management.
+
+    Computed in one query and cached per user (see
+    ``gym_app.utils.dashboard_cache``).
     """
-    # Base queryset for current corporate client's organizations
-    base_queryset = Organization.objects.filter(corporate_client=request.user)
-    
-    # Basic counts
-    total_organizations = base_queryset.count()
-    active_organizations_count = base_queryset.filter(is_active=True).count()
-    
-    # Member counts
-    total_members = OrganizationMembership.objects.filter(
-        organization__corporate_client=request.user,
-        is_active=True
-    ).count()
-    
-    # Invitation counts
-    total_pending_invitations = OrganizationInvitation.objects.filter(
-        organization__corporate_client=request.user,
-        status='PENDING'
-    ).count()
-    
-    recent_invitations_count = OrganizationInvitation.objects.filter(
-        organization__corporate_client=request.user,
-        created_at__gte=timezone.now() - timezone.timedelta(days=7)
-    ).count()
-    
-    # Recent requests count
-    recent_requests_count = CorporateRequest.objects.filter(
-        organization__corporate_client=request.user,
-        created_at__gte=timezone.now() - timezone.timedelta(days=30)
-    ).count()
-    
-    # Organizations by status
-    organizations_by_status = {
-        'active': active_organizations_count,
-        'inactive': total_organizations - active_organizations_count
-    }
-    
-    stats_data = {
+    stats_data = dashboard_cache.get_or_compute(
+        dashboard_cache.ORGANIZATION_STATS,
+        request.user.id,
+        lambda: _organization_dashboard_stats(request.user),
+    )
+    return Response(stats_data, status=status.HTTP_200_OK)
+
+
+def _count_for_organization(queryset):
+    """Correlated COUNT(*) of ``queryset`` rows belonging to the outer organization."""
+    counts = queryset.filter(organization=OuterRef('pk')).order_by().values('organization').annotate(
+        total=Count('*'),
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _with_list_counts(queryset):
+    """Annotate the counts read by the organization serializers (no per-row queries)."""
+    return queryset.select_related('corporate_client').annotate(
+        active_member_count=_count_for_organization(
+            OrganizationMembership.objects.filter(is_active=True)
+        ),
+        pending_invitation_count=_count_for_organization(
+            OrganizationInvitation.objects.filter(status='PENDING')
+        ),
+    )
+
+
+def _with_detail_data(queryset):
+    """List counts plus the active members and 30-day request count of OrganizationSerializer."""
+    return _with_list_counts(queryset).annotate(
+        recent_request_count=_count_for_organization(
+            CorporateRequest.objects.filter(
+                created_at__gte=timezone.now() - timezone.timedelta(days=30)
+            )
+        ),
+    ).prefetch_related(Prefetch(
+        'memberships',
+        queryset=OrganizationMembership.objects.filter(is_active=True).select_related('user'),
+        to_attr='active_memberships',
+    ))
+
+
+def _organization_dashboard_stats(user):
+    now = timezone.now()
+    # Per-organization counts are correlated subqueries summed over the
+    # client's organizations, so the whole dashboard is a single query
+    # without multiplying membership/invitation/request rows in joins.
+    counts = Organization.objects.filter(corporate_client=user).annotate(
+        active_members=_count_for_organization(
+            OrganizationMembership.objects.filter(is_active=True)
+        ),
+        pending_invitations=_count_for_organization(
+            OrganizationInvitation.objects.filter(status='PENDING')
+        ),
+        recent_invitations=_count_for_organization(
+            OrganizationInvitation.objects.filter(created_at__gte=now - timezone.timedelta(days=7))
+        ),
+        recent_requests=_count_for_organization(
+            CorporateRequest.objects.filter(created_at__gte=now - timezone.timedelta(days=30))
+        ),
+    ).aggregate(
+        total_organizations=Count('id'),
+        active_organizations_count=Count('id', filter=Q(is_active=True)),
+        total_members=Coalesce(Sum('active_members'), 0),
+        total_pending_invitations=Coalesce(Sum('pending_invitations'), 0),
+        recent_invitations_count=Coalesce(Sum('recent_invitations'), 0),
+        recent_requests_count=Coalesce(Sum('recent_requests'), 0),
+    )
+
+    total_organizations = counts['total_organizations']
+    active_organizations_count = counts['active_organizations_count']
+    return {
         'total_organizations': total_organizations,
-        'total_members': total_members,
-        'total_pending_invitations': total_pending_invitations,
-        'recent_requests_count': recent_requests_count,
+        'total_members': counts['total_members'],
+        'total_pending_invitations': counts['total_pending_invitations'],
+        'recent_requests_count': counts['recent_requests_count'],
         'active_organizations_count': active_organizations_count,
-        'organizations_by_status': organizations_by_status,
-        'recent_invitations_count': recent_invitations_count
+        # Organizations by status
+        'organizations_by_status': {
+            'active': active_organizations_count,
+            'inactive': total_organizations - active_organizations_count,
+        },
+        'recent_invitations_count': counts['recent_invitations_count'],
     }
-    
-    return Response(stats_data, status=status.HTTP_200_OK)
 
 # =============================================================================
 # ENDPOINTS FOR NORMAL CLIENTS (Invitation Management)
@@ -586,6 +632,7 @@ def respond_to_invitation(request, invitation_id):
         'details': serializer.errors
     }, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(4)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @require_client_only
@@ -593,13 +640,10 @@ def get_my_memberships(request):
     """
     Get organizations where the current normal client is a member.
     """
-    # Get active memberships
-    memberships = OrganizationMembership.objects.filter(
-        user=request.user,
-        is_active=True
-    ).select_related('organization')
-    
-    organizations = [membership.organization for membership in memberships]
+    # Organizations of the active memberships, most recently joined first
+    organizations = _with_list_counts(
+        Organization.objects.filter(memberships__user=request.user, memberships__is_active=True)
+    ).order_by('-memberships__joined_at')
     
     serializer = OrganizationListSerializer(
         organizations,
@@ -644,6 +688,7 @@ def leave_organization(request, organization_id):
 # SHARED ENDPOINTS
 # =============================================================================
 
+@query_budget(6)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 @require_client_or_corporate_client
@@ -652,7 +697,9 @@ def get_organization_public_detail(request, organization_id):
     Get public information about an organization.
     Both clients and corporate clients can view this.
     """
-    organization = get_object_or_404(Organization, id=organization_id, is_active=True)
+    organization = get_object_or_404(
+        _with_detail_data(Organization.objects.all()), id=organization_id, is_active=True
+    )
     
     # Check if user has access (either leader or member)
     has_access = False
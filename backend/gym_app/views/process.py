@@ -1,16 +1,20 @@
 import json
 import logging
 import traceback
+from datetime import date
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
 from gym_app.models import Process, Stage, StageAlert, CaseFile, Case, User, RecentProcess, Notification
-from gym_app.serializers.process import ProcessSerializer, RecentProcessSerializer
+from gym_app.serializers.process import ProcessListSerializer, ProcessSerializer, RecentProcessSerializer
 from gym_app.services.notification_service import (
     build_process_recipients,
     create_bulk_notifications,
@@ -72,6 +76,29 @@ def _user_can_access_process(user, process):
     return process.clients.filter(pk=user.id).exists()
 
 
+def _notify_case_file_added(process, case_file, actor):
+    """Notify stakeholders that a new document was attached to ``process``.
+
+    The actor (the uploader) is excluded from the recipient list so they
+    don't receive a notification about their own action.
+    """
+    try:
+        file_name = getattr(case_file.file, 'name', '') or ''
+        display_name = file_name.rsplit('/', 1)[-1] if file_name else 'documento'
+        notify_process_stakeholders(
+            process=process,
+            title=f"Documento agregado — {process.ref or process.id}",
+            message=(
+                f"Se anexó el documento '{display_name}' al proceso "
+                f"{process.ref or process.id}."
+            ),
+            actor=actor,
+            priority='medium',
+        )
+    except Exception:  # pragma: no cover — never block the upload on notif failure
+        pass
+
+
 class _StageAlertValidationError(Exception):
     """Raised when StageAlert configuration is rejected (e.g. past date)."""
 
@@ -123,69 +150,319 @@ def _create_stage_alerts(created_stages, main_data, process=None, actor=None):
     )
 
     if is_active and process is not None:
-        date_str = last_stage.date.strftime('%d/%m/%Y') if last_stage.date else 'sin fecha'
-        title = f"Alerta activada — {process.ref or 'Proceso'}"
-        message = (
-            f"Se activó una alerta para la etapa '{last_stage.status}' del proceso "
-            f"{process.ref or process.id}, programada para {date_str}."
-        )
-        if description:
-            message += f" Detalle: {description}"
-
-        # Include the actor (typically the lawyer who toggled the alert) so the
-        # confirmation lands in their notification center too. The user
-        # requirement explicitly asked for the lawyer to receive the activation
-        # notification — passing actor=None disables the actor-exclusion in
-        # ``build_process_recipients``.
-        recipients = build_process_recipients(
-            process, notify_clients=notify_clients, actor=None,
+        _notify_alert_activated(process, last_stage, description, notify_clients)
+
+
+def _notify_alert_activated(process, last_stage, description, notify_clients):
+    """Notify the lawyer and (optionally) the clients that the alert of
+    ``last_stage`` was activated, in-app and by email."""
+    date_str = last_stage.date.strftime('%d/%m/%Y') if last_stage.date else 'sin fecha'
+    title = f"Alerta activada — {process.ref or 'Proceso'}"
+    message = (
+        f"Se activó una alerta para la etapa '{last_stage.status}' del proceso "
+        f"{process.ref or process.id}, programada para {date_str}."
+    )
+    if description:
+        message += f" Detalle: {description}"
+
+    # Include the actor (typically the lawyer who toggled the alert) so the
+    # confirmation lands in their notification center too. The user
+    # requirement explicitly asked for the lawyer to receive the activation
+    # notification — passing actor=None disables the actor-exclusion in
+    # ``build_process_recipients``.
+    recipients = build_process_recipients(
+        process, notify_clients=notify_clients, actor=None,
+    )
+    if recipients:
+        create_bulk_notifications(
+            users=recipients,
+            title=title,
+            message=message,
+            category='process_alert',
+            priority='high',
+            link_type='process',
+            link_id=process.id,
         )
-        if recipients:
-            create_bulk_notifications(
-                users=recipients,
-                title=title,
-                message=message,
-                category='process_alert',
-                priority='high',
-                link_type='process',
-                link_id=process.id,
-            )
 
-            # Send an immediate activation email so BOTH lawyer and clients
-            # are informed without waiting for the daily reminder task. The
-            # daily Huey task keeps handling the 3-day / 1-day reminders.
-            try:
-                emails = sorted({u.email for u in recipients if getattr(u, 'email', None)})
-                if emails:
-                    frontend_url = getattr(
-                        settings,
-                        'FRONTEND_BASE_URL',
-                        'https://gmconsultoresjuridicos.com',
-                    )
-                    process_url = f'{frontend_url}/process_detail/{process.id}'
-                    send_template_email(
-                        template_name='notification',
-                        subject=f'Alerta activada — {process.ref or process.id}',
-                        to_emails=emails,
-                        context={
-                            'title': 'Alerta de Proceso Activada',
-                            'badge_text': 'Alerta activa',
-                            'notification_title': f'Proceso: {process.ref or process.id}',
-                            'message': message,
-                            'additional_info': (
-                                'Recibirás recordatorios automáticos 3 días y '
-                                '1 día antes de la fecha programada.'
-                            ),
-                            'action_url': process_url,
-                            'action_text': 'Ver Proceso',
-                        },
-                    )
-            except Exception:
-                logger.error(
-                    'Failed to send alert activation email for process %s',
-                    process.id,
-                    exc_info=True,
+        # Send an immediate activation email so BOTH lawyer and clients
+        # are informed without waiting for the daily reminder task. The
+        # daily Huey task keeps handling the 3-day / 1-day reminders.
+        try:
+            emails = sorted({u.email for u in recipients if getattr(u, 'email', None)})
+            if emails:
+                frontend_url = getattr(
+                    settings,
+                    'FRONTEND_BASE_URL',
+                    'https://gmconsultoresjuridicos.com',
                 )
+                process_url = f'{frontend_url}/process_detail/{process.id}'
+                send_template_email(
+                    template_name='notification',
+                    subject=f'Alerta activada — {process.ref or process.id}',
+                    to_emails=emails,
+                    context={
+                        'title': 'Alerta de Proceso Activada',
+                        'badge_text': 'Alerta activa',
+                        'notification_title': f'Proceso: {process.ref or process.id}',
+                        'message': message,
+                        'additional_info': (
+                            'Recibirás recordatorios automáticos 3 días y '
+                            '1 día antes de la fecha programada.'
+                        ),
+                        'action_url': process_url,
+                        'action_text': 'Ver Proceso',
+                    },
+                )
+        except Exception:
+            logger.error(
+                'Failed to send alert activation email for process %s',
+                process.id,
+                exc_info=True,
+            )
+
+
+def _parse_stage_date(value):
+    """Parse an ISO stage date; missing or invalid values default to today."""
+    if value:
+        try:
+            return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            pass
+    return timezone.now().date()
+
+
+def _stage_signature(stage_status, stage_date):
+    return (stage_status, stage_date.isoformat() if stage_date else '')
+
+
+def _apply_stage_diff(process, stages_data, main_data):
+    """Apply the submitted stage list to ``process`` as a keyed diff.
+
+    Submitted stages are matched to the current ones by ``id`` when given,
+    otherwise by (status, date) in order, so unchanged stages keep their row
+    and their alert (including the 3-day / 1-day notification flags). Matched
+    stages are updated only if they changed, unmatched submissions are
+    bulk-created and stages no longer submitted are deleted. The last stage's
+    alert receives the payload configuration, like ``_create_stage_alerts``.
+
+    Returns ``(added_stages, activated_stage)`` where ``activated_stage`` is
+    the last stage when its alert was just activated, else ``None``; raises
+    ``_StageAlertValidationError`` before writing anything if the alert
+    configuration is rejected.
+    """
+    links = Process.stages.through.objects.filter(process=process) \
+        .select_related('stage__alert').order_by('id')
+    current = [link.stage for link in links]
+    current_by_id = {stage.pk: stage for stage in current}
+    previous_last = current[-1] if current else None
+
+    entries = []
+    for stage_data in stages_data:
+        stage_status = stage_data.get('status')
+        if not stage_status:
+            continue
+        stage_id = stage_data.get('id')
+        try:
+            stage_id = int(stage_id) if stage_id not in (None, '') else None
+        except (TypeError, ValueError):
+            stage_id = None
+        entries.append((stage_id, stage_status, _parse_stage_date(stage_data.get('date'))))
+
+    matched = {}
+    for index, (stage_id, _status, _date) in enumerate(entries):
+        if stage_id in current_by_id and stage_id not in matched.values():
+            matched[index] = stage_id
+    claimed = set(matched.values())
+    for index, (_id, stage_status, stage_date) in enumerate(entries):
+        if index in matched:
+            continue
+        signature = _stage_signature(stage_status, stage_date)
+        for stage in current:
+            if stage.pk not in claimed and _stage_signature(stage.status, stage.date) == signature:
+                matched[index] = stage.pk
+                claimed.add(stage.pk)
+                break
+
+    ordered, added, changed, redated = [], [], [], set()
+    for index, (_id, stage_status, stage_date) in enumerate(entries):
+        if index not in matched:
+            stage = Stage(status=stage_status, date=stage_date)
+            added.append(stage)
+        else:
+            stage = current_by_id[matched[index]]
+            if stage.date != stage_date:
+                redated.add(stage.pk)
+            if stage.status != stage_status or stage.date != stage_date:
+                stage.status, stage.date = stage_status, stage_date
+                changed.append(stage)
+        ordered.append(stage)
+
+    _validate_alert_config(ordered, main_data)
+
+    removed_ids = [stage.pk for stage in current if stage.pk not in claimed]
+    if removed_ids:
+        # Cascades to the StageAlert rows and the process_stages links.
+        Stage.objects.filter(pk__in=removed_ids).delete()
+    if changed:
+        Stage.objects.bulk_update(changed, ['status', 'date'])
+    if added:
+        if connection.features.can_return_rows_from_bulk_insert:
+            Stage.objects.bulk_create(added)
+        else:
+            # MySQL does not return the ids of bulk-inserted rows, and the
+            # links and alerts below need them.
+            for stage in added:
+                stage.save()
+
+    # The current stage is the last link row, so links are only rewritten
+    # when kept stages were reordered or a new stage was inserted before them.
+    kept_ids = [stage.pk for stage in current if stage.pk in claimed]
+    ordered_ids = [stage.pk for stage in ordered]
+    if ordered_ids[:len(kept_ids)] == kept_ids:
+        new_link_ids = ordered_ids[len(kept_ids):]
+    else:
+        Process.stages.through.objects.filter(process=process).delete()
+        new_link_ids = ordered_ids
+    Process.stages.through.objects.bulk_create([
+        Process.stages.through(process=process, stage_id=stage_id)
+        for stage_id in new_link_ids
+    ])
+
+    if not ordered:
+        return added, None
+
+    last_stage = ordered[-1]
+    new_alerts, redated_alerts = [], []
+    for stage in ordered[:-1]:
+        alert = getattr(stage, 'alert', None) if stage.pk in current_by_id else None
+        if alert is None:
+            alert = StageAlert(stage=stage)
+            alert.next_fire_at = alert.compute_next_fire_at()
+            new_alerts.append(alert)
+        elif stage.pk in redated:
+            alert.notified_3_days = alert.notified_1_day = False
+            alert.next_fire_at = alert.compute_next_fire_at()
+            redated_alerts.append(alert)
+    if new_alerts:
+        StageAlert.objects.bulk_create(new_alerts)
+    if redated_alerts:
+        StageAlert.objects.bulk_update(
+            redated_alerts, ['notified_3_days', 'notified_1_day', 'next_fire_at'],
+        )
+
+    last_alert = getattr(last_stage, 'alert', None) if last_stage.pk in current_by_id else None
+    was_active = last_alert is not None and last_alert.is_active
+    if last_alert is None:
+        last_alert = StageAlert(stage=last_stage)
+    elif last_stage.pk in redated:
+        last_alert.notified_3_days = last_alert.notified_1_day = False
+    last_alert.description = main_data.get('alertDescription', '')
+    last_alert.is_active = main_data.get('alertIsActive', True)
+    last_alert.notify_clients = main_data.get('alertNotifyClients', True)
+    last_alert.save()
+
+    activated = last_alert.is_active and (
+        not was_active or last_stage is not previous_last or last_stage.pk in redated
+    )
+    return added, last_stage if activated else None
+
+
+class ProcessCursorPagination(CursorPagination):
+    """Keyset pagination for process listings, newest first.
+
+    ``id`` breaks ties between processes created in the same instant so the
+    cursor stays stable while processes are being added.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+# Query params that switch ``process_list`` to the paginated compact format.
+PROCESS_PAGINATION_PARAMS = ('cursor', 'page_size')
+
+
+def _visible_processes(user):
+    """Processes *user* may list: everything for gym staff, their own for clients."""
+    role = (getattr(user, 'role', '') or '').lower()
+    if is_gym_staff(user):
+        return Process.objects.all()
+    if role == 'client':
+        return Process.objects.filter(clients=user)
+    # corporate_client / basic / unknown roles cannot list processes directly.
+    return Process.objects.none()
+
+
+def _filter_processes(queryset, params):
+    """Apply the ``process_list`` query-string filters to *queryset*.
+
+    The current stage is the last one attached to the process (highest row
+    in the ``process_stages`` table), matching how the frontend reads
+    ``stages[stages.length - 1]``.
+    """
+    current_stage_id = Process.stages.through.objects.filter(
+        process_id=OuterRef('pk'),
+    ).order_by('-id').values('stage_id')[:1]
+    queryset = queryset.annotate(
+        current_stage_id=Subquery(current_stage_id),
+    ).annotate(
+        current_stage_status=Subquery(
+            Stage.objects.filter(pk=OuterRef('current_stage_id')).values('status')[:1]
+        ),
+    )
+
+    for param, lookup in (('lawyer_id', 'lawyer_id'), ('case_type_id', 'case_id')):
+        value = params.get(param)
+        if value:
+            if not value.isdigit():
+                raise ValueError(f'{param} must be an integer.')
+            queryset = queryset.filter(**{lookup: int(value)})
+
+    client_id = params.get('client_id')
+    if client_id:
+        if not client_id.isdigit():
+            raise ValueError('client_id must be an integer.')
+        queryset = queryset.filter(
+            pk__in=Process.clients.through.objects.filter(user_id=int(client_id)).values('process_id')
+        )
+
+    stage_status = (params.get('status') or '').strip()
+    if stage_status:
+        queryset = queryset.filter(current_stage_status__iexact=stage_status)
+
+    closed = (params.get('closed') or '').lower()
+    if closed in ('true', '1'):
+        queryset = queryset.filter(current_stage_status='Fallo')
+    elif closed in ('false', '0'):
+        # A process without stages has not been closed either.
+        queryset = queryset.filter(
+            Q(current_stage_status__isnull=True) | ~Q(current_stage_status='Fallo')
+        )
+
+    search = (params.get('search') or '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(ref__icontains=search)
+            | Q(plaintiff__icontains=search)
+            | Q(defendant__icontains=search)
+        )
+    return queryset
+
+
+def _attach_current_stages(processes):
+    """Set ``current_stage`` and ``stage_count`` on each process with two queries."""
+    stage_ids = [p.current_stage_id for p in processes if p.current_stage_id]
+    stages = Stage.objects.select_related('alert').in_bulk(stage_ids)
+    counts = dict(
+        Process.stages.through.objects.filter(process_id__in=[p.pk for p in processes])
+        .values('process_id').annotate(total=Count('id')).values_list('process_id', 'total')
+    )
+    for process in processes:
+        process.current_stage = stages.get(process.current_stage_id)
+        process.stage_count = counts.get(process.pk, 0)
+    return processes
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -193,32 +470,64 @@ def process_list(request):
     """
     API view to retrieve a list of processes based on the authenticated user's role.
     - If the user is a client, return the processes where the user is the client.
-    - If the user is a lawyer, return the processes where the user is the lawyer.
-    - If the user has any other role, return all processes.
+    - If the user is gym staff, return all processes.
+    - Any other role gets an empty list.
+
+    Optional filters: ``lawyer_id``, ``client_id``, ``case_type_id``,
+    ``status`` (status of the current stage), ``closed`` (``true``/``false``,
+    current stage is "Fallo") and ``search`` (ref, plaintiff or defendant).
+
+    Without ``cursor``/``page_size`` the full list is returned with
+    ``ProcessSerializer`` (legacy format). With either parameter the response
+    is cursor-paginated (``{next, previous, results}``) and each item uses
+    the compact ``ProcessListSerializer``.
     """
-    user = request.user  # Get the authenticated user
+    try:
+        processes = _filter_processes(_visible_processes(request.user), request.query_params)
+    except ValueError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        base_qs = Process.objects.select_related('lawyer') \
-            .prefetch_related('clients', 'stages__alert', 'case_files') \
-            .order_by('-created_at')
-
-        role = (getattr(user, 'role', '') or '').lower()
-        if is_gym_staff(user):
-            processes = base_qs
-        elif role == 'client':
-            processes = base_qs.filter(clients=user)
-        else:
-            # corporate_client / basic / unknown roles cannot list processes directly.
-            processes = base_qs.none()
+        if not any(param in request.query_params for param in PROCESS_PAGINATION_PARAMS):
+            processes = processes.select_related('lawyer', 'case') \
+                .prefetch_related('clients', 'stages__alert', 'case_files') \
+                .order_by('-created_at')
+            serializer = ProcessSerializer(processes, many=True, context={'request': request})
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        paginator = ProcessCursorPagination()
+        page = paginator.paginate_queryset(
+            processes.select_related('lawyer', 'case').prefetch_related('clients'),
+            request,
+        )
+        _attach_current_stages(page)
+        serializer = ProcessListSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
-        serializer = ProcessSerializer(processes, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    
+    except NotFound:
+        raise
     except Exception as e:
         return Response({'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def process_detail(request, pk):
+    """Return a single process with its full stage history and case files."""
+    process = get_object_or_404(
+        Process.objects.select_related('lawyer', 'case')
+        .prefetch_related('clients', 'stages__alert', 'case_files'),
+        pk=pk,
+    )
+    if not _user_can_access_process(request.user, process):
+        return Response(
+            {'detail': 'You do not have permission to view this process.'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    serializer = ProcessSerializer(process, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_process(request):
@@ -282,17 +591,9 @@ def create_process(request):
                 if not stage_status:
                     continue
 
-                date_value = stage_data.get('date')
-                if date_value:
-                    try:
-                        from datetime import date as _date_cls
-                        stage_date = _date_cls.fromisoformat(date_value)
-                    except Exception:
-                        stage_date = timezone.now().date()
-                else:
-                    stage_date = timezone.now().date()
-
-                stage = Stage.objects.create(status=stage_status, date=stage_date)
+                stage = Stage.objects.create(
+                    status=stage_status, date=_parse_stage_date(stage_data.get('date')),
+                )
                 process.stages.add(stage)
                 created_stages.append(stage)
 
@@ -319,7 +620,8 @@ def update_process(request, pk):
     This view will:
     - Update the process data using the provided main data.
     - Retain only the specified case files by 'caseFileIds'.
-    - REPLACE ALL existing stages with the ones from frontend.
+    - Apply 'stages' as a diff against the current stages (see
+      ``_apply_stage_diff``); when 'stages' is omitted they are left untouched.
     """
     process = get_object_or_404(Process, pk=pk)
 
@@ -402,60 +704,26 @@ def update_process(request, pk):
     
     process.save()
 
-    stages_data = main_data.get('stages', [])
-
-    # Process.stages is M2M, so .clear() only unlinks. Hard-delete the rows
-    # to avoid orphan Stage / StageAlert rows piling up in the database.
-    with transaction.atomic():
-        # Snapshot stage signatures (status + date) BEFORE clearing so we can
-        # detect newly-added stages after re-creation.
-        old_stage_signatures = set(
-            (s.status, s.date.isoformat() if s.date else '')
-            for s in process.stages.all()
-        )
-
-        old_stage_ids = list(process.stages.values_list('id', flat=True))
-        process.stages.clear()
-        if old_stage_ids:
-            Stage.objects.filter(id__in=old_stage_ids).delete()
-
-        created_stages = []
-        for stage_data in stages_data:
-            stage_status = stage_data.get('status')
-            if not stage_status:
-                continue
-
-            date_value = stage_data.get('date')
-            if date_value:
-                try:
-                    from datetime import date as _date_cls
-                    stage_date = _date_cls.fromisoformat(date_value)
-                except Exception:
-                    stage_date = timezone.now().date()
-            else:
-                stage_date = timezone.now().date()
-
-            new_stage = Stage.objects.create(status=stage_status, date=stage_date)
-            process.stages.add(new_stage)
-            created_stages.append(new_stage)
-
-        try:
-            _validate_alert_config(created_stages, main_data)
-        except _StageAlertValidationError as exc:
-            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
-
-        _create_stage_alerts(created_stages, main_data, process=process, actor=request.user)
+    stages_data = main_data.get('stages', None)
+    added_stages, activated_stage = [], None
+    if stages_data is not None:
+        with transaction.atomic():
+            try:
+                added_stages, activated_stage = _apply_stage_diff(process, stages_data, main_data)
+            except _StageAlertValidationError as exc:
+                return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
     case_file_ids = main_data.get('caseFileIds', None)
     if case_file_ids is not None:
         process.case_files.set(CaseFile.objects.filter(id__in=case_file_ids))
 
-    process.save()
-
-    added_stages = [
-        s for s in created_stages
-        if (s.status, s.date.isoformat() if s.date else '') not in old_stage_signatures
-    ]
+    if activated_stage is not None:
+        _notify_alert_activated(
+            process,
+            activated_stage,
+            main_data.get('alertDescription', ''),
+            main_data.get('alertNotifyClients', True),
+        )
 
     # Resolve recipients once and reuse across the per-stage loop to avoid an
     # N+1 on process.clients.all().
@@ -566,24 +834,7 @@ def update_case_file(request):
         case_file = CaseFile.objects.create(file=file)
         process.case_files.add(case_file)
 
-        # Notify stakeholders that a new document was attached. The actor (the
-        # uploader) is excluded from the recipient list so they don't receive
-        # a notification about their own action.
-        try:
-            file_name = getattr(case_file.file, 'name', '') or ''
-            display_name = file_name.rsplit('/', 1)[-1] if file_name else 'documento'
-            notify_process_stakeholders(
-                process=process,
-                title=f"Documento agregado — {process.ref or process.id}",
-                message=(
-                    f"Se anexó el documento '{display_name}' al proceso "
-                    f"{process.ref or process.id}."
-                ),
-                actor=request.user,
-                priority='medium',
-            )
-        except Exception:  # pragma: no cover — never block the upload on notif failure
-            pass
+        _notify_case_file_added(process, case_file, request.user)
 
         # Return success response with the ID of the uploaded file
         return Response({'detail': 'File uploaded successfully.', 'fileId': case_file.id}, status=status.HTTP_201_CREATED)
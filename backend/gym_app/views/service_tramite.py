@@ -7,7 +7,7 @@ from datetime import datetime
 from django.core.exceptions import ValidationError
 from django.core.validators import EmailValidator
 from django.db import IntegrityError, models, transaction
-from django.http import FileResponse, Http404
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -45,6 +45,8 @@ from gym_app.services.service_tramite_pdf import (
     ServiceRequestPDFError,
     generate_service_request_pdf,
 )
+from gym_app.utils.chunked_upload import consume_service_request_sessions, delete_upload_sessions
+from gym_app.utils.file_delivery import serve_file
 
 
 logger = logging.getLogger(__name__)
@@ -615,6 +617,22 @@ def save_or_submit_service_request(request):
     answers_payload = payload.get("answers", [])
     uploaded_files = _uploaded_files_by_field(request)
 
+    # Files sent through chunked upload sessions are referenced by session ID
+    # and merged with the multipart ones, so both follow the same validation.
+    session_files = []
+    consumed_sessions = []
+    try:
+        for field_id, session_ids in (payload.get("upload_sessions") or {}).items():
+            files, sessions = consume_service_request_sessions(request.user, session_ids)
+            session_files.extend(files)
+            consumed_sessions.extend(sessions)
+            uploaded_files.setdefault(int(field_id), []).extend(files)
+    except (ValidationError, TypeError, ValueError, AttributeError) as exc:
+        for session_file in session_files:
+            session_file.close()
+        detail = " ".join(exc.messages) if isinstance(exc, ValidationError) else "upload_sessions invalido"
+        return Response({"detail": detail}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         _save_answers_and_files(
             service_request=service_request,
@@ -624,6 +642,12 @@ def save_or_submit_service_request(request):
         )
     except ValidationError as exc:
         return Response({"detail": exc.message_dict if hasattr(exc, "message_dict") else str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    finally:
+        for session_file in session_files:
+            session_file.close()
+
+    if consumed_sessions:
+        delete_upload_sessions(consumed_sessions)
 
     if is_submit and not service_request.is_submitted:
         service_request.mark_submitted()
@@ -842,7 +866,7 @@ def download_service_request_document(request, request_id):
     file_path = service_request.generated_document.path
     filename = os.path.basename(file_path)
     try:
-        return FileResponse(open(file_path, "rb"), as_attachment=True, filename=filename, content_type="application/pdf")
+        return serve_file(request, file_path, filename=filename, content_type="application/pdf")
     except FileNotFoundError:
         raise Http404("Documento no encontrado")
 
@@ -860,9 +884,9 @@ def download_service_request_field_file(request, request_id, file_id):
     filename = file_obj.original_name or os.path.basename(file_path)
     content_type, _ = mimetypes.guess_type(file_path)
     try:
-        return FileResponse(
-            open(file_path, "rb"),
-            as_attachment=True,
+        return serve_file(
+            request,
+            file_path,
             filename=filename,
             content_type=content_type or "application/octet-stream",
         )
@@ -884,9 +908,9 @@ def download_service_request_response_file(request, request_id, response_id, fil
     filename = file_obj.original_name or os.path.basename(file_path)
     content_type, _ = mimetypes.guess_type(file_path)
     try:
-        return FileResponse(
-            open(file_path, "rb"),
-            as_attachment=True,
+        return serve_file(
+            request,
+            file_path,
             filename=filename,
             content_type=content_type or "application/octet-stream",
         )
@@ -12,8 +12,9 @@ from rest_framework.response import Response
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
-from gym_app.models import Subscription, PaymentHistory
+from gym_app.models import Subscription, PaymentHistory, WompiWebhookEvent
 from gym_app.serializers.subscription import SubscriptionSerializer, PaymentHistorySerializer
+from gym_app.tasks import process_wompi_webhook_event
 
 logger = logging.getLogger(__name__)
 
@@ -443,9 +444,11 @@ def wompi_webhook(request):
     """
     Webhook endpoint to receive payment notifications from Wompi.
     
-    This endpoint receives and processes payment status updates from Wompi.
-    It validates the signature to ensure the request is authentic and updates
-    the subscription status accordingly.
+    This endpoint validates the signature to ensure the request is authentic,
+    records the event in WompiWebhookEvent (unique per transaction id and
+    status, so Wompi's retries are deduplicated) and acknowledges it right
+    away. Subscription updates are applied by the
+    ``process_wompi_webhook_event`` Huey task.
     
     Args:
         request (Request): HTTP request containing Wompi event data
@@ -489,63 +492,36 @@ def wompi_webhook(request):
         # Get transaction details
         transaction_id = transaction_data.get('id')
         transaction_status = transaction_data.get('status')
-        reference = transaction_data.get('reference', '')
+        reference = transaction_data.get('reference') or ''
+        
+        if not transaction_id or not transaction_status:
+            logger.warning("Webhook received without transaction id or status")
+            return JsonResponse({'error': 'Missing transaction data'}, status=400)
         
         logger.info(f"Webhook received: {event_type} - Transaction {transaction_id} - Status: {transaction_status}")
         
-        # Process only subscription-related transactions
-        if reference.startswith('SUB-'):
-            # Extract subscription ID from reference (format: SUB-{subscription_id}-{timestamp})
-            try:
-                subscription_id = int(reference.split('-')[1])
-                subscription = Subscription.objects.get(id=subscription_id)
-                
-                # Update subscription based on transaction status
-                if transaction_status == 'APPROVED':
-                    # Payment successful
-                    if subscription.status != 'active':
-                        subscription.status = 'active'
-                        subscription.save()
-                        
-                        # Update user role if needed
-                        role_mapping = {
-                            'basico': 'basic',
-                            'cliente': 'client',
-                            'corporativo': 'corporate_client',
-                        }
-                        expected_role = role_mapping.get(subscription.plan_type)
-                        if subscription.user.role != expected_role:
-                            subscription.user.role = expected_role
-                            subscription.user.save()
-                    
-                    logger.info(f"Subscription {subscription_id} payment approved")
-                    
-                elif transaction_status == 'DECLINED':
-                    # Payment failed
-                    subscription.status = 'expired'
-                    subscription.save()
-                    
-                    # Downgrade user to basic
-                    subscription.user.role = 'basic'
-                    subscription.user.save()
-                    
-                    logger.warning(f"Subscription {subscription_id} payment declined")
-                    
-                elif transaction_status == 'VOIDED':
-                    # Payment voided/cancelled
-                    logger.info(f"Subscription {subscription_id} payment voided")
-                    
-                elif transaction_status == 'ERROR':
-                    # Payment error
-                    logger.error(f"Subscription {subscription_id} payment error")
-                
-            except (IndexError, ValueError):
-                logger.error(f"Invalid subscription reference format: {reference}")
-            except Subscription.DoesNotExist:
-                logger.error(f"Subscription not found for reference: {reference}")
-        
-        # Return success response
-        return JsonResponse({'status': 'success', 'message': 'Webhook processed'}, status=200)
+        # Log the event; Wompi retries deliveries, so the same transaction
+        # status is only recorded (and applied) once.
+        event, created = WompiWebhookEvent.objects.get_or_create(
+            transaction_id=str(transaction_id),
+            transaction_status=transaction_status,
+            defaults={
+                'event_type': event_type or '',
+                'reference': reference,
+                'payload': event_data,
+            },
+        )
+        
+        if not created and event.status in ('processed', 'ignored'):
+            logger.info(f"Duplicate webhook for transaction {transaction_id} ({transaction_status}) ignored")
+            return JsonResponse({'status': 'success', 'message': 'Duplicate event'}, status=200)
+        
+        # Subscription updates run on the Huey queue; a delivery whose
+        # previous processing failed is queued again.
+        process_wompi_webhook_event(event.id)
+        
+        # Acknowledge receipt
+        return JsonResponse({'status': 'success', 'message': 'Webhook received'}, status=200)
         
     except json.JSONDecodeError:
         logger.error("Invalid JSON in webhook payload")
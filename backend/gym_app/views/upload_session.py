@@ -0,0 +1,294 @@
+"""
+Resumable, chunked uploads for large legal request, process and service
+request attachments.
+
+Flow:
+1. ``POST   upload-sessions/``                    declare filename, size and target.
+2. ``PUT    upload-sessions/<id>/chunk/``          send raw bytes; ``Upload-Offset`` header
+                                                    (or ``?offset=``) must equal the
+                                                    bytes already received.
+3. ``GET    upload-sessions/<id>/``                current offset, to resume after a failure.
+4. ``POST   upload-sessions/<id>/complete/``       validate the assembled file once and
+                                                    attach it to the target.
+5. ``DELETE upload-sessions/<id>/``                abort and discard the partial file.
+
+Service request sessions are only validated on ``complete``; they are then
+referenced from ``save_or_submit_service_request`` through
+``payload["upload_sessions"]``.
+"""
+import logging
+import os
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from gym_app.models import CaseFile, LegalRequest, LegalRequestFiles, Process, UploadSession
+from gym_app.serializers import UploadSessionSerializer
+from gym_app.utils.chunked_upload import (
+    ChunkOffsetMismatch,
+    append_chunk,
+    attach_session_file,
+    max_chunk_size,
+    open_assembled_file,
+)
+from gym_app.views.legal_request import MAX_FILE_SIZE, ALLOWED_FILE_TYPES, validate_file_security
+from gym_app.views.process import _notify_case_file_added, _user_can_access_process
+
+logger = logging.getLogger(__name__)
+
+
+def _load_target(user, target, target_id):
+    """Resolve and authorize the object a session will attach to.
+
+    Returns:
+        tuple: ``(target_object, error_response)``; exactly one is ``None``.
+    """
+    if target == UploadSession.TARGET_SERVICE_REQUEST:
+        return None, None
+
+    try:
+        target_id = int(target_id)
+    except (TypeError, ValueError):
+        return None, Response(
+            {'detail': 'target_id is required and must be an integer.'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    if target == UploadSession.TARGET_LEGAL_REQUEST:
+        # Same rules as add_files_to_legal_request: only the client who
+        # created the request can add files to it.
+        legal_request = get_object_or_404(LegalRequest, pk=target_id)
+        if legal_request.user_id != user.id:
+            logger.warning(f"User {user.id} attempted to upload to legal request {target_id} without permission")
+            return None, Response(
+                {'detail': 'You do not have permission to add files to this request'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        user_role = getattr(user, 'role', 'client')
+        if user_role != 'client':
+            logger.warning(f"Non-client user {user.id} ({user_role}) attempted to upload to legal request {target_id}")
+            return None, Response(
+                {'detail': 'Only clients can add files to requests'},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        if legal_request.status == 'CLOSED':
+            return None, Response(
+                {'detail': 'Cannot add files to a closed request'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return legal_request, None
+
+    process = get_object_or_404(Process, pk=target_id)
+    if not _user_can_access_process(user, process):
+        return None, Response(
+            {'detail': 'No tienes permisos para subir archivos a este proceso.'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    return process, None
+
+
+def _parse_offset(request):
+    raw = request.headers.get('Upload-Offset', request.query_params.get('offset'))
+    try:
+        offset = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return offset if offset >= 0 else None
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_upload_session(request):
+    """
+    Start a chunked upload.
+
+    **Request body** (JSON):
+    - ``filename`` (str): Original filename (its extension is validated up front).
+    - ``size`` (int): Final size in bytes.
+    - ``target`` (str): ``legal_request``, ``process`` or ``service_request``.
+    - ``target_id`` (int): Legal request / process ID (not used for service requests).
+
+    **Responses**:
+    - ``201 Created``: The session, including ``id`` and ``received_bytes`` (0).
+    - ``400 Bad Request``: Invalid size, filename or target.
+    - ``403 Forbidden`` / ``404 Not Found``: The target cannot be written by the user.
+    """
+    filename = os.path.basename(str(request.data.get('filename') or '').strip())
+    target = request.data.get('target')
+    target_id = request.data.get('target_id')
+
+    try:
+        total_size = int(request.data.get('size'))
+    except (TypeError, ValueError):
+        return Response({'detail': 'size must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not filename:
+        return Response({'detail': 'filename is required.'}, status=status.HTTP_400_BAD_REQUEST)
+    if target not in dict(UploadSession.TARGET_CHOICES):
+        return Response({'detail': 'Invalid target.'}, status=status.HTTP_400_BAD_REQUEST)
+    if total_size <= 0 or total_size > MAX_FILE_SIZE:
+        return Response(
+            {'detail': f'size must be between 1 byte and {MAX_FILE_SIZE // 1024 // 1024}MB.'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # Reject obviously unsupported types before any byte is transferred; the
+    # content itself is checked on complete.
+    file_ext = os.path.splitext(filename)[1].lower()
+    if not any(file_ext in extensions for extensions in ALLOWED_FILE_TYPES.values()):
+        return Response({'detail': f'File type {file_ext} not allowed.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    _, error_response = _load_target(request.user, target, target_id)
+    if error_response:
+        return error_response
+
+    session = UploadSession.objects.create(
+        user=request.user,
+        target=target,
+        target_id=target_id if target != UploadSession.TARGET_SERVICE_REQUEST else None,
+        filename=filename,
+        total_size=total_size,
+    )
+    logger.info(f"Upload session {session.id} created by user {request.user.id} for {target} {target_id}")
+    return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def upload_session_detail(request, session_id):
+    """
+    Retrieve the progress of an upload session (to resume it) or abort it.
+    """
+    session = get_object_or_404(UploadSession, pk=session_id, user=request.user)
+
+    if request.method == 'DELETE':
+        if session.status == UploadSession.STATUS_COMPLETED and session.target != UploadSession.TARGET_SERVICE_REQUEST:
+            return Response({'detail': 'The upload was already attached.'}, status=status.HTTP_400_BAD_REQUEST)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    return Response(UploadSessionSerializer(session).data, status=status.HTTP_200_OK)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def upload_session_chunk(request, session_id):
+    """
+    Append one chunk to an upload session.
+
+    The body is the raw chunk (``Content-Type: application/octet-stream``) and
+    is streamed to disk without being parsed. The chunk offset is taken from
+    the ``Upload-Offset`` header (or ``?offset=``) and must equal
+    ``received_bytes``; otherwise ``409 Conflict`` is returned together with
+    the offset the client should resume from.
+    """
+    offset = _parse_offset(request)
+    if offset is None:
+        return Response({'detail': 'A valid Upload-Offset is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    if length <= 0:
+        return Response({'detail': 'Empty chunk.'}, status=status.HTTP_400_BAD_REQUEST)
+    if length > max_chunk_size():
+        return Response(
+            {'detail': f'Chunks cannot exceed {max_chunk_size()} bytes.'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    with transaction.atomic():
+        session = get_object_or_404(
+            UploadSession.objects.select_for_update(), pk=session_id, user=request.user,
+        )
+        if session.status != UploadSession.STATUS_UPLOADING:
+            return Response({'detail': 'The upload session is already complete.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            append_chunk(session, offset, request._request, length)
+        except ChunkOffsetMismatch as exc:
+            return Response(
+                {'detail': 'Offset mismatch.', 'received_bytes': exc.expected_offset},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = Response(UploadSessionSerializer(session).data, status=status.HTTP_200_OK)
+    response['Upload-Offset'] = str(session.received_bytes)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def complete_upload_session(request, session_id):
+    """
+    Validate the assembled file and attach it to the session target.
+
+    - Legal requests: a ``LegalRequestFiles`` row is created and linked.
+    - Processes: a ``CaseFile`` row is created, linked and stakeholders are notified.
+    - Service requests: the session is only marked complete; the file is
+      attached when the request is saved.
+
+    **Responses**:
+    - ``201 Created``: ``{'session': {...}, 'file_id': <id or null>}``.
+    - ``400 Bad Request``: Upload incomplete or the file failed validation
+      (the session is discarded in that case).
+    """
+    with transaction.atomic():
+        session = get_object_or_404(
+            UploadSession.objects.select_for_update(), pk=session_id, user=request.user,
+        )
+        if session.status == UploadSession.STATUS_COMPLETED:
+            return Response(
+                {'session': UploadSessionSerializer(session).data, 'file_id': session.attached_object_id},
+                status=status.HTTP_200_OK,
+            )
+        if not session.is_complete:
+            return Response(
+                {'detail': 'Upload incomplete.', 'received_bytes': session.received_bytes},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        assembled = open_assembled_file(session)
+        try:
+            validate_file_security(assembled)
+        except ValidationError as exc:
+            logger.warning(f"Upload session {session.id} rejected: {exc}")
+            assembled.close()
+            session.delete()
+            return Response({'detail': ' '.join(exc.messages)}, status=status.HTTP_400_BAD_REQUEST)
+        assembled.close()
+
+        target, error_response = _load_target(request.user, session.target, session.target_id)
+        if error_response:
+            return error_response
+
+        case_file = None
+        if session.target == UploadSession.TARGET_LEGAL_REQUEST:
+            file_instance = attach_session_file(session, LegalRequestFiles())
+            target.files.add(file_instance)
+            session.attached_object_id = file_instance.id
+        elif session.target == UploadSession.TARGET_PROCESS:
+            case_file = attach_session_file(session, CaseFile())
+            target.case_files.add(case_file)
+            session.attached_object_id = case_file.id
+
+        session.status = UploadSession.STATUS_COMPLETED
+        session.save(update_fields=['status', 'attached_object_id', 'updated_at'])
+
+    if case_file is not None:
+        _notify_case_file_added(target, case_file, request.user)
+
+    logger.info(f"Upload session {session.id} completed for {session.target} {session.target_id}")
+    return Response(
+        {'session': UploadSessionSerializer(session).data, 'file_id': session.attached_object_id},
+        status=status.HTTP_201_CREATED,
+    )
+
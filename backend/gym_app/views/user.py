@@ -2,9 +2,14 @@ from rest_framework.response import Response
 from rest_framework import status
 from gym_app.models import User
 from gym_app.models.user import ActivityFeed, UserSignature
-from gym_app.serializers.user import UserSerializer, ActivityFeedSerializer, UserSignatureSerializer
+from gym_app.serializers.user import (
+    UserSerializer, ActivityFeedSerializer, ActivityFeedEntrySerializer, UserSignatureSerializer,
+)
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
+from django.conf import settings
+from django.db import connection, transaction
 from django.core.files.storage import default_storage
 import logging
 
@@ -89,17 +94,36 @@ def update_profile(request, pk):
     # Return any validation errors that occurred
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class ActivityFeedCursorPagination(CursorPagination):
+    """Keyset pagination for the activity feed, newest first."""
+    ordering = ('-created_at', '-id')
+    page_size = settings.ACTIVITY_FEED_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_activities(request):
     """
     API view to retrieve the activities of the authenticated user.
     
-    Returns a list of activities in chronological order (newest first).
+    Returns activities newest first. With ``cursor`` or ``page_size`` the
+    response is cursor-paginated (``{next, previous, results}``); without
+    them only the newest ``ACTIVITY_FEED_PAGE_SIZE`` entries are returned as
+    a plain list.
     """
     activities = ActivityFeed.objects.filter(user=request.user)
-    serializer = ActivityFeedSerializer(activities, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+
+    if 'cursor' not in request.query_params and 'page_size' not in request.query_params:
+        activities = activities.order_by('-created_at', '-id')[:ActivityFeedCursorPagination.page_size]
+        serializer = ActivityFeedSerializer(activities, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    paginator = ActivityFeedCursorPagination()
+    page = paginator.paginate_queryset(activities, request)
+    serializer = ActivityFeedSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -124,6 +148,44 @@ def create_activity(request):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_activities(request):
+    """
+    API view to record several activities of the authenticated user at once.
+    
+    The request body is ``{"activities": [{"action_type": ..., "description": ...}, ...]}``
+    (or the bare list) with at most ``ACTIVITY_FEED_BATCH_MAX`` entries. The
+    batch is validated as a whole and written with a single ``bulk_create``
+    (row by row, in one transaction, on databases that do not return the ids
+    of bulk-inserted rows).
+    """
+    entries = request.data.get('activities') if isinstance(request.data, dict) else request.data
+    if not isinstance(entries, list) or not entries:
+        return Response({'detail': 'activities must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    batch_max = getattr(settings, 'ACTIVITY_FEED_BATCH_MAX', 100)
+    if len(entries) > batch_max:
+        return Response(
+            {'detail': f'At most {batch_max} activities can be sent per request.'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    serializer = ActivityFeedEntrySerializer(data=entries, many=True)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    created = [ActivityFeed(user=request.user, **entry) for entry in serializer.validated_data]
+    if connection.features.can_return_rows_from_bulk_insert:
+        ActivityFeed.objects.bulk_create(created)
+    else:
+        # MySQL does not return the ids of bulk-inserted rows, and the
+        # response includes them.
+        with transaction.atomic():
+            for activity in created:
+                activity.save()
+    return Response(ActivityFeedSerializer(created, many=True).data, status=status.HTTP_201_CREATED)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def update_signature(request, user_id):
@@ -0,0 +1,38 @@
+"""
+Bootstrap of the document render worker processes.
+
+The render pool (``gym_app.utils.render_pool``) starts its workers with
+``spawn``: a fresh interpreter that unpickles the pool initializer before any
+job. The initializer therefore lives here, in a module that imports nothing
+from ``gym_app`` at import time — importing ``gym_app.utils`` loads the
+models, which needs the app registry this function is about to set up.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def initialize():
+    """Configure Django and preload the render stack in a new worker."""
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+
+    from gym_app.services import service_tramite_pdf  # noqa: F401  (imports xhtml2pdf)
+    from gym_app.utils import documents
+
+    # Resolves and validates the Carlito fonts, builds the stylesheet and
+    # loads WeasyPrint (fontconfig, @font-face files) with a throw-away
+    # render; a failure here must not keep the worker from starting.
+    try:
+        html_content = documents.build_document_html(
+            title='warm-up',
+            body_html='<p>Carlito <b>bold</b> <i>italic</i> <b><i>bold italic</i></b></p>',
+        )
+        documents.render_html_to_pdf(html_content, base_url=settings.BASE_DIR)
+    except Exception as exc:
+        logger.warning(f"Render worker {os.getpid()} warm-up failed: {exc}")
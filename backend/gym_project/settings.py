@@ -5,6 +5,8 @@ from pathlib import Path
 from decouple import config, Csv
 from huey import RedisHuey
 
+from gym_project.database import database_settings
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,8 +45,9 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'huey.contrib.djhuey',
-    'dbbackup',
+    # Before dbbackup: gym_app overrides its mediabackup command.
     'gym_app',
+    'dbbackup',
     'gym_project.apps.GymProjectConfig',
 ]
 
@@ -54,6 +57,9 @@ if ENABLE_SILK:
     INSTALLED_APPS.append('silk')
 
 MIDDLEWARE = [
+    'gym_app.middleware.RequestMetricsMiddleware',
+    'gym_app.middleware.QueryInspectorMiddleware',
+    'gym_app.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -75,12 +81,22 @@ between parties as a JSON object.
 """
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'gym_app.authentication.CachedJWTAuthentication',
     ),
     # Default to authenticated; public endpoints must opt in with @permission_classes([AllowAny]).
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed JSON; the browsable API and form/multipart uploads as before.
+    'DEFAULT_RENDERER_CLASSES': (
+        'gym_app.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'gym_app.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_THROTTLE_CLASSES': (
         'rest_framework.throttling.AnonRateThrottle',
         'rest_framework.throttling.ScopedRateThrottle',
@@ -126,15 +142,21 @@ WSGI_APPLICATION = 'gym_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 # ---------------------------------------------------------------------------
+# Connections are reused for DB_CONN_MAX_AGE seconds (0 = one per request)
+# with health checks; SQLite connections run the DB_SQLITE_PROFILE PRAGMAs
+# ('wal' or 'default') on connect. See gym_project/database.py.
 DATABASES = {
-    'default': {
-        'ENGINE': config('DB_ENGINE', default='django.db.backends.sqlite3'),
-        'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
-        'USER': config('DB_USER', default=''),
-        'PASSWORD': config('DB_PASSWORD', default=''),
-        'HOST': config('DB_HOST', default=''),
-        'PORT': config('DB_PORT', default=''),
-    }
+    'default': database_settings(
+        engine=config('DB_ENGINE', default='django.db.backends.sqlite3'),
+        name=config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        user=config('DB_USER', default=''),
+        password=config('DB_PASSWORD', default=''),
+        host=config('DB_HOST', default=''),
+        port=config('DB_PORT', default=''),
+        conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+        health_checks=config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        sqlite_profile=config('DB_SQLITE_PROFILE', default='wal'),
+    )
 }
 
 # Password validation
@@ -189,6 +211,55 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Content-addressed media storage (gym_app.storage): byte-identical uploads and
+# letterhead snapshots share a single SHA-256 keyed blob under MEDIA_ROOT/.blobs.
+# Unreferenced blobs are removed by the gc_media_blobs command / daily task.
+MEDIA_DEDUP_ENABLED = config('MEDIA_DEDUP_ENABLED', default=True, cast=bool)
+STORAGES = {
+    'default': {
+        'BACKEND': (
+            'gym_app.storage.ContentAddressedStorage'
+            if MEDIA_DEDUP_ENABLED
+            else 'django.core.files.storage.FileSystemStorage'
+        ),
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Protected downloads (gym_app.utils.file_delivery). When the prefix is set,
+# permission-checked downloads are handed to nginx via X-Accel-Redirect and
+# served from the matching ``internal`` location; empty = stream from Django.
+FILE_DELIVERY_X_ACCEL_PREFIX = config('FILE_DELIVERY_X_ACCEL_PREFIX', default='')
+FILE_DELIVERY_CHUNK_SIZE = 64 * 1024
+
+# Chunked upload sessions (gym_app.views.upload_session). Each PUT carries at
+# most this many bytes; sessions idle longer than the TTL are purged.
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = config('CHUNKED_UPLOAD_MAX_CHUNK_SIZE', default=16 * 1024 * 1024, cast=int)
+CHUNKED_UPLOAD_SESSION_TTL_HOURS = config('CHUNKED_UPLOAD_SESSION_TTL_HOURS', default=24, cast=int)
+
+# User activity feed (gym_app.views.user). Each user keeps a rolling window
+# of their newest entries, enforced hourly by prune_activity_feed; reads are
+# paginated with ACTIVITY_FEED_PAGE_SIZE items per page and batch ingestion
+# accepts at most ACTIVITY_FEED_BATCH_MAX entries per request.
+ACTIVITY_FEED_MAX_PER_USER = config('ACTIVITY_FEED_MAX_PER_USER', default=200, cast=int)
+ACTIVITY_FEED_RETENTION_DAYS = config('ACTIVITY_FEED_RETENTION_DAYS', default=365, cast=int)
+ACTIVITY_FEED_PAGE_SIZE = config('ACTIVITY_FEED_PAGE_SIZE', default=20, cast=int)
+ACTIVITY_FEED_BATCH_MAX = config('ACTIVITY_FEED_BATCH_MAX', default=100, cast=int)
+
+# Legal request inbox pagination (gym_app.views.legal_request.list_legal_requests).
+LEGAL_REQUEST_PAGE_SIZE = config('LEGAL_REQUEST_PAGE_SIZE', default=20, cast=int)
+LEGAL_REQUEST_MAX_PAGE_SIZE = config('LEGAL_REQUEST_MAX_PAGE_SIZE', default=100, cast=int)
+
+# Seconds corporate/organization dashboard stats are cached per user
+# (gym_app.utils.dashboard_cache); 0 disables the cache.
+DASHBOARD_STATS_CACHE_TTL = config('DASHBOARD_STATS_CACHE_TTL', default=60, cast=int)
+
+# Seconds the user resolved from a JWT access token is cached
+# (gym_app.utils.auth_cache); 0 loads it from the database on every request.
+USER_AUTH_CACHE_TTL = config('USER_AUTH_CACHE_TTL', default=60, cast=int)
+
 # ---------------------------------------------------------------------------
 # Email
 # ---------------------------------------------------------------------------
@@ -243,6 +314,49 @@ WOMPI_API_URL = (
     else 'https://sandbox.wompi.co/v1'
 )
 
+# Recurring billing (gym_app.tasks.process_monthly_subscriptions): due
+# subscriptions are locked and charged in batches of this size, with up to
+# SUBSCRIPTION_BILLING_CONCURRENCY Wompi charges in flight at once.
+SUBSCRIPTION_BILLING_BATCH_SIZE = config('SUBSCRIPTION_BILLING_BATCH_SIZE', default=50, cast=int)
+SUBSCRIPTION_BILLING_CONCURRENCY = config('SUBSCRIPTION_BILLING_CONCURRENCY', default=4, cast=int)
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+# Shared Redis cache in production so per-user caches (dashboard stats) and
+# DRF throttling are invalidated/enforced across all gunicorn workers; the
+# default per-process memory cache is enough for development and tests.
+#
+# Rendered document PDFs (gym_app.utils.render_cache) get their own cache:
+# multi-megabyte entries in the default Redis cache would evict sessions,
+# throttle counters and dashboard stats. In production it lives on the local
+# disk, bounded by DOCUMENT_RENDER_CACHE_MAX_ENTRIES files.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'document_renders': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'document-renders',
+        'OPTIONS': {'MAX_ENTRIES': 50},
+    },
+}
+if IS_PRODUCTION:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_REDIS_URL', default='redis://localhost:6379/2'),
+    }
+    CACHES['document_renders'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config(
+            'DOCUMENT_RENDER_CACHE_DIR',
+            default=os.path.join('/tmp', 'gym_project', 'document_renders'),
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('DOCUMENT_RENDER_CACHE_MAX_ENTRIES', default=500, cast=int),
+        },
+    }
+
 # ---------------------------------------------------------------------------
 # Huey task queue
 # ---------------------------------------------------------------------------
@@ -252,6 +366,10 @@ HUEY = RedisHuey(
     immediate=not IS_PRODUCTION,
 )
 
+# Hour (UTC) at which process stage reminders become due: 14:00 UTC is
+# 9:00 AM in Colombia (UTC-5).
+PROCESS_ALERT_SEND_HOUR_UTC = config('PROCESS_ALERT_SEND_HOUR_UTC', default=14, cast=int)
+
 # ---------------------------------------------------------------------------
 # SECOP (Public Procurement) integration
 # ---------------------------------------------------------------------------
@@ -312,6 +430,82 @@ if ENABLE_SILK:
 
     SILKY_INTERCEPT_PERCENT = 50
 
+# ---------------------------------------------------------------------------
+# Always-on request/task metrics (Prometheus format at /api/metrics/)
+# ---------------------------------------------------------------------------
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# 'memory' aggregates per process; 'redis' shares one aggregate across the
+# gunicorn workers and the Huey consumer.
+METRICS_BACKEND = config('METRICS_BACKEND', default='redis' if IS_PRODUCTION else 'memory')
+METRICS_REDIS_URL = config('METRICS_REDIS_URL', default=config('REDIS_URL', default='redis://localhost:6379/1'))
+METRICS_AUTH_TOKEN = config('METRICS_AUTH_TOKEN', default='')
+# Scrapes need the token (or a staff session) unless explicitly made public.
+METRICS_PUBLIC = config('METRICS_PUBLIC', default=False, cast=bool)
+# Per-process gauges (render queue depth) in Redis expire this many seconds
+# after their last update, so a crashed worker's value does not linger.
+METRICS_GAUGE_TTL = config('METRICS_GAUGE_TTL', default=300, cast=int)
+METRICS_SLOW_REQUEST_MS = config('METRICS_SLOW_REQUEST_MS', default=1000, cast=int)
+METRICS_SLOW_REQUEST_SAMPLE_RATE = config('METRICS_SLOW_REQUEST_SAMPLE_RATE', default=0.1, cast=float)
+METRICS_SLOW_REQUEST_MAX_QUERIES = 500
+
+# ---------------------------------------------------------------------------
+# N+1 detection and per-view query budgets (development/test only)
+# ---------------------------------------------------------------------------
+# Groups each request's SQL by normalized template and reports templates run
+# QUERY_INSPECTOR_NPLUSONE_THRESHOLD times or more, plus views exceeding
+# their @query_budget. QUERY_INSPECTOR_RAISE turns the reports into errors.
+QUERY_INSPECTOR_ENABLED = config('QUERY_INSPECTOR_ENABLED', default=not IS_PRODUCTION, cast=bool)
+QUERY_INSPECTOR_RAISE = config('QUERY_INSPECTOR_RAISE', default=False, cast=bool)
+QUERY_INSPECTOR_NPLUSONE_THRESHOLD = config('QUERY_INSPECTOR_NPLUSONE_THRESHOLD', default=5, cast=int)
+
+# ---------------------------------------------------------------------------
+# Response compression (gym_app.middleware.CompressionMiddleware)
+# ---------------------------------------------------------------------------
+# Brotli or gzip, negotiated per request, for textual bodies of at least
+# RESPONSE_COMPRESSION_MIN_SIZE bytes (streaming responses included).
+RESPONSE_COMPRESSION_ENABLED = config('RESPONSE_COMPRESSION_ENABLED', default=True, cast=bool)
+RESPONSE_COMPRESSION_MIN_SIZE = config('RESPONSE_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+RESPONSE_COMPRESSION_BROTLI_QUALITY = config('RESPONSE_COMPRESSION_BROTLI_QUALITY', default=4, cast=int)
+
+# ---------------------------------------------------------------------------
+# Word export (gym_app.utils.docx_export)
+# ---------------------------------------------------------------------------
+# Parsed letterhead templates kept per process (0 disables the cache) and the
+# size above which a generated .docx spools to a temporary file on disk.
+DOCX_TEMPLATE_CACHE_SIZE = config('DOCX_TEMPLATE_CACHE_SIZE', default=16, cast=int)
+DOCX_EXPORT_SPOOL_MAX_SIZE = config('DOCX_EXPORT_SPOOL_MAX_SIZE', default=8 * 1024 * 1024, cast=int)
+
+# ---------------------------------------------------------------------------
+# Document render cache and bulk export
+# ---------------------------------------------------------------------------
+# Rendered document PDFs are cached in the DOCUMENT_RENDER_CACHE_ALIAS cache
+# (see CACHES) under the hash of their HTML (gym_app.utils.render_cache) for
+# DOCUMENT_RENDER_CACHE_TTL seconds (0 disables it); renders above
+# DOCUMENT_RENDER_CACHE_MAX_BYTES are not cached. The bulk ZIP export renders
+# on up to BULK_EXPORT_WORKERS threads (1 renders inline), accepts at most
+# BULK_EXPORT_MAX_DOCUMENTS documents and adds at most
+# BULK_EXPORT_CACHE_MAX_BYTES of new renders to the cache.
+DOCUMENT_RENDER_CACHE_ALIAS = 'document_renders'
+DOCUMENT_RENDER_CACHE_TTL = config('DOCUMENT_RENDER_CACHE_TTL', default=6 * 60 * 60, cast=int)
+DOCUMENT_RENDER_CACHE_MAX_BYTES = config('DOCUMENT_RENDER_CACHE_MAX_BYTES', default=5 * 1024 * 1024, cast=int)
+BULK_EXPORT_WORKERS = config('BULK_EXPORT_WORKERS', default=4, cast=int)
+BULK_EXPORT_MAX_DOCUMENTS = config('BULK_EXPORT_MAX_DOCUMENTS', default=200, cast=int)
+BULK_EXPORT_CACHE_MAX_BYTES = config('BULK_EXPORT_CACHE_MAX_BYTES', default=100 * 1024 * 1024, cast=int)
+
+# ---------------------------------------------------------------------------
+# Render pool (gym_app.utils.render_pool)
+# ---------------------------------------------------------------------------
+# WeasyPrint/xhtml2pdf renders run on RENDER_POOL_WORKERS warm worker processes
+# per web process (0 renders in the calling thread), started on the first
+# render of each web worker. Each render worker is a full Django process, so
+# gunicorn --workers 3 with 2 render workers runs 9 processes of that size.
+# A caller waits at most RENDER_POOL_TIMEOUT seconds for its render; workers
+# are replaced after RENDER_POOL_MAX_TASKS_PER_WORKER renders (0 keeps them
+# forever).
+RENDER_POOL_WORKERS = config('RENDER_POOL_WORKERS', default=2 if IS_PRODUCTION else 0, cast=int)
+RENDER_POOL_TIMEOUT = config('RENDER_POOL_TIMEOUT', default=120, cast=int)
+RENDER_POOL_MAX_TASKS_PER_WORKER = config('RENDER_POOL_MAX_TASKS_PER_WORKER', default=200, cast=int)
+
 # Alert thresholds (used by weekly report task)
 SLOW_QUERY_THRESHOLD_MS = 500
 N_PLUS_ONE_THRESHOLD = 10
@@ -357,6 +551,12 @@ LOGGING = {
             'filename': os.path.join(BASE_DIR, 'logs', 'backups.log'),
             'formatter': 'custom',
         },
+        'slow_request_file': {
+            'level': 'WARNING',
+            'class': 'logging.handlers.WatchedFileHandler',
+            'filename': os.path.join(BASE_DIR, 'logs', 'slow_requests.log'),
+            'formatter': 'custom',
+        },
     },
     'loggers': {
         'django': {
@@ -374,6 +574,16 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'gym_app.slow_requests': {
+            'handlers': ['slow_request_file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'gym_app.query_inspector': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
 
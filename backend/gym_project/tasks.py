@@ -6,20 +6,67 @@ This module contains infrastructure/operational tasks:
   - Database and media backups
   - Silk profiling data cleanup
   - Weekly slow query reports
+  - Stale chunked upload session cleanup
+  - Deduplicated media blob garbage collection
+  - Task duration metrics and DB connection recycling (Huey signal handlers)
 """
 import logging
+import time
 from datetime import datetime, timedelta
 from io import StringIO
 from pathlib import Path
 
 from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
 from huey import crontab
-from huey.contrib.djhuey import periodic_task, task
+from huey import signals as huey_signals
+from huey.contrib.djhuey import periodic_task, signal, task
 
 logger = logging.getLogger('backups')
 
 
+# ---------------------------------------------------------------------------
+# Task duration metrics
+# ---------------------------------------------------------------------------
+# Start times keyed by task id; the consumer runs each task on one worker
+# thread, so EXECUTING and the terminal signal arrive in the same process.
+_task_started_at = {}
+
+
+def _close_stale_connections():
+    """Recycle DB connections past CONN_MAX_AGE (or broken) around each task.
+
+    Django does this at request boundaries; consumer threads have none, so a
+    persistent connection would otherwise live until the server drops it.
+    Skipped in immediate mode, where tasks run inside a request or test.
+    """
+    if not settings.HUEY.immediate:
+        close_old_connections()
+
+
+@signal(huey_signals.SIGNAL_EXECUTING)
+def _task_executing(signal_name, huey_task, *args, **kwargs):
+    _close_stale_connections()
+    _task_started_at[huey_task.id] = time.perf_counter()
+
+
+@signal(huey_signals.SIGNAL_COMPLETE, huey_signals.SIGNAL_ERROR, huey_signals.SIGNAL_CANCELED)
+def _task_finished(signal_name, huey_task, *args, **kwargs):
+    _close_stale_connections()
+    started = _task_started_at.pop(huey_task.id, None)
+    if started is None:
+        return
+    from gym_app.utils.metrics import observe
+
+    observe(
+        'huey_task_duration_seconds',
+        time.perf_counter() - started,
+        task=huey_task.name,
+        outcome=signal_name,
+    )
+
+
 # Retired 2026-06-25: daily backups moved to systemd gym-dbbackup.timer
 # (vps-ops-toolkit/config/systemd/) to homogenize gym with the fleet and drop
 # the dependency on the Huey worker being up. Still callable on demand via
@@ -197,3 +244,46 @@ def silk_reports_cleanup():
 
     if deleted:
         logger.info(f"Silk reports cleanup: deleted {deleted} reports older than 6 months")
+
+
+@periodic_task(crontab(minute='30'))
+def purge_stale_upload_sessions():
+    """
+    Hourly removal of chunked upload sessions idle for longer than
+    CHUNKED_UPLOAD_SESSION_TTL_HOURS, together with their partial files.
+    Completed sessions attached to a legal request or process are kept
+    only for the same window (their file already lives on the target).
+    """
+    from gym_app.models import UploadSession
+
+    cutoff = timezone.now() - timedelta(
+        hours=getattr(settings, 'CHUNKED_UPLOAD_SESSION_TTL_HOURS', 24)
+    )
+    stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+    deleted = 0
+    # Delete one by one so the post_delete signal removes each partial file.
+    for session in stale.iterator():
+        session.delete()
+        deleted += 1
+
+    if deleted:
+        logger.info(f"Upload session cleanup: deleted {deleted} stale sessions")
+    return deleted
+
+
+@periodic_task(crontab(hour='2', minute='30'))
+def media_blob_garbage_collection():
+    """
+    Daily removal of deduplicated media blobs no file references anymore.
+    Runs before the backup window so archives don't carry dead blobs.
+    Only runs when content-addressed media storage is enabled.
+    """
+    if not getattr(settings, 'MEDIA_DEDUP_ENABLED', False):
+        return
+
+    from django.core.management import call_command
+
+    logger.info("Running media blob garbage collection...")
+    output = StringIO()
+    call_command('gc_media_blobs', stdout=output)
+    logger.info(output.getvalue())
@@ -2,7 +2,7 @@ from django.conf import settings
 from django.urls import path, include, re_path
 from gym_app.admin import admin_site
 from gym_app.views.spa import SPAView, outlook_callback
-from gym_app.views.health import health_check
+from gym_app.views.health import health_check, metrics
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
 
@@ -10,6 +10,7 @@ urlpatterns = [
     path('admin/', admin_site.urls),    
     path('api/', include('gym_app.urls')),
     path('api/health/', health_check, name='health-check'),
+    path('api/metrics/', metrics, name='metrics'),
 ]
 
 if settings.DEBUG:
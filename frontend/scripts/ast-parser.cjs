@@ -17,6 +17,11 @@
  *       error: string|null,
  *       summary: { testCount, issueCount, hasParseError }
  *     }
+ *   node ast-parser.cjs --serve             (persistent worker, same cwd)
+ *   stdin:  one JSON request per line   { id, file, e2e }
+ *   stdout: one JSON response per line  { id, result }  where `result` is
+ *           exactly the single-file payload above. The worker exits when
+ *           stdin closes; the bridge enforces the 30s budget per request.
  *   Exit code is ALWAYS 0. Failures (unresolvable dependency, unreadable
  *   file, syntax error) are reported inside the payload as `error` plus a
  *   PARSE_ERROR issue — never as a non-zero exit or a bare stack trace.
@@ -1491,8 +1496,46 @@ function parseTestFile(filePath, isE2E) {
   };
 }
 
+function buildPayload(fileArg, isE2E) {
+  const displayPath = path.resolve(fileArg);
+  if (!babelParser) {
+    return errorPayload(displayPath, dependencyError);
+  }
+  try {
+    return parseTestFile(fileArg, isE2E);
+  } catch (error) {
+    return errorPayload(displayPath, String(error && error.message ? error.message : error));
+  }
+}
+
+// Persistent mode: one process parses every file the bridge sends, so Node
+// startup and the @babel/parser load are paid once per worker instead of
+// once per spec. Requests are answered strictly in order.
+function serve() {
+  const readline = require('readline');
+  const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  lines.on('line', (line) => {
+    if (!line.trim()) return;
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (error) {
+      printJson({ id: null, result: errorPayload('', 'Invalid request: ' + String(error.message)) });
+      return;
+    }
+    const result = request && typeof request.file === 'string' && request.file
+      ? buildPayload(request.file, !!request.e2e)
+      : errorPayload('', 'Missing file path argument');
+    printJson({ id: request ? request.id : null, result });
+  });
+}
+
 function main() {
   const args = process.argv.slice(2);
+  if (args.includes('--serve')) {
+    serve();
+    return;
+  }
   const fileArg = args.find((arg) => !arg.startsWith('-'));
   const isE2E = args.includes('--e2e');
 
@@ -1500,16 +1543,7 @@ function main() {
     printJson(errorPayload('', 'Missing file path argument'));
     return;
   }
-  const displayPath = path.resolve(fileArg);
-  if (!babelParser) {
-    printJson(errorPayload(displayPath, dependencyError));
-    return;
-  }
-  try {
-    printJson(parseTestFile(fileArg, isE2E));
-  } catch (error) {
-    printJson(errorPayload(displayPath, String(error && error.message ? error.message : error)));
-  }
+  printJson(buildPayload(fileArg, isE2E));
 }
 
 main();
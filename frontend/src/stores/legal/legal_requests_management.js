@@ -62,6 +62,7 @@ export const useLegalRequestsStore = defineStore('legalRequestsManagement', {
           return {
             requests: response.data.requests,
             count: response.data.count,
+            hasMore: response.data.has_more,
             userRole: response.data.user_role
           }
         }
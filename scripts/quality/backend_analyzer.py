@@ -26,6 +26,7 @@ from .base import (
     FileResult,
     SuiteResult,
 )
+from .file_runner import FileRunner
 
 if TYPE_CHECKING:
     from .base import Config
@@ -436,12 +437,14 @@ class PythonAnalyzer:
         repo_root: Path, 
         config: "Config", 
         patterns: "Patterns", 
-        verbose: bool = False
+        verbose: bool = False,
+        file_runner: FileRunner | None = None,
     ):
         self.repo_root = repo_root
         self.config = config
         self.patterns = patterns
         self.verbose = verbose
+        self.file_runner = file_runner or FileRunner()
     
     def _rel(self, path: Path) -> str:
         return path.relative_to(self.repo_root).as_posix()
@@ -476,11 +479,11 @@ class PythonAnalyzer:
             self._log(f"Directory not found: {tests_root}")
             return result
         
-        for path in sorted(tests_root.rglob(self.config.py_test_file_glob)):
-            if file_matcher and not file_matcher(path):
-                continue
-            file_result = self._analyze_file(path, tests_root)
-            result.files.append(file_result)
+        paths = [
+            path for path in sorted(tests_root.rglob(self.config.py_test_file_glob))
+            if not file_matcher or file_matcher(path)
+        ]
+        result.files.extend(self.file_runner.run(self, "_analyze_file", paths, tests_root))
         
         return result
     
@@ -0,0 +1,267 @@
+"""
+Per-file analysis runner: optional process pool and persistent result cache.
+
+Every analyzer's per-file pass is independent of the other files (duplicate
+detection across a suite runs afterwards, in the parent), so `FileRunner`
+can fan the files of a suite out to a process pool and reuse results from a
+previous run.
+
+Cache keys hash everything a file's result depends on:
+
+* the file's repo-relative path and content,
+* the content of relative-import targets a JS/TS spec may inline (the junk
+  detectors pull helper bodies from sibling modules),
+* the analyzer version: the sources of this package and of the Babel parser
+  script, so editing a rule invalidates every entry,
+* the run context: effective config, junk severity policy, semantic mode,
+  and which analysis method runs (AST bridge vs source-only).
+
+Results are returned in input order and cached entries are snapshots taken
+before the orchestrator mutates issues, so a warm or parallel run produces
+the same report as a serial cold one.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from . import junk_detectors
+from .base import FileResult
+
+# Bump when the cached payload layout changes.
+CACHE_FORMAT = 1
+
+# Entries not read for this long are dropped when the cache is saved.
+CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+_JS_SUFFIXES = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".vue")
+_RELATIVE_IMPORT_RE = re.compile(r"""(?:\bfrom|\bimport)\s*\(?\s*['"](\.{1,2}/[^'"]+)['"]""")
+_IMPORT_PROBE_SUFFIXES = (".js", ".ts", ".mjs", ".jsx", ".tsx", ".vue")
+
+
+def analyzer_version(repo_root: Path) -> str:
+    """Digest of the analysis code: this package plus the Babel parser script."""
+    digest = hashlib.sha256(f"format:{CACHE_FORMAT}".encode())
+    sources = sorted(_PACKAGE_DIR.glob("*.py"))
+    sources.append(repo_root / "frontend" / "scripts" / "ast-parser.cjs")
+    for path in sources:
+        digest.update(path.name.encode())
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-able form of a config value with a stable order for sets."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: _canonical(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(str(_canonical(item)) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def run_context(repo_root: Path, config: Any) -> str:
+    """Digest of everything outside a file that changes its analysis result."""
+    baseline, escalate = junk_detectors.get_junk_policy()
+    payload = {
+        "analyzer": analyzer_version(repo_root),
+        "config": _canonical(config),
+        "junk_baseline": sorted(baseline) if baseline is not None else None,
+        "junk_escalate": escalate,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _import_dependencies(path: Path, source: bytes) -> list[Path]:
+    """Files a JS/TS spec's relative imports may resolve to, in probe order."""
+    if path.suffix not in _JS_SUFFIXES:
+        return []
+    text = source.decode("utf-8", errors="replace")
+    candidates: list[Path] = []
+    for specifier in sorted(set(_RELATIVE_IMPORT_RE.findall(text))):
+        target = (path.parent / specifier).resolve()
+        candidates.append(target)
+        if not target.suffix:
+            candidates.extend(target.with_suffix(ext) for ext in _IMPORT_PROBE_SUFFIXES)
+        candidates.extend(target / f"index{ext}" for ext in (".js", ".ts"))
+    return candidates
+
+
+class ResultCache:
+    """On-disk map from cache key to a pickled `FileResult`."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[float, bytes]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as handle:
+                stored = pickle.load(handle)
+        except FileNotFoundError:
+            return
+        except Exception:
+            # Corrupt or written by another format: start over.
+            self._dirty = True
+            return
+        if isinstance(stored, dict) and stored.get("format") == CACHE_FORMAT:
+            self._entries = stored.get("entries", {})
+
+    def get(self, key: str) -> FileResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries[key] = (time.time(), entry[1])
+        self._dirty = True
+        return pickle.loads(entry[1])
+
+    def put(self, key: str, file_result: FileResult) -> None:
+        self._entries[key] = (time.time(), pickle.dumps(file_result, pickle.HIGHEST_PROTOCOL))
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        cutoff = time.time() - CACHE_MAX_AGE_SECONDS
+        entries = {key: entry for key, entry in self._entries.items() if entry[0] >= cutoff}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as handle:
+            pickle.dump({"format": CACHE_FORMAT, "entries": entries}, handle, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+# Analyzer rebuilt once per worker process by `_init_worker`.
+_WORKER_ANALYZER: Any = None
+
+
+def _analyzer_spec(analyzer: Any) -> tuple[type, dict[str, Any]]:
+    """Constructor arguments that rebuild `analyzer` in a worker (quietly)."""
+    kwargs = {
+        "repo_root": analyzer.repo_root,
+        "config": analyzer.config,
+        "patterns": analyzer.patterns,
+        "verbose": False,
+    }
+    if hasattr(analyzer, "semantic_rules"):
+        kwargs["semantic_rules"] = analyzer.semantic_rules
+    return type(analyzer), kwargs
+
+
+def _init_worker(spec: tuple[type, dict[str, Any]], junk_policy: tuple[set[str] | None, bool]) -> None:
+    global _WORKER_ANALYZER
+    junk_detectors.set_junk_policy(*junk_policy)
+    analyzer_class, kwargs = spec
+    _WORKER_ANALYZER = analyzer_class(**kwargs)
+
+
+def _analyze_in_worker(task: tuple[str, Path, tuple[Any, ...]]) -> FileResult:
+    method, path, args = task
+    return getattr(_WORKER_ANALYZER, method)(path, *args)
+
+
+class FileRunner:
+    """
+    Run an analyzer's per-file method over a list of files.
+
+    `jobs=1` (the default) analyzes in-process, exactly as before; `jobs>1`
+    uses a process pool of that size and `jobs=0` one worker per CPU. With a
+    `ResultCache`, unchanged files are served from it and only the rest are
+    analyzed.
+    """
+
+    def __init__(self, jobs: int = 1, cache: ResultCache | None = None, context: str = ""):
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.cache = cache
+        self.context = context
+
+    def run(self, analyzer: Any, method: str, paths: list[Path], *args: Any) -> list[FileResult]:
+        """`[getattr(analyzer, method)(path, *args) for path in paths]`, parallel and cached."""
+        results: list[FileResult | None] = [None] * len(paths)
+        keys: list[str | None] = [None] * len(paths)
+        pending: list[int] = []
+        for index, path in enumerate(paths):
+            if self.cache is not None:
+                keys[index] = self._key(analyzer, method, path)
+                cached = self.cache.get(keys[index]) if keys[index] else None
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.append(index)
+
+        analyzed = self._analyze(analyzer, method, [paths[index] for index in pending], args)
+        for index, file_result in zip(pending, analyzed):
+            results[index] = file_result
+            if self.cache is not None and keys[index]:
+                self.cache.put(keys[index], file_result)
+        return results  # type: ignore[return-value]
+
+    def _analyze(self, analyzer: Any, method: str, paths: list[Path], args: tuple[Any, ...]) -> list[FileResult]:
+        if self.jobs == 1 or len(paths) < 2:
+            analyze = getattr(analyzer, method)
+            return [analyze(path, *args) for path in paths]
+
+        workers = min(self.jobs, len(paths))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(_analyzer_spec(analyzer), junk_detectors.get_junk_policy()),
+        ) as pool:
+            return list(pool.map(
+                _analyze_in_worker,
+                [(method, path, args) for path in paths],
+                chunksize=max(1, len(paths) // (workers * 4)),
+            ))
+
+    def _key(self, analyzer: Any, method: str, path: Path) -> str | None:
+        try:
+            source = path.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256()
+        for part in (
+            self.context,
+            type(analyzer).__name__,
+            method,
+            str(getattr(analyzer, "semantic_rules", "")),
+            path.relative_to(analyzer.repo_root).as_posix(),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(source)
+        for dependency in _import_dependencies(path, source):
+            try:
+                name = dependency.relative_to(analyzer.repo_root).as_posix()
+            except ValueError:
+                name = str(dependency)
+            digest.update(b"\0" + name.encode() + b"\0")
+            try:
+                digest.update(dependency.read_bytes())
+            except OSError:
+                digest.update(b"<missing>")
+        return digest.hexdigest()
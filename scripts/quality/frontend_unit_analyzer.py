@@ -23,6 +23,7 @@ from .base import (
     SEMANTIC_RULE_IDS,
 )
 from .patterns import Patterns
+from .file_runner import FileRunner
 from .js_ast_bridge import JSASTBridge, JSFileResult, JSIssueInfo
 from .junk_detectors import (
     analyze_unit_source,
@@ -81,6 +82,7 @@ class FrontendUnitAnalyzer:
         patterns: Patterns,
         verbose: bool = False,
         semantic_rules: str = "soft",
+        file_runner: FileRunner | None = None,
     ):
         self.repo_root = repo_root
         self.config = config
@@ -88,6 +90,7 @@ class FrontendUnitAnalyzer:
         self.verbose = verbose
         self.semantic_rules = semantic_rules
         self.bridge = JSASTBridge(repo_root, verbose)
+        self.file_runner = file_runner or FileRunner()
     
     def discover_files(
         self,
@@ -356,15 +359,13 @@ class FrontendUnitAnalyzer:
         if self.verbose:
             print(f"  Found {len(files)} unit test files")
 
-        for file_path in files:
-            file_result = (
-                self.analyze_file(file_path) if bridge_ok
-                else self._analyze_file_source_only(file_path)
-            )
+        method = "analyze_file" if bridge_ok else "_analyze_file_source_only"
+        for file_path, file_result in zip(files, self.file_runner.run(self, method, files)):
             result.add_file(file_result)
 
             if self.verbose and file_result.issues:
                 print(f"    {file_path.name}: {len(file_result.issues)} issues")
+        self.bridge.close()
 
         self._attach_duplicate_issues(result, files)
         
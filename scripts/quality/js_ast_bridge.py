@@ -3,17 +3,30 @@ JavaScript AST Bridge.
 
 Provides Python interface to the Node.js Babel AST parser.
 Handles execution of the parser and parsing of JSON results.
+
+By default files are parsed by long-lived `ast-parser.cjs --serve` workers
+speaking newline-delimited JSON over stdin/stdout, so Node startup and the
+`@babel/parser` load are paid once per worker instead of once per file. A
+worker that exceeds the per-file budget is killed and replaced on the next
+request; `persistent=False` keeps the one-process-per-file mode.
 """
 
 from __future__ import annotations
 
 import json
+import queue
 import subprocess
 import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+# Per-file parse budget, in both bridge modes.
+PARSE_TIMEOUT_SECONDS = 30
+
 
 @dataclass
 class JSTestInfo:
@@ -106,20 +119,108 @@ class JSFileResult:
         )
 
 
+class WorkerProtocolError(RuntimeError):
+    """The parser process answered something other than a serve-mode response."""
+
+
+def _stop_process(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.kill()
+    process.wait()
+    for stream in (process.stdin, process.stdout):
+        if stream is not None:
+            stream.close()
+
+
+class _NodeWorker:
+    """One `ast-parser.cjs --serve` process answering requests in order."""
+
+    def __init__(self, command: list[str], cwd: Path):
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            cwd=str(cwd),
+        )
+        self._responses: queue.Queue[str | None] = queue.Queue()
+        self._next_id = 0
+        threading.Thread(target=self._read_responses, daemon=True).start()
+        # Kill the process even when the bridge is never closed explicitly
+        self._finalizer = weakref.finalize(self, _stop_process, self.process)
+
+    def _read_responses(self) -> None:
+        for line in self.process.stdout:
+            self._responses.put(line)
+        self._responses.put(None)
+
+    def parse(self, file_path: Path, is_e2e: bool, timeout: float) -> dict[str, Any]:
+        """
+        Send one request and wait for its payload.
+
+        Raises subprocess.TimeoutExpired when no answer arrives in `timeout`
+        seconds, WorkerProtocolError when the process exits or answers out of
+        protocol. The worker is unusable after either.
+        """
+        self._next_id += 1
+        request = {"id": self._next_id, "file": str(file_path), "e2e": is_e2e}
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerProtocolError(f"worker not accepting requests: {e}") from e
+
+        try:
+            line = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(request["file"], timeout) from None
+        if line is None:
+            raise WorkerProtocolError(f"worker exited with code {self.process.wait()}")
+        try:
+            response = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise WorkerProtocolError(f"Invalid JSON from parser: {e}") from e
+        if not isinstance(response, dict) or response.get("id") != self._next_id:
+            raise WorkerProtocolError("parser does not support --serve")
+        return response.get("result") or {}
+
+    def close(self) -> None:
+        self._finalizer()
+
+
 class JSASTBridge:
     """
     Bridge to Node.js Babel AST parser.
     
     Executes the ast-parser.cjs script and parses JSON results.
+
+    Args:
+        repo_root: Repository root containing frontend/.
+        verbose: Print each file as it is parsed by `parse_files`.
+        persistent: Parse through long-lived serve-mode workers (default)
+            instead of one Node process per file.
+        workers: Size of the worker pool `parse_files` spreads files over.
     """
     
-    def __init__(self, repo_root: Path, verbose: bool = False):
+    def __init__(
+        self,
+        repo_root: Path,
+        verbose: bool = False,
+        persistent: bool = True,
+        workers: int = 1,
+    ):
         self.repo_root = repo_root
         self.verbose = verbose
+        self.persistent = persistent
+        self.workers = max(1, workers)
         self.parser_script = repo_root / "frontend" / "scripts" / "ast-parser.cjs"
         self._node_available: bool | None = None
         self._parser_available: bool | None = None
         self._node_cmd: str = "node"
+        self._idle_workers: queue.SimpleQueue[_NodeWorker] = queue.SimpleQueue()
 
     def _check_node(self) -> bool:
         """Check if Node.js is available, including NVM-managed installs."""
@@ -219,7 +320,44 @@ class JSASTBridge:
                 file_path=str(file_path),
                 error="AST parser not available (check Node.js and npm dependencies)",
             )
-        
+        if self.persistent:
+            return self._parse_with_worker(file_path, is_e2e)
+        return self._parse_with_subprocess(file_path, is_e2e)
+
+    def _parse_with_worker(self, file_path: Path, is_e2e: bool) -> JSFileResult:
+        """Parse on an idle serve-mode worker, starting one when none is idle."""
+        try:
+            worker = self._idle_workers.get_nowait()
+        except queue.Empty:
+            try:
+                worker = _NodeWorker(
+                    [self._node_cmd, str(self.parser_script), "--serve"],
+                    self.repo_root / "frontend",
+                )
+            except OSError:
+                self.persistent = False
+                return self._parse_with_subprocess(file_path, is_e2e)
+
+        try:
+            data = worker.parse(file_path, is_e2e, PARSE_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            worker.close()
+            return JSFileResult(
+                file_path=str(file_path),
+                error=f"Parser timeout ({PARSE_TIMEOUT_SECONDS}s)",
+            )
+        except WorkerProtocolError:
+            # A parser script without serve mode (or one that crashed): this
+            # file and the rest of the run go through one process per file.
+            worker.close()
+            self.persistent = False
+            return self._parse_with_subprocess(file_path, is_e2e)
+
+        self._idle_workers.put(worker)
+        return JSFileResult.from_dict(data)
+
+    def _parse_with_subprocess(self, file_path: Path, is_e2e: bool) -> JSFileResult:
+        """Parse in a dedicated Node process."""
         try:
             cmd = [self._node_cmd, str(self.parser_script), str(file_path)]
             if is_e2e:
@@ -229,7 +367,7 @@ class JSASTBridge:
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=30,
+                timeout=PARSE_TIMEOUT_SECONDS,
                 cwd=str(self.repo_root / "frontend"),
             )
             
@@ -261,7 +399,7 @@ class JSASTBridge:
         except subprocess.TimeoutExpired:
             return JSFileResult(
                 file_path=str(file_path),
-                error="Parser timeout (30s)",
+                error=f"Parser timeout ({PARSE_TIMEOUT_SECONDS}s)",
             )
         except Exception as e:
             return JSFileResult(
@@ -274,10 +412,25 @@ class JSASTBridge:
         file_paths: list[Path], 
         is_e2e: bool = False,
     ) -> list[JSFileResult]:
-        """Parse multiple files."""
-        results = []
-        for path in file_paths:
-            if self.verbose:
+        """Parse multiple files, over up to `workers` serve-mode workers, in input order."""
+        if self.verbose:
+            for path in file_paths:
                 print(f"  Parsing: {path.name}")
-            results.append(self.parse_file(path, is_e2e))
-        return results
+        if not self.persistent or self.workers == 1 or len(file_paths) < 2 or not self.is_available():
+            return [self.parse_file(path, is_e2e) for path in file_paths]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(file_paths))) as pool:
+            return list(pool.map(lambda path: self.parse_file(path, is_e2e), file_paths))
+
+    def close(self) -> None:
+        """Stop the idle workers; later parses start new ones."""
+        while True:
+            try:
+                self._idle_workers.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> "JSASTBridge":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
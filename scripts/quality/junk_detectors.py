@@ -22,13 +22,21 @@ rather than the Babel AST, for three reasons:
 
 All detectors are pure functions over `TestBlock`, so they are equally usable
 from the gate and from an audit that walks a whole corpus.
+
+Scanning is shared: each file is masked once into a `SourceScan` (masked text,
+bracket tables, line index, function bodies) that block extraction, helper
+resolution and tag resolution all read, and scans of helper modules are
+memoized for the whole run instead of being rebuilt for every spec that
+imports them.
 """
 
 from __future__ import annotations
 
+import bisect
 import hashlib
 import re
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
@@ -95,6 +103,14 @@ MUTATING_VERBS: frozenset[str] = frozenset({
     "cancel", "archive", "publish", "invite", "assign",
 })
 
+# One pattern per interaction call, compiled once (TestBlock.interactions).
+_INTERACTION_CALL_RES: dict[str, re.Pattern[str]] = {
+    name: re.compile(rf"(?<!localStorage)(?<!sessionStorage)\.{name}\s*\(")
+    for name in INTERACTION_CALLS
+}
+
+_CALL_NAME_RE = re.compile(r"\.(\w+)\s*\(")
+
 # Evidence that a test checked the resulting state, not just the starting one.
 _STATE_CHANGE_RE = re.compile(
     r"\.not\.|toHaveCount\(|toBeHidden\(|toHaveText\(|toContainText\(|"
@@ -129,6 +145,11 @@ ALLOW_MARKERS: dict[str, str] = {
     "allow-url-alternation": "tautological_url",
 }
 
+_ALLOW_MARKER_RES: dict[str, re.Pattern[str]] = {
+    marker: re.compile(rf"quality:\s*{re.escape(marker)}", re.IGNORECASE)
+    for marker in ALLOW_MARKERS
+}
+
 # `test`/`it` must be a standalone identifier, never a method. A plain \b here
 # also matched `/^regex$/.test(apiPath)` and `str.it(...)`, which invented test
 # blocks inside API mock helpers and then reported them as duplicates of each
@@ -181,6 +202,10 @@ class TestBlock:
     # Test body plus the helper bodies it reaches; set by the analyze_* entry
     # points. Behavioral rules read this, line-attributed rules read `source`.
     expanded: str = ""
+    # Call names of the last `reach` scanned, shared by every detector.
+    _call_index: tuple[str, frozenset[str]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def reach(self) -> str:
@@ -189,7 +214,10 @@ class TestBlock:
 
     def calls(self) -> set[str]:
         """Method names invoked anywhere this test reaches."""
-        return set(re.findall(r"\.(\w+)\s*\(", self.reach))
+        reach = self.reach
+        if self._call_index is None or self._call_index[0] is not reach:
+            self._call_index = (reach, frozenset(_CALL_NAME_RE.findall(reach)))
+        return set(self._call_index[1])
 
     def interactions(self) -> set[str]:
         # Receiver-qualified (F50): `localStorage.clear()` is test housekeeping,
@@ -198,9 +226,7 @@ class TestBlock:
         # call sites hangs off something other than a Storage object.
         hits: set[str] = set()
         for name in self.calls() & INTERACTION_CALLS:
-            if re.search(
-                rf"(?<!localStorage)(?<!sessionStorage)\.{name}\s*\(", self.reach
-            ):
+            if _INTERACTION_CALL_RES[name].search(self.reach):
                 hits.add(name)
         return hits
 
@@ -309,6 +335,22 @@ def _regex_literal_end(source: str, out: list[str], start: int) -> int:
     return -1
 
 
+# Characters that can open a string, comment or regex literal. Everything
+# between two of them is plain code and is copied through untouched.
+_SCAN_STOP_RE = re.compile(r"[\"'`/]")
+_NOT_NEWLINE_RE = re.compile(r"[^\n]")
+# String body up to (not including) the closing delimiter; `\x` never closes.
+_STRING_BODY_RES = {
+    quote: re.compile(rf"(?:[^\\{quote}]|\\.)*", re.DOTALL) for quote in "\"'`"
+}
+
+
+def _blank(out: list[str], source: str, start: int, end: int) -> None:
+    """Replace `source[start:end]` in `out` with spaces, keeping newlines."""
+    segment = source[start:end]
+    out[start:end] = _NOT_NEWLINE_RE.sub(" ", segment) if "\n" in segment else " " * len(segment)
+
+
 def _strip_for_scanning(source: str) -> str:
     """
     Blank out string, comment and regex-literal content, preserving length and
@@ -319,53 +361,50 @@ def _strip_for_scanning(source: str) -> str:
     fool the paren matcher. Regex literals are blanked whole: a `\\//` or a
     quote inside one otherwise reads as a comment or string opener and
     desynchronizes everything after it.
+
+    Plain code between two delimiter characters is skipped by one regex
+    search rather than walked character by character.
     """
     out = list(source)
-    i = 0
     n = len(source)
+    i = 0
     while i < n:
+        stop = _SCAN_STOP_RE.search(source, i)
+        if stop is None:
+            break
+        i = stop.start()
         ch = source[i]
-        if ch in "\"'`":
-            quote = ch
-            i += 1
-            while i < n:
-                if source[i] == "\\":
-                    if source[i] != "\n":
-                        out[i] = " "
-                    i += 1
-                    if i < n and source[i] != "\n":
-                        out[i] = " "
-                    i += 1
-                    continue
-                if source[i] == quote:
-                    break
-                if source[i] != "\n":
-                    out[i] = " "
-                i += 1
-            i += 1
+        if ch != "/":
+            body_end = _STRING_BODY_RES[ch].match(source, i + 1).end()
+            if body_end < n and source[body_end] == ch:
+                _blank(out, source, i + 1, body_end)
+                i = body_end + 1
+            else:
+                # Unterminated: blank to the end of the file.
+                _blank(out, source, i + 1, n)
+                i = n
             continue
-        if ch == "/" and i + 1 < n and source[i + 1] == "/":
-            while i < n and source[i] != "\n":
-                out[i] = " "
-                i += 1
+        if i + 1 < n and source[i + 1] == "/":
+            newline = source.find("\n", i)
+            end = n if newline == -1 else newline
+            _blank(out, source, i, end)
+            i = end
             continue
-        if ch == "/" and i + 1 < n and source[i + 1] == "*":
-            while i + 1 < n and not (source[i] == "*" and source[i + 1] == "/"):
-                if source[i] != "\n":
-                    out[i] = " "
-                i += 1
-            if i + 1 < n:
-                out[i] = " "
-                out[i + 1] = " "
-            i += 2
+        if i + 1 < n and source[i + 1] == "*":
+            close = source.find("*/", i + 1)
+            if close == -1:
+                # The original walk stopped one short of the end here.
+                _blank(out, source, i, n - 1)
+                i = n + 1
+            else:
+                _blank(out, source, i, close + 2)
+                i = close + 2
+            continue
+        end = _regex_literal_end(source, out, i)
+        if end != -1:
+            out[i:end] = " " * (end - i)  # literal has no newlines by construction
+            i = end
             continue
-        if ch == "/":
-            end = _regex_literal_end(source, out, i)
-            if end != -1:
-                for j in range(i, end):  # literal has no newlines by construction
-                    out[j] = " "
-                i = end
-                continue
         i += 1
     return "".join(out)
 
@@ -456,7 +495,79 @@ def _match_paren(masked: str, open_idx: int) -> int:
     return -1
 
 
-def _describe_tag_options(source: str, masked: str) -> list[tuple[int, int, str]]:
+_BRACKET_RE = re.compile(r"[(){}]")
+
+
+class SourceScan:
+    """
+    One masking pass over a file, shared by everything that reads its structure.
+
+    Holds the masked text plus lazily built bracket tables (matching a paren or
+    brace becomes a lookup instead of a walk), a line index, and the functions
+    the module defines. Build it through `scan_source`, which memoizes scans by
+    text for the whole run: a helper module imported by fifty specs is masked
+    and parsed once, not fifty times.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.masked = _strip_for_scanning(source)
+
+    @cached_property
+    def _closers(self) -> tuple[dict[int, int], dict[int, int]]:
+        # A stack match is exactly the forward depth walk of _match_paren /
+        # _matched_brace_end: the opener on top is the one the walk from it
+        # would close first, and unmatched openers never get an entry (-1).
+        parens: dict[int, int] = {}
+        braces: dict[int, int] = {}
+        open_parens: list[int] = []
+        open_braces: list[int] = []
+        for match in _BRACKET_RE.finditer(self.masked):
+            ch = match.group()
+            if ch == "(":
+                open_parens.append(match.start())
+            elif ch == ")":
+                if open_parens:
+                    parens[open_parens.pop()] = match.end()
+            elif ch == "{":
+                open_braces.append(match.start())
+            elif open_braces:
+                braces[open_braces.pop()] = match.end()
+        return parens, braces
+
+    @cached_property
+    def _newlines(self) -> list[int]:
+        return [match.start() for match in re.finditer("\n", self.source)]
+
+    def paren_end(self, open_idx: int) -> int:
+        """`_match_paren(self.masked, open_idx)`, from the bracket table."""
+        if self.masked[open_idx] != "(":
+            return _match_paren(self.masked, open_idx)
+        return self._closers[0].get(open_idx, -1)
+
+    def brace_end(self, brace: int) -> int:
+        """`_matched_brace_end(self.masked, brace)`, from the bracket table."""
+        if self.masked[brace] != "{":
+            return _matched_brace_end(self.masked, brace)
+        return self._closers[1].get(brace, -1)
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of `offset`."""
+        return bisect.bisect_left(self._newlines, offset) + 1
+
+    @cached_property
+    def function_bodies(self) -> dict[str, str]:
+        """Every function the module defines, mapped to its source text."""
+        return _scan_function_bodies(self)
+
+
+@lru_cache(maxsize=512)
+def scan_source(source: str) -> SourceScan:
+    """The shared `SourceScan` of `source`."""
+    return SourceScan(source)
+
+
+def _describe_tag_options(scan: SourceScan) -> list[tuple[int, int, str]]:
     """
     `(span_start, span_end, options_source)` for each tag-carrying describe.
 
@@ -469,10 +580,11 @@ def _describe_tag_options(source: str, masked: str) -> list[tuple[int, int, str]
     the options text is sliced from the real source because the tags ARE
     string content, which masking blanks.
     """
+    source, masked = scan.source, scan.masked
     regions: list[tuple[int, int, str]] = []
     for match in _DESCRIBE_CALL_RE.finditer(masked):
         open_idx = match.end() - 1
-        close_idx = _match_paren(masked, open_idx)
+        close_idx = scan.paren_end(open_idx)
         if close_idx == -1:
             continue
 
@@ -491,7 +603,7 @@ def _describe_tag_options(source: str, masked: str) -> list[tuple[int, int, str]
             elif ch == "]":
                 bracket -= 1
             elif ch == "{" and depth == 0 and bracket == 0:
-                end = _matched_brace_end(masked, i)
+                end = scan.brace_end(i)
                 if end == -1:
                     break
                 j = i - 1
@@ -517,8 +629,9 @@ def extract_test_blocks(source: str, file: str = "") -> list[TestBlock]:
     template literals and comments cannot break the matching, then slices the
     real source for content.
     """
-    masked = _strip_for_scanning(source)
-    suite_tags = _describe_tag_options(source, masked)
+    scan = scan_source(source)
+    masked = scan.masked
+    suite_tags = _describe_tag_options(scan)
     blocks: list[TestBlock] = []
 
     for match in _TEST_CALL_RE.finditer(masked):
@@ -527,7 +640,7 @@ def extract_test_blocks(source: str, file: str = "") -> list[TestBlock]:
             continue
 
         open_idx = match.end() - 1
-        close_idx = _match_paren(masked, open_idx)
+        close_idx = scan.paren_end(open_idx)
         if close_idx == -1:
             continue
 
@@ -545,8 +658,8 @@ def extract_test_blocks(source: str, file: str = "") -> list[TestBlock]:
         if not re.search(r"=>|\bfunction\b", masked_raw):
             continue
 
-        start_line = source.count("\n", 0, match.start()) + 1
-        end_line = source.count("\n", 0, close_idx) + 1
+        start_line = scan.line_of(match.start())
+        end_line = scan.line_of(close_idx)
 
         name_match = re.search(r"(['\"`])((?:\\.|(?!\1).)*)\1", raw, flags=re.DOTALL)
         name = name_match.group(2) if name_match else ""
@@ -571,7 +684,7 @@ def extract_test_blocks(source: str, file: str = "") -> list[TestBlock]:
         if opts_ref and opts_ref.end() <= close_idx:
             decl = re.search(rf"\b{re.escape(opts_ref.group(2))}\s*=\s*\{{", masked)
             if decl:
-                obj_end = _matched_brace_end(masked, decl.end() - 1)
+                obj_end = scan.brace_end(decl.end() - 1)
                 if obj_end != -1:
                     opts_source = source[decl.end() - 1:obj_end]
                     if re.search(r"\btag\s*:", opts_source):
@@ -591,7 +704,7 @@ def extract_test_blocks(source: str, file: str = "") -> list[TestBlock]:
             outcomes=outcomes,
             allow_markers={
                 rule for marker, rule in ALLOW_MARKERS.items()
-                if re.search(rf"quality:\s*{re.escape(marker)}", raw, re.IGNORECASE)
+                if _ALLOW_MARKER_RES[marker].search(raw)
             },
             inherited_tags=inherited,
         ))
@@ -620,6 +733,8 @@ _FUNC_DECL_RE = re.compile(r"\b(?:async\s+)?function\s+(\w+)\s*\(")
 _FUNC_CONST_RE = re.compile(r"\b(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?(\(|\w+\s*=>)")
 _IMPORT_RE = re.compile(r"import\s+\{([^}]*)\}\s+from\s+['\"](\.[^'\"]*)['\"]")
 
+_CALLED_NAME_RE = re.compile(r"\b(\w+)\s*\(")
+
 _MAX_HELPER_DEPTH = 3
 
 
@@ -638,26 +753,30 @@ def _matched_brace_end(masked: str, brace: int) -> int:
 
 def _function_bodies(source: str) -> dict[str, str]:
     """Map every function defined in a module to its source text."""
-    masked = _strip_for_scanning(source)
+    return dict(scan_source(source).function_bodies)
+
+
+def _scan_function_bodies(scan: SourceScan) -> dict[str, str]:
+    source, masked = scan.source, scan.masked
     bodies: dict[str, str] = {}
 
     for match in _FUNC_DECL_RE.finditer(masked):
         # Match the param list structurally first: a destructured default
         # (`{ title }: {...} = {}`) puts a `{` inside the parens, and taking
         # the first `{` after the name captured the params as the body.
-        close = _match_paren(masked, match.end() - 1)
+        close = scan.paren_end(match.end() - 1)
         if close == -1:
             continue
         brace = masked.find("{", close)
         if brace == -1:
             continue
-        end = _matched_brace_end(masked, brace)
+        end = scan.brace_end(brace)
         if end != -1:
             bodies[match.group(1)] = source[match.start():end]
 
     for match in _FUNC_CONST_RE.finditer(masked):
         if match.group(2).startswith("("):
-            close = _match_paren(masked, match.start(2))
+            close = scan.paren_end(match.start(2))
             if close == -1:
                 continue
             arrow = masked.find("=>", close)
@@ -675,7 +794,7 @@ def _function_bodies(source: str) -> dict[str, str]:
         brace = after + (len(masked[after:]) - len(masked[after:].lstrip()))
         if brace >= len(masked) or masked[brace] != "{":
             continue  # Concise arrow body — nothing to inline.
-        end = _matched_brace_end(masked, brace)
+        end = scan.brace_end(brace)
         if end != -1:
             bodies[match.group(1)] = source[match.start():end]
 
@@ -693,20 +812,17 @@ def _resolve_import_bodies(source: str, spec_path: Path | None) -> dict[str, str
         if not imported:
             continue
 
-        target = (spec_path.parent / rel).resolve()
+        target = _resolve_relative(spec_path.parent, rel)
         candidates = [target]
         if not target.suffix:
             candidates = [target.with_suffix(ext) for ext in (".js", ".ts", ".mjs")]
         candidates += [target / f"index{ext}" for ext in (".js", ".ts")]
 
         for candidate in candidates:
-            if not candidate.is_file():
+            helper_source = _module_text(candidate)
+            if helper_source is None:
                 continue
-            try:
-                helper_source = candidate.read_text(encoding="utf-8", errors="replace")
-            except OSError:
-                break
-            for name, body in _function_bodies(helper_source).items():
+            for name, body in scan_source(helper_source).function_bodies.items():
                 if name in imported:
                     bodies[name] = body
             break
@@ -723,36 +839,62 @@ def effective_source(block: TestBlock, known: dict[str, str]) -> str:
     """
     combined = block.source
     seen: set[str] = set()
+    # Only the newly inlined text is scanned on each hop: the test and every
+    # helper body end in `)` / `}`, so no call match spans an append.
+    called: set[str] = set()
+    fresh = combined
 
     for _ in range(_MAX_HELPER_DEPTH):
-        called = set(re.findall(r"\b(\w+)\s*\(", combined))
+        called.update(_CALLED_NAME_RE.findall(fresh))
         pending = [name for name in called if name in known and name not in seen]
         if not pending:
             break
+        start = len(combined)
         for name in pending:
             seen.add(name)
             combined += "\n" + known[name]
+        fresh = combined[start:]
 
     return combined
 
 
-# Helper-module sources read while resolving imported tag constants. The audit
-# calls resolve_flow_ids once per test block, so a shared flow-tags module would
-# otherwise be re-read for every block in the suite.
-_MODULE_TEXT_CACHE: dict[str, str | None] = {}
+# Helper-module sources read while resolving imported helpers and tag
+# constants, keyed by path and validated by (mtime, size). Every spec importing
+# a shared helper or flow-tags module would otherwise re-read it, and the audit
+# resolves tags once per test block.
+_MODULE_TEXT_CACHE: dict[str, tuple[tuple[int, int] | None, str | None]] = {}
 
 
 def _module_text(path: Path) -> str | None:
     key = str(path)
-    if key not in _MODULE_TEXT_CACHE:
+    try:
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size) if path.is_file() else None
+    except OSError:
+        signature = None
+    cached = _MODULE_TEXT_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    text = None
+    if signature is not None:
         try:
-            _MODULE_TEXT_CACHE[key] = (
-                path.read_text(encoding="utf-8", errors="replace")
-                if path.is_file() else None
-            )
+            text = path.read_text(encoding="utf-8", errors="replace")
         except OSError:
-            _MODULE_TEXT_CACHE[key] = None
-    return _MODULE_TEXT_CACHE[key]
+            text = None
+    _MODULE_TEXT_CACHE[key] = (signature, text)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _resolve_relative(directory: Path, specifier: str) -> Path:
+    return (directory / specifier).resolve()
+
+
+def clear_scan_caches() -> None:
+    """Forget memoized scans, module texts and import resolutions."""
+    scan_source.cache_clear()
+    _resolve_relative.cache_clear()
+    _MODULE_TEXT_CACHE.clear()
 
 
 def _import_candidates(name: str, source: str, spec_path: Path | None) -> list[Path]:
@@ -766,7 +908,7 @@ def _import_candidates(name: str, source: str, spec_path: Path | None) -> list[P
     )
     if not imp:
         return []
-    target = (spec_path.parent / imp.group(1)).resolve()
+    target = _resolve_relative(spec_path.parent, imp.group(1))
     candidates = [target] if target.suffix else []
     candidates += [target.with_suffix(ext) for ext in (".ts", ".js", ".tsx")]
     return candidates
@@ -809,19 +951,6 @@ def _imported_flow_ids(const: str, source: str, spec_path: Path | None) -> list[
     return re.findall(r"@flow:([\w.-]+)", decl)
 
 
-# Masked variants of module/spec texts scanned for object-literal declarations.
-# resolve_flow_ids runs per test block, so without this the same flow-tags
-# catalog (and the spec itself) would be re-masked for every block in a suite.
-_MASKED_TEXT_CACHE: dict[str, str] = {}
-
-
-def _masked_text(text: str) -> str:
-    masked = _MASKED_TEXT_CACHE.get(text)
-    if masked is None:
-        masked = _MASKED_TEXT_CACHE[text] = _strip_for_scanning(text)
-    return masked
-
-
 def _object_member_flow_ids(text: str, obj: str, member: str) -> list[str] | None:
     """
     `@flow:` ids in the MEMBER array of `<obj> = { ..., MEMBER: [...], ... }`.
@@ -843,11 +972,11 @@ def _object_member_flow_ids(text: str, obj: str, member: str) -> list[str] | Non
 
 def _object_member_decl(text: str, obj: str, member: str) -> str | None:
     """Raw array body of `<obj> = { ..., MEMBER: [...], ... }`, or None."""
-    masked = _masked_text(text)
-    decl = re.search(rf"\b{re.escape(obj)}\s*=\s*\{{", masked)
+    scan = scan_source(text)
+    decl = re.search(rf"\b{re.escape(obj)}\s*=\s*\{{", scan.masked)
     if not decl:
         return None
-    end = _matched_brace_end(masked, decl.end() - 1)
+    end = scan.brace_end(decl.end() - 1)
     if end == -1:
         return None
     body = text[decl.end() - 1:end]
@@ -1528,10 +1657,12 @@ def detect_reimplements_sut(block: TestBlock) -> Finding | None:
     """
     if "reimplements_sut" in block.allow_markers:
         return None
-    masked = _strip_for_scanning(block.source)
+    # Block texts are one-offs: scanned directly, outside the shared memo.
+    scan = SourceScan(block.source)
+    masked = scan.masked
     for m in _EQ_MATCHER_RE.finditer(masked):
         open_idx = m.end() - 1
-        close_idx = _match_paren(masked, open_idx)
+        close_idx = scan.paren_end(open_idx)
         if close_idx == -1:
             continue
         expected = masked[open_idx + 1:close_idx - 1]
@@ -1720,6 +1851,11 @@ def set_junk_policy(baseline: set[str] | None, escalate: bool) -> None:
     _ESCALATE = escalate
 
 
+def get_junk_policy() -> tuple[set[str] | None, bool]:
+    """The (baseline, escalate) pair set by `set_junk_policy`, for worker processes."""
+    return _BASELINE, _ESCALATE
+
+
 def findings_to_issues(findings: list[Finding], severity=None) -> list:
     """
     Convert detector findings into the gate's Issue type.
@@ -11,6 +11,7 @@ Usage:
     python test_quality_gate.py --suite backend
     python test_quality_gate.py --suite frontend-unit
     python test_quality_gate.py --suite frontend-e2e
+    python test_quality_gate.py --jobs 0 --cache-dir .cache/test-quality
 
 Exit codes:
     0 - All validations passed (or only info-level issues in non-strict mode)
@@ -49,6 +50,7 @@ from quality import (
 )
 from quality.junk_detectors import set_junk_policy
 from quality.backend_analyzer import PythonAnalyzer
+from quality.file_runner import FileRunner, ResultCache, run_context
 from quality.external_lint import ExternalLintRunResult, ExternalLintRunner
 
 
@@ -169,6 +171,8 @@ class QualityReport:
         external_lint: str = "off",
         suite_time_budget_seconds: float | None = None,
         total_time_budget_seconds: float | None = None,
+        jobs: int = 1,
+        cache_dir: Path | None = None,
     ):
         self.repo_root = repo_root
         self.config = config
@@ -181,6 +185,8 @@ class QualityReport:
         self.external_lint = external_lint
         self.suite_time_budget_seconds = suite_time_budget_seconds
         self.total_time_budget_seconds = total_time_budget_seconds
+        self.jobs = jobs
+        self.cache_dir = cache_dir
 
     def _normalize_rule_id(self, raw_rule_id: str) -> str:
         """Normalize rule IDs to stable lowercase underscore form."""
@@ -869,6 +875,16 @@ class QualityReport:
         path_matcher = self._build_path_matcher(file_matcher)
         if file_matcher and self.verbose:
             print(f"{Colors.DIM}Applying include filters (files/globs){Colors.RESET}")
+
+        # Per-file analysis of every suite goes through one runner: a process
+        # pool with --jobs, cached results with --cache-dir. Neither changes
+        # the report.
+        cache = ResultCache(self.cache_dir / "results.pickle") if self.cache_dir else None
+        file_runner = FileRunner(
+            self.jobs,
+            cache,
+            run_context(self.repo_root, self.config) if cache is not None else "",
+        )
         
         backend = SuiteResult(suite_name="backend")
         unit = SuiteResult(suite_name="frontend_unit")
@@ -881,7 +897,7 @@ class QualityReport:
             
             suite_started = time.perf_counter()
             py_analyzer = PythonAnalyzer(
-                self.repo_root, self.config, self.patterns, self.verbose
+                self.repo_root, self.config, self.patterns, self.verbose, file_runner
             )
             backend_root = self.repo_root / "backend" / self.config.backend_app_name / "tests"
             backend = py_analyzer.analyze_suite(backend_root, file_matcher=path_matcher)
@@ -977,6 +993,7 @@ class QualityReport:
                         self.patterns,
                         self.verbose,
                         self.semantic_rules,
+                        file_runner,
                     )
                     unit_root = self.repo_root / "frontend" / self.config.frontend_unit_dir
                     unit = unit_analyzer.analyze_suite(unit_root, file_matcher=path_matcher)
@@ -1005,6 +1022,7 @@ class QualityReport:
                         self.patterns,
                         self.verbose,
                         self.semantic_rules,
+                        file_runner,
                     )
                     e2e_root = self.repo_root / "frontend" / self.config.frontend_e2e_dir
                     e2e = e2e_analyzer.analyze_suite(e2e_root, file_matcher=path_matcher)
@@ -1013,6 +1031,14 @@ class QualityReport:
                         print(f"  {Colors.DIM}Frontend E2E analyzer not available{Colors.RESET}")
             timings["frontend_e2e"] = time.perf_counter() - suite_started
 
+        if cache is not None:
+            cache.save()
+            if self.verbose:
+                print(
+                    f"\n{Colors.DIM}Result cache: {cache.hits} reused, "
+                    f"{cache.misses} analyzed ({cache.path}){Colors.RESET}"
+                )
+
         # Optional include-file/include-glob filtering
         backend = self._filter_suite_result(backend, file_matcher)
         unit = self._filter_suite_result(unit, file_matcher)
@@ -1244,6 +1270,23 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional total performance budget in seconds",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes for per-file analysis (default: 1 = serial, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Reuse per-file results from previous runs stored in this directory "
+            "(relative to --repo-root). Entries are keyed by file content, analyzer "
+            "version and config, so only changed files are re-analyzed."
+        ),
+    )
     parser.add_argument("--show-all", action="store_true",
                         help="Show all issues including info-level")
     parser.add_argument("--no-color", action="store_true",
@@ -1322,6 +1365,10 @@ def main() -> int:
                   file=sys.stderr)
     set_junk_policy(baseline, escalate=(args.junk_severity == "error") and not args.write_junk_baseline)
 
+    cache_dir = args.cache_dir
+    if cache_dir is not None and not cache_dir.is_absolute():
+        cache_dir = repo_root / cache_dir
+
     # Build report
     try:
         builder = QualityReport(
@@ -1335,6 +1382,8 @@ def main() -> int:
             args.external_lint,
             args.suite_time_budget_seconds,
             args.total_time_budget_seconds,
+            args.jobs,
+            cache_dir,
         )
         report = builder.build()
     except Exception as e: